@@ -1,6 +1,6 @@
 """
 Background Jobs Module
-Handles scheduled tasks like horoscope generation.
+Handles scheduled tasks like horoscope generation and placement indexing.
 """
 
 from server.background_jobs.horoscope_generator import (
@@ -8,9 +8,17 @@ from server.background_jobs.horoscope_generator import (
     stop_horoscope_scheduler,
     get_scheduler_status
 )
+from server.background_jobs.placement_indexer import (
+    start_placement_index_scheduler,
+    stop_placement_index_scheduler,
+    get_placement_index_status
+)
 
 __all__ = [
     "start_horoscope_scheduler",
     "stop_horoscope_scheduler",
-    "get_scheduler_status"
+    "get_scheduler_status",
+    "start_placement_index_scheduler",
+    "stop_placement_index_scheduler",
+    "get_placement_index_status"
 ]
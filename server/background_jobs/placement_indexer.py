@@ -0,0 +1,276 @@
+"""
+Placement Indexer Background Job
+Keeps the research placement index in step with the kundalis collection using APScheduler.
+
+Each run loads the current snapshot, applies charts updated since the last
+watermark, attaches ML scores from predictions created since the prediction
+watermark, drops deleted charts and writes a new snapshot. Readers pick up
+the new snapshot on their next query.
+
+The scheduler starts in every server worker, so a run first takes an
+exclusive lock file in the index directory (flock); while one process
+updates, runs in the other processes are skipped.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from server.services.placement_index import (
+    PLACEMENT_INDEX_DIR,
+    SCORE_COLUMNS,
+    PlacementIndex,
+    chart_values,
+    placement_terms,
+    prediction_values,
+)
+from server.database import get_db
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per index directory is assumed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Global scheduler instance
+scheduler: Optional[BackgroundScheduler] = None
+last_run: Optional[Dict[str, Any]] = None
+_update_lock = threading.Lock()
+
+UPDATE_INTERVAL_MINUTES = 15
+CHUNK_SIZE = 10000
+LOCK_FILE = ".update.lock"
+
+# Only the fields the index needs are fetched
+INDEX_PROJECTION = {
+    "kundali_data.planets": 1,
+    "kundali_data.ascendant": 1,
+    "kundali_data.shad_bala.yogas.yogas.yoga_name": 1,
+    "kundali_data.shad_bala.planetary_strengths": 1,
+    "kundali_data.dasha.current_maha_dasha": 1,
+    "kundali_data.dasha.current_antar_dasha": 1,
+    "updated_at": 1,
+}
+PREDICTION_PROJECTION = {"kundali_id": 1, "created_at": 1, **{column: 1 for column in SCORE_COLUMNS}}
+
+
+def _apply_predictions(index: PlacementIndex, db) -> int:
+    """Copy ML scores of predictions created since the prediction watermark onto their charts."""
+    query = {}
+    if index.prediction_watermark:
+        query = {"created_at": {"$gte": datetime.fromisoformat(index.prediction_watermark)}}
+    cursor = db["predictions"].find(query, PREDICTION_PROJECTION).sort("created_at", 1)
+
+    applied = 0
+    latest: Dict[str, Dict[str, float]] = {}
+    for prediction in cursor:
+        # Later predictions of the same chart win
+        latest[str(prediction.get("kundali_id"))] = prediction_values(prediction)
+        if prediction.get("created_at"):
+            index.prediction_watermark = prediction["created_at"].isoformat()
+        if len(latest) >= CHUNK_SIZE:
+            applied += index.set_values(list(latest), list(latest.values()))
+            latest = {}
+    if latest:
+        applied += index.set_values(list(latest), list(latest.values()))
+    return applied
+
+
+@contextmanager
+def _process_lock(directory: Path) -> Iterator[bool]:
+    """Hold the index directory's update lock if no other process does; yields whether it was taken."""
+    if fcntl is None:
+        yield True
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def update_placement_index(db=None, directory=PLACEMENT_INDEX_DIR, full_rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Apply chart changes since the last run and write a new index snapshot.
+
+    Charts updated at the watermark itself are re-applied, which is harmless
+    since setting a chart replaces its terms.
+
+    Args:
+        db: Database handle (defaults to get_db())
+        directory: Index directory
+        full_rebuild: Ignore the current snapshot and index every chart
+
+    Returns:
+        Run statistics ({"skipped": True, ...} when another process holds
+        the update lock)
+    """
+    directory = Path(directory)
+    with _update_lock, _process_lock(directory) as locked:
+        if not locked:
+            logger.info("Placement index update skipped: another process is updating")
+            return {"skipped": True, "reason": "another process is updating"}
+        started = time.perf_counter()
+        db = db if db is not None else get_db()
+        collection = db["kundalis"]
+
+        index = None
+        if not full_rebuild and (directory / "meta.json").exists():
+            try:
+                index = PlacementIndex.load(directory, mmap_mode="c")
+            except Exception as e:
+                logger.warning(f"Could not load placement index, rebuilding: {e}")
+        if index is None:
+            index = PlacementIndex()
+            full_rebuild = True
+
+        previous_watermarks = (index.watermark, index.prediction_watermark)
+        query = {}
+        if index.watermark:
+            query = {"updated_at": {"$gte": datetime.fromisoformat(index.watermark)}}
+        cursor = collection.find(query, INDEX_PROJECTION).sort("updated_at", 1)
+
+        updated = 0
+        chart_ids, terms_list, values_list = [], [], []
+        watermark = index.watermark
+        for doc in cursor:
+            kundali_data = doc.get("kundali_data") or {}
+            chart_ids.append(str(doc["_id"]))
+            terms_list.append(placement_terms(kundali_data))
+            values_list.append(chart_values(kundali_data))
+            if doc.get("updated_at"):
+                watermark = doc["updated_at"].isoformat()
+            if len(chart_ids) >= CHUNK_SIZE:
+                index.set_charts(chart_ids, terms_list)
+                index.set_values(chart_ids, values_list)
+                updated += len(chart_ids)
+                chart_ids, terms_list, values_list = [], [], []
+        if chart_ids:
+            index.set_charts(chart_ids, terms_list)
+            index.set_values(chart_ids, values_list)
+            updated += len(chart_ids)
+        scored = _apply_predictions(index, db)
+
+        # Deletions leave no trace in updated_at, so compare the id sets
+        removed = 0
+        if not full_rebuild:
+            stored_ids = {str(doc["_id"]) for doc in collection.find({}, {"_id": 1})}
+            indexed_ids = index.chart_ids_of(index.live)
+            removed = index.remove_charts(c for c in indexed_ids if c not in stored_ids)
+
+        index.watermark = watermark
+        # Charts and predictions at an unchanged watermark were already indexed
+        changed = (index.watermark, index.prediction_watermark) != previous_watermarks
+        if changed or removed or full_rebuild:
+            index.save(directory)
+
+        stats = {
+            "full_rebuild": full_rebuild,
+            "updated": updated,
+            "scored": scored,
+            "removed": removed,
+            "charts": len(index),
+            "terms": len(index.keys),
+            "version": index.version,
+            "watermark": index.watermark,
+            "duration_seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(
+            f"Placement index update: {updated} updated, {removed} removed, "
+            f"{stats['charts']} charts in {stats['duration_seconds']}s"
+        )
+        return stats
+
+
+def run_placement_index_update():
+    """Scheduled entry point; failures are logged and retried on the next run."""
+    global last_run
+
+    try:
+        last_run = {**update_placement_index(), "finished_at": datetime.utcnow().isoformat()}
+    except Exception as e:
+        logger.error(f"Placement index update failed: {str(e)}", exc_info=True)
+        last_run = {"error": str(e), "finished_at": datetime.utcnow().isoformat()}
+
+
+def start_placement_index_scheduler():
+    """
+    Initialize and start the placement index scheduler.
+    Called during application startup; the first update runs immediately.
+    """
+    global scheduler
+
+    try:
+        if scheduler is not None:
+            logger.warning("Placement index scheduler already running")
+            return
+
+        scheduler = BackgroundScheduler()
+        scheduler.add_job(
+            run_placement_index_update,
+            trigger=IntervalTrigger(minutes=UPDATE_INTERVAL_MINUTES),
+            id='placement_index_update',
+            name='Incremental placement index update',
+            replace_existing=True,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=300
+        )
+        scheduler.start()
+        logger.info(f"Placement index scheduler started: every {UPDATE_INTERVAL_MINUTES} minutes")
+
+    except Exception as e:
+        logger.error(f"Failed to start placement index scheduler: {str(e)}", exc_info=True)
+
+
+def stop_placement_index_scheduler():
+    """
+    Gracefully shutdown the placement index scheduler.
+    Called during application shutdown.
+    """
+    global scheduler
+
+    try:
+        if scheduler is not None:
+            scheduler.shutdown(wait=True)
+            scheduler = None
+            logger.info("Placement index scheduler stopped successfully")
+        else:
+            logger.warning("Placement index scheduler is not running")
+    except Exception as e:
+        logger.error(f"Error stopping placement index scheduler: {str(e)}", exc_info=True)
+
+
+def get_placement_index_status() -> dict:
+    """
+    Get the status of the placement index scheduler.
+
+    Returns:
+        Status dictionary with the next run time and last run statistics
+    """
+    running = scheduler is not None and scheduler.running
+    job = scheduler.get_job('placement_index_update') if running else None
+    return {
+        "status": "running" if running else "stopped",
+        "running": running,
+        "next_run_time": job.next_run_time.isoformat() if job and job.next_run_time else None,
+        "last_run": last_run,
+    }
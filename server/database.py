@@ -107,6 +107,10 @@ def _create_indexes():
         predictions_collection.create_index([('user_id', ASCENDING)])
         predictions_collection.create_index([('created_at', DESCENDING)])
 
+        # ML prediction cache entries expire after 30 days
+        ml_cache_collection = db['ml_prediction_cache']
+        ml_cache_collection.create_index([('created_at', ASCENDING)], expireAfterSeconds=2592000)
+
         logger.info("Database indexes created successfully")
     except Exception as e:
         logger.warning(f"Error creating indexes: {e}")
@@ -135,6 +139,7 @@ def get_db() -> dict:
         'user_settings': db['user_settings'],
         'kundalis': db['kundalis'],
         'predictions': db['predictions'],
+        'ml_prediction_cache': db['ml_prediction_cache'],
     }
 
 
@@ -7,13 +7,21 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from server.routes import export, kundali, auth, transits, predictions, ml_predictions, compatibility, horoscope, ai_analysis, batch_routes
+from server.routes import export, kundali, auth, transits, predictions, ml_predictions, compatibility, horoscope, ai_analysis, batch_routes, panchang, research, analytics
 from server.utils.swisseph_setup import setup_ephemeris
 from server.middleware.error_handler import setup_error_handlers, get_error_tracker
 from server.pydantic_schemas.api_response import APIResponse, ResponseStatus, success_response
 from server.database import get_db
-from server.background_jobs import start_horoscope_scheduler, stop_horoscope_scheduler
+from server.background_jobs import (
+    start_horoscope_scheduler,
+    stop_horoscope_scheduler,
+    start_placement_index_scheduler,
+    stop_placement_index_scheduler,
+)
 from server.database_indexes import create_all_indexes
+from server.ml.inference_batcher import close_batchers
+from server.ml.model_registry import preload_models
+from server.ml.similarity_index import stop_similarity_sync
 # from server.mcp.mcp_server import get_mcp_server
 
 # Configure logging
@@ -30,6 +38,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Load ML models at import, before a pre-forking server forks its workers,
+# so the workers share the model pages copy-on-write
+preload_models()
+
 # Global database client reference
 _db_client = None
 
@@ -61,6 +73,12 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Background scheduler initialization failed (non-fatal): {e}")
 
+    try:
+        start_placement_index_scheduler()
+        logger.info("Placement index scheduler started on startup")
+    except Exception as e:
+        logger.warning(f"Placement index scheduler initialization failed (non-fatal): {e}")
+
     try:
         create_all_indexes()
         logger.info("Database indexes created/verified on startup")
@@ -79,6 +97,24 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
 
+    try:
+        stop_placement_index_scheduler()
+        logger.info("Placement index scheduler stopped on shutdown")
+    except Exception as e:
+        logger.error(f"Error stopping placement index scheduler: {e}")
+
+    try:
+        close_batchers()
+        logger.info("ML inference batchers stopped on shutdown")
+    except Exception as e:
+        logger.error(f"Error stopping ML inference batchers: {e}")
+
+    try:
+        stop_similarity_sync()
+        logger.info("Chart similarity index written on shutdown")
+    except Exception as e:
+        logger.error(f"Error writing chart similarity index: {e}")
+
     try:
         if _db_client:
             _db_client.close()
@@ -108,6 +144,9 @@ app.include_router(export.router, prefix="/api/export", tags=["Export"])
 app.include_router(transits.router, prefix="/api/transits", tags=["Transits"])
 app.include_router(compatibility.router, prefix="/api/compatibility", tags=["Compatibility"])
 app.include_router(horoscope.router, prefix="/api/predictions/horoscope", tags=["Horoscope"])
+app.include_router(panchang.router, prefix="/api/panchang", tags=["Panchang"])
+app.include_router(research.router, prefix="/api/research", tags=["Research"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
 app.include_router(ai_analysis.router, tags=["AI Analysis"])
 app.include_router(batch_routes.router, prefix="/api", tags=["Batch"])
 
@@ -191,7 +230,10 @@ async def api_root():
                 "predictions": "/api/predictions",
                 "ml": "/api/ml",
                 "compatibility": "/api/compatibility",
-                "transits": "/api/transits"
+                "transits": "/api/transits",
+                "panchang": "/api/panchang",
+                "research": "/api/research",
+                "analytics": "/api/analytics"
             }
         },
         message="Welcome to Kundali Astrology API"
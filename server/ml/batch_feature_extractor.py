@@ -62,6 +62,7 @@ class BatchFeatureExtractor:
 
         NOTE: In production, this would call the actual Kundali generation API.
         For demonstration, we use deterministic features based on birth data.
+        Real features for a whole CSV are built by server.ml.training_data_builder.
 
         Args:
             birth_date: YYYY-MM-DD format
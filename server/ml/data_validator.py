@@ -10,18 +10,333 @@ Checks:
 - Outlier detection
 - Data quality scoring
 
+validate() reads the CSV once, in chunks of chunk_size rows, and folds every
+chunk into mergeable running statistics, so memory depends on the chunk size
+and column count but not on the file size:
+
+- RunningMoments: per-column count, mean and variance (Welford, merged with
+  Chan's formula), min and max
+- QuantileSketch: per-column quantiles for medians and IQR outlier bounds;
+  exact while a column has at most exact_values distinct values, t-digest
+  style centroids beyond
+- DuplicateSketch: distinct rows from 64-bit row hashes (k minimum values);
+  exact up to DUPLICATE_SKETCH_SIZE distinct rows, estimated beyond
+
+The report (validation_report.json) has the same layout as before.
+
 Author: ML Pipeline
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 import logging
 import json
+import time
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 50_000
+# Distinct values a column's quantile sketch keeps exactly
+EXACT_VALUES = 16_384
+# t-digest compression (about compression / 2 centroids per column)
+COMPRESSION = 1000
+# Row hashes kept by the duplicate sketch: 32 MB, exact up to 4M distinct rows
+DUPLICATE_SKETCH_SIZE = 1 << 22
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+_MISSING_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+class RunningMoments:
+    """Per-column count, mean, variance, min and max of float columns, ignoring NaN."""
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "RunningMoments":
+        """Moments of a (rows, columns) matrix."""
+        moments = cls(values.shape[1])
+        moments.count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            moments.mean = np.where(moments.count > 0, np.nansum(values, axis=0) / moments.count, 0.0)
+        moments.m2 = np.nansum(np.square(values - moments.mean), axis=0)
+        moments.min = np.fmin.reduce(values, axis=0, initial=np.inf)
+        moments.max = np.fmax.reduce(values, axis=0, initial=-np.inf)
+        return moments
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Fold in the moments of other rows (Chan et al. parallel update)."""
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(count > 0, other.count / count, 0.0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + np.square(delta) * self.count * weight
+        self.count = count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1, as pandas)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of one column.
+
+    Keeps sorted (value, count) pairs, which answer quantiles exactly, until
+    the column has more than exact_values distinct values; then merges them
+    into t-digest centroids (k1 scale), which are dense in the tails where
+    the IQR outlier bounds fall.
+    """
+
+    def __init__(self, exact_values: int = EXACT_VALUES, compression: float = COMPRESSION):
+        self.exact_values = exact_values
+        self.compression = compression
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+        self.exact = True
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values (NaN ignored)."""
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch = QuantileSketch(self.exact_values, self.compression)
+        batch.values, counts = np.unique(values, return_counts=True)
+        batch.weights = counts.astype(np.float64)
+        batch.min, batch.max = batch.values[0], batch.values[-1]
+        self.merge(batch)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold in another sketch."""
+        values = np.concatenate([self.values, other.values])
+        weights = np.concatenate([self.weights, other.weights])
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.exact = self.exact and other.exact
+        if self.exact:
+            values, inverse = np.unique(values, return_inverse=True)
+            weights = np.bincount(inverse, weights=weights)
+            if len(values) <= self.exact_values:
+                self.values, self.weights = values, weights
+                return
+            self.exact = False
+        else:
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], weights[order]
+        self.values, self.weights = self._compress(values, weights)
+
+    def _compress(self, values: np.ndarray, weights: np.ndarray):
+        """Merge sorted weighted points into centroids spanning at most one unit of the k1 scale."""
+        before = np.cumsum(weights) - weights
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * before / weights.sum() - 1)
+        group = np.floor(scale - scale[0]).astype(np.int64)
+        group_weights = np.bincount(group, weights=weights)
+        group_sums = np.bincount(group, weights=weights * values)
+        used = group_weights > 0
+        return group_sums[used] / group_weights[used], group_weights[used]
+
+    def _knots(self):
+        """(rank, value) interpolation points: centroid centers between min and max."""
+        centers = np.cumsum(self.weights) - self.weights + (self.weights - 1) / 2
+        ranks = np.concatenate([[0.0], centers, [self.count - 1]])
+        points = np.concatenate([[self.min], np.clip(self.values, self.min, self.max), [self.max]])
+        return ranks, points
+
+    def quantile(self, q: float) -> float:
+        """Quantile with linear interpolation between ranks, as pandas."""
+        n = self.count
+        if n == 0:
+            return float('nan')
+        h = (n - 1) * q
+        if self.exact:
+            cumulative = np.cumsum(self.weights)
+            low = np.floor(h)
+            below = self.values[np.searchsorted(cumulative, low, side='right')]
+            above = self.values[min(np.searchsorted(cumulative, low + 1, side='right'), len(self.values) - 1)]
+            return float(below + (h - low) * (above - below))
+        ranks, points = self._knots()
+        return float(np.interp(h, ranks, points))
+
+    def count_outside(self, lower: float, upper: float) -> int:
+        """Values strictly below lower or strictly above upper."""
+        if self.exact:
+            return int(self.weights[(self.values < lower) | (self.values > upper)].sum())
+        n = self.count
+        ranks, points = self._knots()
+        below = 0.0 if lower <= self.min else n if lower > self.max else np.ceil(np.interp(lower, points, ranks))
+        above = 0.0 if upper >= self.max else n if upper < self.min else n - np.floor(np.interp(upper, points, ranks)) - 1
+        return int(below + above)
+
+
+class DuplicateSketch:
+    """
+    Distinct-row counter over 64-bit row hashes (k minimum values).
+
+    Keeps the size smallest distinct hashes: exact while the data has at most
+    size distinct rows, an estimate with relative error about 1/sqrt(size)
+    beyond.
+    """
+
+    def __init__(self, size: int = DUPLICATE_SKETCH_SIZE):
+        self.size = size
+        self.rows = 0
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.saturated = False
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add the hashes of a batch of rows."""
+        self.rows += len(hashes)
+        self._add(np.unique(hashes))
+
+    def merge(self, other: "DuplicateSketch") -> None:
+        """Fold in another sketch."""
+        self.rows += other.rows
+        self.saturated = self.saturated or other.saturated
+        self._add(other.hashes)
+
+    def _add(self, hashes: np.ndarray) -> None:
+        if self.saturated and len(self.hashes):
+            hashes = hashes[hashes < self.hashes[-1]]
+        # Two sorted runs: the stable sort (timsort) merges them in linear time
+        merged = np.concatenate([self.hashes, hashes])
+        merged.sort(kind='stable')
+        keep = np.ones(len(merged), dtype=bool)
+        keep[1:] = merged[1:] != merged[:-1]
+        merged = merged[keep]
+        if len(merged) > self.size:
+            merged = merged[:self.size]
+            self.saturated = True
+        self.hashes = merged
+
+    @property
+    def distinct(self) -> int:
+        if not self.saturated:
+            return len(self.hashes)
+        return int(round((self.size - 1) / ((float(self.hashes[-1]) + 1) / 2.0 ** 64)))
+
+    @property
+    def duplicates(self) -> int:
+        return max(0, self.rows - self.distinct)
+
+
+def _merge_dtype(a, b):
+    """dtype pandas infers for a column whose chunks were read as a and b (None: no values yet)."""
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    if np.issubdtype(a, np.number) and np.issubdtype(b, np.number):
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+def _is_numeric(dtype) -> bool:
+    """Numeric as select_dtypes(include=[np.number]) (bool excluded)."""
+    return isinstance(dtype, np.dtype) and np.issubdtype(dtype, np.number)
+
+
+def _row_hashes(chunk: pd.DataFrame, numeric: List[int]) -> np.ndarray:
+    """
+    64-bit hash of every row. Numbers hash as float64 and missing values
+    alike whatever their dtype, so chunks pandas read with different dtypes
+    (int or float, float or text for a column empty in one chunk) agree.
+    """
+    hashes = np.zeros(len(chunk), dtype=np.uint64)
+    for j in range(chunk.shape[1]):
+        column = chunk.iloc[:, j]
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan) if j in numeric else column.to_numpy(dtype=object)
+        column_hashes = pd.util.hash_array(values)
+        column_hashes[column.isna().to_numpy()] = _MISSING_HASH
+        with np.errstate(over='ignore'):
+            hashes = hashes * _HASH_MULTIPLIER ^ column_hashes
+    return hashes
+
+
+class DatasetStats:
+    """
+    Everything the validation checks need, accumulated chunk by chunk.
+    Stats of disjoint parts of a dataset merge into the stats of the whole.
+    """
+
+    def __init__(self, columns: List[str], feature_ranges: Dict[str, tuple],
+                 exact_values: int = EXACT_VALUES, duplicate_sketch_size: int = DUPLICATE_SKETCH_SIZE):
+        self.columns = list(columns)
+        self.rows = 0
+        self.dtypes: Dict[str, object] = {}
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+        self.range_features = [name for name in feature_ranges if name in self.columns]
+        self.range_index = [self.columns.index(name) for name in self.range_features]
+        self.range_bounds = np.array([feature_ranges[name] for name in self.range_features],
+                                     dtype=np.float64).reshape(-1, 2)
+        self.out_of_range = np.zeros(len(self.range_features), dtype=np.int64)
+        self.moments = RunningMoments(len(self.columns))
+        self.sketches = [QuantileSketch(exact_values) for _ in self.columns]
+        self.duplicates = DuplicateSketch(duplicate_sketch_size)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold in one chunk of rows."""
+        if list(chunk.columns) != self.columns:
+            raise ValueError("Chunk columns differ from the dataset's")
+        self.rows += len(chunk)
+        missing = chunk.isnull().sum().to_numpy(dtype=np.int64)
+        self.missing += missing
+        for name, dtype, empty in zip(self.columns, chunk.dtypes, missing == len(chunk)):
+            # pandas reads a column without values as float64, whatever the rest of the file holds
+            self.dtypes[name] = _merge_dtype(self.dtypes.get(name), None if empty else dtype)
+
+        numeric = [j for j, dtype in enumerate(chunk.dtypes) if _is_numeric(dtype)]
+        values = np.full((len(chunk), len(self.columns)), np.nan)
+        if numeric:
+            values[:, numeric] = chunk.iloc[:, numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        selected = values[:, self.range_index]
+        self.out_of_range += ((selected < self.range_bounds[:, 0]) | (selected > self.range_bounds[:, 1])).sum(axis=0)
+        self.moments.merge(RunningMoments.of(values))
+        for j in numeric:
+            self.sketches[j].update(values[:, j])
+
+        self.duplicates.update(_row_hashes(chunk, numeric))
+
+    def merge(self, other: "DatasetStats") -> None:
+        """Fold in the stats of other rows of the same dataset."""
+        if other.columns != self.columns:
+            raise ValueError("Stats of datasets with different columns cannot be merged")
+        self.rows += other.rows
+        for name in self.columns:
+            self.dtypes[name] = _merge_dtype(self.dtypes.get(name), other.dtypes.get(name))
+        self.missing += other.missing
+        self.out_of_range += other.out_of_range
+        self.moments.merge(other.moments)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        self.duplicates.merge(other.duplicates)
+
+    def empty_frame(self) -> pd.DataFrame:
+        """No rows, with the dtypes pandas would read the whole dataset as."""
+        return pd.DataFrame({
+            name: pd.Series(dtype=self.dtypes.get(name) or np.dtype(np.float64)) for name in self.columns
+        })
+
+    def numeric_columns(self) -> List[str]:
+        """Columns numeric in the whole dataset."""
+        return list(self.empty_frame().select_dtypes(include=[np.number]).columns)
+
 
 class DataValidator:
     """Validate and assess quality of generated Kundali dataset."""
@@ -75,13 +390,31 @@ class DataValidator:
         'life_ease_score': (0, 100),
     }
 
-    def __init__(self):
-        """Initialize the validator."""
+    TARGET_FEATURES = [
+        'career_potential', 'wealth_potential', 'marriage_happiness',
+        'children_prospects', 'health_status', 'spiritual_inclination',
+        'chart_strength', 'life_ease_score'
+    ]
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, exact_values: int = EXACT_VALUES,
+                 duplicate_sketch_size: int = DUPLICATE_SKETCH_SIZE):
+        """
+        Initialize the validator.
+
+        Args:
+            chunk_size: Rows read and validated at a time
+            exact_values: Distinct values per column kept exactly for quantiles
+            duplicate_sketch_size: Distinct row hashes kept for the duplicate count
+        """
         self.df = None
+        self.stats: Optional[DatasetStats] = None
         self.validation_report = {}
+        self.chunk_size = chunk_size
+        self.exact_values = exact_values
+        self.duplicate_sketch_size = duplicate_sketch_size
 
     def load_data(self, csv_file: str) -> pd.DataFrame:
-        """Load dataset from CSV file."""
+        """Load a whole dataset from CSV (validate(csv_file) streams it instead)."""
         try:
             self.df = pd.read_csv(csv_file)
             logger.info(f"Loaded {len(self.df)} records from {csv_file}")
@@ -90,20 +423,49 @@ class DataValidator:
             logger.error(f"Error loading CSV: {str(e)}")
             return None
 
+    def _chunks(self, csv_file: Optional[str]) -> Optional[Iterable[pd.DataFrame]]:
+        """Chunks of the CSV file, or of the loaded DataFrame."""
+        if csv_file:
+            return pd.read_csv(csv_file, chunksize=self.chunk_size)
+        if self.df is not None:
+            return (self.df.iloc[start:start + self.chunk_size] for start in range(0, max(len(self.df), 1), self.chunk_size))
+        return None
+
+    def collect_stats(self, chunks: Iterable[pd.DataFrame]) -> DatasetStats:
+        """Accumulate the statistics of a dataset in one pass over its chunks."""
+        stats = None
+        start = time.perf_counter()
+        for chunk in chunks:
+            if stats is None:
+                stats = DatasetStats(list(chunk.columns), self.FEATURE_RANGES,
+                                     self.exact_values, self.duplicate_sketch_size)
+            stats.update(chunk)
+            elapsed = time.perf_counter() - start
+            logger.debug(f"Validated {stats.rows} rows in {elapsed:.1f}s ({stats.rows / max(elapsed, 1e-9):.0f} rows/sec)")
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            logger.info(f"Read {stats.rows} records in {elapsed:.1f}s ({stats.rows / max(elapsed, 1e-9):.0f} rows/sec)")
+        return stats
+
     def validate(self, csv_file: str = None) -> Dict:
         """
         Perform complete validation of dataset.
 
         Args:
-            csv_file: Path to CSV file to validate
+            csv_file: Path to CSV file to validate (streamed in chunks);
+                without it the DataFrame from load_data is validated
 
         Returns:
             Validation report dictionary
         """
-        if csv_file:
-            self.load_data(csv_file)
+        try:
+            chunks = self._chunks(csv_file)
+            self.stats = self.collect_stats(chunks) if chunks is not None else None
+        except Exception as e:
+            logger.error(f"Error loading CSV: {str(e)}")
+            self.stats = None
 
-        if self.df is None:
+        if self.stats is None:
             logger.error("No data to validate")
             return {}
 
@@ -111,8 +473,8 @@ class DataValidator:
 
         # Run all checks
         self.validation_report = {
-            'dataset_size': len(self.df),
-            'feature_count': len(self.df.columns),
+            'dataset_size': self.stats.rows,
+            'feature_count': len(self.stats.columns),
             'duplicate_check': self._check_duplicates(),
             'feature_ranges': self._check_feature_ranges(),
             'missing_values': self._check_missing_values(),
@@ -136,8 +498,8 @@ class DataValidator:
     def _check_duplicates(self) -> Dict:
         """Check for duplicate records."""
         try:
-            total_records = len(self.df)
-            duplicate_rows = self.df.duplicated().sum()
+            total_records = self.stats.rows
+            duplicate_rows = self.stats.duplicates.duplicates
             duplicate_percentage = (duplicate_rows / total_records) * 100 if total_records > 0 else 0
 
             result = {
@@ -147,7 +509,8 @@ class DataValidator:
                 'status': 'PASS' if duplicate_percentage < 1 else 'FAIL'
             }
 
-            logger.info(f"Duplicate Check: {duplicate_rows} duplicates ({duplicate_percentage:.2f}%)")
+            estimated = " (estimated)" if self.stats.duplicates.saturated else ""
+            logger.info(f"Duplicate Check: {duplicate_rows} duplicates ({duplicate_percentage:.2f}%){estimated}")
             return result
 
         except Exception as e:
@@ -156,16 +519,11 @@ class DataValidator:
 
     def _check_feature_ranges(self) -> Dict:
         """Check if all features are within expected ranges."""
-        out_of_range = {}
-
-        for feature, (min_val, max_val) in self.FEATURE_RANGES.items():
-            if feature in self.df.columns:
-                invalid_count = self.df[
-                    (self.df[feature] < min_val) | (self.df[feature] > max_val)
-                ].shape[0]
-
-                if invalid_count > 0:
-                    out_of_range[feature] = int(invalid_count)
+        out_of_range = {
+            feature: int(count)
+            for feature, count in zip(self.stats.range_features, self.stats.out_of_range)
+            if count > 0
+        }
 
         result = {
             'total_features_checked': len(self.FEATURE_RANGES),
@@ -179,13 +537,12 @@ class DataValidator:
 
     def _check_missing_values(self) -> Dict:
         """Check for missing values."""
-        missing_per_feature = self.df.isnull().sum()
-        total_values = len(self.df) * len(self.df.columns)
-        missing_values = missing_per_feature.sum()
-        missing_percentage = (missing_values / total_values) * 100
+        total_values = self.stats.rows * len(self.stats.columns)
+        missing_values = int(self.stats.missing.sum())
+        missing_percentage = (missing_values / total_values) * 100 if total_values else 0.0
 
         result = {
-            'total_missing': int(missing_values),
+            'total_missing': missing_values,
             'missing_percentage': round(missing_percentage, 2),
             'status': 'PASS' if missing_percentage < 5 else 'WARNING'
         }
@@ -195,22 +552,23 @@ class DataValidator:
 
     def _check_target_distribution(self) -> Dict:
         """Check distribution of target variables."""
-        target_features = [
-            'career_potential', 'wealth_potential', 'marriage_happiness',
-            'children_prospects', 'health_status', 'spiritual_inclination',
-            'chart_strength', 'life_ease_score'
-        ]
-
+        moments = self.stats.moments
+        std = moments.std()
+        dtypes = self.stats.empty_frame().dtypes
         distribution = {}
 
-        for target in target_features:
-            if target in self.df.columns:
+        for target in self.TARGET_FEATURES:
+            if target in self.stats.columns:
+                j = self.stats.columns.index(target)
+                present = moments.count[j] > 0
+                # Integer columns report integer extremes, as pandas
+                extreme = int if pd.api.types.is_integer_dtype(dtypes[target]) else float
                 stats = {
-                    'mean': round(self.df[target].mean(), 2),
-                    'std': round(self.df[target].std(), 2),
-                    'min': round(self.df[target].min(), 2),
-                    'max': round(self.df[target].max(), 2),
-                    'median': round(self.df[target].median(), 2)
+                    'mean': round(float(moments.mean[j]) if present else float('nan'), 2),
+                    'std': round(float(std[j]), 2),
+                    'min': round(extreme(moments.min[j]) if present else float('nan'), 2),
+                    'max': round(extreme(moments.max[j]) if present else float('nan'), 2),
+                    'median': round(self.stats.sketches[j].quantile(0.5), 2)
                 }
                 distribution[target] = stats
 
@@ -226,30 +584,31 @@ class DataValidator:
 
     def _detect_outliers(self) -> Dict:
         """Detect outliers using IQR method."""
-        numeric_columns = self.df.select_dtypes(include=[np.number]).columns
-
         outliers_detected = {}
         total_outliers = 0
 
-        for col in numeric_columns:
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
+        for col in self.stats.numeric_columns():
+            sketch = self.stats.sketches[self.stats.columns.index(col)]
+            if sketch.count == 0:
+                continue
+            Q1 = sketch.quantile(0.25)
+            Q3 = sketch.quantile(0.75)
             IQR = Q3 - Q1
 
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
 
-            outlier_count = ((self.df[col] < lower_bound) | (self.df[col] > upper_bound)).sum()
+            outlier_count = sketch.count_outside(lower_bound, upper_bound)
 
             if outlier_count > 0:
-                outliers_detected[col] = int(outlier_count)
+                outliers_detected[col] = outlier_count
                 total_outliers += outlier_count
 
         result = {
             'total_outliers_detected': total_outliers,
             'columns_with_outliers': len(outliers_detected),
             'outlier_details': outliers_detected,
-            'status': 'PASS' if total_outliers < (len(self.df) * 0.05) else 'WARNING'
+            'status': 'PASS' if total_outliers < (self.stats.rows * 0.05) else 'WARNING'
         }
 
         logger.info(f"Outlier Detection: {total_outliers} outliers found")
@@ -257,13 +616,14 @@ class DataValidator:
 
     def _check_data_types(self) -> Dict:
         """Check data types of columns."""
-        type_counts = self.df.dtypes.value_counts().to_dict()
+        frame = self.stats.empty_frame()
+        type_counts = frame.dtypes.value_counts().to_dict()
 
         result = {
             'type_distribution': {str(k): v for k, v in type_counts.items()},
-            'total_columns': len(self.df.columns),
-            'numeric_columns': len(self.df.select_dtypes(include=[np.number]).columns),
-            'object_columns': len(self.df.select_dtypes(include=['object']).columns)
+            'total_columns': len(frame.columns),
+            'numeric_columns': len(frame.select_dtypes(include=[np.number]).columns),
+            'object_columns': len(frame.select_dtypes(include=['object']).columns)
         }
 
         return result
@@ -344,20 +704,25 @@ class DataValidator:
 
 def main():
     """Main validation function."""
+    parser = argparse.ArgumentParser(description="Validate a training dataset CSV")
+    parser.add_argument("csv_file", nargs="?", default="training_data.csv", help="Dataset to validate")
+    parser.add_argument("--output", default="validation_report.json", help="Report file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows read at a time")
+    args = parser.parse_args()
+
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    validator = DataValidator()
+    validator = DataValidator(chunk_size=args.chunk_size)
 
     # Validate generated dataset
-    csv_file = 'training_data.csv'
-    report = validator.validate(csv_file)
+    report = validator.validate(args.csv_file)
 
     # Print and save results
     validator.print_summary()
-    validator.generate_report('validation_report.json')
+    validator.generate_report(args.output)
 
     if report.get('status') == 'PASS':
         print("[OK] Dataset is ready for ML training!")
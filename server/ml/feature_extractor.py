@@ -2,14 +2,255 @@
 Feature Extractor for ML Model Predictions
 Extracts the exact 53 features needed for the trained XGBoost model
 from a complete Kundali response.
+
+Charts are first read into a ChartTable (one row per chart, one array per
+chart quantity); the feature matrix is then computed from the table with
+array operations. One chart (serving) and a whole training set go through
+the same code, and generators that already hold chart quantities as arrays
+can build a ChartTable directly.
 """
 
 import logging
-from typing import Dict, List, Any, Tuple
+from dataclasses import dataclass, field
+from numbers import Real
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+PLANETS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+YOGA_COUNTS = ['total_yoga_count', 'benefic_yoga_count', 'malefic_yoga_count', 'neutral_yoga_count']
+NEUTRAL_STRENGTH = 50.0
+
+# Estimated aspects: strong aspect angles, orb and number of aspect features
+ASPECT_DEGREES = np.array([0, 60, 90, 120, 180], dtype=np.float64)
+ASPECT_ORB = 8
+N_ASPECTS = 6
+# Charts per step when estimating aspects (bounds the pairwise arrays)
+ASPECT_CHUNK = 65536
+
+
+@dataclass
+class ChartTable:
+    """
+    Columnar state of n charts: the quantities the 53 features derive from.
+
+    Arrays (n rows each):
+        longitudes: (n, 9) planet longitudes in PLANETS order
+        ascendant: (n,) ascendant longitude
+        house_planets: (n, 12) occupant count per house
+        house_lord_strength: (n, 12) house lord strength (0-100)
+        planet_strength: (n, 9) planet strength (0-100) in PLANETS order
+        yoga_counts: (n, 4) yoga counts in YOGA_COUNTS order
+        aspect_strength: (n, 6) given aspect strengths; NaN rows are
+            estimated from aspect_longitudes
+        aspect_longitudes: (n, p) longitudes to estimate aspects from, in
+            each chart's planet order, NaN-padded
+        missing: Per-chart names of features that fell back to defaults
+    """
+    longitudes: np.ndarray
+    ascendant: np.ndarray
+    house_planets: np.ndarray
+    house_lord_strength: np.ndarray
+    planet_strength: np.ndarray
+    yoga_counts: np.ndarray
+    aspect_strength: np.ndarray
+    aspect_longitudes: np.ndarray
+    missing: List[List[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return self.longitudes.shape[0]
+
+    @classmethod
+    def from_responses(cls, responses: Sequence[Dict[str, Any]]) -> "ChartTable":
+        """
+        Read Kundali responses into a table.
+
+        Raises:
+            Exception: If a response is malformed beyond per-feature defaults
+        """
+        rows = [_read_chart(response) for response in responses]
+        n = len(rows)
+        columns = list(zip(*rows)) if rows else [[]] * 8
+
+        width = max((len(positions) for positions in columns[7]), default=0)
+        aspect_longitudes = np.full((n, width), np.nan)
+        for row, positions in enumerate(columns[7]):
+            aspect_longitudes[row, :len(positions)] = positions
+
+        return cls(
+            longitudes=np.array(columns[0], dtype=np.float64).reshape(n, len(PLANETS)),
+            ascendant=np.array(columns[1], dtype=np.float64),
+            house_planets=np.array(columns[2], dtype=np.float64).reshape(n, 12),
+            house_lord_strength=np.array(columns[3], dtype=np.float64).reshape(n, 12),
+            planet_strength=np.array(columns[4], dtype=np.float64).reshape(n, len(PLANETS)),
+            yoga_counts=np.array(columns[5], dtype=np.float64).reshape(n, len(YOGA_COUNTS)),
+            aspect_strength=np.array(
+                [aspects if aspects is not None else [np.nan] * N_ASPECTS for aspects in columns[6]],
+                dtype=np.float64,
+            ).reshape(n, N_ASPECTS),
+            aspect_longitudes=aspect_longitudes,
+            missing=[missing for *_, missing in rows],
+        )
+
+
+def _read_chart(kundali_response: Dict[str, Any]) -> tuple:
+    """
+    Read one Kundali response into ChartTable row values.
+
+    Returns:
+        Tuple of (longitudes, ascendant, house planet counts, house lord
+        strengths, planet strengths, yoga counts, given aspect strengths or
+        None, longitudes to estimate aspects from, missing feature names)
+    """
+    missing = []
+    shad_bala_data = kundali_response.get('shad_bala', {})
+
+    # 1. Planetary positions (10)
+    planets_data = kundali_response.get('planets', {})
+    longitudes = []
+    for planet in PLANETS:
+        try:
+            longitudes.append(_real(planets_data.get(planet, {}).get('longitude', 0)))
+        except Exception:
+            longitudes.append(0.0)
+            missing.append(f"{planet.lower()}_degree")
+
+    try:
+        ascendant = _real(kundali_response.get('ascendant', {}).get('longitude', 0))
+    except Exception:
+        ascendant = 0.0
+        missing.append('ascendant_degree')
+
+    # 2. House placements (24)
+    houses_data = kundali_response.get('houses', {})
+    house_strengths = shad_bala_data.get('house_lord_strengths', {})
+    house_planets, house_lords = [], []
+    for house_num in range(1, 13):
+        house_info = houses_data.get(str(house_num), {})
+
+        try:
+            planets_in_house = house_info.get('planets', [])
+            house_planets.append(float(len(planets_in_house) if isinstance(planets_in_house, list) else 0))
+        except Exception:
+            house_planets.append(0.0)
+            missing.append(f'house_{house_num}_planets')
+
+        try:
+            house_lords.append(float(_house_lord_strength(shad_bala_data, house_strengths, house_num, house_info)))
+        except Exception:
+            house_lords.append(NEUTRAL_STRENGTH)
+            missing.append(f'house_{house_num}_lord_strength')
+
+    # 3. Planetary strengths (9; Rahu and Ketu are read twice, as estimates)
+    planetary_strengths = shad_bala_data.get('planetary_strengths', {})
+    strengths = {}
+    for planet in PLANETS + ['Rahu', 'Ketu']:
+        try:
+            strengths[planet] = float(planetary_strengths.get(planet, {}).get('total_strength_percentage', 50))
+        except Exception:
+            strengths[planet] = NEUTRAL_STRENGTH
+            missing.append(f"{planet.lower()}_strength")
+
+    # 4. Yoga counts (4)
+    yogas_data = shad_bala_data.get('yogas', {}) or {}
+    yoga_counts = []
+    for name in YOGA_COUNTS:
+        try:
+            yoga_counts.append(float(yogas_data.get(name, 0)))
+        except Exception:
+            yoga_counts.append(0.0)
+            missing.append(name)
+
+    # 5. Aspect strengths (6), estimated from positions if not given
+    aspect_strengths = shad_bala_data.get('aspect_strengths', {}) or {}
+    aspects, positions = None, []
+    if aspect_strengths:
+        aspects = [0.0] * N_ASPECTS
+        for i, strength in enumerate(list(aspect_strengths.values())[:N_ASPECTS]):
+            try:
+                aspects[i] = float(strength)
+            except Exception:
+                missing.append(f'aspect_strength_{i + 1}')
+    else:
+        try:
+            positions = [
+                _real(info['longitude']) for info in kundali_response.get('planets', {}).values()
+                if isinstance(info, dict) and 'longitude' in info
+            ]
+        except Exception as e:
+            logger.warning(f"Error calculating aspect strengths: {str(e)}")
+            positions = []
+
+    return (longitudes, ascendant, house_planets, house_lords, [strengths[planet] for planet in PLANETS],
+            yoga_counts, aspects, positions, missing)
+
+
+def _real(value: Any) -> float:
+    """A numeric chart value as float (non-numbers raise TypeError)."""
+    if type(value) is not float and not isinstance(value, Real):
+        raise TypeError(f"Expected a number, got {type(value).__name__}")
+    return float(value)
+
+
+def _house_lord_strength(shad_bala: Dict, house_strengths: Dict, house_num: int, house_info: Dict) -> float:
+    """
+    Get house lord strength from shad_bala or estimate from planets in house.
+    """
+    # Try to get from shad_bala first
+    if str(house_num) in house_strengths:
+        return house_strengths[str(house_num)].get('strength_percentage', 50)
+
+    # Estimate from planets in house
+    planets_in_house = house_info.get('planets', [])
+    if planets_in_house:
+        planetary_strengths = shad_bala.get('planetary_strengths', {})
+        strengths = [
+            planetary_strengths.get(planet, {}).get('total_strength_percentage', 50)
+            for planet in planets_in_house
+        ]
+        return float(np.mean(strengths)) if strengths else NEUTRAL_STRENGTH
+
+    # Default: neutral strength
+    return NEUTRAL_STRENGTH
+
+
+def estimate_aspect_strengths(longitudes: np.ndarray) -> np.ndarray:
+    """
+    Aspect strengths (0-100) from planet longitudes.
+
+    Every planet pair, in column order, within ASPECT_ORB of a strong aspect
+    angle scores 100 at the exact angle, falling linearly to 0 at the orb;
+    the first N_ASPECTS such pairs of each chart are kept, the rest of the
+    row is 0. NaN longitudes form no aspects.
+
+    Args:
+        longitudes: (n, p) longitudes
+
+    Returns:
+        (n, N_ASPECTS) aspect strengths
+    """
+    n, p = longitudes.shape
+    strengths = np.zeros((n, N_ASPECTS))
+    if p < 2:
+        return strengths
+
+    first, second = np.triu_indices(p, 1)
+    for start in range(0, n, ASPECT_CHUNK):
+        block = longitudes[start:start + ASPECT_CHUNK]
+        diff = np.abs(block[:, first] - block[:, second])
+        diff = np.where(diff > 180, 360 - diff, diff)
+
+        # Aspect windows do not overlap, so a pair matches at most one angle
+        deviation = np.abs(diff[:, :, None] - ASPECT_DEGREES).min(axis=2)
+        matched = deviation <= ASPECT_ORB
+        rank = np.cumsum(matched, axis=1) - 1
+        rows, pairs = np.nonzero(matched & (rank < N_ASPECTS))
+        strengths[start + rows, rank[rows, pairs]] = np.maximum(
+            0, 100 * (1 - deviation[rows, pairs] / ASPECT_ORB)
+        )
+    return strengths
+
 
 class KundaliFeatureExtractor:
     """
@@ -62,242 +303,59 @@ class KundaliFeatureExtractor:
         Returns:
             Tuple of (features_dict, missing_features_list)
         """
-        features = {}
-        missing_features = []
-
         try:
-            # 1. Extract planetary positions (10)
-            logger.info("Extracting planetary positions...")
-            planets_data = kundali_response.get('planets', {})
-
-            planet_mapping = {
-                'Sun': 'sun_degree',
-                'Moon': 'moon_degree',
-                'Mercury': 'mercury_degree',
-                'Venus': 'venus_degree',
-                'Mars': 'mars_degree',
-                'Jupiter': 'jupiter_degree',
-                'Saturn': 'saturn_degree',
-                'Rahu': 'rahu_degree',
-                'Ketu': 'ketu_degree',
-            }
-
-            for planet, feature_name in planet_mapping.items():
-                try:
-                    degree = planets_data.get(planet, {}).get('longitude', 0)
-                    # Normalize to 0-360
-                    degree = degree % 360
-                    features[feature_name] = float(degree)
-                except Exception as e:
-                    logger.warning(f"Could not extract {planet} position: {str(e)}")
-                    features[feature_name] = 0.0
-                    missing_features.append(feature_name)
-
-            # Ascendant
-            try:
-                asc_degree = kundali_response.get('ascendant', {}).get('longitude', 0)
-                features['ascendant_degree'] = float(asc_degree % 360)
-            except Exception as e:
-                logger.warning(f"Could not extract ascendant degree: {str(e)}")
-                features['ascendant_degree'] = 0.0
-                missing_features.append('ascendant_degree')
-
-            # 2. Extract house placements (24)
-            logger.info("Extracting house placements...")
-            houses_data = kundali_response.get('houses', {})
-
-            for house_num in range(1, 13):
-                house_key = str(house_num)
-                house_info = houses_data.get(house_key, {})
-
-                try:
-                    # Planet count in house
-                    planets_in_house = house_info.get('planets', [])
-                    planet_count = len(planets_in_house) if isinstance(planets_in_house, list) else 0
-                    features[f'house_{house_num}_planets'] = float(planet_count)
-                except Exception as e:
-                    logger.warning(f"Could not extract planets in house {house_num}: {str(e)}")
-                    features[f'house_{house_num}_planets'] = 0.0
-                    missing_features.append(f'house_{house_num}_planets')
-
-                try:
-                    # House lord strength (from shad_bala or estimate)
-                    lord_strength = self._get_house_lord_strength(
-                        kundali_response, house_num, house_info
-                    )
-                    features[f'house_{house_num}_lord_strength'] = float(lord_strength)
-                except Exception as e:
-                    logger.warning(f"Could not extract lord strength for house {house_num}: {str(e)}")
-                    features[f'house_{house_num}_lord_strength'] = 50.0  # Default to neutral
-                    missing_features.append(f'house_{house_num}_lord_strength')
-
-            # 3. Extract planetary strengths (9)
-            logger.info("Extracting planetary strengths...")
-            shad_bala_data = kundali_response.get('shad_bala', {})
-            planetary_strengths = shad_bala_data.get('planetary_strengths', {})
-
-            for planet in planet_mapping.keys():
-                feature_name = f"{planet.lower()}_strength"
-                try:
-                    strength = planetary_strengths.get(planet, {}).get('total_strength_percentage', 50)
-                    features[feature_name] = float(strength)
-                except Exception as e:
-                    logger.warning(f"Could not extract {planet} strength: {str(e)}")
-                    features[feature_name] = 50.0  # Default to neutral
-                    missing_features.append(feature_name)
-
-            # Rahu and Ketu strengths (estimated)
-            for planet in ['Rahu', 'Ketu']:
-                feature_name = f"{planet.lower()}_strength"
-                try:
-                    strength = planetary_strengths.get(planet, {}).get('total_strength_percentage', 50)
-                    features[feature_name] = float(strength)
-                except Exception as e:
-                    features[feature_name] = 50.0
-                    missing_features.append(feature_name)
-
-            # 4. Extract yoga counts (4)
-            logger.info("Extracting yoga information...")
-            yogas_data = shad_bala_data.get('yogas', {}) or {}
-
-            try:
-                total_yogas = yogas_data.get('total_yoga_count', 0)
-                features['total_yoga_count'] = float(total_yogas)
-            except Exception as e:
-                features['total_yoga_count'] = 0.0
-                missing_features.append('total_yoga_count')
-
-            try:
-                benefic_yogas = yogas_data.get('benefic_yoga_count', 0)
-                features['benefic_yoga_count'] = float(benefic_yogas)
-            except Exception as e:
-                features['benefic_yoga_count'] = 0.0
-                missing_features.append('benefic_yoga_count')
-
-            try:
-                malefic_yogas = yogas_data.get('malefic_yoga_count', 0)
-                features['malefic_yoga_count'] = float(malefic_yogas)
-            except Exception as e:
-                features['malefic_yoga_count'] = 0.0
-                missing_features.append('malefic_yoga_count')
-
-            try:
-                neutral_yogas = yogas_data.get('neutral_yoga_count', 0)
-                features['neutral_yoga_count'] = float(neutral_yogas)
-            except Exception as e:
-                features['neutral_yoga_count'] = 0.0
-                missing_features.append('neutral_yoga_count')
-
-            # 5. Extract aspect strengths (6)
-            logger.info("Extracting aspect strengths...")
-            aspect_strengths = shad_bala_data.get('aspect_strengths', {}) or {}
-
-            # If aspect_strengths is empty, estimate from planetary positions
-            if not aspect_strengths:
-                aspect_strengths = self._calculate_aspect_strengths(
-                    kundali_response.get('planets', {})
-                )
-
-            aspect_values = list(aspect_strengths.values())[:6]
-            for i in range(1, 7):
-                try:
-                    if i - 1 < len(aspect_values):
-                        strength = aspect_values[i - 1]
-                    else:
-                        strength = 0.0
-                    features[f'aspect_strength_{i}'] = float(strength)
-                except Exception as e:
-                    features[f'aspect_strength_{i}'] = 0.0
-                    missing_features.append(f'aspect_strength_{i}')
-
-            # Validate we have all required features
-            logger.info(f"Extracted {len(features)} features")
-            if missing_features:
-                logger.warning(f"Missing features: {missing_features}")
-
-            return features, missing_features
-
+            table = ChartTable.from_responses([kundali_response])
+            values = self.extract_matrix(table, dtype=np.float64)[0]
         except Exception as e:
             logger.error(f"Error extracting features: {str(e)}", exc_info=True)
             raise
 
-    def _get_house_lord_strength(self, kundali_response: Dict, house_num: int,
-                                 house_info: Dict) -> float:
-        """
-        Get house lord strength from shad_bala or estimate from planets in house.
-        """
-        # Try to get from shad_bala first
-        shad_bala = kundali_response.get('shad_bala', {})
-        house_strengths = shad_bala.get('house_lord_strengths', {})
-
-        if str(house_num) in house_strengths:
-            return house_strengths[str(house_num)].get('strength_percentage', 50)
-
-        # Estimate from planets in house
-        planets_in_house = house_info.get('planets', [])
-        if planets_in_house:
-            planetary_strengths = shad_bala.get('planetary_strengths', {})
-            strengths = []
-            for planet in planets_in_house:
-                strength = planetary_strengths.get(planet, {}).get('total_strength_percentage', 50)
-                strengths.append(strength)
-            return float(np.mean(strengths)) if strengths else 50.0
-
-        # Default: neutral strength
-        return 50.0
-
-    def _calculate_aspect_strengths(self, planets_data: Dict[str, Any]) -> Dict[int, float]:
-        """
-        Calculate aspect strengths from planetary positions.
+        features = dict(zip(self.required_features, values.tolist()))
+        missing_features = table.missing[0]
+        if missing_features:
+            logger.warning(f"Missing features: {missing_features}")
+
+        return features, missing_features
 
-        Returns dictionary with aspect strength values (0-100).
+    def extract_matrix(self, charts: Union[ChartTable, Sequence[Dict[str, Any]]],
+                       feature_names: Optional[Sequence[str]] = None,
+                       dtype: Any = np.float32) -> np.ndarray:
         """
-        aspect_strengths = {}
+        Extract the feature matrix of many charts at once.
 
-        try:
-            positions = {}
-            for planet, info in planets_data.items():
-                if isinstance(info, dict) and 'longitude' in info:
-                    positions[planet] = info['longitude']
-
-            if len(positions) < 2:
-                return {i: 0.0 for i in range(1, 7)}
-
-            # Calculate pairwise aspects
-            planets = list(positions.keys())
-            aspect_count = 0
-
-            for i in range(len(planets)):
-                for j in range(i + 1, len(planets)):
-                    pos1 = positions[planets[i]]
-                    pos2 = positions[planets[j]]
-
-                    # Calculate angular distance
-                    diff = abs(pos1 - pos2)
-                    if diff > 180:
-                        diff = 360 - diff
-
-                    # Aspect strength based on distance
-                    # Strong aspects: 0 (conjunction), 60, 90, 120, 180 degrees
-                    aspect_degrees = [0, 60, 90, 120, 180]
-                    orb = 8
-
-                    for aspect_deg in aspect_degrees:
-                        if abs(diff - aspect_deg) <= orb:
-                            strength = max(0, 100 * (1 - abs(diff - aspect_deg) / orb))
-                            aspect_count += 1
-                            aspect_strengths[aspect_count] = strength
-                            break
-
-            # Pad with zeros if needed
-            while len(aspect_strengths) < 6:
-                aspect_strengths[len(aspect_strengths) + 1] = 0.0
-
-            return aspect_strengths
+        Row i equals extract_features(charts[i]) (in dtype precision).
 
-        except Exception as e:
-            logger.warning(f"Error calculating aspect strengths: {str(e)}")
-            return {i: 0.0 for i in range(1, 7)}
+        Args:
+            charts: ChartTable, or Kundali responses
+            feature_names: Column order (default: required_features)
+            dtype: Output dtype
+
+        Returns:
+            (charts, features) matrix
+        """
+        table = charts if isinstance(charts, ChartTable) else ChartTable.from_responses(charts)
+        n = len(table)
+
+        aspects = table.aspect_strength.copy()
+        estimate = np.isnan(aspects).all(axis=1)
+        if estimate.any():
+            aspects[estimate] = estimate_aspect_strengths(table.aspect_longitudes[estimate])
+
+        # required_features order: degrees, interleaved houses, strengths, yogas, aspects
+        houses = np.stack([table.house_planets, table.house_lord_strength], axis=2).reshape(n, 24)
+        matrix = np.hstack([
+            np.mod(table.longitudes, 360),
+            np.mod(table.ascendant, 360)[:, None],
+            houses,
+            table.planet_strength,
+            table.yoga_counts,
+            aspects,
+        ])
+
+        if feature_names is not None and list(feature_names) != self.required_features:
+            index = {name: i for i, name in enumerate(self.required_features)}
+            matrix = matrix[:, [index[name] for name in feature_names]]
+        return matrix.astype(dtype, copy=False)
 
     def validate_features(self, features: Dict[str, float]) -> Tuple[bool, List[str]]:
         """
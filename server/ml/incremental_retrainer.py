@@ -0,0 +1,379 @@
+"""
+Incremental Retrainer
+Continues training the active model on charts saved since it was trained.
+
+Charts saved through kundali_service.save_kundali carry the Kundali response
+(kundali_data) and optionally ml_features; a chart is a training example
+when ml_features holds a value for every model target (career_potential,
+wealth_potential, ...). Each run:
+
+1. streams the kundalis created after the watermark, oldest first, in
+   chunks of CHUNK_SIZE, extracts the 53 features of each chunk at once
+   (what /api/ml/predict-from-kundali computes for the stored chart) and
+   appends the chunk to two sharded datasets (see server.ml.shards):
+   train/ and holdout/. A chart's split is a hash of its id, so it never
+   moves between them. The manifest of train/ records the (created_at, _id)
+   watermark of every shard, so charts are read from Mongo and featurized
+   once, even if the run fails later;
+2. continues boosting the active booster (same scaler and hyperparameters)
+   on the train shards the active version has not been trained on;
+3. scores the active and the new model on the whole holdout, and publishes
+   the new model as trained_models/<version>/ with model_metadata.json
+   (parent version, watermark, trained shards, holdout metrics) when its
+   holdout MSE is no worse than the parent's.
+
+Rejected runs publish nothing; their shards stay pending and are trained on
+again, with newer charts, by the next run. Publishing does not activate the
+version unless asked (--activate, or model_registry activate <version>).
+
+Usage:
+    python -m server.ml.incremental_retrainer [--rounds 20] [--activate]
+
+Author: ML Pipeline
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import xgboost as xgb
+from bson import ObjectId
+
+from server.ml.feature_extractor import KundaliFeatureExtractor
+from server.ml.model_registry import MODELS_DIR, REQUIRED_FILES, LoadedModel, ModelRegistry, load_model
+from server.ml.shards import ShardWriter, iter_shards, read_manifest
+from server.ml.train_models import _RegressionTotals, assign_splits
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+DEFAULT_ROUNDS = 20
+# Fewer new training rows than this leave the shards pending for the next run
+MIN_TRAIN_ROWS = 50
+SPLIT_SEED = 42
+METADATA_FILE = "model_metadata.json"
+DATA_DIR_NAME = "_retraining"
+
+# Only the fields the feature extractor and the labels need are fetched
+CHART_PROJECTION = {
+    "kundali_data.planets": 1,
+    "kundali_data.ascendant": 1,
+    "kundali_data.houses": 1,
+    "kundali_data.shad_bala": 1,
+    "ml_features": 1,
+    "created_at": 1,
+}
+
+
+def chart_row(chart_id: Any) -> int:
+    """Stable int64 row number of a chart (the non-timestamp bytes of its ObjectId)."""
+    return int.from_bytes(ObjectId(str(chart_id)).binary[4:], "big") & (2 ** 63 - 1)
+
+
+def chart_targets(doc: Dict[str, Any], target_names: List[str]) -> Optional[List[float]]:
+    """Target values stored in a chart's ml_features, or None unless all are present and finite."""
+    ml_features = doc.get("ml_features") or {}
+    try:
+        values = [float(ml_features[name]) for name in target_names]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return values if np.isfinite(values).all() else None
+
+
+def chart_features(charts: List[Dict[str, Any]], feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Feature matrix of stored Kundali responses.
+
+    Returns:
+        Tuple of ((readable charts, features) float64 matrix, boolean mask
+        of the charts that could be read)
+    """
+    extractor = KundaliFeatureExtractor()
+    try:
+        return extractor.extract_matrix(charts, feature_names, dtype=np.float64), np.ones(len(charts), dtype=bool)
+    except Exception:
+        # One malformed chart fails the whole table; retry per chart
+        rows, valid = [], np.zeros(len(charts), dtype=bool)
+        for i, chart in enumerate(charts):
+            try:
+                rows.append(extractor.extract_matrix([chart], feature_names, dtype=np.float64))
+                valid[i] = True
+            except Exception as e:
+                logger.warning(f"Skipping unreadable chart: {str(e)}")
+        matrix = np.vstack(rows) if rows else np.empty((0, len(feature_names)))
+        return matrix, valid
+
+
+def _watermark_query(watermark: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Charts strictly after a (created_at, _id) watermark."""
+    if not watermark:
+        return {}
+    created_at = datetime.fromisoformat(watermark["created_at"])
+    return {"$or": [
+        {"created_at": {"$gt": created_at}},
+        {"created_at": created_at, "_id": {"$gt": ObjectId(watermark["_id"])}},
+    ]}
+
+
+def _read_metadata(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((path / METADATA_FILE).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+class IncrementalRetrainer:
+    """
+    Warm-start retraining of the active model version on newly saved charts.
+    """
+
+    def __init__(self, db=None, models_dir: Path = MODELS_DIR, data_dir: Optional[Path] = None,
+                 rounds: int = DEFAULT_ROUNDS, max_regression: float = 0.0, n_jobs: Optional[int] = None):
+        """
+        Initialize the retrainer.
+
+        Args:
+            db: Database handle (defaults to get_db() when a run starts)
+            models_dir: Root directory of model versions
+            data_dir: Processed-chart datasets (default: models_dir/_retraining)
+            rounds: Boosting rounds added per run
+            max_regression: Allowed relative increase of holdout MSE over
+                the parent version
+            n_jobs: XGBoost threads (default: all cores)
+        """
+        self.db = db
+        self.models_dir = Path(models_dir)
+        self.data_dir = Path(data_dir) if data_dir is not None else self.models_dir / DATA_DIR_NAME
+        self.rounds = rounds
+        self.max_regression = max_regression
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+    def _writers(self, parent: LoadedModel) -> Dict[str, ShardWriter]:
+        metadata = {"source": "kundalis", "split_seed": SPLIT_SEED}
+        return {
+            split: ShardWriter(self.data_dir / split, parent.feature_names, parent.target_names, metadata)
+            for split in ("train", "holdout")
+        }
+
+    def ingest(self, parent: LoadedModel) -> Dict[str, Any]:
+        """
+        Featurize the charts created after the watermark into new shards.
+
+        Returns:
+            Counts of charts read, written per split and skipped as
+            unlabeled or unreadable, and the new watermark
+        """
+        if self.db is None:
+            from server.database import get_db
+            self.db = get_db()
+
+        writers = self._writers(parent)
+        manifest = writers["train"].manifest["shards"]
+        watermark = manifest[max(manifest, key=int)]["watermark"] if manifest else None
+        next_index = max(writers["train"].completed, default=-1) + 1
+
+        cursor = self.db["kundalis"].find(_watermark_query(watermark), CHART_PROJECTION).sort(
+            [("created_at", 1), ("_id", 1)])
+        stats = {"charts": 0, "train": 0, "holdout": 0, "unlabeled": 0, "unreadable": 0}
+
+        def flush(docs: List[Dict[str, Any]]) -> None:
+            nonlocal next_index, watermark
+            labeled = [(doc, targets) for doc in docs
+                       if (targets := chart_targets(doc, parent.target_names)) is not None]
+            features, valid = chart_features([doc.get("kundali_data") or {} for doc, _ in labeled],
+                                             parent.feature_names)
+            targets = np.array([t for _, t in labeled], dtype=np.float64).reshape(-1, len(parent.target_names))[valid]
+            rows = np.array([chart_row(doc["_id"]) for doc, _ in labeled], dtype=np.int64)[valid]
+            holdout = assign_splits(rows, SPLIT_SEED) != 0
+
+            last = docs[-1]
+            watermark = {"created_at": last["created_at"].isoformat(), "_id": str(last["_id"])}
+            # holdout first: the train manifest's watermark marks the chunk as done
+            writers["holdout"].write(next_index, features[holdout], targets[holdout], rows[holdout])
+            writers["train"].write(next_index, features[~holdout], targets[~holdout], rows[~holdout],
+                                   watermark=watermark, charts=len(docs))
+            stats["charts"] += len(docs)
+            stats["train"] += int((~holdout).sum())
+            stats["holdout"] += int(holdout.sum())
+            stats["unlabeled"] += len(docs) - len(labeled)
+            stats["unreadable"] += int((~valid).sum())
+            next_index += 1
+
+        docs: List[Dict[str, Any]] = []
+        for doc in cursor:
+            docs.append(doc)
+            if len(docs) >= CHUNK_SIZE:
+                flush(docs)
+                docs = []
+        if docs:
+            flush(docs)
+
+        stats["watermark"] = watermark
+        logger.info(
+            f"Ingested {stats['charts']} new charts: {stats['train']} train, {stats['holdout']} holdout, "
+            f"{stats['unlabeled']} unlabeled, {stats['unreadable']} unreadable"
+        )
+        return stats
+
+    def _load_split(self, split: str, shards: Optional[List[int]], parent: LoadedModel
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Scaled features and targets of a split's shards (all shards if None)."""
+        parts = [(features, targets) for features, targets, _ in iter_shards(self.data_dir / split, shards=shards)]
+        if not parts:
+            return np.empty((0, len(parent.feature_names))), np.empty((0, len(parent.target_names)))
+        features, targets = (np.concatenate(arrays) for arrays in zip(*parts))
+        return parent.plan.transform(features.astype(np.float64)), targets
+
+    def _holdout_metrics(self, booster: xgb.Booster, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        totals = _RegressionTotals(y.shape[1])
+        totals.update(y, booster.inplace_predict(X))
+        return totals.metrics()
+
+    def run(self, activate: bool = False) -> Dict[str, Any]:
+        """
+        Ingest new charts, retrain on pending shards and publish if validated.
+
+        Args:
+            activate: Make the published version active
+
+        Returns:
+            Run statistics; "version" is the published version or None
+
+        Raises:
+            ValueError: If no model version can be loaded
+        """
+        started = time.perf_counter()
+        registry = ModelRegistry(self.models_dir)
+        parent = registry.active
+        if parent is None:
+            raise ValueError(f"No active model to retrain: {registry.status()['load_error']}")
+
+        ingested = self.ingest(parent)
+        trained = set(_read_metadata(parent.path).get("retraining", {}).get("trained_shards", []))
+        available = set(read_manifest(self.data_dir / "train")["shards"])
+        pending = sorted(int(index) for index in available if int(index) not in trained)
+
+        X_train, y_train = self._load_split("train", pending, parent)
+        X_holdout, y_holdout = self._load_split("holdout", None, parent)
+        stats: Dict[str, Any] = {
+            "parent_version": parent.version,
+            "ingested": ingested,
+            "pending_shards": pending,
+            "train_rows": len(X_train),
+            "holdout_rows": len(X_holdout),
+            "version": None,
+        }
+
+        if len(X_train) < MIN_TRAIN_ROWS or len(X_holdout) == 0:
+            stats["reason"] = (f"{len(X_train)} new training rows and {len(X_holdout)} holdout rows; "
+                               f"need {MIN_TRAIN_ROWS} and 1")
+            logger.info(f"Retraining skipped: {stats['reason']}")
+            return self._finish(stats, started)
+
+        parent_booster = parent.xgb_model.get_booster()
+        train_start = time.perf_counter()
+        # Continues the parent's trees with its saved hyperparameters
+        booster = xgb.train({"nthread": self.n_jobs}, xgb.DMatrix(X_train, label=y_train, nthread=self.n_jobs),
+                            num_boost_round=self.rounds, xgb_model=parent_booster)
+        stats["training_seconds"] = round(time.perf_counter() - train_start, 2)
+
+        parent_metrics = self._holdout_metrics(parent_booster, X_holdout, y_holdout)
+        metrics = self._holdout_metrics(booster, X_holdout, y_holdout)
+        stats["holdout"] = {"parent": parent_metrics, "candidate": metrics}
+        if metrics["mse"] > parent_metrics["mse"] * (1 + self.max_regression):
+            stats["reason"] = (f"holdout MSE {metrics['mse']:.4f} is worse than "
+                               f"{parent_metrics['mse']:.4f} of version {parent.version}")
+            logger.warning(f"Retrained model rejected: {stats['reason']}")
+            return self._finish(stats, started)
+
+        model = self.publish(parent, booster, {
+            "parent_version": parent.version,
+            "watermark": ingested["watermark"],
+            "trained_shards": sorted(trained | set(pending)),
+            "train_rows": len(X_train),
+            "holdout_rows": len(X_holdout),
+            "rounds_added": self.rounds,
+            "holdout_metrics": stats["holdout"],
+        })
+        stats["version"] = model.version
+        if activate:
+            registry.activate(model.version)
+        return self._finish(stats, started)
+
+    def _finish(self, stats: Dict[str, Any], started: float) -> Dict[str, Any]:
+        stats["duration_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Retraining run: {stats}")
+        return stats
+
+    def publish(self, parent: LoadedModel, booster: xgb.Booster, retraining: Dict[str, Any]) -> LoadedModel:
+        """
+        Write a retrained booster as a new version next to its parent.
+
+        The version is assembled in a hidden directory, loaded (which runs
+        the registry's smoke test) and renamed into place, so a version
+        directory is always complete.
+
+        Returns:
+            The new version, loaded
+        """
+        name = f"retrain-{datetime.utcnow():%Y%m%d%H%M%S}"
+        suffix = 1
+        while (self.models_dir / name).exists():
+            suffix += 1
+            name = f"retrain-{datetime.utcnow():%Y%m%d%H%M%S}-{suffix}"
+
+        staging = self.models_dir / f".{name}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        # Same artifact layout as train_models, so serving loads it like any version
+        xgb_model = xgb.XGBRegressor(n_estimators=booster.num_boosted_rounds(), n_jobs=self.n_jobs)
+        xgb_model.load_model(bytearray(booster.save_raw("ubj")))
+        joblib.dump(xgb_model, str(staging / "xgboost_model.pkl"))
+        for artifact in REQUIRED_FILES[1:]:
+            shutil.copyfile(parent.path / artifact, staging / artifact)
+
+        base_version = _read_metadata(parent.path).get("version", parent.model_version)
+        metadata = {
+            "version": f"{base_version.split('+')[0]}+{name}",
+            "created_at": datetime.utcnow().isoformat(),
+            "n_estimators": booster.num_boosted_rounds(),
+            "retraining": retraining,
+        }
+        (staging / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+
+        load_model(staging, name)
+        os.replace(staging, self.models_dir / name)
+        logger.info(f"Published model version {name} (parent {parent.version})")
+        return load_model(self.models_dir / name, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the active model on newly saved charts")
+    parser.add_argument("--models-dir", default=str(MODELS_DIR), help="Root directory of model versions")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Boosting rounds to add")
+    parser.add_argument("--max-regression", type=float, default=0.0,
+                        help="Allowed relative increase of holdout MSE over the parent")
+    parser.add_argument("--activate", action="store_true", help="Activate the published version")
+    args = parser.parse_args()
+
+    # force: astro_utils sets up DEBUG logging when imported
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        force=True)
+
+    retrainer = IncrementalRetrainer(models_dir=Path(args.models_dir), rounds=args.rounds,
+                                     max_regression=args.max_regression)
+    stats = retrainer.run(activate=args.activate)
+    print(json.dumps(stats, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Micro-batching Inference Queue
+Collects concurrent single-row predictions into small batches.
+
+A one-row XGBoost prediction is dominated by per-call overhead (input
+conversion, DMatrix construction, thread dispatch), so scoring 64 rows costs
+little more than scoring one. Callers await MicroBatcher.predict() with one
+feature row; rows arriving within max_wait_ms of the first queued row (up to
+max_batch_size rows) are stacked into one matrix and scored with a single
+call on a dedicated executor thread, keeping the event loop free. Each
+caller's future is resolved with its own output row.
+
+While a batch is being scored, new rows keep queueing, so batches grow with
+load and an idle server only pays the max_wait_ms delay.
+
+Author: ML Pipeline
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 10_000
+
+_batchers: Dict[str, "MicroBatcher"] = {}
+
+
+class MicroBatcher:
+    """
+    Batches concurrent single-row predictions of one model.
+    """
+
+    def __init__(self, name: str, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        """
+        Initialize the batcher.
+
+        Args:
+            name: Name reported in metrics
+            predict_fn: Scores a (rows, features) float64 matrix, returning one
+                output row per input row; called on the executor thread
+            max_batch_size: Most rows per predict_fn call
+            max_wait_ms: Longest a queued row waits for more rows
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._batch_sizes = np.zeros(max_batch_size + 1, dtype=np.int64)
+        self._queue_ms: deque = deque(maxlen=LATENCY_WINDOW)
+        self._predict_ms: deque = deque(maxlen=LATENCY_WINDOW)
+        self._errors = 0
+
+        _batchers[name] = self
+
+    async def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Score one feature row.
+
+        Args:
+            features: 1-D feature row
+
+        Returns:
+            The model's output row for it
+        """
+        row = np.asarray(features, dtype=np.float64)
+        if row.ndim != 1:
+            raise ValueError(f"Expected one feature row, got shape {row.shape}")
+
+        queue = self._ensure_worker()
+        future = self._loop.create_future()
+        await queue.put((row, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the collector task on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # A new loop (e.g. a restarted test client) needs its own queue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"inference-{self.name}")
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect(self._queue))
+        return self._queue
+
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        """Form batches from the queue and score them one at a time."""
+        while True:
+            batch = [await queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run(batch)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        """Score one batch on the executor and resolve its futures."""
+        dispatched = time.perf_counter()
+        self._batch_sizes[len(batch)] += 1
+        self._queue_ms.extend((dispatched - queued) * 1000 for _, _, queued in batch)
+
+        try:
+            outputs = await self._loop.run_in_executor(
+                self._executor, self.predict_fn, np.stack([row for row, _, _ in batch])
+            )
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"Batched inference failed for {len(batch)} rows: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._predict_ms.append((time.perf_counter() - dispatched) * 1000)
+        for (_, future, _), output in zip(batch, outputs):
+            # Callers that went away (client disconnects) have cancelled futures
+            if not future.done():
+                future.set_result(output)
+
+    def metrics(self) -> Dict:
+        """Batch-size distribution and queue/predict latencies (ms) over recent batches."""
+        batches = int(self._batch_sizes.sum())
+        sizes = np.flatnonzero(self._batch_sizes)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": batches,
+            "rows": int((self._batch_sizes * np.arange(self._batch_sizes.size)).sum()),
+            "errors": self._errors,
+            "batch_sizes": {int(size): int(self._batch_sizes[size]) for size in sizes},
+            "queue_ms": _latency_summary(self._queue_ms),
+            "predict_ms": _latency_summary(self._predict_ms),
+        }
+
+    def close(self) -> None:
+        """Stop the collector task and the executor; the next predict() restarts them."""
+        if self._worker is not None and not self._worker.done() and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._worker.cancel)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._worker = None
+        self._executor = None
+
+
+def _latency_summary(samples: deque) -> Dict:
+    """Mean and tail percentiles of latency samples."""
+    if not samples:
+        return {"count": 0}
+    values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+    }
+
+
+def get_batching_metrics() -> Dict[str, Dict]:
+    """Metrics of every live batcher, by name."""
+    return {name: batcher.metrics() for name, batcher in list(_batchers.items())}
+
+
+def close_batchers() -> None:
+    """Close every live batcher (on application shutdown)."""
+    for batcher in list(_batchers.values()):
+        batcher.close()
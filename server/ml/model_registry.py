@@ -0,0 +1,464 @@
+"""
+Model Registry
+Loads the trained ML artifacts once per process and serves them to every
+consumer (ML prediction routes, KundaliMLPredictor, deployment checks).
+
+A model version is a directory holding xgboost_model.pkl, scaler.pkl,
+feature_names.json and target_names.json (model_metadata.json optional).
+trained_models/ itself is the default version; further versions live in
+trained_models/<version>/. The file trained_models/ACTIVE names the version
+to serve.
+
+Consumers read registry.active once per request (or batch) and use that
+LoadedModel throughout, so swapping versions is a single reference
+assignment and no request ever mixes one version's scaler with another's
+booster. Every process re-reads ACTIVE at most every POLL_INTERVAL seconds,
+so a rollout (python -m server.ml.model_registry activate <version>) reaches
+all workers without restarting them. A newly named version is loaded on a
+background thread while requests keep using the current one; only the
+reference swap happens on the request path.
+
+Small batches (single requests, micro-batches) are scored by the native
+NumPy tree evaluator (server.ml.tree_predictor) when the booster can be
+flattened and matches it on a probe batch; large batches and models it does
+not support use the booster. Set ML_PREDICTOR_BACKEND=xgboost to always use
+the booster.
+
+preload_models() loads the active version at import time; under a
+pre-forking server that imports the app before forking (e.g. gunicorn
+--preload) workers then share the model pages copy-on-write.
+
+Author: ML Pipeline
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from server.ml.inference_batcher import MicroBatcher
+from server.ml.preprocessing import PreprocessingPlan
+from server.ml.tree_predictor import TreeEnsemblePredictor
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = Path(__file__).parent / "trained_models"
+ACTIVE_FILE = "ACTIVE"
+DEFAULT_VERSION = "default"
+REQUIRED_FILES = ("xgboost_model.pkl", "scaler.pkl", "feature_names.json", "target_names.json")
+POLL_INTERVAL = 5.0
+# Largest batch scored natively; beyond it the multi-threaded booster wins
+NATIVE_MAX_ROWS = 256
+NATIVE_PARITY_TOLERANCE = 1e-3
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """One loaded model version (immutable once loaded)."""
+    version: str
+    path: Path
+    xgb_model: Any
+    scaler: Any
+    feature_names: List[str]
+    target_names: List[str]
+    model_version: str
+    load_time_ms: float
+    memory_bytes: int
+    fingerprint: str
+    plan: PreprocessingPlan
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+    native_predictor: Optional[TreeEnsemblePredictor] = None
+
+    def predict_matrix(self, features: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Raw model outputs for a (rows, features) matrix of unscaled features.
+
+        Args:
+            features: Feature matrix in feature_names order
+            copy: False scales a float matrix in place, saving a copy
+
+        Returns:
+            numpy array of shape (rows, targets)
+        """
+        if len(features) == 0:
+            return np.empty((0, len(self.target_names)), dtype=np.float32)
+        scaled = self.plan.transform(features, copy=copy)
+        if self.native_predictor is not None and len(features) <= NATIVE_MAX_ROWS:
+            return self.native_predictor.predict(scaled)
+        return self.xgb_model.predict(scaled)
+
+    def info(self) -> Dict[str, Any]:
+        """Load statistics of this version."""
+        return {
+            "version": self.version,
+            "model_version": self.model_version,
+            "path": str(self.path),
+            "features": len(self.feature_names),
+            "targets": len(self.target_names),
+            "backend": "native" if self.native_predictor is not None else "xgboost",
+            "load_time_ms": round(self.load_time_ms, 3),
+            "memory_bytes": self.memory_bytes,
+            "fingerprint": self.fingerprint,
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+def _native_bytes(predictor: Optional[TreeEnsemblePredictor]) -> int:
+    """Size of a native predictor's node arrays."""
+    if predictor is None:
+        return 0
+    return sum(v.nbytes for v in vars(predictor).values() if isinstance(v, np.ndarray))
+
+
+def _fingerprint(path: Path) -> str:
+    """Content hash of a version's artifacts, stable across processes and restarts."""
+    digest = hashlib.sha256()
+    for name in REQUIRED_FILES:
+        digest.update((path / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _memory_bytes(xgb_model: Any, scaler: Any) -> int:
+    """Approximate resident size of a booster and scaler."""
+    booster_bytes = len(xgb_model.get_booster().save_raw("ubj")) if hasattr(xgb_model, "get_booster") else 0
+    scaler_bytes = sum(v.nbytes for v in vars(scaler).values() if isinstance(v, np.ndarray))
+    return booster_bytes + scaler_bytes
+
+
+def _native_predictor(xgb_model: Any, plan: PreprocessingPlan, version: str) -> Optional[TreeEnsemblePredictor]:
+    """Flatten the booster if enabled, supported and matching it on a probe batch."""
+    if os.getenv("ML_PREDICTOR_BACKEND", "native") != "native" or not plan.fused:
+        return None
+    try:
+        predictor = TreeEnsemblePredictor.from_booster(xgb_model)
+    except ValueError as e:
+        logger.info(f"Model version {version} uses the booster: {str(e)}")
+        return None
+
+    probe = plan.mean + plan.scale * np.random.default_rng(0).normal(0, 2, (NATIVE_MAX_ROWS, plan.n_features))
+    probe[::7, ::3] = np.nan
+    scaled = plan.transform(probe)
+    deviation = float(np.abs(predictor.predict(scaled) - xgb_model.predict(scaled)).max())
+    if deviation > NATIVE_PARITY_TOLERANCE:
+        logger.warning(f"Model version {version} uses the booster: native predictions deviate by {deviation}")
+        return None
+    return predictor
+
+
+def load_model(path: Path, version: str = DEFAULT_VERSION) -> LoadedModel:
+    """
+    Load and validate one model version directory.
+
+    Raises:
+        ValueError: If artifacts are missing or inconsistent
+    """
+    missing = [name for name in REQUIRED_FILES if not (path / name).exists()]
+    if missing:
+        raise ValueError(f"Model version {version} is missing {', '.join(missing)}")
+
+    started = time.perf_counter()
+    xgb_model = joblib.load(str(path / "xgboost_model.pkl"))
+    scaler = joblib.load(str(path / "scaler.pkl"))
+
+    with open(path / "feature_names.json") as f:
+        feature_names = json.load(f)
+
+    with open(path / "target_names.json") as f:
+        target_names = json.load(f)
+
+    model_version = "v1.0"
+    metadata_path = path / "model_metadata.json"
+    if metadata_path.exists():
+        with open(metadata_path) as f:
+            model_version = json.load(f).get("version", model_version)
+
+    plan = PreprocessingPlan(feature_names, target_names, scaler)
+    native_predictor = _native_predictor(xgb_model, plan, version)
+
+    model = LoadedModel(
+        version=version,
+        path=path,
+        xgb_model=xgb_model,
+        scaler=scaler,
+        feature_names=feature_names,
+        target_names=target_names,
+        model_version=model_version,
+        load_time_ms=(time.perf_counter() - started) * 1000,
+        memory_bytes=_memory_bytes(xgb_model, scaler) + _native_bytes(native_predictor),
+        fingerprint=_fingerprint(path),
+        plan=plan,
+        native_predictor=native_predictor,
+    )
+
+    # Smoke test so a broken version is never activated
+    outputs = model.predict_matrix(np.zeros((1, len(feature_names))))
+    if outputs.shape != (1, len(target_names)):
+        raise ValueError(
+            f"Model version {version} predicts {outputs.shape[1]} targets, expected {len(target_names)}"
+        )
+    return model
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the active model version.
+    """
+
+    def __init__(self, models_dir: Path = MODELS_DIR, poll_interval: float = POLL_INTERVAL):
+        """
+        Initialize the registry (nothing is loaded until first use).
+
+        Args:
+            models_dir: Root directory of model versions
+            poll_interval: Seconds between checks of the ACTIVE file
+        """
+        self.models_dir = Path(models_dir)
+        self.poll_interval = poll_interval
+        self._active: Optional[LoadedModel] = None
+        self._previous: Optional[LoadedModel] = None
+        self._pinned: Dict[Path, LoadedModel] = {}
+        self._failed_version: Optional[str] = None
+        self._next_poll = 0.0
+        self._load_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+        self._batcher: Optional[MicroBatcher] = None
+
+    @property
+    def active(self) -> Optional[LoadedModel]:
+        """The version being served, or None if it could not be loaded."""
+        if time.monotonic() >= self._next_poll:
+            self._refresh()
+        return self._active
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        """
+        Micro-batching queue over the active version, shared by every
+        single-prediction path so their requests land in the same batches.
+        """
+        if self._batcher is None:
+            self._batcher = MicroBatcher("model_registry", self._predict_active)
+        return self._batcher
+
+    def _predict_active(self, features: np.ndarray) -> np.ndarray:
+        """Score a batch with the version active when the batch runs."""
+        model = self.active
+        if model is None:
+            raise ValueError("Models not loaded")
+        return model.predict_matrix(features, copy=False)
+
+    def version_path(self, version: str) -> Path:
+        """
+        Directory of a version.
+
+        Raises:
+            ValueError: On names that are not a direct subdirectory
+        """
+        if version == DEFAULT_VERSION:
+            return self.models_dir
+        if not version or Path(version).name != version or version.startswith("."):
+            raise ValueError(f"Invalid model version: {version}")
+        return self.models_dir / version
+
+    def versions(self) -> List[str]:
+        """Versions available on disk."""
+        found = [DEFAULT_VERSION] if (self.models_dir / REQUIRED_FILES[0]).exists() else []
+        found += sorted(
+            p.name for p in self.models_dir.iterdir()
+            if p.is_dir() and not p.name.startswith((".", "_")) and (p / REQUIRED_FILES[0]).exists()
+        )
+        return found
+
+    def _read_active_file(self) -> str:
+        """Version named in ACTIVE (the default version when absent)."""
+        try:
+            return (self.models_dir / ACTIVE_FILE).read_text().strip() or DEFAULT_VERSION
+        except FileNotFoundError:
+            return DEFAULT_VERSION
+
+    def _refresh(self) -> None:
+        """Load the version named in ACTIVE if it changed since the last poll."""
+        # Requests arriving while another thread loads keep the current model
+        blocking = self._active is None
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            if time.monotonic() < self._next_poll:
+                # Another thread refreshed while this one waited
+                return
+            self._next_poll = time.monotonic() + self.poll_interval
+            version = self._read_active_file()
+            if self._active is None:
+                # Nothing to serve yet, so the first load blocks
+                model = self._try_load(version)
+                if model is not None:
+                    self._swap(model)
+                return
+
+            loading = self._loader is not None and self._loader.is_alive()
+            if loading or version in (self._active.version, self._failed_version):
+                return
+            self._loader = threading.Thread(
+                target=self._load_in_background, args=(version,), name=f"model-loader-{version}", daemon=True)
+            self._loader.start()
+        finally:
+            self._lock.release()
+
+    def _try_load(self, version: str) -> Optional[LoadedModel]:
+        """Load a version, recording the error and returning None on failure."""
+        try:
+            return load_model(self.version_path(version), version)
+        except Exception as e:
+            self._load_error = str(e)
+            logger.error(f"Could not load model version {version}: {str(e)}")
+            if self._active is not None:
+                # Keep serving the current version until ACTIVE names another one
+                self._failed_version = version
+            return None
+
+    def _load_in_background(self, version: str) -> None:
+        """Load a version off the request path, then swap it in."""
+        model = self._try_load(version)
+        if model is None:
+            return
+        with self._lock:
+            # activate() or rollback() in this process may have moved on meanwhile
+            if self._read_active_file() == version:
+                self._swap(model)
+
+    def wait_for_load(self, timeout: Optional[float] = None) -> Optional[LoadedModel]:
+        """
+        Wait for a background load started by a poll to finish.
+
+        Returns:
+            The active version afterwards
+        """
+        loader = self._loader
+        if loader is not None:
+            loader.join(timeout)
+        return self._active
+
+    def _swap(self, model: LoadedModel) -> None:
+        """Make a loaded version active."""
+        if self._active is not None and self._active.version != model.version:
+            self._previous = self._active
+        self._active = model
+        self._load_error = None
+        self._failed_version = None
+        logger.info(
+            f"Model version {model.version} active - {len(model.feature_names)} features, "
+            f"{len(model.target_names)} targets, loaded in {model.load_time_ms:.1f} ms"
+        )
+
+    def activate(self, version: str) -> LoadedModel:
+        """
+        Load a version, switch this process to it and record it in ACTIVE so
+        other workers follow.
+
+        Raises:
+            ValueError: On unknown or invalid versions
+        """
+        path = self.version_path(version)
+        if not path.is_dir():
+            raise ValueError(f"Unknown model version: {version}")
+
+        return self._promote(load_model(path, version))
+
+    def rollback(self) -> LoadedModel:
+        """
+        Re-activate the previously active version (still in memory).
+
+        Raises:
+            ValueError: If no version was active before
+        """
+        if self._previous is None:
+            raise ValueError("No previous model version to roll back to")
+        return self._promote(self._previous)
+
+    def _promote(self, model: LoadedModel) -> LoadedModel:
+        """Record a version in ACTIVE and switch this process to it."""
+        with self._lock:
+            active_file = self.models_dir / ACTIVE_FILE
+            tmp_file = active_file.with_suffix(".tmp")
+            tmp_file.write_text(model.version + "\n")
+            os.replace(tmp_file, active_file)
+            self._swap(model)
+        return model
+
+    def get(self, path: Path) -> LoadedModel:
+        """
+        A version pinned by directory (loaded once, never hot-swapped).
+        """
+        path = Path(path).resolve()
+        with self._lock:
+            if path not in self._pinned:
+                self._pinned[path] = load_model(path, path.name)
+            return self._pinned[path]
+
+    def status(self) -> Dict[str, Any]:
+        """Active and previous versions with their load time and memory."""
+        active = self.active
+        return {
+            "active": active.info() if active else None,
+            "previous": self._previous.info() if self._previous else None,
+            "available": self.versions(),
+            "load_error": self._load_error,
+            "pid": os.getpid(),
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get the process-wide registry (singleton pattern).
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def preload_models() -> Optional[LoadedModel]:
+    """
+    Load the active version now and move everything allocated so far out of
+    the garbage collector's reach, so forked workers do not dirty the shared
+    pages by touching object headers.
+    """
+    model = get_model_registry().active
+    gc.freeze()
+    return model
+
+
+def main(argv: List[str]) -> int:
+    """Command line: list versions, or activate / roll back a version."""
+    registry = get_model_registry()
+    if len(argv) == 2 and argv[0] == "activate":
+        model = registry.activate(argv[1])
+        print(json.dumps(model.info(), indent=2))
+        return 0
+    if argv in ([], ["status"]):
+        print(json.dumps(registry.status(), indent=2))
+        return 0
+    print("Usage: python -m server.ml.model_registry [status | activate <version>]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
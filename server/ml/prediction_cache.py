@@ -0,0 +1,229 @@
+"""
+ML Prediction Cache
+Reuses raw model outputs for feature vectors that were already scored.
+
+The same charts are predicted over and over: every AI analysis call
+regenerates the user's chart and re-extracts its 53 features, as does
+/api/ml/predict-from-kundali. Entries are keyed by the model's artifact
+fingerprint plus a hash of the feature vector, so a rollout or retrain never
+serves stale scores. Vectors are hashed exactly by default; with
+ML_CACHE_DECIMALS set they are rounded first, so charts differing only in
+float noise share an entry.
+
+The in-memory LRU is bounded by ML_CACHE_MAX_MB. With ML_CACHE_PERSIST=1
+entries are also written to the ml_prediction_cache MongoDB collection (next
+to the cached kundalis and compatibility results, expiring after 30 days),
+so a restarted worker starts warm. Hits and misses are
+counted per endpoint.
+
+Author: ML Pipeline
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from server.ml.model_registry import LoadedModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 64.0
+PERSIST_COLLECTION = "ml_prediction_cache"
+
+
+class PredictionCache:
+    """
+    Memory-bounded LRU of raw model outputs per (model, feature vector).
+    """
+
+    def __init__(self, max_bytes: int = int(DEFAULT_MAX_MB * 2 ** 20), decimals: Optional[int] = None,
+                 persist: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget of the cached entries
+            decimals: Round feature vectors to this many decimals before
+                hashing (None hashes them exactly)
+            persist: Also store entries in MongoDB
+        """
+        self.max_bytes = max_bytes
+        self.decimals = decimals
+        self.persist = persist
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._evictions = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def key(self, model: LoadedModel, features: np.ndarray) -> str:
+        """Cache key of a raw feature row under a model version."""
+        row = np.asarray(features, dtype=np.float64)
+        if self.decimals is not None:
+            # + 0.0 folds -0.0 into 0.0 so both hash alike
+            row = np.round(row, self.decimals) + 0.0
+        return f"{model.fingerprint}:{hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest()}"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached outputs for a key, marking it most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: np.ndarray) -> np.ndarray:
+        """
+        Store outputs, evicting least recently used entries over budget.
+
+        Returns:
+            The stored read-only copy
+        """
+        value = np.array(value)
+        value.flags.writeable = False
+        size = _entry_bytes(key, value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _entry_bytes(key, previous)
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self._bytes -= _entry_bytes(old_key, old_value)
+                self._evictions += 1
+        return value
+
+    async def predict(self, model: LoadedModel, features: np.ndarray, endpoint: str,
+                      compute: Callable[[np.ndarray], Awaitable[np.ndarray]]) -> np.ndarray:
+        """
+        Raw model outputs for one feature row, from the cache or compute().
+
+        Args:
+            model: Model version the outputs belong to
+            features: Raw feature row in feature_names order
+            endpoint: Name the hit/miss counts are reported under
+            compute: Scores the row on a miss
+
+        Returns:
+            Read-only output row
+        """
+        key = self.key(model, features)
+        stats = self._endpoint_stats(endpoint)
+
+        value = self.get(key)
+        if value is None and self.persist:
+            value = await asyncio.to_thread(self._load, key)
+            if value is not None:
+                stats["persisted_hits"] += 1
+                value = self.put(key, value)
+        if value is not None:
+            stats["hits"] += 1
+            return value
+
+        stats["misses"] += 1
+        value = self.put(key, await compute(features))
+        if self.persist:
+            asyncio.get_running_loop().run_in_executor(None, self._store, key, value)
+        return value
+
+    def _endpoint_stats(self, endpoint: str) -> Dict[str, int]:
+        with self._lock:
+            return self._stats.setdefault(endpoint, {"hits": 0, "misses": 0, "persisted_hits": 0})
+
+    def _collection(self):
+        """The MongoDB collection, or None (persistence off) if unavailable."""
+        try:
+            from server.database import get_db
+            return get_db()[PERSIST_COLLECTION]
+        except Exception as e:
+            logger.warning(f"ML prediction cache persistence disabled: {str(e)}")
+            self.persist = False
+            return None
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            doc = collection.find_one({"_id": key})
+        except Exception as e:
+            logger.error(f"Error reading ML prediction cache: {str(e)}")
+            return None
+        return np.asarray(doc["outputs"], dtype=np.float32) if doc else None
+
+    def _store(self, key: str, value: np.ndarray) -> None:
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            collection.replace_one(
+                {"_id": key},
+                {"outputs": value.tolist(), "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            # Non-critical error, continue with the in-memory cache
+            logger.error(f"Error persisting ML prediction: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._evictions = 0
+            self._stats.clear()
+
+    def metrics(self) -> Dict:
+        """Size, evictions and per-endpoint hit rates."""
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                endpoints[endpoint] = {**stats, "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0}
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "decimals": self.decimals,
+                "persist": self.persist,
+                "endpoints": endpoints,
+            }
+
+
+def _entry_bytes(key: str, value: np.ndarray) -> int:
+    """Approximate memory held by one entry (key, array and LRU node)."""
+    return sys.getsizeof(key) + sys.getsizeof(value) + 100
+
+
+_cache: Optional[PredictionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """
+    Get the process-wide cache (singleton pattern), configured from
+    ML_CACHE_MAX_MB, ML_CACHE_DECIMALS and ML_CACHE_PERSIST.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                decimals = os.getenv("ML_CACHE_DECIMALS")
+                _cache = PredictionCache(
+                    max_bytes=int(float(os.getenv("ML_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 2 ** 20),
+                    decimals=int(decimals) if decimals else None,
+                    persist=os.getenv("ML_CACHE_PERSIST", "0") == "1",
+                )
+    return _cache
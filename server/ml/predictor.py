@@ -6,14 +6,15 @@ Author: ML Engineer
 """
 
 import numpy as np
-import joblib
-import json
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
 
 # Import MLScoreBox from response schema
 from server.pydantic_schemas.ml_response import MLScoreBox
+from server.ml.inference_batcher import MicroBatcher
+from server.ml.model_registry import LoadedModel, get_model_registry
+from server.ml.prediction_cache import get_prediction_cache
 
 
 class KundaliMLPredictor:
@@ -28,41 +29,21 @@ class KundaliMLPredictor:
         Initialize predictor with trained models.
 
         Args:
-            models_dir: Path to trained models directory
+            models_dir: Path to a trained models directory to pin; by default
+                the predictor follows the registry's active version
         """
-        if models_dir is None:
-            models_dir = Path(__file__).parent / "trained_models"
-
-        self.models_dir = models_dir
-        self.scaler = None
-        self.xgb_model = None
-        self.feature_names = []
-        self.target_names = []
-        self.model_version = "v1.0"
+        self.models_dir = Path(models_dir) if models_dir is not None else None
         self.loaded = False
+        self._batcher: Optional[MicroBatcher] = None
 
         # Load models on init
         self._load_models()
 
     def _load_models(self):
-        """Load trained models, scaler, and metadata."""
+        """Load trained models, scaler, and metadata (once per process, via the model registry)."""
         try:
-            self.scaler = joblib.load(str(self.models_dir / "scaler.pkl"))
-            self.xgb_model = joblib.load(str(self.models_dir / "xgboost_model.pkl"))
-
-            with open(self.models_dir / "feature_names.json") as f:
-                self.feature_names = json.load(f)
-
-            with open(self.models_dir / "target_names.json") as f:
-                self.target_names = json.load(f)
-
-            # Load model version from metadata if available
-            metadata_path = self.models_dir / "model_metadata.json"
-            if metadata_path.exists():
-                with open(metadata_path) as f:
-                    metadata = json.load(f)
-                    self.model_version = metadata.get("version", "v1.0")
-
+            if self.model is None:
+                raise ValueError("Models not loaded")
             self.loaded = True
 
         except Exception as e:
@@ -70,6 +51,37 @@ class KundaliMLPredictor:
             self.loaded = False
             raise
 
+    @property
+    def model(self) -> Optional[LoadedModel]:
+        """The model version this predictor serves."""
+        registry = get_model_registry()
+        return registry.active if self.models_dir is None else registry.get(self.models_dir)
+
+    @property
+    def scaler(self):
+        """Fitted feature scaler."""
+        return self.model.scaler
+
+    @property
+    def xgb_model(self):
+        """XGBoost multi-output regressor."""
+        return self.model.xgb_model
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Feature names in model input order."""
+        return self.model.feature_names
+
+    @property
+    def target_names(self) -> List[str]:
+        """Target names in model output order."""
+        return self.model.target_names
+
+    @property
+    def model_version(self) -> str:
+        """Version string reported in MLScoreBox."""
+        return self.model.model_version
+
     def predict(self, features_dict: Dict[str, float]) -> Dict[str, MLScoreBox]:
         """
         Make predictions on kundali features.
@@ -87,63 +99,105 @@ class KundaliMLPredictor:
             raise ValueError("Models not loaded")
 
         start_time = time.time()
+        model = self.model
 
-        # Convert features dict to list in correct order
-        features_list = [features_dict.get(fname, 0.0) for fname in self.feature_names]
+        # Order, scale and predict through the model's preprocessing plan
+        features = model.plan.order([features_dict])
+        predictions = model.predict_matrix(features, copy=False)
 
-        # Validate feature count
-        if len(features_list) != len(self.feature_names):
-            raise ValueError(f"Expected {len(self.feature_names)} features, got {len(features_list)}")
+        return self._score_boxes(model, predictions, (time.time() - start_time) * 1000)[0]
 
-        # Scale features
-        features_array = np.array(features_list).reshape(1, -1)
-        features_scaled = self.scaler.transform(features_array)
+    async def predict_async(self, features_dict: Dict[str, float],
+                            endpoint: str = "predictor") -> Dict[str, MLScoreBox]:
+        """
+        Make predictions on kundali features through the prediction cache and
+        the micro-batching queue.
 
-        # Make prediction
-        predictions = self.xgb_model.predict(features_scaled)[0]
+        Repeated feature vectors are served from the cache; concurrent misses
+        are scored together in one model call on the inference executor
+        instead of one by one on the event loop.
 
-        # Calculate inference time
-        inference_time_ms = (time.time() - start_time) * 1000
+        Args:
+            features_dict: Dictionary of feature_name -> value
+            endpoint: Caller name for the cache hit-rate metrics
 
-        # Convert to Dict[str, MLScoreBox]
-        result = {}
+        Returns:
+            Dict[str, MLScoreBox]: Predictions with score, confidence, model_version
 
-        for target_name, prediction in zip(self.target_names, predictions):
-            # Clip to [0, 100] range (model trained on 0-100 scale)
-            score = float(np.clip(prediction, 0.0, 100.0))
+        Raises:
+            ValueError: If models not loaded
+        """
+        if not self.loaded:
+            raise ValueError("Models not loaded")
 
-            # Calculate confidence based on score distribution (0-100 scale)
-            # Higher confidence for mid-range scores (model is more certain)
-            # Lower confidence for extreme values
-            if 30 <= score <= 70:
-                confidence = 0.85
-            elif 20 <= score <= 80:
-                confidence = 0.80
-            else:
-                confidence = 0.75
+        start_time = time.time()
+        model = self.model
+        features = model.plan.order([features_dict])[0]
+        predictions = await get_prediction_cache().predict(model, features, endpoint, self.batcher.predict)
+        return self._score_boxes(model, predictions[None, :], (time.time() - start_time) * 1000)[0]
 
-            result[target_name] = MLScoreBox(
-                score=score,
-                confidence=confidence,
-                model_version=self.model_version
-            )
+    @property
+    def batcher(self) -> MicroBatcher:
+        """
+        Micro-batching queue: the registry's shared queue, or a queue of its
+        own for a pinned models directory.
+        """
+        if self.models_dir is None:
+            return get_model_registry().batcher
+        if self._batcher is None:
+            self._batcher = MicroBatcher(f"kundali_predictor:{self.models_dir.name}", self.predict_matrix)
+        return self._batcher
 
-        # Add inference time metadata (not in MLScoreBox, but useful)
-        result["_inference_time_ms"] = inference_time_ms
+    def predict_matrix(self, features: np.ndarray) -> np.ndarray:
+        """
+        Raw model outputs for a (rows, features) matrix of unscaled features.
 
-        return result
+        Args:
+            features: Feature matrix in feature_names order
+
+        Returns:
+            numpy array of shape (rows, targets)
+        """
+        return self.model.predict_matrix(features)
+
+    def _score_boxes(self, model: LoadedModel, predictions: np.ndarray,
+                     inference_time_ms: float) -> List[Dict[str, MLScoreBox]]:
+        """Wrap (rows, targets) model outputs in MLScoreBoxes, one dict per row."""
+        # Scores clipped to [0, 100] (the training scale); mid-range scores
+        # get higher confidence (model is more certain), extremes lower
+        scores, confidences = model.plan.postprocess(predictions)
+
+        results = []
+        for row_scores, row_confidences in zip(scores.tolist(), confidences.tolist()):
+            result = {
+                target_name: MLScoreBox(score=score, confidence=confidence, model_version=model.model_version)
+                for target_name, score, confidence in zip(model.target_names, row_scores, row_confidences)
+            }
+            # Add inference time metadata (not in MLScoreBox, but useful)
+            result["_inference_time_ms"] = inference_time_ms
+            results.append(result)
+
+        return results
 
     def predict_batch(self, features_list: List[Dict[str, float]]) -> List[Dict[str, MLScoreBox]]:
         """
         Make predictions on batch of kundali features.
 
+        All rows are ordered, scaled and predicted together.
+
         Args:
             features_list: List of feature dictionaries
 
         Returns:
             List[Dict[str, MLScoreBox]]: List of predictions
         """
-        return [self.predict(features) for features in features_list]
+        if not self.loaded:
+            raise ValueError("Models not loaded")
+
+        start_time = time.time()
+        model = self.model
+        predictions = model.predict_matrix(model.plan.order(features_list), copy=False)
+        return self._score_boxes(model, predictions, (time.time() - start_time) * 1000)
 
     def get_feature_names(self) -> List[str]:
         """Get list of feature names."""
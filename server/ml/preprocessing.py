@@ -0,0 +1,136 @@
+"""
+Prediction Preprocessing Plan
+Precompiled input ordering, scaling and output post-processing for one model.
+
+Building a plan once per loaded model replaces the per-call work of the
+prediction paths (a Python list in feature_names order, sklearn's
+StandardScaler.transform with its validation and feature-name checks, and a
+per-target clip/confidence loop) with a handful of NumPy operations that
+are the same for one row or a million:
+
+    order:        feature dicts -> (rows, features) float64 matrix
+    transform:    (X - mean) / scale, emitted as float32 model input
+    postprocess:  clip scores to [0, 100] and bucket confidences
+
+Centering stays in float64: large raw features (Julian days) lose their
+fraction in float32, so the plan emits float32 only after scaling, which is
+the precision both the booster and the native tree predictor consume.
+
+Author: ML Pipeline
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SCORE_MIN = 0.0
+SCORE_MAX = 100.0
+# (low, high, confidence): mid-range scores are the model's most certain
+CONFIDENCE_BANDS = ((30.0, 70.0, 0.85), (20.0, 80.0, 0.80))
+DEFAULT_CONFIDENCE = 0.75
+
+
+class PreprocessingPlan:
+    """
+    Feature ordering, scaling and score post-processing of one model version.
+    """
+
+    def __init__(self, feature_names: List[str], target_names: List[str], scaler: Any):
+        """
+        Compile the plan.
+
+        Args:
+            feature_names: Feature names in model input order
+            target_names: Target names in model output order
+            scaler: Fitted scaler; a StandardScaler is applied with NumPy,
+                anything else through its own transform()
+        """
+        self.feature_names = list(feature_names)
+        self.target_names = list(target_names)
+        self.column_index: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self.scaler = scaler
+
+        scaling = _standard_scaling(scaler)
+        self.mean, self.scale = scaling if scaling is not None else (None, None)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    @property
+    def fused(self) -> bool:
+        """Whether scaling runs in NumPy rather than through the scaler."""
+        return self.mean is not None
+
+    def order(self, records: Iterable[Dict[str, float]]) -> np.ndarray:
+        """
+        Pack feature dicts into a float64 matrix in model input order.
+
+        Missing features are 0.0 and unknown keys are ignored.
+
+        Returns:
+            (rows, features) float64 matrix
+        """
+        records = list(records)
+        matrix = np.zeros((len(records), self.n_features), dtype=np.float64)
+        index = self.column_index
+        for row, record in enumerate(records):
+            if record.keys() == index.keys():
+                matrix[row] = list(map(record.__getitem__, self.feature_names))
+                continue
+            for name, value in record.items():
+                column = index.get(name)
+                if column is not None:
+                    matrix[row, column] = value
+        return matrix
+
+    def transform(self, features: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Scale a (rows, features) matrix of raw features.
+
+        Args:
+            features: Raw features in feature_names order
+            copy: False centers a float64 matrix in place, saving a copy
+
+        Returns:
+            float32 scaled matrix (or the scaler's output for non-standard scalers)
+        """
+        if not self.fused:
+            return self.scaler.transform(features, copy=copy)
+
+        features = np.asarray(features)
+        if features.shape[-1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {features.shape[-1]}")
+        if copy or features.dtype != np.float64:
+            centered = np.subtract(features, self.mean, dtype=np.float64)
+        else:
+            centered = np.subtract(features, self.mean, out=features)
+        return np.divide(centered, self.scale, out=np.empty(centered.shape, dtype=np.float32), casting="same_kind")
+
+    def postprocess(self, predictions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Clip raw model outputs to the score range and assign confidences.
+
+        Args:
+            predictions: (rows, targets) or (targets,) model outputs
+
+        Returns:
+            Tuple of (scores, confidences), both shaped like predictions
+        """
+        scores = np.clip(predictions, SCORE_MIN, SCORE_MAX)
+        confidence = np.select(
+            [(scores >= low) & (scores <= high) for low, high, _ in CONFIDENCE_BANDS],
+            [value for _, _, value in CONFIDENCE_BANDS],
+            default=DEFAULT_CONFIDENCE,
+        )
+        return scores, confidence
+
+
+def _standard_scaling(scaler: Any) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """(mean, scale) applied by a StandardScaler, or None for other scalers."""
+    if type(scaler).__name__ != "StandardScaler":
+        return None
+    n_features = scaler.n_features_in_
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
@@ -18,6 +18,8 @@ from typing import Tuple, Dict, List
 from datetime import datetime
 import json
 
+from server.utils.time_utils import local_to_julian_days, normalize_time_strings
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -216,25 +218,55 @@ class RealDataProcessor:
 
     def standardize_datetime_formats(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Ensure consistent datetime formats.
+        Ensure consistent datetime formats and add each record's Julian Day.
+
+        The julian_day column is computed in one vectorized pass per timezone
+        (see server.utils.time_utils); rows with a missing date, time or
+        timezone, or an unknown timezone, get NaN.
         """
         logger.info("Standardizing datetime formats...")
 
         # Standardize date format to YYYY-MM-DD
         df['birth_date'] = pd.to_datetime(df['birth_date']).dt.strftime('%Y-%m-%d')
 
-        # Standardize time format to HH:MM:SS
+        # Standardize time format to HH:MM:SS (HH:MM is padded first)
         if 'birth_time' in df.columns and df['birth_time'].notna().any():
+            times = df['birth_time'].astype(object)
+            present = times.notna()
+            times[present] = normalize_time_strings(times[present].astype(str))
             df['birth_time'] = pd.to_datetime(
-                df['birth_time'],
+                times,
                 format='%H:%M:%S',
                 errors='coerce'
             ).dt.strftime('%H:%M:%S')
 
+        if {'birth_time', 'timezone'}.issubset(df.columns):
+            df['julian_day'] = self._compute_julian_days(df)
+
         logger.info("  Date and time formats standardized")
 
         return df
 
+    def _compute_julian_days(self, df: pd.DataFrame) -> np.ndarray:
+        """Julian Days for all complete rows, NaN elsewhere."""
+        julian_days = np.full(len(df), np.nan)
+        complete = (df['birth_date'].notna() & df['birth_time'].notna() & df['timezone'].notna()).to_numpy()
+        rows = df.loc[complete]
+
+        for zone in pd.unique(rows['timezone']):
+            in_zone = (rows['timezone'] == zone).to_numpy()
+            try:
+                julian_days[np.flatnonzero(complete)[in_zone]] = local_to_julian_days(
+                    rows['birth_date'].to_numpy()[in_zone],
+                    rows['birth_time'].to_numpy()[in_zone],
+                    zone,
+                )
+            except ValueError as e:
+                logger.warning(f"  Skipping Julian Day for timezone {zone}: {e}")
+
+        logger.info(f"  Computed Julian Day for {int(np.isfinite(julian_days).sum())} records")
+        return julian_days
+
     def merge_data_sources(self, filepath_list: List[str]) -> pd.DataFrame:
         """
         Merge data from multiple CSV files.
@@ -0,0 +1,550 @@
+"""
+Chart Similarity Index
+Nearest-neighbour search over the 53-feature chart representation used by
+KundaliFeatureExtractor, covering celebrity charts and users' saved kundalis.
+
+Encoding:
+- The 10 longitude features (planets and ascendant) become sin/cos pairs, so
+  359 and 1 degree are neighbours
+- The 43 remaining features are z-scored with statistics from the celebrity
+  set
+- Each vector is L2-normalized, so similarity is one BLAS mat-vec of cosines
+
+Small indexes are searched by brute force. Large ones can be partitioned
+with IVF (spherical k-means lists, searching the nprobe closest lists).
+The index is saved as a single .npz file and updated incrementally as
+charts are saved, updated or deleted.
+
+Saved, updated and deleted charts change the in-memory index at once and
+are queued; a background thread writes them to disk every
+SYNC_INTERVAL_SECONDS, so request handlers never write the file. Every
+server worker holds its own index, so a sync takes an exclusive lock file
+next to the index (flock), reloads the file if another worker replaced it,
+replays its queued changes onto it and saves the result. Workers that have
+nothing queued still reload the file, so each worker sees the others'
+charts within one interval.
+
+Author: ML Pipeline
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from server.ml.feature_extractor import KundaliFeatureExtractor
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per index file is assumed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = Path(__file__).parent / "trained_models" / "chart_similarity_index.npz"
+CELEBRITY_FEATURES_PATH = Path(__file__).parent.parent.parent / "processed_data" / "celebrity_features.csv"
+
+FEATURE_NAMES = KundaliFeatureExtractor().required_features
+CIRCULAR_FEATURES = [f for f in FEATURE_NAMES if f.endswith('_degree')]
+LINEAR_FEATURES = [f for f in FEATURE_NAMES if not f.endswith('_degree')]
+
+KIND_CELEBRITY = "celebrity"
+KIND_USER = "user"
+KINDS = (KIND_CELEBRITY, KIND_USER)
+
+# Build IVF lists automatically once the index holds this many charts
+IVF_MIN_ITEMS = 20000
+DEFAULT_NPROBE = 8
+
+# Seconds between writes of queued changes (and reloads of other workers' changes)
+SYNC_INTERVAL_SECONDS = 10
+
+
+class ChartSimilarityIndex:
+    """
+    In-process cosine-similarity index over encoded chart features.
+
+    Usage:
+        index = ChartSimilarityIndex.from_celebrity_csv()
+        index.add("64f0...", KIND_USER, "My chart", features, owner_id="user-1")
+        matches = index.search(features, k=10)
+    """
+
+    def __init__(self, mean: Optional[np.ndarray] = None, std: Optional[np.ndarray] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            mean: Per-feature mean of the linear features (defaults to 0)
+            std: Per-feature standard deviation of the linear features (defaults to 1)
+        """
+        self.mean = np.zeros(len(LINEAR_FEATURES)) if mean is None else np.asarray(mean, dtype=np.float64)
+        std = np.ones(len(LINEAR_FEATURES)) if std is None else np.asarray(std, dtype=np.float64)
+        self.std = np.where(std > 0, std, 1.0)
+        self.dimension = 2 * len(CIRCULAR_FEATURES) + len(LINEAR_FEATURES)
+
+        self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._kind_codes = np.empty(0, dtype=np.int8)
+        self._size = 0
+        self.ids: List[str] = []
+        self.kinds: List[str] = []
+        self.names: List[str] = []
+        self.owners: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self._lists = np.empty(0, dtype=np.int32)
+
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Encoded vectors of all indexed charts, shape (N, dimension)."""
+        return self._vectors[:self._size]
+
+    def encode(self, features: Any) -> np.ndarray:
+        """
+        Encode feature rows into unit vectors.
+
+        Args:
+            features: Feature dict, list of dicts, DataFrame, or array with
+                columns in FEATURE_NAMES order
+
+        Returns:
+            float32 array of shape (N, dimension)
+        """
+        if isinstance(features, dict):
+            features = [features]
+        if isinstance(features, pd.DataFrame):
+            matrix = features.reindex(columns=FEATURE_NAMES).to_numpy(dtype=np.float64)
+        elif len(features) and isinstance(features[0], dict):
+            matrix = np.array([[row.get(f, np.nan) for f in FEATURE_NAMES] for row in features], dtype=np.float64)
+        else:
+            matrix = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        matrix = np.nan_to_num(matrix)
+
+        n_circular = len(CIRCULAR_FEATURES)
+        angles = np.radians(matrix[:, :n_circular])
+        linear = (matrix[:, n_circular:] - self.mean) / self.std
+
+        encoded = np.hstack((np.sin(angles), np.cos(angles), linear))
+        norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+        return (encoded / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+    def add(self, item_id: str, kind: str, name: str, features: Any, owner_id: str = "") -> None:
+        """
+        Add a chart, replacing any existing entry with the same id.
+
+        Args:
+            item_id: Unique id (kundali id or celebrity key)
+            kind: One of KINDS
+            name: Display name
+            features: 53-feature dict or row
+            owner_id: User id owning the chart (empty for celebrities)
+        """
+        self.add_many([item_id], [kind], [name], self.encode(features), [owner_id])
+
+    def add_many(self, item_ids: Sequence[str], kinds: Sequence[str], names: Sequence[str],
+                 vectors: np.ndarray, owner_ids: Optional[Sequence[str]] = None) -> None:
+        """
+        Add already-encoded charts in bulk.
+
+        Args:
+            item_ids: Unique ids
+            kinds: Kind per chart
+            names: Display name per chart
+            vectors: Encoded vectors from encode(), shape (N, dimension)
+            owner_ids: Owner per chart (defaults to empty)
+        """
+        owner_ids = owner_ids if owner_ids is not None else [""] * len(item_ids)
+        with self._lock:
+            for item_id in item_ids:
+                if item_id in self._rows:
+                    self.remove(item_id)
+
+            count = len(item_ids)
+            self._reserve(self._size + count)
+            start = self._size
+            self._vectors[start:start + count] = vectors
+            self._kind_codes[start:start + count] = [KINDS.index(kind) for kind in kinds]
+            self._size += count
+
+            for offset, item_id in enumerate(item_ids):
+                self._rows[item_id] = start + offset
+            self.ids.extend(item_ids)
+            self.kinds.extend(kinds)
+            self.names.extend(str(n) for n in names)
+            self.owners.extend(str(o) for o in owner_ids)
+
+            if self.centroids is not None:
+                self._lists = np.concatenate((self._lists, self._assign_lists(vectors)))
+
+    def remove(self, item_id: str) -> bool:
+        """
+        Remove a chart by id.
+
+        Returns:
+            True if the chart was indexed
+        """
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return False
+
+            # Move the last chart into the freed row
+            last = self._size - 1
+            if row != last:
+                self._vectors[row] = self._vectors[last]
+                self._kind_codes[row] = self._kind_codes[last]
+                for values in (self.ids, self.kinds, self.names, self.owners):
+                    values[row] = values[last]
+                self._rows[self.ids[row]] = row
+                if self.centroids is not None:
+                    self._lists[row] = self._lists[last]
+
+            for values in (self.ids, self.kinds, self.names, self.owners):
+                values.pop()
+            if self.centroids is not None:
+                self._lists = self._lists[:last]
+            self._size = last
+            return True
+
+    def search(self, features: Any, k: int = 10, kinds: Optional[Iterable[str]] = None,
+               exclude_ids: Iterable[str] = (), nprobe: int = DEFAULT_NPROBE) -> List[Dict[str, Any]]:
+        """
+        Find the most similar charts.
+
+        Args:
+            features: 53-feature dict or row of the query chart
+            k: Number of matches
+            kinds: Restrict to these kinds (default all)
+            exclude_ids: Ids never returned (e.g. the query chart itself)
+            nprobe: IVF lists searched when the index is partitioned
+
+        Returns:
+            Matches ordered by descending cosine similarity, each with id,
+            kind, name, owner_id and similarity
+        """
+        query = self.encode(features)[0]
+        with self._lock:
+            if self._size == 0:
+                return []
+
+            if self.centroids is not None:
+                probe = np.argsort(-(self.centroids @ query))[:nprobe]
+                candidates = np.flatnonzero(np.isin(self._lists, probe))
+            else:
+                candidates = np.arange(self._size)
+
+            if kinds is not None:
+                wanted = [KINDS.index(kind) for kind in kinds]
+                candidates = candidates[np.isin(self._kind_codes[candidates], wanted)]
+            excluded = [self._rows[i] for i in exclude_ids if i in self._rows]
+            if excluded:
+                candidates = candidates[~np.isin(candidates, excluded)]
+            if candidates.size == 0:
+                return []
+
+            scores = self._vectors[candidates] @ query
+            k = min(k, candidates.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                {
+                    "id": self.ids[candidates[i]],
+                    "kind": self.kinds[candidates[i]],
+                    "name": self.names[candidates[i]],
+                    "owner_id": self.owners[candidates[i]],
+                    "similarity": round(float(scores[i]), 4),
+                }
+                for i in top
+            ]
+
+    def build_ivf(self, n_lists: Optional[int] = None, n_iter: int = 10, seed: int = 42) -> None:
+        """
+        Partition the index into IVF lists with spherical k-means.
+
+        Args:
+            n_lists: Number of lists (defaults to sqrt(N))
+            n_iter: k-means iterations
+            seed: Random seed for centroid initialization
+        """
+        with self._lock:
+            vectors = self.vectors
+            n_lists = n_lists or max(1, int(np.sqrt(self._size)))
+            n_lists = min(n_lists, self._size)
+            if n_lists < 2:
+                self.centroids = None
+                self._lists = np.empty(0, dtype=np.int32)
+                return
+
+            rng = np.random.default_rng(seed)
+            centroids = vectors[rng.choice(self._size, n_lists, replace=False)].copy()
+            for _ in range(n_iter):
+                assignment = np.argmax(vectors @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, vectors)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                # Empty lists keep their previous centroid
+                centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+
+            self.centroids = centroids.astype(np.float32)
+            self._lists = self._assign_lists(vectors)
+            logger.info(f"Built IVF index: {n_lists} lists over {self._size} charts")
+
+    def save(self, path: Path = INDEX_PATH) -> None:
+        """Persist the index to a .npz file (written atomically)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with self._lock:
+            arrays = {
+                "vectors": self.vectors,
+                "ids": np.array(self.ids, dtype=str),
+                "kinds": np.array(self.kinds, dtype=str),
+                "names": np.array(self.names, dtype=str),
+                "owners": np.array(self.owners, dtype=str),
+                "mean": self.mean,
+                "std": self.std,
+            }
+            if self.centroids is not None:
+                arrays["centroids"] = self.centroids
+                arrays["lists"] = self._lists
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> "ChartSimilarityIndex":
+        """Load an index saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(mean=data["mean"], std=data["std"])
+            index.add_many(data["ids"].tolist(), data["kinds"].tolist(), data["names"].tolist(),
+                           data["vectors"], data["owners"].tolist())
+            if "centroids" in data:
+                index.centroids = data["centroids"]
+                index._lists = data["lists"].astype(np.int32)
+        return index
+
+    @classmethod
+    def from_celebrity_csv(cls, path: Path = CELEBRITY_FEATURES_PATH) -> "ChartSimilarityIndex":
+        """
+        Build an index from celebrity_features.csv.
+
+        The celebrity set also supplies the z-score statistics used for every
+        chart added later.
+        """
+        df = pd.read_csv(path)
+        if 'extraction_success' in df.columns:
+            df = df[df['extraction_success'].astype(str).str.lower() == 'true']
+        df = df.dropna(subset=FEATURE_NAMES).reset_index(drop=True)
+
+        linear = df[LINEAR_FEATURES].to_numpy(dtype=np.float64)
+        index = cls(mean=linear.mean(axis=0), std=linear.std(axis=0))
+
+        names = df['name'].astype(str).tolist() if 'name' in df.columns else [""] * len(df)
+        ids = [f"{KIND_CELEBRITY}:{i}" for i in range(len(df))]
+        index.add_many(ids, [KIND_CELEBRITY] * len(df), names, index.encode(df[FEATURE_NAMES]))
+
+        if len(index) >= IVF_MIN_ITEMS:
+            index.build_ivf()
+        logger.info(f"Built chart similarity index from {len(index)} celebrity charts")
+        return index
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow vector storage geometrically so appends are amortized O(1)."""
+        if capacity <= len(self._vectors):
+            return
+        grown = np.empty((max(capacity, 2 * len(self._vectors), 64), self.dimension), dtype=np.float32)
+        grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+        codes = np.empty(len(grown), dtype=np.int8)
+        codes[:self._size] = self._kind_codes[:self._size]
+        self._kind_codes = codes
+
+    def _assign_lists(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest IVF list of each vector."""
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+
+def chart_features(kundali: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Get the 53 features of a saved kundali document.
+
+    Uses stored ml_features when complete, otherwise extracts them from
+    kundali_data.
+    """
+    stored = kundali.get('ml_features') or {}
+    if all(f in stored for f in FEATURE_NAMES):
+        return {f: float(stored[f]) for f in FEATURE_NAMES}
+    features, _ = KundaliFeatureExtractor().extract_features(kundali.get('kundali_data') or {})
+    return features
+
+
+_index: Optional[ChartSimilarityIndex] = None
+_index_lock = threading.Lock()
+
+# Changes not yet written: id -> (name, vector, owner), or None for a removal
+_pending: Dict[str, Optional[Tuple[str, np.ndarray, str]]] = {}
+_pending_lock = threading.Lock()
+_sync_lock = threading.Lock()
+_loaded_stamp: Optional[Tuple[int, int]] = None
+_sync_thread: Optional[threading.Thread] = None
+_stop_sync = threading.Event()
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Identity of the file at path; os.replace gives every save a new one."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock shared by every process using the index at path."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path.with_name(path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def get_similarity_index() -> ChartSimilarityIndex:
+    """
+    Get the shared index, loading it from disk or building it from the
+    celebrity set on first use.
+    """
+    global _index, _loaded_stamp
+    with _index_lock:
+        if _index is None:
+            with _file_lock(INDEX_PATH):
+                if INDEX_PATH.exists():
+                    _index = ChartSimilarityIndex.load(INDEX_PATH)
+                    logger.info(f"Loaded chart similarity index with {len(_index)} charts")
+                else:
+                    _index = ChartSimilarityIndex.from_celebrity_csv()
+                    _index.save(INDEX_PATH)
+                _loaded_stamp = _file_stamp(INDEX_PATH)
+        return _index
+
+
+def _start_sync_thread() -> None:
+    global _sync_thread
+    with _pending_lock:
+        if _sync_thread is None or not _sync_thread.is_alive():
+            _stop_sync.clear()
+            _sync_thread = threading.Thread(target=_sync_loop, name="similarity-index-sync", daemon=True)
+            _sync_thread.start()
+
+
+def _sync_loop() -> None:
+    while not _stop_sync.wait(SYNC_INTERVAL_SECONDS):
+        try:
+            sync_similarity_index()
+        except Exception as e:
+            logger.error(f"Chart similarity index sync failed: {e}", exc_info=True)
+
+
+def sync_similarity_index() -> int:
+    """
+    Write queued changes to disk, merging those of other workers.
+
+    Returns:
+        Number of queued changes written
+    """
+    global _index, _loaded_stamp
+    if _index is None:
+        return 0
+    with _sync_lock, _file_lock(INDEX_PATH):
+        stamp = _file_stamp(INDEX_PATH)
+        merged = None
+        if stamp is not None and stamp != _loaded_stamp:
+            # Another worker saved since our last load or save
+            merged = ChartSimilarityIndex.load(INDEX_PATH)
+
+        with _pending_lock:
+            changes = dict(_pending)
+            _pending.clear()
+            if merged is not None:
+                for item_id, change in changes.items():
+                    if change is None:
+                        merged.remove(item_id)
+                    else:
+                        name, vector, owner = change
+                        merged.add_many([item_id], [KIND_USER], [name], vector[None], [owner])
+                # Swapped under the queue lock, so no later change misses the new index
+                with _index_lock:
+                    _index = merged
+
+        if changes or stamp is None:
+            _index.save(INDEX_PATH)
+            _loaded_stamp = _file_stamp(INDEX_PATH)
+        elif merged is not None:
+            _loaded_stamp = stamp
+        if merged is not None:
+            logger.info(f"Reloaded chart similarity index with {len(merged)} charts")
+        return len(changes)
+
+
+def stop_similarity_sync() -> None:
+    """Stop the sync thread and write any queued changes."""
+    global _sync_thread
+    _stop_sync.set()
+    if _sync_thread is not None:
+        _sync_thread.join(timeout=SYNC_INTERVAL_SECONDS)
+        _sync_thread = None
+    sync_similarity_index()
+
+
+def index_saved_kundali(kundali: Dict[str, Any], persist: bool = True) -> None:
+    """
+    Add or refresh a saved user kundali in the shared index.
+
+    Args:
+        kundali: Saved kundali document (with '_id' as string)
+        persist: Queue the change for the next write to disk
+    """
+    index = get_similarity_index()
+    item_id, name = str(kundali['_id']), str(kundali.get('name', ''))
+    owner_id = str(kundali.get('user_id', ''))
+    vector = index.encode(chart_features(kundali))
+    with _pending_lock:
+        # A sync may have swapped in a merged index since the lookup above
+        _index.add_many([item_id], [KIND_USER], [name], vector, [owner_id])
+        if persist:
+            _pending[item_id] = (name, vector[0], owner_id)
+    if persist:
+        _start_sync_thread()
+
+
+def unindex_kundali(kundali_id: str, persist: bool = True) -> None:
+    """Remove a deleted kundali from the shared index."""
+    get_similarity_index()
+    with _pending_lock:
+        _index.remove(str(kundali_id))
+        if persist:
+            # Queued even if absent here: another worker may have indexed it
+            _pending[str(kundali_id)] = None
+    if persist:
+        _start_sync_thread()
@@ -7,14 +7,22 @@ Instead, it generates:
 1. Realistic astrological features (planetary positions, house placements)
 2. Realistic target variables with actual variance
 3. Proper data validation and quality checks
+
+generate_shards streams datasets larger than memory: records are generated
+in fixed-size chunks, each from its own seed derived from (seed, chunk
+index), in a process pool, and written as shards (see server.ml.shards) as
+they finish. The same seed and chunk size give the same dataset for any
+worker count, and an interrupted run resumes where it stopped.
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import logging
 from pathlib import Path
 from typing import Dict, List
 import json
+import os
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +30,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 100_000
+
+
 class FixedSyntheticKundaliGenerator:
     """Generate realistic synthetic Kundali data with proper feature/target variance."""
 
@@ -40,10 +51,13 @@ class FixedSyntheticKundaliGenerator:
             'life_ease_score'
         ]
 
-    def generate_features(self, num_records: int) -> pd.DataFrame:
+    def generate_features(self, num_records: int, rng=None, report: bool = True) -> pd.DataFrame:
         """
         Generate 62 realistic astrological features with VARIANCE.
 
+        Draws from rng (a RandomState) if given, else the global seed.
+        report=False skips the logging and variance warnings.
+
         Features include:
         - Planetary positions (zodiac degrees): 10 planets x 1 = 10
         - House placements: 12 houses x 2 (planet count, lord strength) = 24
@@ -51,35 +65,39 @@ class FixedSyntheticKundaliGenerator:
         - Yogas: 6 yoga counts = 6
         - Aspect strengths: 6 aspect types = 6
         """
-        logger.info(f"Generating {num_records} feature records...")
+        rng = rng if rng is not None else np.random
+        if report:
+            logger.info(f"Generating {num_records} feature records...")
 
         features = {}
 
         # 1. Planetary positions (0-360 degrees, realistic variation)
         planets = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu', 'Ascendant']
         for planet in planets:
-            features[f'{planet.lower()}_degree'] = np.random.uniform(0, 360, num_records)
+            features[f'{planet.lower()}_degree'] = rng.uniform(0, 360, num_records)
 
         # 2. House placements (0-12 planets per house, lord strength 0-100)
         for house_num in range(1, 13):
-            features[f'house_{house_num}_planets'] = np.random.randint(0, 4, num_records)
-            features[f'house_{house_num}_lord_strength'] = np.random.uniform(20, 100, num_records)
+            features[f'house_{house_num}_planets'] = rng.randint(0, 4, num_records)
+            features[f'house_{house_num}_lord_strength'] = rng.uniform(20, 100, num_records)
 
         # 3. Planetary strengths (0-100 scale)
         for planet in planets[:-1]:  # Exclude Ascendant
-            features[f'{planet.lower()}_strength'] = np.random.uniform(20, 100, num_records)
+            features[f'{planet.lower()}_strength'] = rng.uniform(20, 100, num_records)
 
         # 4. Yoga counts
-        features['total_yoga_count'] = np.random.randint(0, 8, num_records)
-        features['benefic_yoga_count'] = np.random.randint(0, 6, num_records)
-        features['malefic_yoga_count'] = np.random.randint(0, 4, num_records)
-        features['neutral_yoga_count'] = np.random.randint(0, 3, num_records)
+        features['total_yoga_count'] = rng.randint(0, 8, num_records)
+        features['benefic_yoga_count'] = rng.randint(0, 6, num_records)
+        features['malefic_yoga_count'] = rng.randint(0, 4, num_records)
+        features['neutral_yoga_count'] = rng.randint(0, 3, num_records)
 
         # 5. Aspect strengths (0-100)
         for i in range(1, 7):
-            features[f'aspect_strength_{i}'] = np.random.uniform(0, 100, num_records)
+            features[f'aspect_strength_{i}'] = rng.uniform(0, 100, num_records)
 
         df = pd.DataFrame(features)
+        if not report:
+            return df
         logger.info(f"  Generated features shape: {df.shape}")
         logger.info(f"  Features: {list(df.columns)[:5]}... (showing first 5)")
 
@@ -91,12 +109,14 @@ class FixedSyntheticKundaliGenerator:
 
         return df
 
-    def generate_targets(self, features: pd.DataFrame) -> pd.DataFrame:
+    def generate_targets(self, features: pd.DataFrame, rng=None, report: bool = True) -> pd.DataFrame:
         """
         Generate realistic target variables based on features.
         Targets have REAL VARIANCE and meaningful relationships to features.
         """
-        logger.info(f"Generating targets with meaningful relationships to features...")
+        rng = rng if rng is not None else np.random
+        if report:
+            logger.info(f"Generating targets with meaningful relationships to features...")
 
         targets = {}
         num_records = len(features)
@@ -107,7 +127,7 @@ class FixedSyntheticKundaliGenerator:
             (features['house_10_lord_strength'] / 100) * 30 + \
             (features['saturn_strength'] / 100) * 15 + \
             (features['sun_strength'] / 100) * 5 + \
-            np.random.normal(0, 5, num_records)  # Add realistic noise
+            rng.normal(0, 5, num_records)  # Add realistic noise
         targets['career_potential'] = np.clip(career_potential, 0, 100)
 
         # 2. Wealth Potential (depends on House 2, Jupiter, Venus strength)
@@ -116,7 +136,7 @@ class FixedSyntheticKundaliGenerator:
             (features['house_2_lord_strength'] / 100) * 25 + \
             (features['jupiter_strength'] / 100) * 20 + \
             (features['venus_strength'] / 100) * 10 + \
-            np.random.normal(0, 6, num_records)
+            rng.normal(0, 6, num_records)
         targets['wealth_potential'] = np.clip(wealth_potential, 0, 100)
 
         # 3. Marriage Happiness (depends on House 7, Venus, Mars, D9 compatibility)
@@ -125,7 +145,7 @@ class FixedSyntheticKundaliGenerator:
             (features['house_7_lord_strength'] / 100) * 30 + \
             (features['venus_strength'] / 100) * 15 - \
             (features['mars_strength'] / 100) * 5 + \
-            np.random.normal(0, 7, num_records)
+            rng.normal(0, 7, num_records)
         targets['marriage_happiness'] = np.clip(marriage_happiness, 0, 100)
 
         # 4. Children Prospects (depends on House 5, Jupiter, Moon strength)
@@ -133,7 +153,7 @@ class FixedSyntheticKundaliGenerator:
         children_prospects = base + \
             (features['house_5_lord_strength'] / 100) * 25 + \
             (features['jupiter_strength'] / 100) * 15 + \
-            np.random.normal(0, 5, num_records)
+            rng.normal(0, 5, num_records)
         targets['children_prospects'] = np.clip(children_prospects, 0, 100)
 
         # 5. Health Status (depends on House 6, Saturn, Mars, Moon strength)
@@ -142,7 +162,7 @@ class FixedSyntheticKundaliGenerator:
             (100 - features['mars_strength']) / 100 * 20 + \
             (100 - features['saturn_strength']) / 100 * 10 + \
             (features['moon_strength'] / 100) * 15 + \
-            np.random.normal(0, 6, num_records)
+            rng.normal(0, 6, num_records)
         targets['health_status'] = np.clip(health_status, 0, 100)
 
         # 6. Spiritual Inclination (depends on 12H, Saturn, Rahu, yoga count)
@@ -151,14 +171,14 @@ class FixedSyntheticKundaliGenerator:
             (features['house_12_lord_strength'] / 100) * 25 + \
             (features['saturn_strength'] / 100) * 10 + \
             (features['total_yoga_count'] / 8) * 20 + \
-            np.random.normal(0, 8, num_records)
+            rng.normal(0, 8, num_records)
         targets['spiritual_inclination'] = np.clip(spiritual_inclination, 0, 100)
 
         # 7. Chart Strength (overall average of all strengths + yoga boost)
         chart_strength = \
             (features['sun_strength'] + features['moon_strength'] + features['jupiter_strength']) / 3 * 0.6 + \
             (features['total_yoga_count'] / 8) * 30 + \
-            np.random.normal(0, 5, num_records)
+            rng.normal(0, 5, num_records)
         targets['chart_strength'] = np.clip(chart_strength, 0, 100)
 
         # 8. Life Ease Score (overall well-being, combines all factors)
@@ -167,10 +187,12 @@ class FixedSyntheticKundaliGenerator:
             (features['house_1_lord_strength'] / 100) * 15 + \
             (features['benefic_yoga_count'] / 6) * 30 - \
             (features['malefic_yoga_count'] / 4) * 10 + \
-            np.random.normal(0, 8, num_records)
+            rng.normal(0, 8, num_records)
         targets['life_ease_score'] = np.clip(life_ease_score, 0, 100)
 
         df = pd.DataFrame(targets)
+        if not report:
+            return df
         logger.info(f"  Generated targets shape: {df.shape}")
 
         # Validate variance
@@ -242,26 +264,95 @@ class FixedSyntheticKundaliGenerator:
 
         return dataset_df.to_dict()
 
+    def chunk_rng(self, index: int) -> np.random.RandomState:
+        """Random state of one chunk, seeded from (seed, chunk index)."""
+        return np.random.RandomState(np.random.MT19937(np.random.SeedSequence([self.seed, index])))
+
+    def generate_chunk(self, index: int, num_records: int):
+        """
+        Generate one chunk of a sharded dataset.
+
+        Returns:
+            Tuple of (features_df, targets_df)
+        """
+        rng = self.chunk_rng(index)
+        features = self.generate_features(num_records, rng=rng, report=False)
+        return features, self.generate_targets(features, rng=rng, report=False)
+
+    def generate_shards(self, output_dir: str, num_records: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        workers: int = None) -> Dict:
+        """
+        Generate a dataset chunk by chunk into sharded columnar files.
+
+        Memory holds a few chunks at a time, whatever num_records is.
+
+        Args:
+            output_dir: Dataset directory; an existing one is resumed
+            num_records: Total records
+            chunk_size: Records per chunk (and shard)
+            workers: Worker processes (default: all cores)
+
+        Returns:
+            Summary with rows, shards, elapsed seconds and rows/sec
+        """
+        from server.ml.shards import ShardWriter, write_shards
+
+        feature_names = list(self.generate_features(0, rng=self.chunk_rng(0), report=False).columns)
+        writer = ShardWriter(output_dir, feature_names, self.target_cols, metadata={
+            "generator": type(self).__name__,
+            "seed": self.seed,
+            "num_records": num_records,
+            "chunk_size": chunk_size,
+        })
+        chunks = (
+            (index, (self.seed, index, start, min(chunk_size, num_records - start)))
+            for index, start in enumerate(range(0, num_records, chunk_size))
+        )
+        summary = write_shards(writer, _generate_chunk, chunks, workers=workers or os.cpu_count() or 1)
+        logger.info(f"Synthetic dataset written to {output_dir}: {summary}")
+        return summary
+
+
+def _generate_chunk(seed: int, index: int, start: int, num_records: int):
+    """Worker task: one chunk's features, targets and record numbers."""
+    generator = FixedSyntheticKundaliGenerator(seed=seed)
+    features, targets = generator.generate_chunk(index, num_records)
+    return features.to_numpy(), targets.to_numpy(), np.arange(start, start + num_records), {}
+
 
 def main():
     """Main function to generate fixed synthetic dataset."""
+    parser = argparse.ArgumentParser(description="Generate synthetic Kundali training data")
+    parser.add_argument("--records", type=int, default=10000, help="Number of records")
+    parser.add_argument("--shards", default=None,
+                        help="Write sharded columnar files to this directory instead of one CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per shard")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
     logger.info("="*70)
     logger.info("FIXED SYNTHETIC DATA GENERATOR")
     logger.info("No dependency on broken backend API")
     logger.info("="*70 + "\n")
 
+    generator = FixedSyntheticKundaliGenerator(seed=42)
+    if args.shards:
+        generator.generate_shards(args.shards, args.records, chunk_size=args.chunk_size, workers=args.workers)
+        print(f"\n[SUCCESS] Sharded training data generated in {args.shards}")
+        print(f"  Train with: KundaliMLTrainer(csv_file='{args.shards}')")
+        return
+
     script_dir = Path(__file__).parent
     output_file = script_dir / 'training_data_fixed.csv'
 
-    generator = FixedSyntheticKundaliGenerator(seed=42)
     dataset = generator.generate_dataset(
-        num_records=10000,
+        num_records=args.records,
         output_file=str(output_file)
     )
 
     print(f"\n[SUCCESS] Fixed training data generated!")
     print(f"  File: {output_file}")
-    print(f"  Records: 10,000")
+    print(f"  Records: {args.records:,}")
     print(f"\nNext steps:")
     print(f"  1. Delete old broken data: rm training_data.csv")
     print(f"  2. Rename fixed file: mv training_data_fixed.csv training_data.csv")
@@ -6,14 +6,21 @@ Models:
 1. Neural Network (Keras) - Multi-task learning for 8 predictions
 2. XGBoost - Gradient boosting for ensemble predictions
 
+KundaliMLTrainer loads the data into memory; OutOfCoreTrainer trains the same
+models from a sharded dataset (server.ml.shards) with bounded memory.
+
 Author: ML Pipeline
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import logging
+import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
 # Optional TensorFlow imports
@@ -39,6 +46,9 @@ from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 
 import joblib
 
+from server.ml.preprocessing import PreprocessingPlan
+from server.ml.shards import iter_shards, read_frame, read_manifest
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +60,7 @@ class KundaliMLTrainer:
         Initialize the ML trainer.
 
         Args:
-            csv_file: Path to training data CSV
+            csv_file: Path to training data CSV or sharded dataset directory
             random_state: Random seed for reproducibility
         """
         self.csv_file = csv_file
@@ -88,10 +98,14 @@ class KundaliMLTrainer:
         ]
 
     def load_data(self) -> bool:
-        """Load training data from CSV."""
+        """Load training data from CSV, or from a sharded dataset directory."""
         try:
             logger.info(f"Loading data from {self.csv_file}...")
-            self.df = pd.read_csv(self.csv_file)
+            if Path(self.csv_file).is_dir():
+                # Shards are read one at a time, without CSV parsing
+                self.df = read_frame(self.csv_file).reset_index(drop=True)
+            else:
+                self.df = pd.read_csv(self.csv_file)
             logger.info(f"Loaded {len(self.df)} records with {len(self.df.columns)} columns")
             return True
         except Exception as e:
@@ -178,10 +192,13 @@ class KundaliMLTrainer:
             logger.error(f"Error splitting data: {str(e)}")
             return False
 
-    def build_neural_network(self):
+    def build_neural_network(self, input_dim: int = None):
         """
         Build neural network for multi-task learning.
 
+        Args:
+            input_dim: Number of input features (default: X_train's columns)
+
         Returns:
             Compiled Keras model, or None if TensorFlow is not available
         """
@@ -189,7 +206,7 @@ class KundaliMLTrainer:
             logger.warning("TensorFlow not available - skipping neural network")
             return None
 
-        input_dim = self.X_train.shape[1]
+        input_dim = input_dim or self.X_train.shape[1]
         output_dim = len(self.target_cols)
 
         logger.info(f"Building neural network: {input_dim} inputs -> {output_dim} outputs")
@@ -407,7 +424,7 @@ class KundaliMLTrainer:
 
             # Save feature names
             feature_names_path = output_path / 'feature_names.json'
-            feature_names = list(self.X_train.columns)
+            feature_names = self.get_feature_names()
             with open(feature_names_path, 'w') as f:
                 json.dump(feature_names, f, indent=2)
             logger.info(f"Saved feature names to {feature_names_path}")
@@ -424,6 +441,14 @@ class KundaliMLTrainer:
             logger.error(f"Error saving models: {str(e)}")
             return False
 
+    def get_feature_names(self) -> List[str]:
+        """Model input columns, in training order."""
+        return list(self.X_train.columns)
+
+    def split_sizes(self) -> Dict[str, int]:
+        """Number of train, validation and test samples."""
+        return {"train": len(self.X_train), "val": len(self.X_val), "test": len(self.X_test)}
+
     def print_summary(self):
         """Print training summary."""
         print("\n" + "="*70)
@@ -431,10 +456,11 @@ class KundaliMLTrainer:
         print("="*70)
 
         print("\nData:")
-        print(f"  Training samples: {len(self.X_train)}")
-        print(f"  Validation samples: {len(self.X_val)}")
-        print(f"  Test samples: {len(self.X_test)}")
-        print(f"  Features: {self.X_train.shape[1]}")
+        sizes = self.split_sizes()
+        print(f"  Training samples: {sizes['train']}")
+        print(f"  Validation samples: {sizes['val']}")
+        print(f"  Test samples: {sizes['test']}")
+        print(f"  Features: {len(self.get_feature_names())}")
         print(f"  Targets: {len(self.target_cols)}")
 
         print("\nNeural Network Metrics:")
@@ -510,6 +536,418 @@ class KundaliMLTrainer:
             return False
 
 
+# Fractions of the train/validation/test splits (as in split_data)
+SPLIT_FRACTIONS = (0.70, 0.15, 0.15)
+SPLITS = ("train", "val", "test")
+# splitmix64 constants
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+
+
+def assign_splits(rows: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Deterministic split (0 train, 1 validation, 2 test) of source rows.
+
+    Every row number is hashed with the seed (splitmix64), so a record
+    lands in the same split however the data is sharded or ordered.
+    """
+    z = np.uint64(seed * _GOLDEN_GAMMA % 2 ** 64) + (np.asarray(rows, dtype=np.uint64) + np.uint64(1)) * np.uint64(_GOLDEN_GAMMA)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX_2)
+    z = z ^ (z >> np.uint64(31))
+    uniform = (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+    return np.searchsorted(np.cumsum(SPLIT_FRACTIONS)[:-1], uniform, side='right')
+
+
+class _RegressionTotals:
+    """Running sums giving R², MSE and MAE of multi-target predictions."""
+
+    def __init__(self, n_targets: int):
+        self.count = 0
+        self.sum = np.zeros(n_targets)
+        self.sum_squares = np.zeros(n_targets)
+        self.squared_error = np.zeros(n_targets)
+        self.absolute_error = np.zeros(n_targets)
+
+    def update(self, y: np.ndarray, prediction: np.ndarray) -> None:
+        y = y.astype(np.float64)
+        error = prediction.reshape(y.shape) - y
+        self.count += len(y)
+        self.sum += y.sum(axis=0)
+        self.sum_squares += np.square(y).sum(axis=0)
+        self.squared_error += np.square(error).sum(axis=0)
+        self.absolute_error += np.abs(error).sum(axis=0)
+
+    def metrics(self) -> Dict[str, float]:
+        """R² averaged over targets (as r2_score), MSE and MAE over all outputs."""
+        if self.count == 0:
+            return {"r2": float("nan"), "mse": float("nan"), "mae": float("nan")}
+        total = self.sum_squares - np.square(self.sum) / self.count
+        r2 = 1.0 - self.squared_error / np.where(total > 0, total, np.nan)
+        return {
+            "r2": float(np.nanmean(r2)) if np.isfinite(r2).any() else float("nan"),
+            "mse": float(self.squared_error.sum() / (self.count * self.sum.size)),
+            "mae": float(self.absolute_error.sum() / (self.count * self.sum.size)),
+        }
+
+
+class _ShardBatches(xgb.DataIter):
+    """XGBoost data iterator over one split of a sharded dataset."""
+
+    def __init__(self, trainer: "OutOfCoreTrainer", split: str, cache_prefix: str):
+        self._trainer = trainer
+        self._split = split
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._batches is None:
+            self._batches = self._trainer.iter_split(self._split)
+        for X, y in self._batches:
+            if len(X):
+                input_data(data=X, label=y)
+                return True
+        return False
+
+    def reset(self) -> None:
+        self._batches = None
+
+
+class _RoundTimer(xgb.callback.TrainingCallback):
+    """Logs wall time and throughput of every boosting round."""
+
+    def __init__(self, rows: int, rounds: int):
+        super().__init__()
+        self.rows = rows
+        self.rounds = rounds
+        self.started = 0.0
+
+    def before_iteration(self, model, epoch: int, evals_log) -> bool:
+        self.started = time.perf_counter()
+        return False
+
+    def after_iteration(self, model, epoch: int, evals_log) -> bool:
+        elapsed = time.perf_counter() - self.started
+        scores = ", ".join(
+            f"{data} {metric} {values[-1]:.4f}" for data, log in evals_log.items() for metric, values in log.items()
+        )
+        logger.info(
+            f"Round {epoch + 1}/{self.rounds}: {elapsed:.3f}s "
+            f"({self.rows / max(elapsed, 1e-9):,.0f} rows/sec) {scores}"
+        )
+        return False
+
+
+class OutOfCoreTrainer(KundaliMLTrainer):
+    """
+    Trains the same models from a sharded dataset without loading it.
+
+    Shards (see server.ml.shards) are streamed one at a time, so peak memory
+    depends on the shard size, not the dataset size:
+
+    1. One pass fits the scaler (StandardScaler.partial_fit) and target means
+       on the training rows and counts every split. Rows are assigned to
+       train/validation/test by hashing their source row numbers.
+    2. XGBoost trains on external-memory quantile DMatrices built from a
+       data iterator; quantized pages are cached on disk, and every round
+       uses all cores.
+    3. The Keras network trains on batches generated from the shards.
+
+    Missing values are imputed with training means, like prepare_data does,
+    and metrics are accumulated shard by shard. Wall time and rows/sec are
+    logged for every boosting round and every epoch.
+    """
+
+    def __init__(self, data_dir: str, random_state: int = 42, n_estimators: int = 50,
+                 epochs: int = 100, batch_size: int = 32, cache_dir: Optional[str] = None,
+                 n_jobs: Optional[int] = None):
+        """
+        Initialize the trainer.
+
+        Args:
+            data_dir: Sharded dataset directory
+            random_state: Seed for the splits and models
+            n_estimators: Boosting rounds
+            epochs: Maximum neural network epochs
+            batch_size: Neural network batch size
+            cache_dir: Directory for XGBoost's external-memory pages
+                (default: a temporary directory)
+            n_jobs: Threads (default: all cores)
+        """
+        super().__init__(csv_file=data_dir, random_state=random_state)
+        self.data_dir = data_dir
+        self.n_estimators = n_estimators
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+        manifest = read_manifest(data_dir)
+        missing = [name for name in self.target_cols if name not in manifest["target_names"]]
+        if missing:
+            raise ValueError(f"Dataset {data_dir} has no target columns {missing}")
+        self.feature_names = [name for name in manifest["feature_names"] if name not in self.exclude_cols]
+        self.target_index = [manifest["target_names"].index(name) for name in self.target_cols]
+        self.counts = {split: 0 for split in SPLITS}
+        self.shard_rows: Dict[str, List[int]] = {split: [] for split in SPLITS}
+        self.plan: Optional[PreprocessingPlan] = None
+        self.target_mean: Optional[np.ndarray] = None
+
+    def get_feature_names(self) -> List[str]:
+        return list(self.feature_names)
+
+    def split_sizes(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    def _read(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(features, targets, split codes) of every shard."""
+        for features, targets, row in iter_shards(self.data_dir, self.feature_names):
+            yield features, targets[:, self.target_index], assign_splits(row, self.random_state)
+
+    def fit_scaler(self) -> None:
+        """Fit the scaler and target means on the training rows, counting every split."""
+        start = time.perf_counter()
+        self.shard_rows = {split: [] for split in SPLITS}
+        target_sum = np.zeros(len(self.target_cols))
+        target_count = np.zeros(len(self.target_cols))
+
+        for features, targets, split in self._read():
+            for code, name in enumerate(SPLITS):
+                self.shard_rows[name].append(int(np.count_nonzero(split == code)))
+            train = split == 0
+            if train.any():
+                self.scaler.partial_fit(features[train])
+                known = ~np.isnan(targets[train])
+                target_sum += np.where(known, targets[train], 0.0).sum(axis=0)
+                target_count += known.sum(axis=0)
+
+        self.counts = {name: sum(rows) for name, rows in self.shard_rows.items()}
+        if self.counts["train"] == 0:
+            raise ValueError(f"Dataset {self.data_dir} has no training rows")
+        self.target_mean = target_sum / np.maximum(target_count, 1)
+        self.plan = PreprocessingPlan(self.feature_names, self.target_cols, self.scaler)
+        logger.info(
+            f"Scaler fitted in {time.perf_counter() - start:.1f}s - "
+            f"Train: {self.counts['train']}, Val: {self.counts['val']}, Test: {self.counts['test']}"
+        )
+
+    def iter_split(self, split: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream the scaled features and targets of one split, shard by shard.
+
+        Missing features become 0 after scaling (the training mean) and
+        missing targets the training target mean.
+        """
+        code = SPLITS.index(split)
+        for features, targets, assigned in self._read():
+            rows = assigned == code
+            X = self.plan.transform(features[rows])
+            np.nan_to_num(X, copy=False, nan=0.0)
+            y = targets[rows]
+            y = np.where(np.isnan(y), self.target_mean.astype(y.dtype), y)
+            yield X, y
+
+    def iter_batches(self, split: str, batch_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Batches of at most batch_size rows of a split, one pass."""
+        for X, y in self.iter_split(split):
+            for start in range(0, len(X), batch_size):
+                yield X[start:start + batch_size], y[start:start + batch_size]
+
+    def _batch_count(self, split: str) -> int:
+        """Batches per pass over a split (batches restart at every shard)."""
+        return sum(-(-rows // self.batch_size) for rows in self.shard_rows[split])
+
+    def _evaluate(self, predict) -> Dict[str, Dict[str, float]]:
+        """Stream every split through predict(X) and accumulate metrics."""
+        totals = {split: _RegressionTotals(len(self.target_cols)) for split in SPLITS}
+        for split in SPLITS:
+            for X, y in self.iter_split(split):
+                if len(X):
+                    totals[split].update(y, predict(X))
+        return {split: totals[split].metrics() for split in SPLITS}
+
+    def train_xgboost(self) -> Dict:
+        """
+        Train XGBoost on external-memory quantile DMatrices.
+
+        Returns:
+            Training metrics dictionary
+        """
+        try:
+            logger.info("Starting out-of-core XGBoost training...")
+            params = {
+                'learning_rate': 0.05,
+                'max_depth': 3,
+                'subsample': 0.6,
+                'colsample_bytree': 0.6,
+                'reg_alpha': 1.0,
+                'reg_lambda': 1.0,
+                'min_child_weight': 5,
+                'seed': self.random_state,
+                'objective': 'reg:squarederror',
+                'tree_method': 'hist',
+                'nthread': self.n_jobs,
+            }
+
+            with tempfile.TemporaryDirectory(dir=self.cache_dir) as cache:
+                start = time.perf_counter()
+                dtrain = xgb.ExtMemQuantileDMatrix(
+                    _ShardBatches(self, "train", os.path.join(cache, "train")), nthread=self.n_jobs)
+                evals = []
+                if self.counts["val"]:
+                    dval = xgb.ExtMemQuantileDMatrix(
+                        _ShardBatches(self, "val", os.path.join(cache, "val")), ref=dtrain, nthread=self.n_jobs)
+                    evals.append((dval, "val"))
+                logger.info(f"Built external-memory DMatrices in {time.perf_counter() - start:.1f}s")
+
+                start = time.perf_counter()
+                booster = xgb.train(
+                    params, dtrain, num_boost_round=self.n_estimators, evals=evals, verbose_eval=False,
+                    callbacks=[_RoundTimer(self.counts["train"], self.n_estimators)],
+                )
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"XGBoost trained {self.n_estimators} rounds in {elapsed:.1f}s "
+                    f"({self.counts['train'] * self.n_estimators / elapsed:,.0f} row-rounds/sec)"
+                )
+
+            # Same artifact as the in-memory mode, so serving loads either
+            xgb_model = xgb.XGBRegressor(n_estimators=self.n_estimators, n_jobs=self.n_jobs)
+            xgb_model.load_model(bytearray(booster.save_raw("ubj")))
+
+            scores = self._evaluate(lambda X: booster.inplace_predict(X))
+            metrics = {
+                'model_type': 'xgboost',
+                'training_mode': 'out_of_core',
+                'test_r2': scores['test']['r2'],
+                'val_r2': scores['val']['r2'],
+                'train_r2': scores['train']['r2'],
+                'test_mse': scores['test']['mse'],
+                'test_mae': scores['test']['mae'],
+                'n_estimators': self.n_estimators,
+                'training_seconds': round(elapsed, 2),
+            }
+
+            logger.info(f"XGBoost - Test R²: {metrics['test_r2']:.4f}, Test MAE: {metrics['test_mae']:.4f}")
+
+            self.models['xgboost'] = xgb_model
+            self.metrics['xgboost'] = metrics
+
+            return metrics
+
+        except Exception as e:
+            logger.error(f"Error training XGBoost: {str(e)}")
+            return {}
+
+    def _repeat_batches(self, split: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Endless batches of a split, as Keras expects from a generator."""
+        while True:
+            yield from self.iter_batches(split, self.batch_size)
+
+    def train_neural_network(self, model) -> Dict:
+        """
+        Train the neural network on batches streamed from the shards.
+
+        Args:
+            model: Keras model to train
+
+        Returns:
+            Training metrics dictionary
+        """
+        if model is None:
+            logger.warning("No model provided - skipping neural network training")
+            return {}
+
+        try:
+            logger.info("Starting out-of-core neural network training...")
+            epoch_started = {}
+            rows = self.counts["train"]
+
+            def log_epoch(epoch, logs):
+                elapsed = time.perf_counter() - epoch_started["time"]
+                logger.info(
+                    f"Epoch {epoch + 1}: {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec) "
+                    f"loss {logs.get('loss', float('nan')):.4f} val_loss {logs.get('val_loss', float('nan')):.4f}"
+                )
+
+            callbacks = [
+                EarlyStopping(monitor='val_loss', patience=15, restore_best_weights=True, verbose=1),
+                ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=5, min_lr=1e-6, verbose=1),
+                keras.callbacks.LambdaCallback(
+                    on_epoch_begin=lambda epoch, logs: epoch_started.update(time=time.perf_counter()),
+                    on_epoch_end=log_epoch,
+                ),
+            ]
+
+            history = model.fit(
+                self._repeat_batches("train"),
+                steps_per_epoch=self._batch_count("train"),
+                validation_data=self._repeat_batches("val"),
+                validation_steps=self._batch_count("val"),
+                epochs=self.epochs,
+                callbacks=callbacks,
+                verbose=0
+            )
+
+            scores = self._evaluate(lambda X: model.predict_on_batch(X))
+            metrics = {
+                'model_type': 'neural_network',
+                'training_mode': 'out_of_core',
+                'test_loss': scores['test']['mse'],
+                'test_mae': scores['test']['mae'],
+                'train_r2': scores['train']['r2'],
+                'val_r2': scores['val']['r2'],
+                'test_r2': scores['test']['r2'],
+                'epochs_trained': len(history.history['loss'])
+            }
+
+            logger.info(f"Neural Network - Test R²: {metrics['test_r2']:.4f}, Test Loss: {metrics['test_loss']:.4f}")
+
+            self.models['neural_network'] = model
+            self.metrics['neural_network'] = metrics
+
+            return metrics
+
+        except Exception as e:
+            logger.error(f"Error training neural network: {str(e)}")
+            return {}
+
+    def train_all(self, output_dir: str = 'trained_models') -> bool:
+        """
+        Complete out-of-core training pipeline.
+
+        Returns:
+            True if all models trained successfully
+        """
+        try:
+            self.fit_scaler()
+
+            if TF_AVAILABLE:
+                logger.info("\n" + "="*70)
+                logger.info("TRAINING NEURAL NETWORK (out-of-core)")
+                logger.info("="*70)
+                self.train_neural_network(self.build_neural_network(len(self.feature_names)))
+            else:
+                logger.warning("SKIPPING NEURAL NETWORK (TensorFlow not available)")
+
+            logger.info("\n" + "="*70)
+            logger.info("TRAINING XGBOOST (out-of-core)")
+            logger.info("="*70)
+            if not self.train_xgboost():
+                return False
+
+            self.save_models(output_dir)
+            self.print_summary()
+
+            logger.info("[OK] All available models trained successfully!")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error in out-of-core training pipeline: {str(e)}")
+            return False
+
+
 def main():
     """Main training function."""
     logging.basicConfig(
@@ -517,15 +955,25 @@ def main():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    # Use absolute path
-    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Train the Kundali ML models")
+    parser.add_argument("--shards", default=None,
+                        help="Train out-of-core from this sharded dataset directory")
+    args = parser.parse_args()
+
+    if args.shards:
+        print(f"[INFO] Training out-of-core from shards: {args.shards}")
+        trainer = OutOfCoreTrainer(args.shards)
+        success = trainer.train_all()
+    else:
+        # Use absolute path
+        script_dir = Path(__file__).parent
 
-    # Use celebrity data
-    csv_file = script_dir / 'labeled_celebrity_data.csv'
-    print(f"[INFO] Using CELEBRITY DATA: {csv_file}")
+        # Use celebrity data
+        csv_file = script_dir / 'labeled_celebrity_data.csv'
+        print(f"[INFO] Using CELEBRITY DATA: {csv_file}")
 
-    trainer = KundaliMLTrainer(csv_file=str(csv_file))
-    success = trainer.train_all()
+        trainer = KundaliMLTrainer(csv_file=str(csv_file))
+        success = trainer.train_all()
 
     if success:
         print("\n[OK] Training complete! Models saved to 'trained_models/' directory")
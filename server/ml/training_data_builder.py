@@ -0,0 +1,227 @@
+"""
+Training Data Builder
+Computes the 53 model features from real charts for a whole birth-data CSV.
+
+BatchFeatureExtractor fakes planetary degrees from day-of-year arithmetic and
+integrated_pipeline calls the HTTP API once per row; neither scales to real
+features for 100k+ people. This builder reads the CSV (cleaned_real_data.csv
+layout: birth_date, birth_time, latitude, longitude, timezone, plus the
+target columns) in fixed-size chunks and hands each chunk to a process pool.
+A worker converts the chunk's birth times to Julian Days in one pass,
+computes exact ascendants and planet longitudes with the batched ephemeris
+helpers, runs the Shad Bala calculations that Kundali generation uses and
+extracts the feature matrix of the whole chunk at once, so every row gets the
+same features /api/ml/predict-from-kundali would compute for that person.
+
+Chunks are written as shards of a columnar dataset (see server.ml.shards)
+whose manifest is the checkpoint: an interrupted run started again with the
+same arguments skips the finished chunks. Throughput is logged in rows/sec
+after every chunk.
+
+Usage:
+    python -m server.ml.training_data_builder processed_data/cleaned_real_data.csv \\
+        processed_data/real_features --workers 8
+
+Author: ML Pipeline
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from server.ml.feature_extractor import KundaliFeatureExtractor
+from server.ml.shards import ShardResult, ShardWriter, write_shards
+from server.services.logic import build_planet_details, calculate_shad_bala
+from server.utils.astro_utils import (
+    assign_planets_to_houses,
+    calculate_houses_batch,
+    calculate_planet_positions_batch,
+)
+from server.utils.ayanamsa import DEFAULT_AYANAMSA, resolve_ayanamsa
+from server.utils.time_utils import local_to_julian_day, local_to_julian_days
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+TARGET_COLUMNS = [
+    'career_potential',
+    'wealth_potential',
+    'marriage_happiness',
+    'children_prospects',
+    'health_status',
+    'spiritual_inclination',
+    'chart_strength',
+    'life_ease_score',
+]
+# Modules logging once per chart; kept at WARNING so a run logs per chunk
+CHART_LOGGERS = ("server.services.logic",)
+
+
+def build_chunk_features(chunk: pd.DataFrame, ayanamsa: str = DEFAULT_AYANAMSA
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the features of every birth record in a chunk.
+
+    Args:
+        chunk: Rows with birth_date, birth_time, latitude, longitude and
+            timezone (UTC offset in hours or IANA name; UTC if empty)
+        ayanamsa: Sidereal ayanamsa
+
+    Returns:
+        Tuple of ((valid rows, 53) float64 features in required_features
+        order, boolean mask of the rows that were valid)
+    """
+    dates = chunk['birth_date'].astype(str).str.strip().to_numpy()
+    times = chunk['birth_time'].astype(str).str.strip().to_numpy()
+    zones = chunk['timezone'].where(chunk['timezone'].notna(), 'UTC').astype(str).to_numpy()
+    lats = pd.to_numeric(chunk['latitude'], errors='coerce').to_numpy(dtype=np.float64)
+    lons = pd.to_numeric(chunk['longitude'], errors='coerce').to_numpy(dtype=np.float64)
+
+    valid = (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+    jds = np.full(len(chunk), np.nan)
+    try:
+        jds[valid] = local_to_julian_days(dates[valid], times[valid], zones[valid])
+    except ValueError:
+        # A malformed date, time or zone fails the whole array; retry per row
+        for i in np.flatnonzero(valid):
+            try:
+                jds[i] = local_to_julian_day(dates[i], times[i], zones[i])
+            except ValueError:
+                valid[i] = False
+
+    charts: List[Dict] = []
+    if valid.any():
+        ascendants = calculate_houses_batch(jds[valid], lats[valid], lons[valid], ayanamsa=ayanamsa)["ascendant"]
+        positions = calculate_planet_positions_batch(jds[valid], node_step=None, ayanamsa=ayanamsa)
+        for k, i in enumerate(np.flatnonzero(valid)):
+            chart = _feature_chart(
+                float(ascendants[k]),
+                {planet: float(longitudes[k]) for planet, longitudes in positions.items()},
+                datetime.strptime(dates[i], "%Y-%m-%d"),
+            )
+            if chart is None:
+                valid[i] = False
+            else:
+                charts.append(chart)
+
+    features = KundaliFeatureExtractor().extract_matrix(charts, dtype=np.float64)
+    return features.reshape(len(charts), -1), valid
+
+
+def _feature_chart(asc_deg: float, planet_positions: Dict[str, float], birth_date: datetime) -> Optional[Dict]:
+    """
+    The parts of a Kundali response the feature extractor reads, shaped
+    as generate_kundali_logic(...).model_dump(exclude_none=True).
+    """
+    asc_deg_normalized = asc_deg % 360
+    try:
+        house_assignments = assign_planets_to_houses(planet_positions, asc_deg)
+        planets = build_planet_details(planet_positions, house_assignments)
+    except Exception as e:
+        logger.warning(f"Could not place planets: {str(e)}")
+        return None
+
+    shad_bala = calculate_shad_bala(
+        planets, int(asc_deg_normalized / 30) + 1, asc_deg_normalized, planet_positions, house_assignments,
+        birth_date=birth_date,
+    )
+    chart = {
+        'ascendant': {'longitude': asc_deg_normalized},
+        'planets': {name: {'longitude': pos} for name, pos in planet_positions.items()},
+        'houses': {house: {'planets': plist} for house, plist in house_assignments.items()},
+    }
+    if shad_bala is not None:
+        chart['shad_bala'] = shad_bala.model_dump(exclude_none=True)
+    return chart
+
+
+def _process_chunk(chunk: pd.DataFrame, target_names: List[str], ayanamsa: str) -> ShardResult:
+    """Worker task: features, targets and source rows of a chunk's valid records."""
+    features, valid = build_chunk_features(chunk, ayanamsa)
+    targets = chunk.reindex(columns=target_names).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return features, targets[valid], chunk.index.to_numpy()[valid], {"failed": int((~valid).sum())}
+
+
+def _quiet_chart_logging() -> None:
+    for name in CHART_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+class TrainingDataBuilder:
+    """
+    Builds a sharded feature dataset from a birth-data CSV with a process pool.
+    """
+
+    def __init__(self, input_file: str, output_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None, ayanamsa: str = DEFAULT_AYANAMSA):
+        """
+        Initialize the builder.
+
+        Args:
+            input_file: Birth-data CSV
+            output_dir: Dataset directory; an existing one is resumed
+            chunk_size: Rows per chunk (and shard)
+            workers: Worker processes (default: all cores; 1 runs in-process)
+            ayanamsa: Sidereal ayanamsa
+        """
+        self.input_file = str(input_file)
+        self.output_dir = str(output_dir)
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.ayanamsa = resolve_ayanamsa(ayanamsa)
+        self.feature_names = KundaliFeatureExtractor().required_features
+
+    def build(self) -> Dict:
+        """
+        Process every chunk not yet in the dataset.
+
+        Returns:
+            Summary with rows written and failed, elapsed seconds and rows/sec
+            (see write_shards)
+        """
+        header = pd.read_csv(self.input_file, nrows=0).columns
+        target_names = [name for name in TARGET_COLUMNS if name in header]
+        writer = ShardWriter(self.output_dir, self.feature_names, target_names, metadata={
+            "source": os.path.abspath(self.input_file),
+            "chunk_size": self.chunk_size,
+            "ayanamsa": self.ayanamsa,
+        })
+        chunks = (
+            (index, (chunk, target_names, self.ayanamsa))
+            for index, chunk in enumerate(pd.read_csv(
+                self.input_file, chunksize=self.chunk_size,
+                dtype={'birth_date': str, 'birth_time': str, 'timezone': str},
+            ))
+        )
+        summary = write_shards(writer, _process_chunk, chunks, workers=self.workers,
+                               initializer=_quiet_chart_logging)
+        logger.info(f"Training data build complete: {summary}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build real-chart ML features for a birth-data CSV")
+    parser.add_argument("input_file", help="Birth-data CSV (cleaned_real_data.csv layout)")
+    parser.add_argument("output_dir", help="Sharded dataset directory (resumed if it exists)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--ayanamsa", default=DEFAULT_AYANAMSA, help="Sidereal ayanamsa")
+    args = parser.parse_args()
+
+    # force: astro_utils sets up DEBUG logging when imported
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        force=True)
+    _quiet_chart_logging()
+
+    builder = TrainingDataBuilder(args.input_file, args.output_dir, chunk_size=args.chunk_size,
+                                  workers=args.workers, ayanamsa=args.ayanamsa)
+    builder.build()
+
+
+if __name__ == "__main__":
+    main()
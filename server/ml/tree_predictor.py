@@ -0,0 +1,226 @@
+"""
+Native Tree Ensemble Predictor
+Evaluates an XGBoost tree ensemble with NumPy, without the booster.
+
+Each booster call pays for input validation, DMatrix construction and thread
+dispatch, which for this model (400 shallow trees, 53 features, 8 targets)
+costs far more than walking the trees. The booster is exported to its native
+JSON format once and flattened into arrays covering every tree; a prediction
+then evaluates every split of every tree at once:
+
+    go_right = x[feature] >= threshold
+
+and maps each tree's decisions to its leaf, either through a lookup table
+indexed by the packed decision bits (shallow trees) or by walking the
+decisions level by level. Leaf values are summed per target with one matrix
+product.
+
+Comparisons are done in float32 with missing values following each split's
+default direction, exactly as XGBoost does, so results match the booster to
+float32 rounding.
+
+Author: ML Pipeline
+"""
+
+import json
+import logging
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Objectives whose prediction is the raw margin (no link function)
+IDENTITY_OBJECTIVES = {"reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror", "reg:squaredlogerror"}
+# Rows evaluated per step; bounds the (rows, splits) decision matrix
+CHUNK_ROWS = 1024
+# Padding to complete trees doubles the splits per level
+MAX_DEPTH = 10
+# Trees up to this depth (15 splits) find leaves through a lookup table
+LOOKUP_MAX_DEPTH = 4
+
+
+class TreeEnsemblePredictor:
+    """
+    Flattened NumPy evaluator of a regression tree ensemble.
+
+    Every tree is padded to a complete binary tree of depth max_depth in heap
+    order (children of node i are 2i+1 and 2i+2), so walking a level is pure
+    index arithmetic. Leaves above max_depth become always-left splits whose
+    whole subtree carries the leaf value.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, default_left: np.ndarray,
+                 leaf_value: np.ndarray, tree_targets: np.ndarray, base_score: np.ndarray, n_features: int):
+        """
+        Initialize from padded heap-order arrays (see from_booster).
+
+        Args:
+            feature, threshold, default_left: (trees, 2**depth - 1) split arrays
+            leaf_value: (trees, 2**depth) leaf values
+            tree_targets: Output target of each tree
+            base_score: Per-target base score
+            n_features: Input feature count
+        """
+        self.n_trees, self.n_splits = feature.shape
+        self.max_depth = int(np.log2(self.n_splits + 1))
+        self.n_features = n_features
+        self.n_targets = base_score.size
+        self.base_score = base_score
+
+        self.feature = feature.ravel().astype(np.intp)
+        self.threshold = threshold.ravel()
+        self.default_right = ~default_left.ravel()
+        self.leaf_value = leaf_value.ravel()
+        self.split_base = np.arange(self.n_trees, dtype=np.intp) * self.n_splits
+        self.leaf_base = np.arange(self.n_trees, dtype=np.intp) * (self.n_splits + 1)
+        self.leaf_lookup = _leaf_lookup(self.max_depth) if self.max_depth <= LOOKUP_MAX_DEPTH else None
+        self.split_bits = (1 << np.arange(self.n_splits)).astype(np.uint8 if self.n_splits <= 8 else np.uint16)
+        # Sums leaf values into their targets with one matrix product
+        self.target_matrix = np.zeros((self.n_trees, self.n_targets), dtype=np.float32)
+        self.target_matrix[np.arange(self.n_trees), tree_targets] = 1.0
+
+    @classmethod
+    def from_booster(cls, booster: Any, iteration_range: Optional[Tuple[int, int]] = None) -> "TreeEnsemblePredictor":
+        """
+        Flatten an xgboost Booster (or sklearn wrapper).
+
+        Args:
+            booster: xgboost.Booster or XGBModel
+            iteration_range: Boosting rounds to use, as in booster.predict
+
+        Raises:
+            ValueError: On ensembles this evaluator does not support
+                (categorical splits, non-tree boosters, link functions,
+                trees deeper than MAX_DEPTH)
+        """
+        if hasattr(booster, "get_booster"):
+            if iteration_range is None and getattr(booster, "best_iteration", None) is not None:
+                iteration_range = (0, booster.best_iteration + 1)
+            booster = booster.get_booster()
+
+        model = json.loads(bytes(booster.save_raw("json")))
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for native prediction: {objective}")
+        if learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster: {learner['gradient_booster']['name']}")
+
+        params = learner["learner_model_param"]
+        n_targets = max(1, int(params.get("num_target", 1)))
+        base_score = np.array(json.loads(params["base_score"].replace("E", "e")), dtype=np.float32).reshape(-1)
+        base_score = np.broadcast_to(base_score, (n_targets,)).copy()
+
+        gbtree = learner["gradient_booster"]["model"]
+        trees = gbtree["trees"]
+        tree_info = gbtree["tree_info"]
+        if iteration_range is not None:
+            per_round = n_targets * int(gbtree["gbtree_model_param"].get("num_parallel_tree", 1))
+            start, end = iteration_range
+            trees = trees[start * per_round:end * per_round]
+            tree_info = tree_info[start * per_round:end * per_round]
+
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported for native prediction")
+        depth = max(
+            _tree_depth(np.asarray(tree["left_children"]), np.asarray(tree["right_children"])) for tree in trees
+        )
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Trees of depth {depth} exceed the native predictor limit of {MAX_DEPTH}")
+
+        n_splits = 2 ** depth - 1
+        feature = np.zeros((len(trees), n_splits), dtype=np.int32)
+        threshold = np.full((len(trees), n_splits), np.inf, dtype=np.float32)
+        default_left = np.ones((len(trees), n_splits), dtype=bool)
+        leaf_value = np.zeros((len(trees), n_splits + 1), dtype=np.float32)
+
+        for t, tree in enumerate(trees):
+            left, right = tree["left_children"], tree["right_children"]
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            stack = [(0, 0, 0)]  # (source node, heap position, level)
+            while stack:
+                node, position, level = stack.pop()
+                if left[node] == -1:
+                    # Every leaf below this position carries the leaf value
+                    span = 2 ** (depth - level)
+                    first = (position + 1) * span - 1 - n_splits
+                    leaf_value[t, first:first + span] = conditions[node]
+                    continue
+                feature[t, position] = tree["split_indices"][node]
+                threshold[t, position] = conditions[node]
+                default_left[t, position] = tree["default_left"][node]
+                stack.append((left[node], 2 * position + 1, level + 1))
+                stack.append((right[node], 2 * position + 2, level + 1))
+
+        return cls(feature, threshold, default_left, leaf_value,
+                   np.asarray(tree_info, dtype=np.int64), base_score, int(params["num_feature"]))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict a (rows, features) matrix (or one 1-D row).
+
+        Returns:
+            float32 array of shape (rows, targets), or (targets,) for one row
+        """
+        features = np.asarray(features, dtype=np.float32)
+        if features.shape[-1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {features.shape[-1]}")
+        if features.ndim == 1:
+            return self._predict_block(features[:, None])[:, 0]
+
+        output = np.empty((features.shape[0], self.n_targets), dtype=np.float32)
+        for start in range(0, features.shape[0], CHUNK_ROWS):
+            output[start:start + CHUNK_ROWS] = self._predict_block(features[start:start + CHUNK_ROWS].T).T
+        return output
+
+    def _predict_block(self, columns: np.ndarray) -> np.ndarray:
+        """
+        Predict a (features, rows) block, returning (targets, rows).
+
+        Rows run along the last axis so gathering a split's feature copies a
+        contiguous row of the block.
+        """
+        columns = np.ascontiguousarray(columns)
+        x = columns.take(self.feature, axis=0)
+        go_right = x >= self.threshold[:, None]
+        if np.isnan(columns).any():
+            go_right = np.where(np.isnan(x), self.default_right[:, None], go_right)
+
+        leaf = self._leaves(go_right.reshape(self.n_trees, self.n_splits, -1))
+        values = self.leaf_value[self.leaf_base[:, None] + leaf]
+        return self.target_matrix.T @ values + self.base_score[:, None]
+
+    def _leaves(self, go_right: np.ndarray) -> np.ndarray:
+        """(trees, rows) leaf indices from (trees, splits, rows) decisions."""
+        if self.leaf_lookup is not None:
+            # Shallow trees: a tree's decision bits index a table of leaves
+            code = np.einsum("tsn,s->tn", go_right.view(np.uint8), self.split_bits)
+            return self.leaf_lookup[code]
+
+        node = np.zeros(go_right.shape[::2], dtype=np.intp)
+        for _ in range(self.max_depth):
+            node = 2 * node + 1 + np.take_along_axis(go_right, node[:, None, :], axis=1)[:, 0, :]
+        return node - self.n_splits
+
+
+def _leaf_lookup(depth: int) -> np.ndarray:
+    """Leaf reached for every pattern of a complete tree's split decisions."""
+    n_splits = 2 ** depth - 1
+    codes = np.arange(2 ** n_splits, dtype=np.intp)
+    node = np.zeros_like(codes)
+    for _ in range(depth):
+        node = 2 * node + 1 + ((codes >> node) & 1)
+    return node - n_splits
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Number of splits on the longest root-to-leaf path."""
+    depth, level = 0, np.array([0])
+    while True:
+        level = level[left[level] != -1]
+        if level.size == 0:
+            return depth
+        level = np.concatenate([left[level], right[level]])
+        depth += 1
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
+from server.utils.ayanamsa import AYANAMSAS, DEFAULT_AYANAMSA, resolve_ayanamsa
+
 # Request Schemas
 class KundaliRequest(BaseModel):
     """Birth chart request - accepts both camelCase and snake_case fields."""
@@ -14,6 +16,13 @@ class KundaliRequest(BaseModel):
     timezone: Optional[str] = Field(default="UTC", description="e.g., UTC, America/New_York")
     name: Optional[str] = Field(None, description="Person's name (optional)")
     timezone_offset: Optional[float] = Field(None, description="Timezone offset in hours (optional, can be decimal like 5.5 or 5.75, overrides timezone)")
+    ayanamsa: Optional[str] = Field(default=DEFAULT_AYANAMSA, description=f"Sidereal ayanamsa: {', '.join(AYANAMSAS)}")
+
+    @field_validator('ayanamsa')
+    @classmethod
+    def validate_ayanamsa(cls, v: Optional[str]) -> str:
+        """Normalize the ayanamsa name and reject unsupported ones."""
+        return resolve_ayanamsa(v)
 
 
 # Response Schemas
@@ -115,6 +124,16 @@ class ShaBalaInfo(BaseModel):
     yogas: Optional[YogaInfo] = None
     aspect_strengths: Optional[Dict[int, float]] = None
 
+class HouseCusps(BaseModel):
+    house_system: str = Field(..., description="House system used for the cusps")
+    ayanamsa: str = Field(DEFAULT_AYANAMSA, description="Ayanamsa used for sidereal longitudes")
+    ayanamsa_degrees: Optional[float] = Field(None, description="Ayanamsa value at the birth instant")
+    cusps: List[float] = Field(..., description="Sidereal cusp longitudes, 1st house first")
+    ascendant: float
+    mc: float = Field(..., description="Sidereal midheaven longitude")
+    armc: float = Field(..., description="Right ascension of the MC")
+    vertex: float
+
 # Divisional Charts Schemas
 class VargaChart(BaseModel):
     name: str = Field(..., description="Chart name (D1, D2, D7, D9)")
@@ -122,6 +141,7 @@ class VargaChart(BaseModel):
     significance: str = Field(..., description="What this chart shows")
     planets: Dict[str, Any] = Field(..., description="Planet positions in this varga")
     ascendant: Optional[str] = Field(None, description="Ascendant in varga")
+    midheaven: Optional[str] = Field(None, description="Midheaven (MC) in varga")
 
 class DivisionalChartsInfo(BaseModel):
     D1_Rasi: Optional[VargaChart] = None
@@ -140,6 +160,7 @@ class KundaliResponse(BaseModel):
     dasha: Optional[DashaInfo] = None  # Dasha System
     shad_bala: Optional[ShaBalaInfo] = None  # NEW: Planetary Strengths
     divisional_charts: Optional[DivisionalChartsInfo] = None  # NEW: Vargas
+    house_cusps: Optional[HouseCusps] = None
     training_data: Optional[Dict[str, float]] = None
     ml_features: Optional[Dict[str, float]] = None
     generated_at: Optional[datetime] = None
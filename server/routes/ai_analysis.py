@@ -8,6 +8,7 @@ Endpoint:
 Author: Backend AI Systems Team
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
@@ -75,12 +76,13 @@ class CompatibilityAnalysisRequest(BaseModel):
 
 # ========== HELPER FUNCTIONS ==========
 
-def extract_ml_predictions(kundali_response) -> Dict[str, MLScoreBox]:
+async def extract_ml_predictions(kundali_response, endpoint: str = "ai_analysis") -> Dict[str, MLScoreBox]:
     """
     Extract ML predictions from Kundali data.
 
     Args:
         kundali_data: Complete kundali calculation result
+        endpoint: Caller name for the prediction cache metrics
 
     Returns:
         Dict[str, MLScoreBox]: ML predictions wrapped in MLScoreBox
@@ -108,9 +110,11 @@ def extract_ml_predictions(kundali_response) -> Dict[str, MLScoreBox]:
         if missing_features:
             logger.warning(f"Missing {len(missing_features)} features during extraction")
 
-        # Use new predictor that returns Dict[str, MLScoreBox]
+        # Use new predictor that returns Dict[str, MLScoreBox]; repeated charts
+        # come from the prediction cache, concurrent new ones are scored
+        # together by its micro-batching queue
         predictor = get_predictor()
-        ml_scores = predictor.predict(features_dict)
+        ml_scores = await predictor.predict_async(features_dict, endpoint)
 
         # Remove metadata keys (keep only target predictions)
         ml_scores_clean = {k: v for k, v in ml_scores.items() if not k.startswith("_")}
@@ -513,7 +517,7 @@ async def ai_analysis_endpoint(
         
         # 4. Extract ML predictions
         ml_start = time.time()
-        ml_scores = extract_ml_predictions(user_kundali)
+        ml_scores = await extract_ml_predictions(user_kundali)
         ml_inference_time_ms = (time.time() - ml_start) * 1000
         
         logger.debug(f"ML predictions extracted in {ml_inference_time_ms:.2f}ms: {list(ml_scores.keys())}")
@@ -631,7 +635,7 @@ async def ai_analysis_full_endpoint(request: AIAnalysisRequest):
 
         # 2. Extract ML predictions (measure actual execution)
         ml_start = time.time()
-        ml_scores = extract_ml_predictions(user_kundali)
+        ml_scores = await extract_ml_predictions(user_kundali, "ai_analysis_full")
         ml_inference_time_ms = (time.time() - ml_start) * 1000
 
         # 3. Extract astrology scores
@@ -859,8 +863,10 @@ async def compatibility_ai_analysis_simplified(
         
         # 4. Extract scores with ML timing
         ml_start = time.time()
-        ml_scores = extract_ml_predictions(user_kundali)
-        partner_ml_scores = extract_ml_predictions(partner_kundali)
+        ml_scores, partner_ml_scores = await asyncio.gather(
+            extract_ml_predictions(user_kundali, "compatibility"),
+            extract_ml_predictions(partner_kundali, "compatibility")
+        )
         ml_inference_time_ms = (time.time() - ml_start) * 1000
         
         # 5. Extract compatibility astrology scores
@@ -950,8 +956,10 @@ async def compatibility_ai_analysis(request: CompatibilityAnalysisRequest):
 
         # Extract scores with ML timing
         ml_start = time.time()
-        ml_scores = extract_ml_predictions(user_kundali)
-        partner_ml_scores = extract_ml_predictions(partner_kundali)
+        ml_scores, partner_ml_scores = await asyncio.gather(
+            extract_ml_predictions(user_kundali, "compatibility_full"),
+            extract_ml_predictions(partner_kundali, "compatibility_full")
+        )
         ml_inference_time_ms = (time.time() - ml_start) * 1000
 
         astro_start = time.time()
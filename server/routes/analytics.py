@@ -0,0 +1,95 @@
+"""
+Analytics Routes
+Aggregate statistics over all saved charts.
+
+Endpoints:
+1. POST /api/analytics/cohort - Score, strength and dasha distributions of a placement cohort
+
+Cohorts are computed from the placement index snapshot, which is refreshed in
+the background, so the newest charts and predictions may not be counted yet.
+
+Author: Backend API Team
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Union
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from server.pydantic_schemas.api_response import APIResponse, success_response, error_response
+from server.services.cohort_analytics import MAX_BINS, cohort_statistics
+from server.services.placement_index import get_placement_index
+from server.routes.auth import get_current_user
+from server.models.user import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["Analytics"]
+)
+
+
+class CohortRequest(BaseModel):
+    """Cohort statistics request."""
+    query: Optional[Union[str, Dict[str, Any]]] = Field(
+        None,
+        description="Placement query selecting the cohort (same format as /api/research/placements/query); "
+                    "omit for all charts"
+    )
+    group_by: Optional[str] = Field(
+        None,
+        description='"maha_dasha_lord", "antar_dasha_lord" or a placement dimension such as "moon:sign"'
+    )
+    bins: int = Field(10, ge=1, le=MAX_BINS, description="Histogram bins over 0-100")
+
+
+@router.post('/cohort', response_model=APIResponse)
+async def get_cohort_statistics(
+    request: CohortRequest,
+    user: User = Depends(get_current_user)
+) -> APIResponse:
+    """
+    Distributions of ML scores, strength percentages and dasha lords for a cohort.
+
+    Requires authentication token in Authorization header.
+
+    Returns:
+        APIResponse with cohort_size, scores, strengths, dasha_lords and,
+        when group_by is set, per-group means
+    """
+    try:
+        if isinstance(user, APIResponse):
+            return user
+
+        index = get_placement_index()
+        if index is None:
+            return error_response(
+                code="INDEX_NOT_READY",
+                message="Placement index has not been built yet",
+                http_status=503
+            )
+
+        started = time.perf_counter()
+        statistics = cohort_statistics(index, request.query, group_by=request.group_by, bins=request.bins)
+        statistics["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+        return success_response(
+            data=statistics,
+            message=f"Cohort of {statistics['cohort_size']} charts"
+        )
+
+    except ValueError as e:
+        return error_response(
+            code="INVALID_QUERY",
+            message=str(e),
+            http_status=400
+        )
+    except Exception as e:
+        logger.error(f"Error computing cohort statistics: {str(e)}", exc_info=True)
+        return error_response(
+            code="COHORT_ERROR",
+            message=f"Failed to compute cohort statistics: {str(e)}",
+            http_status=500
+        )
@@ -7,9 +7,9 @@ All responses follow standardized APIResponse format.
 Author: Backend API Team
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from bson import ObjectId
 from datetime import datetime
 import logging
@@ -25,6 +25,7 @@ from server.pydantic_schemas.kundali_db_schema import (
 )
 from server.pydantic_schemas.api_response import APIResponse, success_response, error_response
 from server.services.logic import generate_kundali_logic
+from server.utils.astro_utils import HOUSE_SYSTEMS, calculate_houses, get_julian_day_from_birth_details
 from server.services.kundali_service import (
     save_kundali,
     get_kundali,
@@ -34,6 +35,24 @@ from server.services.kundali_service import (
     get_kundali_count,
     get_primary_kundali,
 )
+from server.services.rectification_calculator import (
+    BirthTimeRectifier,
+    DEFAULT_WINDOW_MINUTES,
+    EVENT_SIGNIFICATIONS,
+    MAX_EVENTS,
+    MAX_WINDOW_MINUTES,
+)
+from server.services.varshaphala_calculator import VarshaphalaCalculator, parse_years
+from server.utils.ayanamsa import DEFAULT_AYANAMSA
+from server.utils.time_utils import local_to_julian_day
+from server.ml.similarity_index import (
+    KIND_CELEBRITY,
+    KIND_USER,
+    chart_features,
+    get_similarity_index,
+    index_saved_kundali,
+    unindex_kundali,
+)
 from server.routes.auth import get_current_user
 from server.models.user import User
 from server.database import get_db
@@ -43,6 +62,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _refresh_similarity_index(kundali: dict) -> None:
+    """Index a saved or updated Kundali; failures never block the save."""
+    try:
+        index_saved_kundali(kundali)
+    except Exception as e:
+        logger.warning(f"Could not index Kundali {kundali.get('_id')} for similarity search: {str(e)}")
+
+
 class TransitRequest(BaseModel):
     """Transit calculation request."""
     birthDate: str = Field(..., description="Birth date (YYYY-MM-DD)")
@@ -59,6 +86,26 @@ class SynastryRequest(BaseModel):
     kundali2: KundaliRequest = Field(..., description="Second person birth details")
 
 
+class LifeEvent(BaseModel):
+    """Known life event used for rectification."""
+    event_type: str = Field(..., description=f"One of: {', '.join(EVENT_SIGNIFICATIONS)}")
+    date: str = Field(..., description="Event date (YYYY-MM-DD)")
+
+
+class RectificationRequest(BaseModel):
+    """Birth time rectification request."""
+    birthDate: str = Field(..., description="Birth date (YYYY-MM-DD)")
+    birthTime: str = Field(..., description="Approximate birth time (HH:MM)")
+    latitude: float = Field(..., ge=-90, le=90, description="Birth latitude")
+    longitude: float = Field(..., ge=-180, le=180, description="Birth longitude")
+    timezone: str = Field("UTC", description="Birth timezone")
+    window_minutes: int = Field(DEFAULT_WINDOW_MINUTES, ge=1, le=MAX_WINDOW_MINUTES,
+                                description="Minutes either side of birthTime to search")
+    step_minutes: int = Field(1, ge=1, le=30, description="Candidate resolution in minutes")
+    events: List[LifeEvent] = Field(..., min_length=1, max_length=MAX_EVENTS, description="Known life events")
+    max_results: int = Field(10, ge=1, le=100)
+
+
 @router.post('/generate_kundali', response_model=APIResponse, tags=["Kundali"])
 async def generate_kundali(request: KundaliRequest) -> APIResponse:
     """
@@ -181,6 +228,106 @@ async def calculate_synastry(request: SynastryRequest) -> APIResponse:
         )
 
 
+@router.post('/houses', response_model=APIResponse, tags=["Kundali"])
+async def calculate_house_cusps(request: KundaliRequest, house_system: str = "placidus") -> APIResponse:
+    """
+    Calculate sidereal house cusps, ascendant and MC.
+
+    Args:
+        request: Birth details (date, time, location, timezone)
+        house_system: One of placidus, koch, porphyry, regiomontanus,
+            campanus, equal, whole_sign, sripati
+
+    Returns:
+        APIResponse with the 12 cusps and the chart angles
+    """
+    try:
+        if house_system.lower() not in HOUSE_SYSTEMS:
+            raise ValueError(f"Unknown house system: {house_system}. Use one of: {', '.join(HOUSE_SYSTEMS)}")
+
+        jd = get_julian_day_from_birth_details(request)
+        houses = calculate_houses(jd, request.latitude, request.longitude, house_system, request.ayanamsa)
+
+        return success_response(
+            data=houses,
+            message="House cusps calculated successfully"
+        )
+
+    except ValueError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        return error_response(
+            code="VALIDATION_ERROR",
+            message=str(e),
+            http_status=400
+        )
+
+    except Exception as e:
+        logger.error(f"Error calculating houses: {str(e)}", exc_info=True)
+        return error_response(
+            code="HOUSE_CALCULATION_ERROR",
+            message=str(e),
+            http_status=500
+        )
+
+
+@router.post('/rectify', response_model=APIResponse, tags=["Kundali"])
+async def rectify_birth_time(request: RectificationRequest) -> APIResponse:
+    """
+    Rank candidate birth times against known life events.
+
+    Every minute in the window is evaluated in one batch (ascendant, navamsha
+    and other varga ascendants, Vimshottari dasha at each event, Jupiter and
+    Saturn transits) and scored by how well it explains the events.
+
+    Args:
+        request: Birth date, approximate time, location and life events
+
+    Returns:
+        APIResponse with ranked candidate time windows
+    """
+    try:
+        start_time = time.time()
+        birth_date = datetime.strptime(request.birthDate, "%Y-%m-%d").date()
+
+        rectifier = BirthTimeRectifier(
+            birth_date=birth_date,
+            approximate_time=request.birthTime,
+            latitude=request.latitude,
+            longitude=request.longitude,
+            timezone=request.timezone,
+            window_minutes=request.window_minutes,
+            step_minutes=request.step_minutes,
+        )
+        result = rectifier.rectify(
+            [event.model_dump() for event in request.events],
+            max_results=request.max_results,
+        )
+
+        calculation_time = (time.time() - start_time) * 1000
+
+        return success_response(
+            data=result,
+            message=f"Evaluated {result['candidates_evaluated']} candidate birth times",
+            calculation_time_ms=calculation_time
+        )
+
+    except ValueError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        return error_response(
+            code="VALIDATION_ERROR",
+            message=str(e),
+            http_status=400
+        )
+
+    except Exception as e:
+        logger.error(f"Error rectifying birth time: {str(e)}", exc_info=True)
+        return error_response(
+            code="RECTIFICATION_ERROR",
+            message=str(e),
+            http_status=500
+        )
+
+
 @router.post('/save', response_model=APIResponse, status_code=201, tags=["Kundali"])
 async def save_kundali_chart(
     request: KundaliSaveRequest,
@@ -226,6 +373,7 @@ async def save_kundali_chart(
             ml_features=request.ml_features,
             is_primary=is_primary
         )
+        _refresh_similarity_index(saved_kundali)
 
         # Convert to response schema
         response_data = KundaliResponse(
@@ -454,6 +602,150 @@ async def get_kundali_detail(
         )
 
 
+@router.get('/{kundali_id}/similar', response_model=APIResponse, tags=["Kundali"])
+async def get_similar_kundalis(
+    kundali_id: str,
+    k: int = Query(10, ge=1, le=100, description="Matches per group"),
+    user: User = Depends(get_current_user),
+    db: dict = Depends(get_db)
+) -> APIResponse:
+    """
+    Find celebrity and user charts similar to a saved Kundali.
+
+    Requires authentication token in Authorization header. Other users'
+    charts are returned anonymously (id and similarity only).
+
+    Args:
+        kundali_id: ID of the Kundali to match (MongoDB ObjectId as string)
+        k: Number of celebrity and of user matches
+
+    Returns:
+        APIResponse with celebrity_matches and user_matches ordered by
+        cosine similarity
+    """
+    try:
+        # Handle error response from get_current_user
+        if isinstance(user, APIResponse):
+            return user
+
+        kundali = get_kundali(db, kundali_id, user.id)
+        if not kundali:
+            return error_response(
+                code="KUNDALI_NOT_FOUND",
+                message=f"Kundali {kundali_id} not found",
+                http_status=404
+            )
+
+        if kundali_id not in get_similarity_index():
+            # Charts saved before the index existed are added on first lookup
+            index_saved_kundali(kundali)
+        index = get_similarity_index()
+        features = chart_features(kundali)
+
+        celebrity_matches = index.search(features, k=k, kinds=[KIND_CELEBRITY])
+        user_matches = index.search(features, k=k, kinds=[KIND_USER], exclude_ids=[kundali_id])
+        for match in celebrity_matches + user_matches:
+            owned = match.pop("owner_id") == user.id
+            if match["kind"] == KIND_USER and not owned:
+                match["name"] = None
+            match["is_own_chart"] = owned
+
+        return success_response(
+            data={
+                "kundali_id": kundali_id,
+                "celebrity_matches": celebrity_matches,
+                "user_matches": user_matches,
+            },
+            message=f"Found {len(celebrity_matches)} celebrity and {len(user_matches)} user matches"
+        )
+
+    except Exception as e:
+        logger.error(f"Error finding similar Kundalis: {str(e)}", exc_info=True)
+        return error_response(
+            code="SIMILAR_KUNDALI_ERROR",
+            message=f"Failed to find similar Kundalis: {str(e)}",
+            http_status=500
+        )
+
+
+@router.get('/{kundali_id}/varshaphala', response_model=APIResponse, tags=["Kundali"])
+async def get_varshaphala(
+    kundali_id: str,
+    years: Optional[str] = Query(None, description="Years, e.g. 2025, 2024,2026 or 2024-2030 (default: this year)"),
+    ayanamsa: Optional[str] = Query(None, description="Ayanamsa (default: the one the Kundali was cast with)"),
+    user: User = Depends(get_current_user),
+    db: dict = Depends(get_db)
+) -> APIResponse:
+    """
+    Cast Varshaphala (annual charts) of a saved Kundali.
+
+    Each annual chart is cast at the exact sidereal solar return near the
+    birthday in that year, at the birth place.
+
+    Requires authentication token in Authorization header.
+
+    Args:
+        kundali_id: ID of the Kundali (MongoDB ObjectId as string)
+        years: Calendar years to cast
+        ayanamsa: Optional ayanamsa override
+
+    Returns:
+        APIResponse with one annual chart (return instant, Varsha Lagna,
+        Muntha and planets with houses) per year
+    """
+    try:
+        # Handle error response from get_current_user
+        if isinstance(user, APIResponse):
+            return user
+
+        kundali = get_kundali(db, kundali_id, user.id)
+        if not kundali:
+            return error_response(
+                code="KUNDALI_NOT_FOUND",
+                message=f"Kundali {kundali_id} not found",
+                http_status=404
+            )
+
+        year_list = parse_years(years) if years else [datetime.utcnow().year]
+        if ayanamsa is None:
+            house_cusps = (kundali.get('kundali_data') or {}).get('house_cusps') or {}
+            ayanamsa = house_cusps.get('ayanamsa') or DEFAULT_AYANAMSA
+
+        calculator = VarshaphalaCalculator(
+            birth_jd=local_to_julian_day(kundali['birth_date'], kundali['birth_time'], kundali['timezone']),
+            latitude=float(kundali['latitude']),
+            longitude=float(kundali['longitude']),
+            birth_year=int(kundali['birth_date'][:4]),
+            ayanamsa=ayanamsa
+        )
+        annual_charts = calculator.annual_charts(year_list)
+
+        return success_response(
+            data={
+                "kundali_id": kundali_id,
+                "ayanamsa": calculator.ayanamsa,
+                "annual_charts": annual_charts,
+            },
+            message=f"Cast {len(annual_charts)} annual charts"
+        )
+
+    except ValueError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        return error_response(
+            code="VALIDATION_ERROR",
+            message=str(e),
+            http_status=400
+        )
+
+    except Exception as e:
+        logger.error(f"Error casting Varshaphala: {str(e)}", exc_info=True)
+        return error_response(
+            code="VARSHAPHALA_ERROR",
+            message=f"Failed to cast Varshaphala: {str(e)}",
+            http_status=500
+        )
+
+
 @router.put('/{kundali_id}', response_model=APIResponse, tags=["Kundali"])
 async def update_kundali_chart(
     kundali_id: str,
@@ -490,6 +782,7 @@ async def update_kundali_chart(
             name=request.name,
             ml_features=request.ml_features
         )
+        _refresh_similarity_index(updated_kundali)
 
         # Convert to response schema
         response_data = KundaliResponse(
@@ -557,6 +850,10 @@ async def delete_kundali_chart(
 
         # Delete from database
         delete_kundali(db, kundali_id, user.id)
+        try:
+            unindex_kundali(kundali_id)
+        except Exception as e:
+            logger.warning(f"Could not remove Kundali {kundali_id} from similarity index: {str(e)}")
 
         # Convert to response schema
         response_data = KundaliDeleteResponse(
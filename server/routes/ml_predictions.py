@@ -9,61 +9,45 @@ Endpoints:
 - GET /ml/test-scenarios - Test model on 3 predefined scenarios
 - GET /ml/model-info - Model information
 - GET /ml/health - Health check
+- GET /ml/inference-stats - Micro-batching queue metrics
+- GET /ml/models - Active model version, load time and memory
+- GET /ml/cache-stats - Prediction cache size and per-endpoint hit rates
 
 Author: ML Pipeline
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional, Any, Iterator, Literal, Tuple
+import asyncio
 import logging
 import json
-from pathlib import Path
 import numpy as np
 import pandas as pd
 
-import joblib
-
 from server.pydantic_schemas.api_response import APIResponse, success_response, error_response
 from server.pydantic_schemas.kundali_schema import KundaliRequest
 from server.ml.feature_extractor import KundaliFeatureExtractor
+from server.ml.inference_batcher import get_batching_metrics
+from server.ml.model_registry import LoadedModel, get_model_registry
+from server.ml.prediction_cache import get_prediction_cache
 from server.services.logic import generate_kundali_logic
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["ML Predictions"])
 
-# Model paths
-MODELS_DIR = Path(__file__).parent.parent / "ml" / "trained_models"
-
-# Load models on startup
-xgb_model = None
-scaler = None
-feature_names = []
-target_names = []
-feature_extractor = None
+# Model artifacts are served by the shared model registry (loaded once per
+# process and hot-swappable); handlers read get_model_registry().active once
+# and use that snapshot for the whole request
+feature_extractor = KundaliFeatureExtractor()
 nn_model = None
-MODELS_LOADED = False
-
-try:
-    logger.info("Loading trained ML models...")
-    xgb_model = joblib.load(str(MODELS_DIR / "xgboost_model.pkl"))
-    scaler = joblib.load(str(MODELS_DIR / "scaler.pkl"))
-
-    with open(MODELS_DIR / "feature_names.json") as f:
-        feature_names = json.load(f)
-
-    with open(MODELS_DIR / "target_names.json") as f:
-        target_names = json.load(f)
-
-    feature_extractor = KundaliFeatureExtractor()
 
-    logger.info(f"Models loaded successfully - {len(feature_names)} features, {len(target_names)} targets")
-    MODELS_LOADED = True
 
-except Exception as e:
-    logger.error(f"Could not load models: {str(e)}")
-    MODELS_LOADED = False
+def _active_model() -> Optional[LoadedModel]:
+    """The model version currently served, or None if models failed to load."""
+    return get_model_registry().active
 
 
 class PredictionRequest(BaseModel):
@@ -76,9 +60,18 @@ class FeaturesListRequest(BaseModel):
     features: List[float]
 
 
+MAX_BATCH_RECORDS = 100_000
+STREAM_CHUNK_RECORDS = 1000
+
+
 class BatchPredictionRequest(BaseModel):
     """Batch prediction request."""
     records: List[List[float]]  # List of feature lists
+    format: Literal["rows", "columns", "ndjson"] = Field(
+        "rows",
+        description="rows: one object per record; columns: one array per target; "
+                    "ndjson: streamed newline-delimited records"
+    )
 
 
 class PredictionResponse(BaseModel):
@@ -106,10 +99,11 @@ def normalize_features(features: List[float]) -> np.ndarray:
     Returns:
         Normalized feature array
     """
-    if scaler is None:
+    model = _active_model()
+    if model is None:
         raise ValueError("Scaler not loaded")
 
-    return scaler.transform([features])
+    return model.plan.transform(np.asarray([features], dtype=np.float64))
 
 
 def make_prediction(features_normalized: np.ndarray) -> Dict:
@@ -122,11 +116,12 @@ def make_prediction(features_normalized: np.ndarray) -> Dict:
     Returns:
         Dictionary with predictions
     """
-    if not MODELS_LOADED or xgb_model is None:
+    model = _active_model()
+    if model is None:
         raise ValueError("Models not loaded")
 
     try:
-        xgb_pred = xgb_model.predict(features_normalized)[0]
+        xgb_pred = model.xgb_model.predict(features_normalized)[0]
         return {
             'predictions': xgb_pred,
             'model_type': 'xgboost'
@@ -136,6 +131,66 @@ def make_prediction(features_normalized: np.ndarray) -> Dict:
         raise
 
 
+def build_feature_matrix(records: List[List[float]],
+                         n_features: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[Dict]]:
+    """
+    Validate batch records and pack the valid ones into one float64 matrix.
+
+    Raw features are kept in double precision until they are scaled; large
+    values such as Julian days lose their fraction in float32.
+
+    Args:
+        records: Feature lists in feature_names order
+        n_features: Expected features per record (default: the active model's)
+
+    Returns:
+        Tuple of (feature matrix, record ids of its rows, per-record errors)
+    """
+    if n_features is None:
+        model = _active_model()
+        if model is None:
+            raise ValueError("Models not loaded")
+        n_features = len(model.feature_names)
+    lengths = np.fromiter(map(len, records), dtype=np.int64, count=len(records))
+    valid_ids = np.flatnonzero(lengths == n_features)
+
+    if valid_ids.size == len(records):
+        matrix = np.array(records, dtype=np.float64)
+    else:
+        matrix = np.empty((valid_ids.size, n_features), dtype=np.float64)
+        for row, record_id in enumerate(valid_ids):
+            matrix[row] = records[record_id]
+
+    finite = np.isfinite(matrix).all(axis=1)
+    errors = [
+        {'record_id': int(i), 'error': f"Invalid feature count: expected {n_features}, got {int(lengths[i])}"}
+        for i in np.flatnonzero(lengths != n_features)
+    ]
+    errors.extend({'record_id': int(i), 'error': "Non-finite feature value"} for i in valid_ids[~finite])
+    errors.sort(key=lambda e: e['record_id'])
+
+    return matrix[finite], valid_ids[finite], errors
+
+
+def predict_matrix(features: np.ndarray, model: Optional[LoadedModel] = None) -> np.ndarray:
+    """
+    Predict all rows of a feature matrix with one scaler transform and one
+    booster call.
+
+    Args:
+        features: Raw feature matrix (centered in place)
+        model: Model version to use (default: the active one)
+
+    Returns:
+        Predictions, one row per record and one column per target
+    """
+    model = model or _active_model()
+    if model is None:
+        raise ValueError("Models not loaded")
+
+    return model.predict_matrix(features, copy=False)
+
+
 def interpret_prediction(predictions: np.ndarray) -> str:
     """
     Interpret prediction as human-readable text.
@@ -186,25 +241,22 @@ async def predict_from_features(request: FeaturesListRequest) -> APIResponse:
         APIResponse with 8 life outcome predictions
     """
     try:
-        if not MODELS_LOADED:
+        model = _active_model()
+        if model is None:
             return error_response(
                 code="MODELS_NOT_LOADED",
                 message="Models not loaded"
             )
 
         # Validate feature count
-        if len(request.features) != len(feature_names):
+        if len(request.features) != len(model.feature_names):
             return error_response(
                 code="INVALID_FEATURE_COUNT",
-                message=f"Invalid feature count: expected {len(feature_names)}, got {len(request.features)}"
+                message=f"Invalid feature count: expected {len(model.feature_names)}, got {len(request.features)}"
             )
 
-        # Normalize features
-        features_normalized = normalize_features(request.features)
-
-        # Make prediction
-        result = make_prediction(features_normalized)
-        predictions = result['predictions']
+        # Normalize features and make prediction (batched with concurrent requests)
+        predictions = await get_model_registry().batcher.predict(np.asarray(request.features, dtype=np.float64))
 
         # Interpret predictions
         avg_score = float(np.mean(predictions))
@@ -221,7 +273,7 @@ async def predict_from_features(request: FeaturesListRequest) -> APIResponse:
             'life_ease_score': float(predictions[7]),
             'average_score': avg_score,
             'interpretation': interpretation,
-            'model_type': result['model_type']
+            'model_type': 'xgboost'
         }
 
         logger.info(f"Prediction successful - Average score: {avg_score:.2f}")
@@ -265,7 +317,8 @@ async def predict_from_kundali(request: KundaliRequest) -> APIResponse:
         APIResponse with Kundali and predictions
     """
     try:
-        if not MODELS_LOADED:
+        model = _active_model()
+        if model is None:
             return error_response(
                 code="MODELS_NOT_LOADED",
                 message="Models not loaded"
@@ -288,15 +341,12 @@ async def predict_from_kundali(request: KundaliRequest) -> APIResponse:
         if not is_valid:
             logger.warning(f"Feature validation issues: {issues}")
 
-        # Convert dict to ordered list
-        features_list = [features_dict.get(name, 0.0) for name in feature_names]
-
-        # Normalize
-        features_normalized = normalize_features(features_list)
-
-        # Predict
-        result = make_prediction(features_normalized)
-        predictions = result['predictions']
+        # Order features, then predict (cached per chart, batched with
+        # concurrent requests)
+        features = model.plan.order([features_dict])[0]
+        predictions = await get_prediction_cache().predict(
+            model, features, "predict_from_kundali", get_model_registry().batcher.predict
+        )
 
         # Interpret
         avg_score = float(np.mean(predictions))
@@ -318,7 +368,7 @@ async def predict_from_kundali(request: KundaliRequest) -> APIResponse:
                 'average_score': avg_score,
                 'interpretation': interpretation
             },
-            'model_type': result['model_type']
+            'model_type': 'xgboost'
         }
 
         logger.info(f"Kundali prediction successful - Average score: {avg_score:.2f}")
@@ -338,18 +388,24 @@ async def predict_from_kundali(request: KundaliRequest) -> APIResponse:
 
 
 @router.post("/predict-batch", response_model=APIResponse)
-async def predict_batch(request: BatchPredictionRequest) -> APIResponse:
+async def predict_batch(request: BatchPredictionRequest):
     """
     Make batch predictions for multiple records.
 
+    All valid records are scaled and predicted together as one matrix;
+    records with a wrong feature count or non-finite values are reported as
+    per-record errors.
+
     Args:
         request: Batch prediction request with list of feature lists
 
     Returns:
-        APIResponse with list of predictions
+        APIResponse with predictions as rows or columns, or a streamed
+        newline-delimited JSON response (one record per line)
     """
     try:
-        if not MODELS_LOADED:
+        model = _active_model()
+        if model is None:
             return error_response(
                 code="MODELS_NOT_LOADED",
                 message="Models not loaded"
@@ -362,60 +418,44 @@ async def predict_batch(request: BatchPredictionRequest) -> APIResponse:
                 message="Empty batch: No records provided for prediction"
             )
 
-        # Validate feature count in first record
-        if len(request.records[0]) != len(feature_names):
+        if len(request.records) > MAX_BATCH_RECORDS:
             return error_response(
-                code="INVALID_FEATURE_COUNT",
-                message=f"Invalid feature count: expected {len(feature_names)} features per record"
+                code="BATCH_TOO_LARGE",
+                message=f"Batch too large: at most {MAX_BATCH_RECORDS} records per request"
             )
 
-        batch_predictions = []
-
         logger.info(f"Processing batch of {len(request.records)} records...")
 
-        for i, features in enumerate(request.records):
-            try:
-                # Normalize features
-                features_normalized = normalize_features(features)
-
-                # Make prediction
-                result = make_prediction(features_normalized)
-                predictions = result['predictions']
-
-                # Interpret
-                avg_score = float(np.mean(predictions))
-
-                # Format response
-                prediction_dict = {
-                    'record_id': i,
-                    'career_potential': float(predictions[0]),
-                    'wealth_potential': float(predictions[1]),
-                    'marriage_happiness': float(predictions[2]),
-                    'children_prospects': float(predictions[3]),
-                    'health_status': float(predictions[4]),
-                    'spiritual_inclination': float(predictions[5]),
-                    'chart_strength': float(predictions[6]),
-                    'life_ease_score': float(predictions[7]),
-                    'average_score': avg_score,
-                    'model_type': result['model_type']
-                }
-
-                batch_predictions.append(prediction_dict)
-
-            except Exception as e:
-                logger.error(f"Error predicting record {i}: {str(e)}")
-                batch_predictions.append({
-                    'record_id': i,
-                    'error': str(e)
-                })
-
-        successful = sum(1 for p in batch_predictions if 'error' not in p)
-        logger.info(f"Batch prediction complete - {successful}/{len(batch_predictions)} successful")
+        # Packing and scoring thousands of records would stall the event loop
+        record_ids, predictions, average_scores, errors = await asyncio.get_running_loop().run_in_executor(
+            None, _score_records, request.records, model
+        )
+
+        logger.info(f"Batch prediction complete - {len(record_ids)}/{len(request.records)} successful")
+
+        if request.format == "ndjson":
+            return StreamingResponse(
+                _stream_batch_predictions(record_ids, predictions, average_scores, errors, model.target_names),
+                media_type="application/x-ndjson"
+            )
+
+        if request.format == "columns":
+            batch_predictions = {
+                'record_ids': record_ids.tolist(),
+                **{name: predictions[:, j].tolist() for j, name in enumerate(model.target_names)},
+                'average_score': average_scores.tolist(),
+                'model_type': 'xgboost',
+                'errors': errors
+            }
+        else:
+            batch_predictions = _prediction_rows(record_ids, predictions, average_scores, model.target_names)
+            batch_predictions.extend(errors)
+            batch_predictions.sort(key=lambda p: p['record_id'])
 
         return success_response(
             data={
                 'total_records': len(request.records),
-                'successful_predictions': successful,
+                'successful_predictions': len(record_ids),
                 'predictions': batch_predictions
             },
             message="Batch prediction completed"
@@ -430,6 +470,45 @@ async def predict_batch(request: BatchPredictionRequest) -> APIResponse:
         )
 
 
+def _score_records(records: List[List[float]],
+                   model: LoadedModel) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+    """
+    Validate and score batch records with one model version.
+
+    Returns:
+        Tuple of (record ids, predictions, average scores, per-record errors)
+    """
+    features, record_ids, errors = build_feature_matrix(records, len(model.feature_names))
+    predictions = predict_matrix(features, model)
+    return record_ids, predictions, predictions.mean(axis=1), errors
+
+
+def _prediction_rows(record_ids: np.ndarray, predictions: np.ndarray, average_scores: np.ndarray,
+                     target_names: List[str]) -> List[Dict]:
+    """Per-record prediction dictionaries."""
+    return [
+        {
+            'record_id': record_id,
+            **dict(zip(target_names, values)),
+            'average_score': average,
+            'model_type': 'xgboost'
+        }
+        for record_id, values, average in zip(record_ids.tolist(), predictions.tolist(), average_scores.tolist())
+    ]
+
+
+def _stream_batch_predictions(record_ids: np.ndarray, predictions: np.ndarray, average_scores: np.ndarray,
+                              errors: List[Dict], target_names: List[str]) -> Iterator[str]:
+    """Yield predictions then errors as newline-delimited JSON, a chunk of records at a time."""
+    for start in range(0, len(record_ids), STREAM_CHUNK_RECORDS):
+        end = start + STREAM_CHUNK_RECORDS
+        rows = _prediction_rows(record_ids[start:end], predictions[start:end], average_scores[start:end],
+                                target_names)
+        yield "".join(json.dumps(row) + "\n" for row in rows)
+    if errors:
+        yield "".join(json.dumps(error) + "\n" for error in errors)
+
+
 @router.get("/test-scenarios", response_model=APIResponse)
 async def test_scenarios() -> APIResponse:
     """
@@ -444,7 +523,8 @@ async def test_scenarios() -> APIResponse:
         APIResponse with test results
     """
     try:
-        if not MODELS_LOADED:
+        model = _active_model()
+        if model is None:
             return error_response(
                 code="MODELS_NOT_LOADED",
                 message="Models not loaded"
@@ -471,9 +551,8 @@ async def test_scenarios() -> APIResponse:
         for i in range(1, 7):
             strong_features[f'aspect_strength_{i}'] = float(np.random.uniform(60, 90))
 
-        strong_list = [strong_features.get(name, 0.0) for name in feature_names]
-        strong_norm = normalize_features(strong_list)
-        strong_pred = make_prediction(strong_norm)['predictions']
+        strong_list = [strong_features.get(name, 0.0) for name in model.feature_names]
+        strong_pred = model.predict_matrix(np.array([strong_list]))[0]
         strong_avg = float(np.mean(strong_pred))
 
         test_scenarios['strong_chart'] = {
@@ -507,9 +586,8 @@ async def test_scenarios() -> APIResponse:
             elif 'aspect_strength' in key:
                 weak_features[key] = float(np.random.uniform(10, 30))
 
-        weak_list = [weak_features.get(name, 0.0) for name in feature_names]
-        weak_norm = normalize_features(weak_list)
-        weak_pred = make_prediction(weak_norm)['predictions']
+        weak_list = [weak_features.get(name, 0.0) for name in model.feature_names]
+        weak_pred = model.predict_matrix(np.array([weak_list]))[0]
         weak_avg = float(np.mean(weak_pred))
 
         test_scenarios['weak_chart'] = {
@@ -550,9 +628,8 @@ async def test_scenarios() -> APIResponse:
             elif 'aspect_strength' in key:
                 avg_features[key] = float(np.random.uniform(40, 60))
 
-        avg_list = [avg_features.get(name, 0.0) for name in feature_names]
-        avg_norm = normalize_features(avg_list)
-        avg_pred = make_prediction(avg_norm)['predictions']
+        avg_list = [avg_features.get(name, 0.0) for name in model.feature_names]
+        avg_pred = model.predict_matrix(np.array([avg_list]))[0]
         avg_avg = float(np.mean(avg_pred))
 
         test_scenarios['average_chart'] = {
@@ -596,22 +673,24 @@ async def get_model_info() -> APIResponse:
         APIResponse with model information
     """
     try:
-        if not MODELS_LOADED:
+        model = _active_model()
+        if model is None:
             return error_response(
                 code="MODELS_NOT_LOADED",
                 message="Models not loaded"
             )
 
         # Load metrics
-        with open(MODELS_DIR / "model_metrics.json") as f:
+        with open(model.path / "model_metrics.json") as f:
             metrics = json.load(f)
 
         info = {
-            'models_loaded': MODELS_LOADED,
+            'models_loaded': True,
             'available_models': ['neural_network', 'xgboost'],
-            'input_features': len(feature_names),
-            'output_targets': len(target_names),
-            'target_names': target_names,
+            'model_version': model.version,
+            'input_features': len(model.feature_names),
+            'output_targets': len(model.target_names),
+            'target_names': model.target_names,
             'metrics': metrics
         }
 
@@ -637,15 +716,73 @@ async def ml_health_check() -> APIResponse:
     Returns:
         APIResponse with health status
     """
+    model = _active_model()
     health_status = {
-        'models_loaded': MODELS_LOADED,
+        'models_loaded': model is not None,
         'neural_network_loaded': nn_model is not None,
-        'xgboost_loaded': xgb_model is not None,
-        'scaler_loaded': scaler is not None,
-        'status': 'healthy' if MODELS_LOADED else 'unhealthy'
+        'xgboost_loaded': model is not None,
+        'scaler_loaded': model is not None,
+        'model_version': model.version if model else None,
+        'status': 'healthy' if model else 'unhealthy'
     }
 
     return success_response(
         data=health_status,
         message="ML health check complete"
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/inference-stats", response_model=APIResponse)
+async def get_inference_stats() -> APIResponse:
+    """
+    Micro-batching metrics of the single-prediction queues.
+
+    Returns:
+        APIResponse with batch-size distribution and queue/predict latency
+        percentiles per queue
+    """
+    return success_response(
+        data=get_batching_metrics(),
+        message="Inference statistics retrieved successfully"
+    )
+
+
+@router.get("/cache-stats", response_model=APIResponse)
+async def get_cache_stats() -> APIResponse:
+    """
+    Prediction cache metrics of this worker.
+
+    Returns:
+        APIResponse with entry count, memory use, evictions and hit rates
+        per endpoint
+    """
+    return success_response(
+        data=get_prediction_cache().metrics(),
+        message="Prediction cache statistics retrieved successfully"
+    )
+
+
+@router.get("/models", response_model=APIResponse)
+async def get_model_versions() -> APIResponse:
+    """
+    Model registry status of this worker.
+
+    Versions are rolled out with `python -m server.ml.model_registry activate
+    <version>`; every worker switches within a few seconds.
+
+    Returns:
+        APIResponse with the active and previous versions (load time and
+        memory per model) and the versions available on disk
+    """
+    try:
+        return success_response(
+            data=get_model_registry().status(),
+            message="Model registry status retrieved successfully"
+        )
+    except Exception as e:
+        logger.error(f"Error getting model registry status: {str(e)}")
+        return error_response(
+            code="MODEL_INFO_ERROR",
+            message="Error retrieving model registry status",
+            details={"error": str(e)}
+        )
@@ -0,0 +1,229 @@
+"""
+Panchang Routes
+Daily Hindu almanac (tithi, nakshatra, yoga, karana, vara).
+
+Endpoints:
+1. GET /api/panchang - Panchang for a single day
+2. GET /api/panchang/range - Panchang for consecutive days
+3. POST /api/panchang/muhurta - Ranked auspicious windows over a date range
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Query, status
+from dateutil.parser import parse as parse_date
+from pydantic import BaseModel, Field
+
+from server.services.panchang_calculator import DEFAULT_TIMEZONE, get_daily_panchang
+from server.services.muhurta_calculator import (
+    DEFAULT_AVOIDED_TITHIS,
+    DEFAULT_FAVORABLE_ASCENDANTS,
+    DEFAULT_FAVORABLE_NAKSHATRAS,
+    DEFAULT_STEP_MINUTES,
+    MALEFIC_PLANETS,
+    MAX_SEARCH_DAYS,
+    MuhurtaCriteria,
+    MuhurtaSearch,
+)
+from server.pydantic_schemas.api_response import APIResponse, success_response, error_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["Panchang"]
+)
+
+MAX_RANGE_DAYS = 366
+
+
+class MuhurtaRequest(BaseModel):
+    """Muhurta search request."""
+    start_date: Optional[str] = Field(None, description="First date (YYYY-MM-DD), defaults to today")
+    days: int = Field(30, ge=1, le=MAX_SEARCH_DAYS, description="Number of days to search")
+    latitude: float = Field(..., ge=-90, le=90, description="Location latitude")
+    longitude: float = Field(..., ge=-180, le=180, description="Location longitude")
+    timezone: str = Field(DEFAULT_TIMEZONE, description="IANA timezone defining the civil day")
+    natal_moon_nakshatra: Optional[str] = Field(None, description="Natal Moon nakshatra, enables Tara bala")
+    avoided_tithis: List[int] = Field(list(DEFAULT_AVOIDED_TITHIS), description="Tithi numbers (1-30) to avoid")
+    favorable_nakshatras: List[str] = Field(list(DEFAULT_FAVORABLE_NAKSHATRAS))
+    favorable_ascendants: List[str] = Field(list(DEFAULT_FAVORABLE_ASCENDANTS))
+    malefics: List[str] = Field(list(MALEFIC_PLANETS), description="Planets to keep out of kendras")
+    tithi_weight: float = Field(2.0, ge=0)
+    nakshatra_weight: float = Field(2.0, ge=0)
+    ascendant_weight: float = Field(1.5, ge=0)
+    kendra_weight: float = Field(2.0, ge=0)
+    tara_weight: float = Field(2.0, ge=0)
+    min_score: float = Field(60.0, ge=0, le=100, description="Minimum window score (0-100)")
+    max_results: int = Field(20, ge=1, le=200)
+    step_minutes: int = Field(DEFAULT_STEP_MINUTES, ge=1, le=60, description="Coarse scan resolution")
+
+
+def _parse_day(date_str: Optional[str]) -> date:
+    """Parse a YYYY-MM-DD string, defaulting to today."""
+    if not date_str:
+        return date.today()
+    return parse_date(date_str).date()
+
+
+@router.get("", response_model=APIResponse)
+async def get_panchang(
+    date_str: Optional[str] = Query(None, alias="date", description="Date (YYYY-MM-DD), defaults to today"),
+    timezone: str = Query(DEFAULT_TIMEZONE, description="IANA timezone defining the civil day"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Latitude for sunrise/sunset"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180, description="Longitude for sunrise/sunset")
+) -> APIResponse:
+    """
+    Get the Panchang for a day.
+
+    Returns:
+        Tithi, nakshatra, yoga and karana periods with transition times
+    """
+    try:
+        try:
+            target_date = _parse_day(date_str)
+        except (ValueError, OverflowError):
+            return error_response(
+                code="INVALID_DATE",
+                message="Date format should be YYYY-MM-DD",
+                http_status=status.HTTP_400_BAD_REQUEST
+            )
+
+        panchang = get_daily_panchang(target_date, timezone, latitude, longitude)
+
+        return success_response(
+            data=panchang,
+            message=f"Panchang for {target_date.isoformat()}"
+        )
+
+    except ValueError as e:
+        return error_response(
+            code="INVALID_REQUEST",
+            message=str(e),
+            http_status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.error(f"Error calculating Panchang: {str(e)}", exc_info=True)
+        return error_response(
+            code="PANCHANG_ERROR",
+            message=f"Error calculating Panchang: {str(e)}",
+            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.get("/range", response_model=APIResponse)
+async def get_panchang_range(
+    start: Optional[str] = Query(None, description="First date (YYYY-MM-DD), defaults to today"),
+    days: int = Query(7, ge=1, le=MAX_RANGE_DAYS, description="Number of days"),
+    timezone: str = Query(DEFAULT_TIMEZONE, description="IANA timezone defining the civil day"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180)
+) -> APIResponse:
+    """
+    Get the Panchang for consecutive days.
+
+    Returns:
+        List of daily Panchang entries
+    """
+    try:
+        try:
+            start_date = _parse_day(start)
+        except (ValueError, OverflowError):
+            return error_response(
+                code="INVALID_DATE",
+                message="Date format should be YYYY-MM-DD",
+                http_status=status.HTTP_400_BAD_REQUEST
+            )
+
+        panchangs = [
+            get_daily_panchang(start_date + timedelta(days=i), timezone, latitude, longitude)
+            for i in range(days)
+        ]
+
+        return success_response(
+            data={"days": panchangs, "count": len(panchangs)},
+            message=f"Panchang for {days} days from {start_date.isoformat()}"
+        )
+
+    except ValueError as e:
+        return error_response(
+            code="INVALID_REQUEST",
+            message=str(e),
+            http_status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.error(f"Error calculating Panchang range: {str(e)}", exc_info=True)
+        return error_response(
+            code="PANCHANG_ERROR",
+            message=f"Error calculating Panchang: {str(e)}",
+            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.post("/muhurta", response_model=APIResponse)
+async def search_muhurta(request: MuhurtaRequest) -> APIResponse:
+    """
+    Search a date range for auspicious windows.
+
+    Returns:
+        Windows ranked by score, with the tithi, nakshatra, ascendant and
+        kendra state that produced each score
+    """
+    try:
+        try:
+            start_date = _parse_day(request.start_date)
+        except (ValueError, OverflowError):
+            return error_response(
+                code="INVALID_DATE",
+                message="Date format should be YYYY-MM-DD",
+                http_status=status.HTTP_400_BAD_REQUEST
+            )
+
+        criteria = MuhurtaCriteria(
+            avoided_tithis=request.avoided_tithis,
+            favorable_nakshatras=request.favorable_nakshatras,
+            favorable_ascendants=request.favorable_ascendants,
+            malefics=request.malefics,
+            tithi_weight=request.tithi_weight,
+            nakshatra_weight=request.nakshatra_weight,
+            ascendant_weight=request.ascendant_weight,
+            kendra_weight=request.kendra_weight,
+            tara_weight=request.tara_weight,
+        )
+        search = MuhurtaSearch(
+            start=start_date,
+            days=request.days,
+            latitude=request.latitude,
+            longitude=request.longitude,
+            timezone=request.timezone,
+            natal_moon_nakshatra=request.natal_moon_nakshatra,
+            criteria=criteria,
+            step_minutes=request.step_minutes,
+        )
+        windows = search.find_windows(request.min_score, request.max_results)
+
+        return success_response(
+            data={
+                "start_date": start_date.isoformat(),
+                "days": request.days,
+                "timezone": request.timezone,
+                "windows": windows,
+                "count": len(windows),
+            },
+            message=f"Found {len(windows)} muhurta windows"
+        )
+
+    except ValueError as e:
+        return error_response(
+            code="INVALID_REQUEST",
+            message=str(e),
+            http_status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.error(f"Error searching muhurta: {str(e)}", exc_info=True)
+        return error_response(
+            code="MUHURTA_ERROR",
+            message=f"Error searching muhurta: {str(e)}",
+            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,136 @@
+"""
+Research Routes
+Aggregate placement queries over all saved charts.
+
+Endpoints:
+1. POST /api/research/placements/query - Count and list charts matching a boolean placement query
+2. GET /api/research/placements/terms - Number of charts per indexed term
+
+Results come from the placement index, which is refreshed in the background,
+so charts saved in the last few minutes may not be counted yet.
+
+Author: Backend API Team
+"""
+
+import logging
+import time
+from typing import Any, Dict, Union
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from server.pydantic_schemas.api_response import APIResponse, success_response, error_response
+from server.services.placement_index import get_placement_index, run_query
+from server.routes.auth import get_current_user
+from server.models.user import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["Research"]
+)
+
+MAX_RESULT_IDS = 10000
+
+
+class PlacementQueryRequest(BaseModel):
+    """Boolean placement query."""
+    query: Union[str, Dict[str, Any]] = Field(
+        ...,
+        description='Term such as "jupiter:house:1", {"planet": "Moon", "nakshatra": "Rohini"}, '
+                    '{"yoga": "Gajakesari Yoga"} or {"and"/"or": [...]}, {"not": ...}'
+    )
+    limit: int = Field(100, ge=0, le=MAX_RESULT_IDS, description="Chart ids to return (0 for count only)")
+    offset: int = Field(0, ge=0, description="Chart ids to skip")
+
+
+@router.post('/placements/query', response_model=APIResponse)
+async def query_placements(
+    request: PlacementQueryRequest,
+    user: User = Depends(get_current_user)
+) -> APIResponse:
+    """
+    Count and list saved charts matching a placement query.
+
+    Requires authentication token in Authorization header.
+
+    Returns:
+        APIResponse with count and chart_ids
+    """
+    try:
+        if isinstance(user, APIResponse):
+            return user
+
+        started = time.perf_counter()
+        count, chart_ids = run_query(request.query, limit=request.limit, offset=request.offset)
+
+        return success_response(
+            data={
+                "count": count,
+                "chart_ids": chart_ids,
+                "offset": request.offset,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            },
+            message=f"{count} charts match"
+        )
+
+    except ValueError as e:
+        return error_response(
+            code="INVALID_QUERY",
+            message=str(e),
+            http_status=400
+        )
+    except RuntimeError as e:
+        return error_response(
+            code="INDEX_NOT_READY",
+            message=str(e),
+            http_status=503
+        )
+    except Exception as e:
+        logger.error(f"Error running placement query: {str(e)}", exc_info=True)
+        return error_response(
+            code="PLACEMENT_QUERY_ERROR",
+            message=f"Failed to run placement query: {str(e)}",
+            http_status=500
+        )
+
+
+@router.get('/placements/terms', response_model=APIResponse)
+async def get_placement_terms(
+    user: User = Depends(get_current_user)
+) -> APIResponse:
+    """
+    Number of saved charts per indexed term.
+
+    Requires authentication token in Authorization header.
+
+    Returns:
+        APIResponse with total charts and per-term counts
+    """
+    try:
+        if isinstance(user, APIResponse):
+            return user
+
+        index = get_placement_index()
+        if index is None:
+            return error_response(
+                code="INDEX_NOT_READY",
+                message="Placement index has not been built yet",
+                http_status=503
+            )
+
+        return success_response(
+            data={
+                "total_charts": len(index),
+                "terms": index.term_counts(),
+            },
+            message=f"{len(index.keys)} indexed terms"
+        )
+
+    except Exception as e:
+        logger.error(f"Error listing placement terms: {str(e)}", exc_info=True)
+        return error_response(
+            code="PLACEMENT_TERMS_ERROR",
+            message=f"Failed to list placement terms: {str(e)}",
+            http_status=500
+        )
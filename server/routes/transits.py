@@ -115,7 +115,11 @@ async def calculate_transits(
                 'transit_date': (t_date or datetime.now()).strftime('%Y-%m-%d'),
                 'transits': transits,
                 'important_transits': transit_calc.get_important_transits(),
-                'predictions': transit_calc.get_transit_predictions()
+                'predictions': transit_calc.get_transit_predictions(),
+                'ashtakavarga': (
+                    transit_calc.ashtakavarga.get_complete_analysis()
+                    if transit_calc.ashtakavarga else None
+                )
             },
             message="Transits calculated successfully"
         )
@@ -11,6 +11,8 @@ Author: Astrology Backend
 from typing import Dict, List
 import logging
 
+from server.utils.house_analysis import HouseAnalyzer, HouseTable
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +97,36 @@ class HouseRules:
             logger.error(f"Error interpreting house: {str(e)}")
             return ["Unable to generate house interpretation"]
 
+    @staticmethod
+    def interpret_house_table(house_table: HouseTable) -> Dict[int, List[str]]:
+        """
+        Generate interpretations for all twelve houses from a precomputed house table.
+
+        Args:
+            house_table: HouseTable from HouseAnalyzer.get_house_table()
+
+        Returns:
+            Dictionary mapping house number to interpretation strings
+        """
+        interpretations = {}
+
+        try:
+            for house_num in range(1, 13):
+                interpretations[house_num] = HouseRules.interpret_house({
+                    'house_number': house_num,
+                    'house_name': HouseAnalyzer.HOUSE_SIGNIFICATORS[house_num]['name'],
+                    'sign': house_table.sign_name(house_num),
+                    'strength': house_table.house_strength_label(house_num),
+                    'planets': house_table.planets_in_house(house_num),
+                    'lord': house_table.lord_name(house_num),
+                    'lord_strength': house_table.lord_strength_label(house_num),
+                })
+
+        except Exception as e:
+            logger.error(f"Error interpreting house table: {str(e)}")
+
+        return interpretations
+
     @staticmethod
     def _get_specific_interpretation(house_num: int, sign: str, planets: List[str],
                                       lord: str) -> List[str]:
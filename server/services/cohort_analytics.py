@@ -0,0 +1,189 @@
+"""
+Cohort Analytics
+Distributions of ML scores, planet strengths and dasha lords over all saved
+charts matching a placement query.
+
+Cohorts are selected with the placement index bitmaps and aggregated over its
+column-major value columns, so a cohort is summarized with a handful of numpy
+passes instead of a per-document database aggregation. Group-bys map every
+cohort row to a group code and aggregate with np.bincount.
+
+Author: Backend API Team
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server.services.panchang_calculator import NAKSHATRA_NAMES
+from server.services.placement_index import (
+    DASHA_COLUMNS,
+    DASHA_LORDS,
+    SCORE_COLUMNS,
+    SIGN_NAMES,
+    STRENGTH_COLUMNS,
+    PlacementIndex,
+    placement_term,
+)
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_RANGE = (0.0, 100.0)
+MAX_BINS = 100
+# Percentiles are read off a counting histogram of this resolution, which is
+# far cheaper than partitioning every column (strengths are stored to 0.1)
+PERCENTILE_RESOLUTION = 0.01
+MAX_PERCENTILE_BUCKETS = 1 << 20
+
+
+def _percentiles(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Percentiles of non-empty values, accurate to PERCENTILE_RESOLUTION."""
+    width = max(PERCENTILE_RESOLUTION, (high - low) / MAX_PERCENTILE_BUCKETS)
+    buckets = ((values - low) / width).astype(np.int64)
+    cumulative = np.cumsum(np.bincount(buckets))
+    ranks = np.array(PERCENTILES) / 100 * (values.size - 1)
+    # Interpolate linearly between neighbouring order statistics, as np.percentile does
+    below = low + np.searchsorted(cumulative, np.floor(ranks), side="right") * width
+    above = low + np.searchsorted(cumulative, np.ceil(ranks), side="right") * width
+    return below + (above - below) * (ranks - np.floor(ranks))
+
+
+def _summarize(values: np.ndarray, bins: int) -> Dict[str, Any]:
+    """
+    Summary statistics and a 0-100 histogram of one column.
+
+    Values outside the histogram range are counted in the edge bins.
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"count": 0}
+
+    low, high = float(values.min()), float(values.max())
+    quantiles = np.minimum(_percentiles(values, low, high), high)
+    scaled = (values - HISTOGRAM_RANGE[0]) * (bins / (HISTOGRAM_RANGE[1] - HISTOGRAM_RANGE[0]))
+    counts = np.bincount(np.clip(scaled.astype(np.int64), 0, bins - 1), minlength=bins)
+    return {
+        "count": int(values.size),
+        "mean": round(float(values.mean(dtype=np.float64)), 3),
+        "std": round(float(values.std(dtype=np.float64)), 3),
+        "min": round(low, 3),
+        "max": round(high, 3),
+        "percentiles": {f"p{p}": round(float(q), 3) for p, q in zip(PERCENTILES, quantiles)},
+        "histogram": {
+            "edges": np.linspace(*HISTOGRAM_RANGE, bins + 1).round(3).tolist(),
+            "counts": counts.tolist(),
+        },
+    }
+
+
+def _lord_counts(codes: np.ndarray) -> Dict[str, int]:
+    """Number of charts per dasha lord from encoded lord values."""
+    codes = codes[~np.isnan(codes)].astype(np.int64)
+    counts = np.bincount(codes, minlength=len(DASHA_LORDS))
+    return {lord: int(n) for lord, n in zip(DASHA_LORDS, counts)}
+
+
+def _group_codes(index: PlacementIndex, rows: np.ndarray, block: Dict[str, np.ndarray],
+                 group_by: str) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Group code (-1 for none) of each cohort row, and the group labels.
+
+    Args:
+        group_by: A dasha column ("maha_dasha_lord", "antar_dasha_lord") or a
+            placement dimension such as "moon:sign", "jupiter:house" or
+            "ascendant:nakshatra"
+
+    Raises:
+        ValueError: On unknown group-bys
+    """
+    if group_by in DASHA_COLUMNS:
+        codes = block[group_by]
+        return np.where(np.isnan(codes), -1, codes).astype(np.int64), list(DASHA_LORDS)
+
+    body, _, kind = group_by.partition(":")
+    labels = {"sign": list(SIGN_NAMES), "house": list(range(1, 13)), "nakshatra": list(NAKSHATRA_NAMES)}.get(kind)
+    if labels is None:
+        raise ValueError(
+            f"Invalid group_by: {group_by}. Use {' or '.join(DASHA_COLUMNS)}, or <planet>:sign|house|nakshatra"
+        )
+
+    codes = np.full(rows.size, -1, dtype=np.int64)
+    n_rows = index.live.size * 8
+    for code, label in enumerate(labels):
+        member = np.unpackbits(index.evaluate(placement_term(body, kind, label)), count=n_rows)
+        codes[member[rows].astype(bool)] = code
+    return codes, labels
+
+
+def _group_statistics(codes: np.ndarray, labels: List[Any], block: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Chart count and per-column means of each non-empty group."""
+    grouped = codes >= 0
+    counts = np.bincount(codes[grouped], minlength=len(labels))
+
+    means = {}
+    for column in SCORE_COLUMNS + STRENGTH_COLUMNS:
+        if column not in block:
+            continue
+        values = block[column]
+        valid = grouped & ~np.isnan(values)
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=len(labels))
+        n = np.bincount(codes[valid], minlength=len(labels))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[column] = sums / n
+
+    groups = []
+    for code, label in enumerate(labels):
+        if counts[code] == 0:
+            continue
+        groups.append({
+            "group": label,
+            "count": int(counts[code]),
+            "means": {
+                column: None if np.isnan(mean[code]) else round(float(mean[code]), 3)
+                for column, mean in means.items()
+            },
+        })
+    return groups
+
+
+def cohort_statistics(index: PlacementIndex, query: Any = None, group_by: Optional[str] = None,
+                      bins: int = 10) -> Dict[str, Any]:
+    """
+    Aggregate the charts matching a placement query.
+
+    Args:
+        index: Placement index
+        query: Placement query (see placement_index), None for all charts
+        group_by: Optional dasha column or placement dimension to group by
+        bins: Histogram bins over 0-100
+
+    Returns:
+        Cohort size, score and strength distributions, dasha lord counts and
+        optional per-group means
+
+    Raises:
+        ValueError: On malformed queries, group-bys or bin counts
+    """
+    if not 1 <= bins <= MAX_BINS:
+        raise ValueError(f"bins must be between 1 and {MAX_BINS}")
+
+    bitmap = index.live if query is None else index.evaluate(query)
+    rows = index.rows_of(bitmap)
+    block = {column: np.asarray(index.values[i, rows]) for i, column in enumerate(index.columns)}
+
+    result = {
+        "cohort_size": int(rows.size),
+        "scores": {c: _summarize(block[c], bins) for c in SCORE_COLUMNS if c in block},
+        "strengths": {
+            planet: _summarize(block[c], bins)
+            for planet, c in zip(DASHA_LORDS, STRENGTH_COLUMNS) if c in block
+        },
+        "dasha_lords": {c: _lord_counts(block[c]) for c in DASHA_COLUMNS if c in block},
+    }
+    if group_by:
+        codes, labels = _group_codes(index, rows, block, group_by)
+        result["group_by"] = group_by
+        result["groups"] = _group_statistics(codes, labels, block)
+    return result
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -106,9 +108,9 @@ class DashaCalculator:
         Returns:
             Planet name that rules this nakshatra
         """
-        # Each set of 3 nakshatras (0-2, 3-5, 6-8...) is ruled by a planet
-        # This maps to the order: Ketu, Venus, Sun, Moon, Mars, Rahu, Jupiter, Saturn, Mercury
-        lord_index = (nakshatra_num // 3) % 9
+        # Lords repeat every 9 nakshatras in the order:
+        # Ketu, Venus, Sun, Moon, Mars, Rahu, Jupiter, Saturn, Mercury
+        lord_index = nakshatra_num % 9
         return self.DASHA_ORDER[lord_index]
 
     def calculate_dasha_balance(self) -> Tuple[str, float, float]:
@@ -376,3 +378,60 @@ class DashaCalculator:
             'best_for': 'Unknown',
             'challenges': 'Unknown'
         })
+
+
+def _build_dasha_cumulative_table() -> np.ndarray:
+    """
+    Build the 9x10 table of cumulative Maha Dasha years.
+
+    Row s lists the years at which each Maha Dasha begins (and the last one
+    ends) for a cycle starting with DASHA_ORDER[s].
+    """
+    durations = np.array([DashaCalculator.DASHA_DURATIONS[p] for p in DashaCalculator.DASHA_ORDER], dtype=np.float64)
+    rotated = durations[(np.arange(9)[:, None] + np.arange(9)[None, :]) % 9]
+    return np.concatenate([np.zeros((9, 1)), np.cumsum(rotated, axis=1)], axis=1)
+
+
+DASHA_DURATION_TABLE = np.array(
+    [DashaCalculator.DASHA_DURATIONS[p] for p in DashaCalculator.DASHA_ORDER], dtype=np.float64
+)
+DASHA_CUMULATIVE_TABLE = _build_dasha_cumulative_table()
+
+
+def calculate_dasha_lords_batch(moon_longitudes, elapsed_years) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate Maha and Antar Dasha lords for many charts and dates at once.
+
+    Antar Dashas within a Maha Dasha follow the same rotated order scaled by
+    the Maha Dasha length, so both levels are read from DASHA_CUMULATIVE_TABLE.
+
+    Args:
+        moon_longitudes: Array (N,) of natal sidereal Moon longitudes
+        elapsed_years: Array (M,) of years elapsed since birth at each date
+
+    Returns:
+        Tuple of (maha, antar) integer arrays of shape (N, M) indexing
+        DashaCalculator.DASHA_ORDER
+    """
+    span = 360.0 / 27.0
+    moon = np.asarray(moon_longitudes, dtype=np.float64) % 360
+    elapsed = np.asarray(elapsed_years, dtype=np.float64)
+
+    nakshatra = np.minimum((moon // span).astype(np.int64), 26)
+    start = nakshatra % 9
+    fraction = (moon - nakshatra * span) / span
+
+    # Years into the 120-year cycle that starts with the birth Maha Dasha
+    offset = (fraction * DASHA_DURATION_TABLE[start])[:, None] + elapsed[None, :]
+    offset = offset % DASHA_CUMULATIVE_TABLE[0, -1]
+
+    cumulative = DASHA_CUMULATIVE_TABLE[start][:, None, :]
+    maha_step = (offset[..., None] >= cumulative[..., 1:]).sum(axis=-1)
+    maha = (start[:, None] + maha_step) % 9
+
+    within = offset - np.take_along_axis(cumulative[:, 0, :], maha_step, axis=1)
+    antar_cumulative = DASHA_CUMULATIVE_TABLE[maha] * (DASHA_DURATION_TABLE[maha] / 120.0)[..., None]
+    antar_step = (within[..., None] >= antar_cumulative[..., 1:]).sum(axis=-1)
+    antar = (maha + antar_step) % 9
+
+    return maha, antar
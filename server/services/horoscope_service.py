@@ -9,6 +9,8 @@ from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional
 from enum import Enum
 
+from server.services.panchang_calculator import get_noon_tithi, get_lunation_dates
+
 logger = logging.getLogger(__name__)
 
 # Zodiac signs order
@@ -56,6 +58,19 @@ LUCKY_ELEMENTS = {
 }
 
 
+# Luck bonus per lunar phase
+LUNAR_PHASE_EFFECTS = {
+    "Waxing Crescent": 15,  # building energy
+    "First Quarter": 20,
+    "Waxing Gibbous": 20,   # strongest
+    "Full Moon": 20,
+    "Waning Gibbous": 10,   # releasing energy
+    "Last Quarter": 10,
+    "Waning Crescent": 5,
+    "Dark Moon": 5,         # introspective
+}
+
+
 class HoroscopeType(str, Enum):
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -398,44 +413,43 @@ class HoroscopeService:
 
     def _calculate_lunar_effect(self, target_date: date) -> float:
         """Calculate lunar phase effect on horoscope"""
-        # Simplified lunar calculation
-        day_of_month = target_date.day
-
-        if day_of_month < 8:
-            return 15  # Waxing crescent - building energy
-        elif day_of_month < 15:
-            return 20  # Waxing gibbous - strongest
-        elif day_of_month < 23:
-            return 10  # Waning - releasing energy
-        else:
-            return 5  # Dark moon - introspective
+        return LUNAR_PHASE_EFFECTS.get(self._get_lunar_phase(target_date), 10)
 
     def _get_lunar_phase(self, target_date: date) -> str:
-        """Get lunar phase name"""
-        day_of_month = target_date.day
-
-        if day_of_month < 8:
+        """Get lunar phase name from the tithi in effect at noon"""
+        try:
+            tithi = get_noon_tithi(target_date)
+        except Exception as e:
+            logger.warning(f"Panchang unavailable for {target_date}, approximating lunar phase: {e}")
+            # Approximate the tithi from a mean synodic month
+            days_since_new_moon = (target_date - date(2000, 1, 6)).days % 29.530588
+            tithi = int(days_since_new_moon / 29.530588 * 30)
+
+        if tithi == 29:
+            return "Dark Moon"
+        if tithi == 14:
+            return "Full Moon"
+        if tithi == 7:
+            return "First Quarter"
+        if tithi == 22:
+            return "Last Quarter"
+        if tithi < 7:
             return "Waxing Crescent"
-        elif day_of_month == 8 or day_of_month == 15:
-            return "First/Full Quarter"
-        elif day_of_month < 15:
+        if tithi < 14:
             return "Waxing Gibbous"
-        elif day_of_month < 23:
+        if tithi < 22:
             return "Waning Gibbous"
-        elif day_of_month == 23:
-            return "Last Quarter"
-        else:
-            return "Dark Moon"
+        return "Waning Crescent"
 
     def _calculate_lunar_impact(self, lunar_phase: str, zodiac_sign: str) -> str:
         """Generate description of lunar impact"""
         water_signs = ["Cancer", "Scorpio", "Pisces"]
 
-        if "Waxing" in lunar_phase:
+        if "Waxing" in lunar_phase or lunar_phase == "First Quarter":
             impact = "Energetic. Good for starting new ventures and projects."
         elif "Full" in lunar_phase:
             impact = "Peak energy. Culminations and revelations. Full clarity."
-        elif "Waning" in lunar_phase:
+        elif "Waning" in lunar_phase or lunar_phase == "Last Quarter":
             impact = "Releasing energy. Good for completion and letting go."
         else:
             impact = "Introspective. Good for rest and inner work."
@@ -724,18 +738,22 @@ class HoroscopeService:
 
     def _get_key_dates_for_month(self, year: int, month: int, zodiac_sign: str) -> List[Dict[str, Any]]:
         """Get key astronomical dates for the month"""
-        # Simplified - would integrate with actual astronomical calendar in production
-        return [
-            {
-                "date": f"{year}-{month:02d}-05",
-                "event": "New Moon",
-                "impact": "High - New beginnings and fresh starts",
-                "advice": f"Perfect time for {zodiac_sign} to set intentions"
-            },
-            {
-                "date": f"{year}-{month:02d}-20",
-                "event": "Full Moon",
-                "impact": "High - Culminations and revelations",
-                "advice": "Complete projects and celebrate achievements"
-            }
-        ]
+        advice = {
+            "New Moon": ("High - New beginnings and fresh starts", f"Perfect time for {zodiac_sign} to set intentions"),
+            "Full Moon": ("High - Culminations and revelations", "Complete projects and celebrate achievements"),
+        }
+
+        key_dates = []
+        try:
+            for lunation in get_lunation_dates(year, month):
+                impact, tip = advice[lunation["event"]]
+                key_dates.append({
+                    "date": lunation["datetime"][:10],
+                    "event": lunation["event"],
+                    "impact": impact,
+                    "advice": tip
+                })
+        except Exception as e:
+            logger.warning(f"Could not get lunation dates for {year}-{month:02d}: {e}")
+
+        return key_dates
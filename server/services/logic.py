@@ -12,10 +12,11 @@ from server.pydantic_schemas.kundali_schema import (
     DashaInfo,
     ShaBalaInfo,
     DivisionalChartsInfo,
+    HouseCusps,
 )
 
 from server.utils.astro_utils import (
-    calculate_ascendant,
+    calculate_houses,
     get_nakshatra,
     calculate_planet_positions,
     assign_planets_to_houses,
@@ -34,6 +35,80 @@ from server.rule_engine.rules.varga_rules import VargaRules
 
 logger = logging.getLogger(__name__)
 
+def build_planet_details(planet_positions, house_assignments):
+    """
+    Build the PlanetDetails of a chart from its positions and house assignments.
+    """
+    planet_nakshatras = {p: get_nakshatra(pos) for p, pos in planet_positions.items()}
+    return {
+        planet: PlanetDetails(
+            longitude=pos,
+            sign=get_zodiac_sign(pos),
+            nakshatra=planet_nakshatras[planet][0],
+            pada=planet_nakshatras[planet][1],
+            house=next(h for h, plist in house_assignments.items() if planet in plist),
+        )
+        for planet, pos in planet_positions.items()
+    }
+
+
+def calculate_shad_bala(planets, ascendant_index, asc_deg_normalized, planet_positions, house_assignments, birth_date):
+    """
+    Calculate Shad Bala enhanced with house lord strengths, yogas and aspects.
+
+    Shared by Kundali generation and the ML training-data builder, so both
+    produce the same strength features.
+
+    Returns:
+        ShaBalaInfo, or None if the strengths could not be calculated
+    """
+    try:
+        # Convert PlanetDetails to dict for StrengthCalculator
+        planets_dict = {name: planet.model_dump() for name, planet in planets.items()}
+        strength_calculator = StrengthCalculator(
+            planets_info=planets_dict,
+            ascendant_sign=ascendant_index,
+            birth_date=birth_date
+        )
+        shad_bala_data = strength_calculator.calculate_all_strengths()
+
+        # Enhance with yoga and house lord strengths
+        try:
+            enhancer = EnhancedShadBalaCalculator(
+                ascendant_degree=asc_deg_normalized,
+                planet_positions=planet_positions,
+                house_assignments=house_assignments
+            )
+
+            # Add house lord strengths
+            house_lord_strengths = enhancer.calculate_house_lord_strengths(
+                shad_bala_data.get('planetary_strengths', {})
+            )
+
+            # Add yoga analysis
+            yogas = enhancer.calculate_yogas(
+                shad_bala_data.get('planetary_strengths', {})
+            )
+
+            # Add aspect strengths
+            aspect_strengths = enhancer.calculate_aspect_strengths()
+
+            shad_bala_data['house_lord_strengths'] = house_lord_strengths
+            shad_bala_data['yogas'] = yogas
+            shad_bala_data['aspect_strengths'] = aspect_strengths
+
+            logger.info("Enhanced Shad Bala with house lord strengths, yogas, and aspects")
+        except Exception as e:
+            logger.warning(f"Could not enhance Shad Bala: {str(e)}")
+
+        shad_bala_info = ShaBalaInfo(**shad_bala_data)
+        logger.info("Successfully calculated Shad Bala (Planetary Strengths)")
+        return shad_bala_info
+    except Exception as e:
+        logger.warning(f"Could not calculate Shad Bala: {str(e)}")
+        return None
+
+
 # Enhanced service function
 async def generate_kundali_logic(birth_details: KundaliRequest) -> KundaliResponse:
     ml_generator = KundaliMLDataGenerator()
@@ -44,8 +119,11 @@ async def generate_kundali_logic(birth_details: KundaliRequest) -> KundaliRespon
         # Julian day
         jd = get_julian_day_from_birth_details(birth_details)
 
-        # Ascendant
-        asc_deg = calculate_ascendant(jd, birth_details.latitude, birth_details.longitude)
+        # Houses (cusps, MC and ascendant) computed once and shared below
+        house_data = calculate_houses(
+            jd, birth_details.latitude, birth_details.longitude, ayanamsa=birth_details.ayanamsa
+        )
+        asc_deg = house_data["ascendant"]
         asc_nakshatra, asc_pada = get_nakshatra(asc_deg)
         asc_sign = get_zodiac_sign(asc_deg)
 
@@ -61,21 +139,11 @@ async def generate_kundali_logic(birth_details: KundaliRequest) -> KundaliRespon
         )
 
         # Planet positions with coordinates for enhanced accuracy
-        planet_positions = calculate_planet_positions(jd)
+        planet_positions = calculate_planet_positions(jd, ayanamsa=birth_details.ayanamsa)
         house_assignments = assign_planets_to_houses(planet_positions, asc_deg)
-        planet_nakshatras = {p: get_nakshatra(pos) for p, pos in planet_positions.items()}
 
         # Planets
-        planets = {
-            planet: PlanetDetails(
-                longitude=pos,
-                sign=get_zodiac_sign(pos),
-                nakshatra=planet_nakshatras[planet][0],
-                pada=planet_nakshatras[planet][1],
-                house=next(h for h, plist in house_assignments.items() if planet in plist),
-            )
-            for planet, pos in planet_positions.items()
-        }
+        planets = build_planet_details(planet_positions, house_assignments)
 
         # Houses
         houses = {
@@ -122,58 +190,18 @@ async def generate_kundali_logic(birth_details: KundaliRequest) -> KundaliRespon
             dasha_info = None
 
         # Calculate Shad Bala (Six Strength Measures) with enhancements
-        shad_bala_info = None
-        try:
-            # Convert PlanetDetails to dict for StrengthCalculator
-            planets_dict = {name: planet.model_dump() for name, planet in planets.items()}
-            strength_calculator = StrengthCalculator(
-                planets_info=planets_dict,
-                ascendant_sign=ascendant.index,
-                birth_date=datetime.strptime(birth_details.birthDate, "%Y-%m-%d")
-            )
-            shad_bala_data = strength_calculator.calculate_all_strengths()
-
-            # Enhance with yoga and house lord strengths
-            try:
-                enhancer = EnhancedShadBalaCalculator(
-                    ascendant_degree=asc_deg_normalized,
-                    planet_positions=planet_positions,
-                    house_assignments=house_assignments
-                )
-
-                # Add house lord strengths
-                house_lord_strengths = enhancer.calculate_house_lord_strengths(
-                    shad_bala_data.get('planetary_strengths', {})
-                )
-
-                # Add yoga analysis
-                yogas = enhancer.calculate_yogas(
-                    shad_bala_data.get('planetary_strengths', {})
-                )
-
-                # Add aspect strengths
-                aspect_strengths = enhancer.calculate_aspect_strengths()
-
-                shad_bala_data['house_lord_strengths'] = house_lord_strengths
-                shad_bala_data['yogas'] = yogas
-                shad_bala_data['aspect_strengths'] = aspect_strengths
-
-                logger.info("Enhanced Shad Bala with house lord strengths, yogas, and aspects")
-            except Exception as e:
-                logger.warning(f"Could not enhance Shad Bala: {str(e)}")
-
-            shad_bala_info = ShaBalaInfo(**shad_bala_data)
-            logger.info("Successfully calculated Shad Bala (Planetary Strengths)")
-        except Exception as e:
-            logger.warning(f"Could not calculate Shad Bala: {str(e)}")
-            shad_bala_info = None
+        shad_bala_info = calculate_shad_bala(
+            planets, ascendant.index, asc_deg_normalized, planet_positions, house_assignments,
+            birth_date=datetime.strptime(birth_details.birthDate, "%Y-%m-%d"),
+        )
 
         # Calculate Divisional Charts (Vargas)
         divisional_charts_info = None
         try:
             varga_calculator = VargaCalculator(
                 planets_info=planet_positions,
-                ascendant_degree=asc_deg_normalized
+                ascendant_degree=asc_deg_normalized,
+                houses=house_data
             )
             vargas_data = varga_calculator.calculate_all_vargas()
 
@@ -202,6 +230,7 @@ async def generate_kundali_logic(birth_details: KundaliRequest) -> KundaliRespon
             dasha=dasha_info,
             shad_bala=shad_bala_info,
             divisional_charts=divisional_charts_info,
+            house_cusps=HouseCusps(**house_data),
             generated_at=datetime.now()
         )
 
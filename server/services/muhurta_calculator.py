@@ -0,0 +1,299 @@
+"""
+Muhurta Calculator Module
+Searches a date range for auspicious windows to begin an undertaking.
+
+Each instant is scored against configurable criteria:
+- Tithi: avoid Rikta tithis (4th, 9th, 14th) and Amavasya
+- Nakshatra: Moon in a favourable nakshatra
+- Ascendant: rising sign ruled by a natural benefic
+- Kendras: no malefics in the 1st, 4th, 7th or 10th house
+- Tara bala: Moon's nakshatra counted from the natal Moon's nakshatra
+
+The range is first sampled on a coarse grid with batch ephemeris arrays.
+Runs of samples that share the same scoring state become candidate windows,
+and the boundaries between runs are then refined by vectorised bisection.
+
+Author: Astrology Backend
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+from server.services.panchang_calculator import (
+    DEFAULT_TIMEZONE,
+    NAKSHATRA_NAMES,
+    TITHI_NAMES,
+    PanchangCalendar,
+    tithi_paksha,
+)
+from server.utils.astro_utils import calculate_ascendant_batch, calculate_planet_positions_batch
+
+logger = logging.getLogger(__name__)
+
+
+SIGNS = [
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
+]
+
+MALEFIC_PLANETS = ('Sun', 'Mars', 'Saturn', 'Rahu', 'Ketu')
+
+# Rikta tithis (Chaturthi, Navami, Chaturdashi of each paksha) and Amavasya, 1-based
+RIKTA_TITHIS = (4, 9, 14, 19, 24, 29)
+DEFAULT_AVOIDED_TITHIS = RIKTA_TITHIS + (30,)
+
+# Fixed, soft and movable nakshatras commonly accepted for auspicious beginnings
+DEFAULT_FAVORABLE_NAKSHATRAS = (
+    'Ashwini', 'Rohini', 'Mrigashira', 'Punarvasu', 'Pushya', 'Uttara Phalguni',
+    'Hasta', 'Chitra', 'Swati', 'Anuradha', 'Uttara Ashadha', 'Shravana',
+    'Dhanishta', 'Shatabhisha', 'Uttara Bhadrapada', 'Revati'
+)
+
+# Signs ruled by natural benefics (Moon, Mercury, Jupiter, Venus)
+DEFAULT_FAVORABLE_ASCENDANTS = ('Taurus', 'Gemini', 'Cancer', 'Virgo', 'Libra', 'Sagittarius', 'Pisces')
+
+TARA_NAMES = ['Janma', 'Sampat', 'Vipat', 'Kshema', 'Pratyari', 'Sadhana', 'Vadha', 'Mitra', 'Parama Mitra']
+FAVORABLE_TARAS = (2, 4, 6, 8, 9)
+
+# Search settings
+DEFAULT_STEP_MINUTES = 10
+MAX_SEARCH_DAYS = 62
+_REFINE_ITERATIONS = 10   # 10-minute step / 2**10 < 1 s
+
+
+@dataclass
+class MuhurtaCriteria:
+    """Scoring criteria and weights for a muhurta search."""
+    avoided_tithis: Sequence[int] = DEFAULT_AVOIDED_TITHIS
+    favorable_nakshatras: Sequence[str] = DEFAULT_FAVORABLE_NAKSHATRAS
+    favorable_ascendants: Sequence[str] = DEFAULT_FAVORABLE_ASCENDANTS
+    malefics: Sequence[str] = MALEFIC_PLANETS
+    tithi_weight: float = 2.0
+    nakshatra_weight: float = 2.0
+    ascendant_weight: float = 1.5
+    kendra_weight: float = 2.0
+    tara_weight: float = 2.0
+    weights: Dict[str, float] = field(init=False)
+
+    def __post_init__(self):
+        unknown = [n for n in self.favorable_nakshatras if n not in NAKSHATRA_NAMES]
+        unknown += [s for s in self.favorable_ascendants if s not in SIGNS]
+        unknown += [p for p in self.malefics if p not in ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter',
+                                                          'Venus', 'Saturn', 'Rahu', 'Ketu')]
+        if unknown:
+            raise ValueError(f"Unknown names in muhurta criteria: {', '.join(unknown)}")
+        if any(not 1 <= t <= 30 for t in self.avoided_tithis):
+            raise ValueError("Tithi numbers must be between 1 and 30")
+
+        self.weights = {
+            'tithi': self.tithi_weight,
+            'nakshatra': self.nakshatra_weight,
+            'ascendant': self.ascendant_weight,
+            'kendra': self.kendra_weight,
+            'tara': self.tara_weight,
+        }
+
+
+def tara_number(nakshatra_index, natal_nakshatra_index):
+    """Get the 1-based Tara (1-9) of a nakshatra counted from the natal one."""
+    return (np.asarray(nakshatra_index) - natal_nakshatra_index) % 27 % 9 + 1
+
+
+class MuhurtaSearch:
+    """
+    Ranked muhurta windows over a range of civil days at one location.
+
+    Every scoring input is evaluated for arrays of instants, so the coarse scan
+    and each bisection round are a handful of numpy operations.
+    """
+
+    def __init__(self, start: date, days: int, latitude: float, longitude: float,
+                 timezone: str = DEFAULT_TIMEZONE,
+                 natal_moon_nakshatra: Optional[str] = None,
+                 criteria: Optional[MuhurtaCriteria] = None,
+                 step_minutes: int = DEFAULT_STEP_MINUTES):
+        """
+        Initialize Muhurta Search.
+
+        Args:
+            start: First civil day to search
+            days: Number of days to search
+            latitude: Location latitude
+            longitude: Location longitude
+            timezone: IANA timezone name defining the civil days
+            natal_moon_nakshatra: Natal Moon nakshatra for Tara bala (optional)
+            criteria: Scoring criteria (defaults to MuhurtaCriteria())
+            step_minutes: Coarse scan resolution
+        """
+        if not 1 <= days <= MAX_SEARCH_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_SEARCH_DAYS}")
+        if natal_moon_nakshatra is not None and natal_moon_nakshatra not in NAKSHATRA_NAMES:
+            raise ValueError(f"Unknown nakshatra: {natal_moon_nakshatra}")
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.criteria = criteria or MuhurtaCriteria()
+        self.natal_nakshatra = (NAKSHATRA_NAMES.index(natal_moon_nakshatra)
+                                if natal_moon_nakshatra is not None else None)
+
+        self.calendar = PanchangCalendar(timezone, start, days)
+        self.jd_start = float(self.calendar.day_start_jd[0])
+        self.jd_end = float(self.calendar.day_start_jd[-1])
+        self.step = step_minutes / 1440.0
+
+        # Sign membership masks used by the scorer
+        self._avoided_tithi = np.zeros(30, dtype=bool)
+        self._avoided_tithi[np.array(self.criteria.avoided_tithis, dtype=int) - 1] = True
+        self._favorable_nakshatra = np.isin(NAKSHATRA_NAMES, self.criteria.favorable_nakshatras)
+        self._favorable_ascendant = np.isin(SIGNS, self.criteria.favorable_ascendants)
+
+        # Slow-moving malefic positions, interpolated from ephemeris nodes
+        self._malefic_nodes = np.arange(self.jd_start - 1, self.jd_end + 2, 1.0)
+        malefic_positions = calculate_planet_positions_batch(
+            self._malefic_nodes, self.criteria.malefics, node_step=1.0
+        )
+        self._malefic_unwrapped = np.array([
+            np.unwrap(np.radians(malefic_positions[p])) for p in self.criteria.malefics
+        ]).reshape(len(self.criteria.malefics), -1)
+
+    def _state(self, jds: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every scoring input at an array of instants.
+
+        Returns:
+            Dictionary of integer arrays: tithi, nakshatra, ascendant sign and a
+            bit mask of malefics in kendras
+        """
+        state = {}
+        for element in ('tithi', 'nakshatra'):
+            starts, indexes = self.calendar.transitions[element]
+            state[element] = indexes[np.searchsorted(starts, jds, side='right') - 1].astype(np.int64)
+
+        asc_sign = (calculate_ascendant_batch(jds, self.latitude, self.longitude) // 30).astype(np.int64)
+        state['ascendant'] = asc_sign
+
+        kendra_mask = np.zeros(len(jds), dtype=np.int64)
+        for bit, unwrapped in enumerate(self._malefic_unwrapped):
+            longitude = np.degrees(np.interp(jds, self._malefic_nodes, unwrapped)) % 360
+            house_offset = ((longitude // 30).astype(np.int64) - asc_sign) % 12
+            kendra_mask |= (house_offset % 3 == 0).astype(np.int64) << bit
+        state['kendra'] = kendra_mask
+        return state
+
+    @staticmethod
+    def _state_key(state: Dict[str, np.ndarray]) -> np.ndarray:
+        """Pack a state into one integer per instant for change detection."""
+        return (((state['tithi'] * 27 + state['nakshatra']) * 12 + state['ascendant']) << 16) | state['kendra']
+
+    def _score(self, state: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Score states against the criteria.
+
+        Returns:
+            Tuple of (score 0-100 per instant, per-criterion pass flags)
+        """
+        passes = {
+            'tithi': ~self._avoided_tithi[state['tithi']],
+            'nakshatra': self._favorable_nakshatra[state['nakshatra']],
+            'ascendant': self._favorable_ascendant[state['ascendant']],
+            'kendra': state['kendra'] == 0,
+        }
+        if self.natal_nakshatra is not None:
+            taras = tara_number(state['nakshatra'], self.natal_nakshatra)
+            passes['tara'] = np.isin(taras, FAVORABLE_TARAS)
+
+        weights = self.criteria.weights
+        total = sum(weights[name] for name in passes)
+        points = sum(weights[name] * flags for name, flags in passes.items())
+        score = 100.0 * points / total if total else np.zeros(len(state['tithi']))
+        return score, passes
+
+    def _refine_boundaries(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Bisect every state change between paired samples at once.
+
+        Args:
+            left: Julian Days of the last samples before each change
+            right: Julian Days of the first samples after each change
+
+        Returns:
+            Julian Days of the refined change instants
+        """
+        if len(left) == 0:
+            return left
+        left_key = self._state_key(self._state(left))
+        for _ in range(_REFINE_ITERATIONS):
+            mid = (left + right) / 2
+            same = self._state_key(self._state(mid)) == left_key
+            left = np.where(same, mid, left)
+            right = np.where(same, right, mid)
+        return right
+
+    def find_windows(self, min_score: float = 60.0, max_results: int = 20) -> List[Dict]:
+        """
+        Find ranked muhurta windows.
+
+        Args:
+            min_score: Minimum window score (0-100)
+            max_results: Maximum number of windows to return
+
+        Returns:
+            Windows sorted by score then duration, each with times and reasons
+        """
+        jds = np.arange(self.jd_start, self.jd_end, self.step)
+        state = self._state(jds)
+        keys = self._state_key(state)
+
+        # Runs of identical state: [run_start, run_end) sample indexes
+        changes = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        run_starts = np.concatenate(([0], changes))
+        boundaries = np.concatenate((
+            [self.jd_start],
+            self._refine_boundaries(jds[changes - 1], jds[changes]),
+            [self.jd_end],
+        ))
+
+        run_state = {name: values[run_starts] for name, values in state.items()}
+        scores, passes = self._score(run_state)
+        durations = (boundaries[1:] - boundaries[:-1]) * 1440.0
+
+        candidates = np.flatnonzero(scores >= min_score)
+        order = np.lexsort((-durations[candidates], -scores[candidates]))
+        selected = candidates[order][:max_results]
+
+        logger.debug(f"Muhurta search: {len(jds)} samples, {len(run_starts)} runs, "
+                     f"{len(candidates)} candidates")
+
+        return [
+            self._describe_window(k, boundaries, scores, durations, run_state, passes)
+            for k in selected
+        ]
+
+    def _describe_window(self, k: int, boundaries: np.ndarray, scores: np.ndarray,
+                         durations: np.ndarray, run_state: Dict[str, np.ndarray],
+                         passes: Dict[str, np.ndarray]) -> Dict:
+        """Build the response dict for one run."""
+        tithi = int(run_state['tithi'][k])
+        nakshatra = int(run_state['nakshatra'][k])
+        kendra = int(run_state['kendra'][k])
+
+        window = {
+            'starts_at': self.calendar.format_jd(boundaries[k]),
+            'ends_at': self.calendar.format_jd(boundaries[k + 1]),
+            'duration_minutes': round(float(durations[k]), 1),
+            'score': round(float(scores[k]), 1),
+            'tithi': {'number': tithi + 1, 'name': TITHI_NAMES[tithi], 'paksha': tithi_paksha(tithi)},
+            'nakshatra': NAKSHATRA_NAMES[nakshatra],
+            'ascendant': SIGNS[int(run_state['ascendant'][k])],
+            'malefics_in_kendras': [p for bit, p in enumerate(self.criteria.malefics) if kendra >> bit & 1],
+            'criteria_met': [name for name, flags in passes.items() if flags[k]],
+            'criteria_failed': [name for name, flags in passes.items() if not flags[k]],
+        }
+        if self.natal_nakshatra is not None:
+            tara = int(tara_number(nakshatra, self.natal_nakshatra))
+            window['tara'] = {'number': tara, 'name': TARA_NAMES[tara - 1]}
+        return window
@@ -0,0 +1,420 @@
+"""
+Panchang Calculator Module
+Computes the five limbs of the Hindu almanac (Panchang) for civil days.
+
+Limbs:
+- Tithi: lunar day, every 12 degrees of Moon-Sun elongation (30 per month)
+- Karana: half tithi, every 6 degrees of elongation (60 per month)
+- Nakshatra: Moon's lunar mansion, every 13 degrees 20 minutes of sidereal Moon
+- Yoga: every 13 degrees 20 minutes of sidereal Sun + Moon
+- Vara: weekday
+
+Transition instants are found with a Newton root-finder on the relevant
+angle, using the daily motions reported by Swiss Ephemeris. A month of
+transitions is computed once per timezone and stored as compact arrays, so
+a day lookup is a cached index read rather than repeated ephemeris work.
+
+Author: Astrology Backend
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pytz
+
+from server.utils.ayanamsa import get_ayanamsa_series
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIMEZONE = 'Asia/Kolkata'
+
+TITHI_NAMES = [
+    'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi',
+    'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi',
+    'Trayodashi', 'Chaturdashi', 'Purnima',
+    'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi',
+    'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi',
+    'Trayodashi', 'Chaturdashi', 'Amavasya',
+]
+
+NAKSHATRA_NAMES = [
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira',
+    'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha', 'Magha',
+    'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra',
+    'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula',
+    'Purva Ashadha', 'Uttara Ashadha', 'Shravana',
+    'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada',
+    'Uttara Bhadrapada', 'Revati'
+]
+
+YOGA_NAMES = [
+    'Vishkambha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda',
+    'Sukarma', 'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva',
+    'Vyaghata', 'Harshana', 'Vajra', 'Siddhi', 'Vyatipata', 'Variyan',
+    'Parigha', 'Shiva', 'Siddha', 'Sadhya', 'Shubha', 'Shukla',
+    'Brahma', 'Indra', 'Vaidhriti'
+]
+
+# 60 karanas per lunar month: Kimstughna, 8 cycles of the 7 movable karanas,
+# then the three fixed karanas
+_MOVABLE_KARANAS = ['Bava', 'Balava', 'Kaulava', 'Taitila', 'Garaja', 'Vanija', 'Vishti']
+KARANA_NAMES = ['Kimstughna'] + _MOVABLE_KARANAS * 8 + ['Shakuni', 'Chatushpada', 'Naga']
+
+VARA_NAMES = ['Somavara', 'Mangalavara', 'Budhavara', 'Guruvara', 'Shukravara', 'Shanivara', 'Ravivara']
+
+# Angular span (degrees) and count of each limb that is solved for
+ELEMENT_SPANS = {
+    'karana': (6.0, 60),
+    'nakshatra': (360.0 / 27.0, 27),
+    'yoga': (360.0 / 27.0, 27),
+}
+ELEMENT_NAMES = {
+    'tithi': TITHI_NAMES,
+    'karana': KARANA_NAMES,
+    'nakshatra': NAKSHATRA_NAMES,
+    'yoga': YOGA_NAMES,
+}
+
+# Padding (days) around a calendar span so periods at its edges have real bounds
+_CALENDAR_MARGIN_DAYS = 2.0
+
+# Root-finder settings
+_TOLERANCE_DEG = 1e-5     # ~0.1 s of lunar motion
+_MAX_ITERATIONS = 12
+
+_J2000_JD = 2451545.0
+_J2000 = datetime(2000, 1, 1, 12, tzinfo=pytz.UTC)
+
+
+def datetime_to_jd(dt: datetime) -> float:
+    """Convert an aware datetime to a Julian Day (UT)."""
+    return _J2000_JD + (dt - _J2000).total_seconds() / 86400.0
+
+
+def jd_to_datetime(jd: float, tz=pytz.UTC) -> datetime:
+    """Convert a Julian Day (UT) to an aware datetime in the given timezone."""
+    return (_J2000 + timedelta(days=jd - _J2000_JD)).astimezone(tz)
+
+
+def _sidereal_sun_moon(jd: float) -> Tuple[float, float, float, float]:
+    """
+    Get sidereal Sun and Moon longitudes and daily motions.
+
+    Args:
+        jd: Julian Day (UT)
+
+    Returns:
+        Tuple of (sun longitude, moon longitude, sun speed, moon speed)
+    """
+    import swisseph  # Lazy import to avoid import-time failures
+
+    ayanamsa = float(get_ayanamsa_series(jd))
+    flag = swisseph.FLG_SWIEPH | swisseph.FLG_SPEED
+    sun = swisseph.calc_ut(jd, swisseph.SUN, flag)[0]
+    moon = swisseph.calc_ut(jd, swisseph.MOON, flag)[0]
+    return (sun[0] - ayanamsa) % 360, (moon[0] - ayanamsa) % 360, sun[3], moon[3]
+
+
+def _element_angle(element: str, jd: float) -> Tuple[float, float]:
+    """
+    Get the angle that drives a limb and its rate of change.
+
+    Args:
+        element: 'karana', 'nakshatra' or 'yoga'
+        jd: Julian Day (UT)
+
+    Returns:
+        Tuple of (angle in degrees 0-360, rate in degrees per day)
+    """
+    sun, moon, sun_speed, moon_speed = _sidereal_sun_moon(jd)
+    if element == 'karana':
+        return (moon - sun) % 360, moon_speed - sun_speed
+    if element == 'nakshatra':
+        return moon, moon_speed
+    return (sun + moon) % 360, sun_speed + moon_speed
+
+
+def find_next_transition(element: str, jd: float) -> Tuple[float, int]:
+    """
+    Find the next instant a limb changes, by Newton iteration on its angle.
+
+    Args:
+        element: 'karana', 'nakshatra' or 'yoga'
+        jd: Julian Day (UT) to search from
+
+    Returns:
+        Tuple of (transition Julian Day, limb index that starts there)
+    """
+    span, count = ELEMENT_SPANS[element]
+    angle, rate = _element_angle(element, jd)
+    index = int(angle // span) % count
+    target = ((index + 1) * span) % 360
+
+    for _ in range(_MAX_ITERATIONS):
+        diff = (target - angle + 180.0) % 360.0 - 180.0
+        if abs(diff) < _TOLERANCE_DEG:
+            break
+        jd += diff / rate
+        angle, rate = _element_angle(element, jd)
+
+    return jd, (index + 1) % count
+
+
+def compute_transitions(element: str, jd_start: float, jd_end: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute every change of a limb in a time range.
+
+    Args:
+        element: 'karana', 'nakshatra' or 'yoga'
+        jd_start: Range start (UT)
+        jd_end: Range end (UT)
+
+    Returns:
+        Tuple of (start Julian Days, limb indexes); the first entry is the limb
+        in effect at jd_start
+    """
+    span, count = ELEMENT_SPANS[element]
+    angle, _ = _element_angle(element, jd_start)
+    jds = [jd_start]
+    indexes = [int(angle // span) % count]
+
+    jd = jd_start
+    while True:
+        jd, index = find_next_transition(element, jd)
+        if jd >= jd_end:
+            break
+        if index != indexes[-1]:
+            jds.append(jd)
+            indexes.append(index)
+        # Step past the boundary (~9 s) so the next search starts inside the new limb
+        jd += 1e-4
+
+    return np.array(jds, dtype=np.float64), np.array(indexes, dtype=np.int8)
+
+
+class PanchangCalendar:
+    """
+    Precomputed Panchang transitions over a span of civil days in one timezone.
+
+    Each limb is stored as a pair of arrays (start Julian Day, index), plus the
+    limb in effect at each local noon, so day lookups are searchsorted reads.
+    """
+
+    def __init__(self, timezone: str, start: date, days: int):
+        """
+        Initialize Panchang Calendar.
+
+        Args:
+            timezone: IANA timezone name defining the civil day
+            start: First civil day
+            days: Number of days to precompute
+        """
+        self.timezone = timezone
+        self.tz = pytz.timezone(timezone)
+        self.start = start
+        self.days = days
+
+        # Local midnights (days + 1 boundaries) and local noons as Julian Days
+        self.day_start_jd = np.array([
+            datetime_to_jd(self.tz.localize(datetime.combine(start + timedelta(days=i), datetime.min.time())))
+            for i in range(days + 1)
+        ])
+        self.noon_jd = np.array([
+            datetime_to_jd(self.tz.localize(datetime.combine(start + timedelta(days=i), datetime.min.time()) + timedelta(hours=12)))
+            for i in range(days)
+        ])
+
+        jd_start = self.day_start_jd[0] - _CALENDAR_MARGIN_DAYS
+        jd_end = self.day_start_jd[-1] + _CALENDAR_MARGIN_DAYS
+        self.transitions: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            element: compute_transitions(element, jd_start, jd_end)
+            for element in ELEMENT_SPANS
+        }
+
+        # Tithi boundaries are the even karana boundaries
+        karana_jds, karana_indexes = self.transitions['karana']
+        tithi_mask = (karana_indexes % 2 == 0)
+        tithi_mask[0] = True
+        self.transitions['tithi'] = (karana_jds[tithi_mask], (karana_indexes[tithi_mask] // 2).astype(np.int8))
+
+        self.noon_index = {
+            element: indexes[np.searchsorted(jds, self.noon_jd, side='right') - 1]
+            for element, (jds, indexes) in self.transitions.items()
+        }
+
+    def contains(self, target_date: date) -> bool:
+        """Check whether a civil day is covered by this calendar."""
+        return 0 <= (target_date - self.start).days < self.days
+
+    def get_noon_index(self, element: str, target_date: date) -> int:
+        """Get the index of a limb in effect at local noon of a covered day."""
+        return int(self.noon_index[element][(target_date - self.start).days])
+
+    def get_periods(self, element: str, target_date: date) -> List[Dict]:
+        """
+        Get every period of a limb that overlaps a civil day.
+
+        Args:
+            element: 'tithi', 'karana', 'nakshatra' or 'yoga'
+            target_date: Covered civil day
+
+        Returns:
+            List of period dicts with index, name, start and end times
+        """
+        day = (target_date - self.start).days
+        jd0, jd1 = self.day_start_jd[day], self.day_start_jd[day + 1]
+        jds, indexes = self.transitions[element]
+
+        first = np.searchsorted(jds, jd0, side='right') - 1
+        last = np.searchsorted(jds, jd1, side='left')
+        names = ELEMENT_NAMES[element]
+
+        return [
+            {
+                'index': int(indexes[k]),
+                'number': int(indexes[k]) + 1,
+                'name': names[indexes[k]],
+                'starts_at': self.format_jd(jds[k]),
+                'ends_at': self.format_jd(jds[k + 1]),
+            }
+            for k in range(first, last)
+        ]
+
+    def format_jd(self, jd: float) -> str:
+        """Format a Julian Day as a local ISO timestamp."""
+        return jd_to_datetime(jd, self.tz).replace(microsecond=0).isoformat()
+
+
+@lru_cache(maxsize=128)
+def get_month_calendar(timezone: str, year: int, month: int) -> PanchangCalendar:
+    """
+    Get the cached Panchang calendar for a calendar month.
+
+    Args:
+        timezone: IANA timezone name
+        year: Year
+        month: Month (1-12)
+
+    Returns:
+        PanchangCalendar covering the whole month
+    """
+    start = date(year, month, 1)
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    logger.debug(f"Precomputing Panchang calendar for {year}-{month:02d} ({timezone})")
+    return PanchangCalendar(timezone, start, (next_month - start).days)
+
+
+@lru_cache(maxsize=1024)
+def _sun_rise_set(jd_midnight: float, latitude: float, longitude: float) -> Tuple[Optional[float], Optional[float]]:
+    """Get sunrise and sunset Julian Days after a local midnight (None if circumpolar)."""
+    import swisseph  # Lazy import to avoid import-time failures
+
+    geopos = (longitude, latitude, 0.0)
+    times = []
+    for event in (swisseph.CALC_RISE, swisseph.CALC_SET):
+        res, tret = swisseph.rise_trans(jd_midnight, swisseph.SUN, event, geopos)
+        times.append(tret[0] if res == 0 else None)
+    return times[0], times[1]
+
+
+def tithi_paksha(tithi_index: int) -> str:
+    """Get the lunar fortnight of a 0-based tithi index."""
+    return 'Shukla' if tithi_index < 15 else 'Krishna'
+
+
+def get_daily_panchang(target_date: date, timezone: str = DEFAULT_TIMEZONE,
+                       latitude: Optional[float] = None,
+                       longitude: Optional[float] = None) -> Dict:
+    """
+    Get the Panchang for a civil day.
+
+    Args:
+        target_date: Civil day
+        timezone: IANA timezone name defining the civil day
+        latitude: Optional latitude for sunrise/sunset
+        longitude: Optional longitude for sunrise/sunset
+
+    Returns:
+        Dictionary with every limb's periods during the day
+
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    try:
+        tz = pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"Unknown timezone: {timezone}")
+
+    calendar = get_month_calendar(timezone, target_date.year, target_date.month)
+    noon_tithi = calendar.get_noon_index('tithi', target_date)
+
+    panchang = {
+        'date': target_date.isoformat(),
+        'timezone': timezone,
+        'vara': VARA_NAMES[target_date.weekday()],
+        'paksha': tithi_paksha(noon_tithi),
+        'tithi': calendar.get_periods('tithi', target_date),
+        'nakshatra': calendar.get_periods('nakshatra', target_date),
+        'yoga': calendar.get_periods('yoga', target_date),
+        'karana': calendar.get_periods('karana', target_date),
+        'sunrise': None,
+        'sunset': None,
+    }
+
+    if latitude is not None and longitude is not None:
+        day = (target_date - calendar.start).days
+        try:
+            sunrise, sunset = _sun_rise_set(
+                float(calendar.day_start_jd[day]), round(latitude, 2), round(longitude, 2)
+            )
+            panchang['sunrise'] = calendar.format_jd(sunrise) if sunrise else None
+            panchang['sunset'] = calendar.format_jd(sunset) if sunset else None
+        except Exception as e:
+            logger.warning(f"Could not calculate sunrise/sunset: {str(e)}")
+
+    return panchang
+
+
+def get_noon_tithi(target_date: date, timezone: str = DEFAULT_TIMEZONE) -> int:
+    """
+    Get the 0-based tithi in effect at local noon (cached calendar read).
+
+    Args:
+        target_date: Civil day
+        timezone: IANA timezone name
+
+    Returns:
+        Tithi index 0-29 (0 = Shukla Pratipada, 14 = Purnima, 29 = Amavasya)
+    """
+    calendar = get_month_calendar(timezone, target_date.year, target_date.month)
+    return calendar.get_noon_index('tithi', target_date)
+
+
+def get_lunation_dates(year: int, month: int, timezone: str = DEFAULT_TIMEZONE) -> List[Dict]:
+    """
+    Get full and new moon instants in a month from the tithi transitions.
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        timezone: IANA timezone name
+
+    Returns:
+        List of {'event', 'datetime'} dicts in chronological order
+    """
+    calendar = get_month_calendar(timezone, year, month)
+    jds, indexes = calendar.transitions['tithi']
+    # The transitions span a margin on either side; keep the month's own days
+    in_month = (jds >= calendar.day_start_jd[0]) & (jds < calendar.day_start_jd[-1])
+    in_month[0] = False
+    events = []
+    for jd, index in zip(jds[in_month], indexes[in_month]):
+        if index == 15:
+            events.append({'event': 'Full Moon', 'datetime': calendar.format_jd(jd)})
+        elif index == 0:
+            events.append({'event': 'New Moon', 'datetime': calendar.format_jd(jd)})
+    return events
@@ -0,0 +1,554 @@
+"""
+Placement Index
+Columnar bitmap index over saved kundalis for research queries such as
+"Jupiter in house 1 and Moon in Rohini".
+
+Every chart gets a row number. For each term (planet-sign, planet-house,
+planet-nakshatra, yoga) the index holds a bitmap with one bit per row,
+packed 8 rows per byte. Placement terms cover 1/12 to 1/27 of all charts,
+so packed bitmaps are already close to their compressed size and can be
+memory-mapped and combined with numpy bitwise operations directly.
+
+Alongside the bitmaps the index keeps numeric value columns per chart row
+(ML scores, planet strength percentages, dasha lords as codes) for cohort
+aggregation. Values are stored column-major with NaN for missing data.
+
+Snapshots are written as versioned .npy files plus a meta.json that is
+swapped atomically, so readers always map a complete snapshot. The files of
+the snapshot meta.json pointed at before a save are kept until the next
+save, so a reader that has just read meta.json can still map them.
+
+Query format (JSON):
+    "jupiter:house:1"                                 single term
+    {"planet": "Moon", "nakshatra": "Rohini"}          placement (several fields = AND)
+    {"yoga": "Gajakesari Yoga"}                        yoga
+    {"and": [...]}, {"or": [...]}, {"not": query}      boolean operators
+
+Author: Backend API Team
+"""
+
+import json
+import logging
+import numbers
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from server.services.panchang_calculator import NAKSHATRA_NAMES
+
+logger = logging.getLogger(__name__)
+
+PLACEMENT_INDEX_DIR = Path(os.getenv(
+    "PLACEMENT_INDEX_DIR",
+    str(Path(__file__).parent.parent / "placement_index")
+))
+
+PLACEMENT_BODIES = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu", "Ascendant")
+SIGN_NAMES = ("Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+              "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces")
+
+MAX_QUERY_TERMS = 64
+
+DASHA_LORDS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+TARGET_NAMES_PATH = Path(__file__).parent.parent / "ml" / "trained_models" / "target_names.json"
+
+
+def _load_score_columns() -> Tuple[str, ...]:
+    """ML score names from the trained model, falling back to the prediction schema."""
+    try:
+        return tuple(json.loads(TARGET_NAMES_PATH.read_text()))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {TARGET_NAMES_PATH}: {e}")
+        return ("career_potential", "wealth_potential", "marriage_happiness", "children_prospects",
+                "health_status", "spiritual_inclination", "chart_strength", "life_ease_score")
+
+
+SCORE_COLUMNS = _load_score_columns()
+STRENGTH_COLUMNS = tuple(f"{planet.lower()}_strength" for planet in DASHA_LORDS)
+DASHA_COLUMNS = ("maha_dasha_lord", "antar_dasha_lord")
+VALUE_COLUMNS = SCORE_COLUMNS + STRENGTH_COLUMNS + DASHA_COLUMNS
+
+# Set bits per byte value, for counting
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _slug(value: Any) -> str:
+    """Normalize a name for term keys ("Purva Phalguni" -> "purva_phalguni")."""
+    return re.sub(r"[^a-z0-9]+", "_", str(value).lower()).strip("_")
+
+
+_BODY_SLUGS = {_slug(b) for b in PLACEMENT_BODIES}
+_SIGN_SLUGS = {_slug(s) for s in SIGN_NAMES}
+_NAKSHATRA_SLUGS = {_slug(n) for n in NAKSHATRA_NAMES}
+
+
+def placement_term(body: str, kind: str, value: Any) -> str:
+    """
+    Build and validate a placement term key.
+
+    Args:
+        body: Planet name or "Ascendant"
+        kind: "sign", "house" or "nakshatra"
+        value: Sign name, house number (1-12) or nakshatra name
+
+    Returns:
+        Term key such as "jupiter:house:1"
+
+    Raises:
+        ValueError: On unknown bodies, kinds or values
+    """
+    body, kind = _slug(body), _slug(kind)
+    if body not in _BODY_SLUGS:
+        raise ValueError(f"Unknown planet: {body}. Use one of: {', '.join(PLACEMENT_BODIES)}")
+
+    if kind == "house":
+        try:
+            house = int(value)
+        except (TypeError, ValueError):
+            house = 0
+        if not 1 <= house <= 12:
+            raise ValueError(f"House must be between 1 and 12, got {value}")
+        return f"{body}:house:{house}"
+
+    value = _slug(value)
+    if kind == "sign" and value in _SIGN_SLUGS:
+        return f"{body}:sign:{value}"
+    if kind == "nakshatra" and value in _NAKSHATRA_SLUGS:
+        return f"{body}:nakshatra:{value}"
+    raise ValueError(f"Unknown {kind}: {value}")
+
+
+def yoga_term(name: str) -> str:
+    """Term key of a yoga."""
+    return f"yoga:{_slug(name)}"
+
+
+def placement_terms(kundali_data: Dict[str, Any]) -> List[str]:
+    """
+    Extract the indexed terms of a saved chart.
+
+    Args:
+        kundali_data: Kundali analysis as stored in the kundalis collection
+
+    Returns:
+        List of term keys
+    """
+    terms = []
+    for body, info in (kundali_data.get("planets") or {}).items():
+        if not isinstance(info, dict):
+            continue
+        for kind in ("sign", "house", "nakshatra"):
+            if info.get(kind) is not None:
+                try:
+                    terms.append(placement_term(body, kind, info[kind]))
+                except ValueError:
+                    continue
+
+    ascendant = kundali_data.get("ascendant") or {}
+    for kind in ("sign", "nakshatra"):
+        if ascendant.get(kind) is not None:
+            try:
+                terms.append(placement_term("Ascendant", kind, ascendant[kind]))
+            except ValueError:
+                continue
+
+    yogas = ((kundali_data.get("shad_bala") or {}).get("yogas") or {}).get("yogas") or []
+    terms.extend(yoga_term(y["yoga_name"]) for y in yogas if isinstance(y, dict) and y.get("yoga_name"))
+    return terms
+
+
+def chart_values(kundali_data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Extract the strength and dasha value columns of a saved chart.
+
+    Dasha lords are encoded as their position in DASHA_LORDS.
+
+    Returns:
+        Dict of column name to value (missing columns are omitted)
+    """
+    values = {}
+    strengths = (kundali_data.get("shad_bala") or {}).get("planetary_strengths") or {}
+    for planet, column in zip(DASHA_LORDS, STRENGTH_COLUMNS):
+        percentage = (strengths.get(planet) or {}).get("strength_percentage")
+        if isinstance(percentage, numbers.Real):
+            values[column] = float(percentage)
+
+    dasha = kundali_data.get("dasha") or {}
+    for column, field in zip(DASHA_COLUMNS, ("current_maha_dasha", "current_antar_dasha")):
+        if dasha.get(field) in DASHA_LORDS:
+            values[column] = float(DASHA_LORDS.index(dasha[field]))
+    return values
+
+
+def prediction_values(prediction: Dict[str, Any]) -> Dict[str, float]:
+    """Extract the ML score columns of a stored prediction."""
+    return {
+        column: float(prediction[column])
+        for column in SCORE_COLUMNS
+        if isinstance(prediction.get(column), numbers.Real)
+    }
+
+
+class PlacementIndex:
+    """
+    Bitmap index from placement terms to chart rows.
+
+    Usage:
+        index = PlacementIndex()
+        index.set_charts(["id1"], [placement_terms(kundali_data)])
+        index.set_values(["id1"], [chart_values(kundali_data)])
+        bitmap = index.evaluate({"and": ["jupiter:house:1", "moon:nakshatra:rohini"]})
+        index.count(bitmap), index.chart_ids_of(bitmap)
+    """
+
+    def __init__(self, columns: Sequence[str] = VALUE_COLUMNS):
+        """Initialize an empty index with the given value columns."""
+        self.keys: List[str] = []
+        self._key_rows: Dict[str, int] = {}
+        self.bits = np.zeros((0, 0), dtype=np.uint8)
+        self.live = np.zeros(0, dtype=np.uint8)
+        self.columns: List[str] = list(columns)
+        self._column_rows = {column: i for i, column in enumerate(self.columns)}
+        self.values = np.zeros((len(self.columns), 0), dtype=np.float32)
+        self.chart_ids: List[str] = []
+        self._chart_rows: Dict[str, int] = {}
+        self.watermark: Optional[str] = None
+        self.prediction_watermark: Optional[str] = None
+        self.version: Optional[str] = None
+
+    def __len__(self) -> int:
+        """Number of live charts."""
+        return self.count(self.live)
+
+    @property
+    def n_rows(self) -> int:
+        """Rows allocated to charts, including deleted ones."""
+        return len(self.chart_ids)
+
+    def set_charts(self, chart_ids: Sequence[str], terms_list: Sequence[Iterable[str]]) -> None:
+        """
+        Insert or replace charts in bulk.
+
+        Args:
+            chart_ids: Chart ids
+            terms_list: Term keys of each chart
+        """
+        existing = np.array([chart_id in self._chart_rows for chart_id in chart_ids], dtype=bool)
+        rows = np.array([self._chart_row(chart_id) for chart_id in chart_ids], dtype=np.int64)
+        if rows.size == 0:
+            return
+        # Newly allocated rows are already clear
+        if existing.any():
+            self._clear_rows(rows[existing])
+
+        rows_by_key: Dict[str, List[int]] = {}
+        for row, terms in zip(rows, terms_list):
+            for term in set(terms):
+                rows_by_key.setdefault(term, []).append(row)
+        for term, term_rows in rows_by_key.items():
+            key_row = self._key_row(term)
+            self._set_bits(self.bits[key_row], np.array(term_rows, dtype=np.int64))
+        self._set_bits(self.live, rows)
+
+    def set_values(self, chart_ids: Sequence[str], values_list: Sequence[Dict[str, float]]) -> int:
+        """
+        Set value columns of indexed charts. Unknown charts and columns are skipped.
+
+        Args:
+            chart_ids: Chart ids
+            values_list: Column values of each chart (later entries win)
+
+        Returns:
+            Number of charts updated
+        """
+        updates: Dict[Tuple[int, int], float] = {}
+        updated = 0
+        for chart_id, values in zip(chart_ids, values_list):
+            row = self._chart_rows.get(chart_id)
+            if row is None:
+                continue
+            for column, value in values.items():
+                if column in self._column_rows:
+                    updates[self._column_rows[column], row] = value
+            updated += 1
+
+        if updates:
+            cells = np.array(list(updates), dtype=np.int64)
+            self.values[cells[:, 0], cells[:, 1]] = np.fromiter(updates.values(), dtype=np.float32, count=len(updates))
+        return updated
+
+    def remove_charts(self, chart_ids: Iterable[str]) -> int:
+        """
+        Remove charts. Their rows stay allocated until the next full rebuild.
+
+        Returns:
+            Number of charts removed
+        """
+        rows = np.array([self._chart_rows[c] for c in chart_ids if c in self._chart_rows], dtype=np.int64)
+        if rows.size:
+            self._clear_rows(rows)
+        return int(rows.size)
+
+    def evaluate(self, query: Any) -> np.ndarray:
+        """
+        Evaluate a boolean query.
+
+        Args:
+            query: Query in the format described in the module docstring
+
+        Returns:
+            Packed bitmap of matching live charts
+
+        Raises:
+            ValueError: On malformed queries or unknown terms
+        """
+        budget = [MAX_QUERY_TERMS]
+        return self._evaluate(query, budget) & self.live
+
+    def count(self, bitmap: np.ndarray) -> int:
+        """Number of set bits in a packed bitmap."""
+        return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def rows_of(self, bitmap: np.ndarray) -> np.ndarray:
+        """
+        Row numbers of the set bits, ascending.
+
+        Only non-zero bytes are unpacked, so sparse results stay cheap.
+        """
+        nonzero = np.flatnonzero(bitmap)
+        bits = np.unpackbits(bitmap[nonzero]).reshape(-1, 8).astype(bool)
+        return (nonzero[:, None] * 8 + np.arange(8))[bits]
+
+    def chart_ids_of(self, bitmap: np.ndarray, limit: Optional[int] = None, offset: int = 0) -> List[str]:
+        """Chart ids of the set bits, in row order."""
+        end = None if limit is None else offset + limit
+        rows = self.rows_of(bitmap)[offset:end]
+        if isinstance(self.chart_ids, np.ndarray):
+            return self.chart_ids[rows].tolist()
+        return [self.chart_ids[row] for row in rows]
+
+    def term_counts(self) -> Dict[str, int]:
+        """Number of live charts per term."""
+        counts = _POPCOUNT[self.bits & self.live].sum(axis=1, dtype=np.int64)
+        return {key: int(n) for key, n in zip(self.keys, counts)}
+
+    def save(self, directory: Path = PLACEMENT_INDEX_DIR) -> None:
+        """
+        Write a snapshot and atomically point meta.json at it.
+
+        Snapshot files older than the one replaced are removed afterwards.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        version = uuid.uuid4().hex[:12]
+        try:
+            previous = json.loads((directory / "meta.json").read_text())["version"]
+        except (OSError, ValueError, KeyError):
+            previous = None
+
+        np.save(directory / f"bits-{version}.npy", self.bits)
+        np.save(directory / f"live-{version}.npy", self.live)
+        np.save(directory / f"ids-{version}.npy", np.array(self.chart_ids, dtype=str))
+        np.save(directory / f"values-{version}.npy", self.values)
+        meta = {
+            "version": version,
+            "keys": self.keys,
+            "columns": self.columns,
+            "watermark": self.watermark,
+            "prediction_watermark": self.prediction_watermark,
+            "n_rows": self.n_rows,
+        }
+        tmp_meta = directory / "meta.json.tmp"
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, directory / "meta.json")
+        self.version = version
+
+        for path in directory.glob("*.npy"):
+            if path.stem.rsplit("-", 1)[-1] not in (version, previous):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, directory: Path = PLACEMENT_INDEX_DIR, mmap_mode: Optional[str] = "r") -> "PlacementIndex":
+        """
+        Load the current snapshot.
+
+        Args:
+            directory: Index directory
+            mmap_mode: "r" to memory-map read-only, "c" for copy-on-write
+                (for updating), None to read into memory
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        version = meta["version"]
+
+        index = cls(meta.get("columns", VALUE_COLUMNS))
+        index.version = version
+        index.watermark = meta.get("watermark")
+        index.prediction_watermark = meta.get("prediction_watermark")
+        index.keys = list(meta["keys"])
+        index._key_rows = {key: i for i, key in enumerate(index.keys)}
+        index.bits = np.load(directory / f"bits-{version}.npy", mmap_mode=mmap_mode)
+        index.live = np.load(directory / f"live-{version}.npy", mmap_mode=mmap_mode)
+        values_path = directory / f"values-{version}.npy"
+        if values_path.exists():
+            index.values = np.load(values_path, mmap_mode=mmap_mode)
+        else:
+            # Snapshots from before value columns existed
+            index.values = np.full((len(index.columns), index.live.size * 8), np.nan, dtype=np.float32)
+        ids = np.load(directory / f"ids-{version}.npy", mmap_mode=mmap_mode)
+        if mmap_mode == "r":
+            # Read-only readers only need row -> id lookups
+            index.chart_ids = ids
+        else:
+            index.chart_ids = ids.tolist()
+            index._chart_rows = {chart_id: i for i, chart_id in enumerate(index.chart_ids)}
+        return index
+
+    def _chart_row(self, chart_id: str) -> int:
+        """Row of a chart, allocating one (and growing the bitmaps) if new."""
+        row = self._chart_rows.get(chart_id)
+        if row is None:
+            row = len(self.chart_ids)
+            self.chart_ids.append(chart_id)
+            self._chart_rows[chart_id] = row
+            if row >= self.live.size * 8:
+                self._grow_bytes(max(64, 2 * self.live.size))
+        return row
+
+    def _key_row(self, key: str) -> int:
+        """Bitmap row of a term, adding an empty bitmap if new."""
+        row = self._key_rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            self.keys.append(key)
+            self._key_rows[key] = row
+            self.bits = np.vstack((self.bits, np.zeros((1, self.live.size), dtype=np.uint8)))
+        return row
+
+    def _grow_bytes(self, n_bytes: int) -> None:
+        """Widen every bitmap to n_bytes (geometric growth keeps appends cheap)."""
+        grow = n_bytes - self.live.size
+        self.bits = np.pad(self.bits, ((0, 0), (0, grow)))
+        self.live = np.pad(self.live, (0, grow))
+        self.values = np.pad(self.values, ((0, 0), (0, 8 * grow)), constant_values=np.nan)
+
+    @staticmethod
+    def _set_bits(bitmap: np.ndarray, rows: np.ndarray) -> None:
+        """Set the bits of rows in a packed bitmap."""
+        np.bitwise_or.at(bitmap, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+
+    def _clear_rows(self, rows: np.ndarray) -> None:
+        """Clear rows in every bitmap and mark them deleted."""
+        keep = np.full(self.live.size, 0xFF, dtype=np.uint8)
+        np.bitwise_and.at(keep, rows >> 3, (~(0x80 >> (rows & 7))).astype(np.uint8))
+        self.bits &= keep
+        self.live &= keep
+
+    def _evaluate(self, query: Any, budget: List[int]) -> np.ndarray:
+        """Recursive query evaluation; budget caps the number of terms."""
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise ValueError(f"Query has more than {MAX_QUERY_TERMS} terms")
+
+        if isinstance(query, str):
+            return self._term_bitmap(query)
+        if not isinstance(query, dict) or not query:
+            raise ValueError(f"Invalid query: {query!r}")
+
+        if "and" in query or "or" in query:
+            op = "and" if "and" in query else "or"
+            parts = query[op]
+            if not isinstance(parts, list) or not parts:
+                raise ValueError(f"'{op}' needs a non-empty list")
+            result = self._evaluate(parts[0], budget).copy()
+            for part in parts[1:]:
+                if op == "and":
+                    result &= self._evaluate(part, budget)
+                else:
+                    result |= self._evaluate(part, budget)
+            return result
+        if "not" in query:
+            return self.live & ~self._evaluate(query["not"], budget)
+        if "yoga" in query:
+            return self._term_bitmap(yoga_term(query["yoga"]))
+        if "planet" in query:
+            fields = [kind for kind in ("sign", "house", "nakshatra") if kind in query]
+            if not fields:
+                raise ValueError("A planet query needs a sign, house or nakshatra")
+            terms = [placement_term(query["planet"], kind, query[kind]) for kind in fields]
+            return self._evaluate({"and": terms}, budget)
+        raise ValueError(f"Invalid query: {query!r}")
+
+    def _term_bitmap(self, term: str) -> np.ndarray:
+        """Bitmap of one term key (validated; unseen yogas match nothing)."""
+        parts = term.split(":")
+        if len(parts) == 3:
+            term = placement_term(*parts)
+        elif len(parts) == 2 and parts[0] == "yoga":
+            term = yoga_term(parts[1])
+        else:
+            raise ValueError(f"Invalid term: {term}")
+
+        row = self._key_rows.get(term)
+        if row is None:
+            return np.zeros(self.live.size, dtype=np.uint8)
+        return np.asarray(self.bits[row])
+
+
+_index: Optional[PlacementIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_placement_index(directory: Path = PLACEMENT_INDEX_DIR) -> Optional[PlacementIndex]:
+    """
+    Get the memory-mapped index, remapping when a newer snapshot exists.
+
+    Returns:
+        PlacementIndex, or None if no snapshot has been built yet
+    """
+    global _index
+    meta_path = Path(directory) / "meta.json"
+    if not meta_path.exists():
+        return None
+
+    with _index_lock:
+        version = json.loads(meta_path.read_text())["version"]
+        if _index is None or _index.version != version:
+            try:
+                loaded = PlacementIndex.load(directory, mmap_mode="r")
+            except FileNotFoundError as e:
+                # Two saves since meta.json was read; the next call maps the newest
+                if _index is None:
+                    raise
+                logger.warning(f"Placement index {version} was replaced while mapping it: {e}")
+                return _index
+            _index = loaded
+            logger.info(f"Mapped placement index {version}: {_index.n_rows} chart rows, {len(_index.keys)} terms")
+        return _index
+
+
+def run_query(query: Any, limit: int = 100, offset: int = 0,
+              directory: Path = PLACEMENT_INDEX_DIR) -> Tuple[int, List[str]]:
+    """
+    Count and list charts matching a query.
+
+    Returns:
+        Tuple of (total count, chart ids from offset up to limit)
+
+    Raises:
+        RuntimeError: If the index has not been built
+        ValueError: On malformed queries
+    """
+    index = get_placement_index(directory)
+    if index is None:
+        raise RuntimeError("Placement index has not been built yet")
+    bitmap = index.evaluate(query)
+    return index.count(bitmap), index.chart_ids_of(bitmap, limit=limit, offset=offset)
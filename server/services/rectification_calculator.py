@@ -0,0 +1,283 @@
+"""
+Birth Time Rectification Module
+Ranks candidate birth times by how well they explain known life events.
+
+For every candidate minute in a window around the approximate birth time:
+- Ascendant (D1) and the divisional ascendants used by the events
+- Natal Moon, which fixes the Vimshottari Dasha running at each event
+
+Each event is then scored on:
+- Dasha signature: Maha/Antar Dasha lords that rule, occupy or signify the
+  event's houses (in D1 and the event's varga), or are its natural karakas
+- Transit signature: Jupiter and Saturn transiting or aspecting the event
+  house from the candidate ascendant (the "double transit")
+
+All candidates are evaluated together as arrays: one batch ephemeris call for
+the natal positions, one dasha table lookup and a few broadcasts per event.
+
+Author: Astrology Backend
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import logging
+
+import numpy as np
+import pytz
+
+from server.services.dasha_calculator import DashaCalculator, calculate_dasha_lords_batch
+from server.services.panchang_calculator import datetime_to_jd
+from server.utils.astro_utils import calculate_ascendant_batch, calculate_planet_positions_batch
+from server.utils.house_analysis import LORD_PLANETS, SIGN_LORDS, SIGNS
+
+logger = logging.getLogger(__name__)
+
+
+# Houses (primary first), natural karakas and the varga that refines each event
+EVENT_SIGNIFICATIONS = {
+    'marriage': {'houses': (7, 2, 11), 'karakas': ('Venus', 'Jupiter'), 'varga': 9},
+    'career': {'houses': (10, 6, 11), 'karakas': ('Saturn', 'Sun', 'Mercury'), 'varga': 10},
+    'childbirth': {'houses': (5, 9, 11), 'karakas': ('Jupiter',), 'varga': 7},
+    'education': {'houses': (4, 5, 9), 'karakas': ('Mercury', 'Jupiter'), 'varga': None},
+    'relocation': {'houses': (4, 12, 3), 'karakas': ('Moon', 'Rahu'), 'varga': None},
+    'property': {'houses': (4, 11, 2), 'karakas': ('Mars', 'Venus'), 'varga': None},
+    'health': {'houses': (6, 8, 12), 'karakas': ('Saturn', 'Mars', 'Sun'), 'varga': None},
+    'bereavement': {'houses': (8, 12, 2), 'karakas': ('Saturn', 'Rahu', 'Ketu'), 'varga': None},
+    'wealth': {'houses': (2, 11, 9), 'karakas': ('Jupiter', 'Venus'), 'varga': None},
+}
+
+# Houses (counted from the planet) that Jupiter and Saturn aspect besides the 7th
+TRANSIT_ASPECTS = {
+    'Jupiter': (1, 5, 7, 9),
+    'Saturn': (1, 3, 7, 10),
+}
+
+# Points per matched factor; Maha Dasha factors count more than Antar Dasha
+DASHA_POINTS = {'rules_primary': 3.0, 'rules_secondary': 1.0, 'occupies': 1.0, 'karaka': 1.0, 'varga': 2.0}
+ANTAR_WEIGHT = 0.75
+TRANSIT_POINTS = {'Jupiter': 1.5, 'Saturn': 1.5, 'double': 1.0}
+
+DEFAULT_WINDOW_MINUTES = 120
+MAX_WINDOW_MINUTES = 720
+MAX_EVENTS = 20
+
+DASHA_PLANETS = DashaCalculator.DASHA_ORDER
+_DAYS_PER_YEAR = 365.25
+
+
+def _lord_planet_table() -> np.ndarray:
+    """Map sign index -> DASHA_ORDER index of its lord."""
+    return np.array([DASHA_PLANETS.index(LORD_PLANETS[lord]) for lord in SIGN_LORDS], dtype=np.int64)
+
+
+SIGN_LORD_DASHA_INDEX = _lord_planet_table()
+
+
+class BirthTimeRectifier:
+    """
+    Evaluate every candidate birth minute in a window against life events.
+    """
+
+    def __init__(self, birth_date: date, approximate_time: str, latitude: float, longitude: float,
+                 timezone: str = 'UTC', window_minutes: int = DEFAULT_WINDOW_MINUTES,
+                 step_minutes: int = 1):
+        """
+        Initialize Birth Time Rectifier.
+
+        Args:
+            birth_date: Birth date
+            approximate_time: Approximate local birth time (HH:MM or HH:MM:SS)
+            latitude: Birth latitude
+            longitude: Birth longitude
+            timezone: IANA timezone of the birth place
+            window_minutes: Search this many minutes either side of approximate_time
+            step_minutes: Candidate resolution
+        """
+        if not 1 <= window_minutes <= MAX_WINDOW_MINUTES:
+            raise ValueError(f"window_minutes must be between 1 and {MAX_WINDOW_MINUTES}")
+        if step_minutes < 1:
+            raise ValueError("step_minutes must be at least 1")
+        try:
+            self.tz = pytz.timezone(timezone)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"Unknown timezone: {timezone}")
+
+        time_format = "%H:%M:%S" if approximate_time.count(':') == 2 else "%H:%M"
+        local_time = datetime.strptime(approximate_time, time_format).time()
+        center = self.tz.localize(datetime.combine(birth_date, local_time))
+
+        offsets = np.arange(-window_minutes, window_minutes + 1, step_minutes)
+        self.birth_datetime = center
+        self.offsets = offsets
+        self.latitude = latitude
+        self.longitude = longitude
+        self.jds = datetime_to_jd(center) + offsets / 1440.0
+
+        # Natal state of every candidate
+        self.ascendant = calculate_ascendant_batch(self.jds, latitude, longitude)
+        self.asc_sign = (self.ascendant // 30).astype(np.int64)
+        positions = calculate_planet_positions_batch(self.jds, DASHA_PLANETS)
+        self.moon = positions['Moon']
+        # Natal signs of the dasha planets: (N, 9) in DASHA_ORDER
+        self.planet_signs = np.stack([(positions[p] // 30).astype(np.int64) for p in DASHA_PLANETS], axis=1)
+
+    def _varga_ascendant(self, division: int) -> np.ndarray:
+        """Divisional ascendant signs, using VargaCalculator's degree x division rule."""
+        return ((self.ascendant * division) % 360 // 30).astype(np.int64)
+
+    @staticmethod
+    def _transit_signs(event_jds: np.ndarray) -> Dict[str, np.ndarray]:
+        """Sidereal signs of Jupiter and Saturn at each event."""
+        positions = calculate_planet_positions_batch(event_jds, tuple(TRANSIT_ASPECTS), node_step=1.0)
+        return {planet: (positions[planet] // 30).astype(np.int64) for planet in TRANSIT_ASPECTS}
+
+    def _score_dasha_lord(self, lords: np.ndarray, houses: Sequence[int], karakas: Sequence[str],
+                          varga_sign: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Match one level of dasha lords (N,) against an event's significations.
+
+        Returns:
+            Factor name -> boolean array (N,)
+        """
+        rows = np.arange(len(lords))
+        house_lords = SIGN_LORD_DASHA_INDEX[(self.asc_sign[:, None] + np.array(houses)[None, :] - 1) % 12]
+        lord_house = (self.planet_signs[rows, lords] - self.asc_sign) % 12 + 1
+
+        factors = {
+            'rules_primary': house_lords[:, 0] == lords,
+            'rules_secondary': (house_lords[:, 1:] == lords[:, None]).any(axis=1),
+            'occupies': np.isin(lord_house, houses),
+            'karaka': np.isin(lords, [DASHA_PLANETS.index(k) for k in karakas]),
+        }
+        if varga_sign is not None:
+            factors['varga'] = SIGN_LORD_DASHA_INDEX[(varga_sign + houses[0] - 1) % 12] == lords
+        return factors
+
+    def rectify(self, events: List[Dict], max_results: int = 10) -> Dict:
+        """
+        Rank candidate birth times against life events.
+
+        Args:
+            events: List of {'event_type', 'date' (YYYY-MM-DD)} dicts
+            max_results: Maximum number of candidate windows to return
+
+        Returns:
+            Dictionary with ranked windows of candidate times and their matches
+        """
+        if not events:
+            raise ValueError("At least one life event is required")
+        if len(events) > MAX_EVENTS:
+            raise ValueError(f"At most {MAX_EVENTS} events are supported")
+
+        unknown = sorted({e['event_type'] for e in events} - set(EVENT_SIGNIFICATIONS))
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(unknown)}")
+
+        event_dates = [datetime.strptime(e['date'], "%Y-%m-%d") for e in events]
+        event_jds = np.array([datetime_to_jd(pytz.UTC.localize(d + timedelta(hours=12))) for d in event_dates])
+        if (event_jds <= self.jds.max()).any():
+            raise ValueError("Life events must be after the birth date")
+
+        # (N, M) dasha lords at every event for every candidate; the window is
+        # a few hours wide, so ages are measured from its centre
+        elapsed_years = (event_jds - datetime_to_jd(self.birth_datetime)) / _DAYS_PER_YEAR
+        maha, antar = calculate_dasha_lords_batch(self.moon, elapsed_years)
+        transit_signs = self._transit_signs(event_jds)
+
+        total = np.zeros(len(self.jds))
+        per_event = []
+        for m, event in enumerate(events):
+            meaning = EVENT_SIGNIFICATIONS[event['event_type']]
+            varga = meaning['varga']
+            varga_sign = self._varga_ascendant(varga) if varga else None
+
+            maha_factors = self._score_dasha_lord(maha[:, m], meaning['houses'], meaning['karakas'], varga_sign)
+            antar_factors = self._score_dasha_lord(antar[:, m], meaning['houses'], meaning['karakas'], varga_sign)
+            dasha_score = sum(DASHA_POINTS[name] * flags for name, flags in maha_factors.items())
+            dasha_score = dasha_score + ANTAR_WEIGHT * sum(
+                DASHA_POINTS[name] * flags for name, flags in antar_factors.items()
+            )
+
+            # Transit of Jupiter and Saturn over the primary house from the candidate lagna
+            event_house_sign = (self.asc_sign + meaning['houses'][0] - 1) % 12
+            transit_hits = {}
+            for planet, aspects in TRANSIT_ASPECTS.items():
+                reach = (event_house_sign - transit_signs[planet][m]) % 12 + 1
+                transit_hits[planet] = np.isin(reach, aspects)
+            transit_score = sum(TRANSIT_POINTS[p] * hits for p, hits in transit_hits.items())
+            transit_score = transit_score + TRANSIT_POINTS['double'] * (transit_hits['Jupiter'] & transit_hits['Saturn'])
+
+            event_score = dasha_score + transit_score
+            total += event_score
+            per_event.append({
+                'maha': maha_factors, 'antar': antar_factors,
+                'transits': transit_hits, 'score': event_score,
+            })
+
+        max_event = (sum(DASHA_POINTS.values()) * (1 + ANTAR_WEIGHT)
+                     + sum(TRANSIT_POINTS.values()))
+        scores = 100.0 * total / (max_event * len(events))
+
+        windows = self._group_candidates(scores, maha, antar)
+        windows.sort(key=lambda w: (-w['score'], abs(w['_center_offset'])))
+
+        results = []
+        for window in windows[:max_results]:
+            k = window.pop('_index')
+            window.pop('_center_offset')
+            window['events'] = [
+                self._describe_event(event, m, k, maha, antar, per_event[m])
+                for m, event in enumerate(events)
+            ]
+            results.append(window)
+
+        return {
+            'approximate_time': self.birth_datetime.isoformat(),
+            'candidates_evaluated': len(self.jds),
+            'windows': results,
+        }
+
+    def _group_candidates(self, scores: np.ndarray, maha: np.ndarray, antar: np.ndarray) -> List[Dict]:
+        """Collapse consecutive candidates with the same signature into windows."""
+        navamsha = self._varga_ascendant(9)
+        signature = np.concatenate([
+            scores.round(6)[:, None], self.asc_sign[:, None], navamsha[:, None], maha, antar,
+        ], axis=1)
+        changes = np.flatnonzero((signature[1:] != signature[:-1]).any(axis=1)) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(self.jds)])) - 1
+
+        windows = []
+        for first, last in zip(starts, ends):
+            middle = (first + last) // 2
+            windows.append({
+                'start_time': self._format_offset(first),
+                'end_time': self._format_offset(last),
+                'best_time': self._format_offset(middle),
+                'candidates': int(last - first + 1),
+                'score': round(float(scores[first]), 1),
+                'ascendant': SIGNS[self.asc_sign[first]],
+                'navamsha_ascendant': SIGNS[navamsha[first]],
+                '_index': int(middle),
+                '_center_offset': int(self.offsets[middle]),
+            })
+        return windows
+
+    def _describe_event(self, event: Dict, m: int, k: int, maha: np.ndarray,
+                        antar: np.ndarray, matches: Dict) -> Dict:
+        """Explain how a candidate matched one event."""
+        return {
+            'event_type': event['event_type'],
+            'date': event['date'],
+            'maha_dasha': DASHA_PLANETS[maha[k, m]],
+            'antar_dasha': DASHA_PLANETS[antar[k, m]],
+            'maha_dasha_factors': [name for name, flags in matches['maha'].items() if flags[k]],
+            'antar_dasha_factors': [name for name, flags in matches['antar'].items() if flags[k]],
+            'transits': [planet for planet, hits in matches['transits'].items() if hits[k]],
+            'score': round(float(matches['score'][k]), 2),
+        }
+
+    def _format_offset(self, k: int) -> str:
+        """Format candidate k as a local birth datetime (windows may cross midnight)."""
+        candidate = self.birth_datetime + timedelta(minutes=int(self.offsets[k]))
+        return self.tz.normalize(candidate).isoformat()
@@ -12,6 +12,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from server.utils.astro_utils import calculate_planet_positions, get_zodiac_sign, get_nakshatra
+from server.utils.ashtakavarga_calculator import (
+    AshtakavargaCalculator,
+    SIGNS,
+    SAV_STRONG_THRESHOLD,
+    SAV_WEAK_THRESHOLD,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +69,9 @@ class TransitCalculator:
         self.birth_planets = birth_chart.get('planets', {})
         self.birth_houses = birth_chart.get('houses', {})
 
+        # Natal Ashtakavarga, computed once so transit scoring is a table read
+        self.ashtakavarga = AshtakavargaCalculator.from_chart(birth_chart)
+
     def calculate_current_transits(self) -> Dict:
         """
         Calculate all current planetary transits.
@@ -111,6 +120,10 @@ class TransitCalculator:
                 transit_info['transit_quality'] = self._determine_transit_quality(
                     planet, current_sign, birth_sign
                 )
+                if self.ashtakavarga:
+                    transit_info['sav_bindus'] = self.ashtakavarga.get_sav_bindus(
+                        SIGNS.index(current_sign)
+                    )
 
                 # Generate interpretation
                 transit_info['interpretation'] = self._get_transit_interpretation(
@@ -210,10 +223,18 @@ class TransitCalculator:
         Returns:
             'Benefic', 'Neutral', or 'Malefic'
         """
-        # Simple logic: some planets are naturally benefic/malefic
+        # Score by natal Sarvashtakavarga bindus of the transited sign when available
+        if self.ashtakavarga and current_sign in SIGNS:
+            bindus = self.ashtakavarga.get_sav_bindus(SIGNS.index(current_sign))
+            if bindus >= SAV_STRONG_THRESHOLD:
+                return 'Benefic'
+            elif bindus < SAV_WEAK_THRESHOLD:
+                return 'Malefic'
+            return 'Neutral'
+
+        # Fallback: some planets are naturally benefic/malefic
         benefic_planets = ['Sun', 'Moon', 'Jupiter', 'Venus', 'Mercury']
         malefic_planets = ['Mars', 'Saturn', 'Rahu', 'Ketu']
-        neutral_planets = []
 
         if planet in benefic_planets:
             return 'Benefic'
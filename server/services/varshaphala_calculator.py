@@ -0,0 +1,204 @@
+"""
+Varshaphala (Annual Chart) Module
+Casts Tajika annual charts at the Sun's sidereal returns.
+
+The return instant of a year is where the sidereal Sun is back at its natal
+longitude. Initial guesses one sidereal year apart are refined by Newton
+iteration on the Sun's longitude, with every requested year iterated together
+as one array. The annual chart is then cast at the return instant with the
+same planet and ascendant code as the natal chart, plus the Muntha (natal
+ascendant sign progressed one sign per year).
+
+Returns are cached per natal chart (birth instant, place and ayanamsa), so
+repeated or overlapping year requests only compute the missing years.
+
+Author: Astrology Backend
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+import logging
+import threading
+
+import numpy as np
+
+from server.services.panchang_calculator import jd_to_datetime
+from server.utils.astro_utils import calculate_ascendant, calculate_planet_positions, get_zodiac_sign
+from server.utils.ayanamsa import DEFAULT_AYANAMSA, get_ayanamsa_series, resolve_ayanamsa
+
+logger = logging.getLogger(__name__)
+
+SIDEREAL_YEAR_DAYS = 365.256363004
+MAX_AGE = 150
+MAX_YEARS_PER_REQUEST = 120
+MAX_CACHED_CHARTS = 512
+
+# Root-finder settings
+_TOLERANCE_DEG = 1e-7     # ~9 ms of solar motion
+_MAX_ITERATIONS = 10
+
+_cache: "OrderedDict[tuple, Dict[int, Dict]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_years(spec: str) -> List[int]:
+    """
+    Parse a year list such as "2025", "2024,2026" or "2024-2030".
+
+    Raises:
+        ValueError: On malformed specs or more than MAX_YEARS_PER_REQUEST years
+    """
+    years = set()
+    for part in spec.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                first, last = (int(p) for p in part.split("-", 1))
+                if last - first >= MAX_YEARS_PER_REQUEST:
+                    raise ValueError(f"At most {MAX_YEARS_PER_REQUEST} years per request")
+                years.update(range(first, last + 1))
+            elif part:
+                years.add(int(part))
+        except ValueError as e:
+            raise ValueError(f"Invalid years: {spec}. Use e.g. 2025, 2024,2026 or 2024-2030") from e
+
+    if not years:
+        raise ValueError("No years given")
+    if len(years) > MAX_YEARS_PER_REQUEST:
+        raise ValueError(f"At most {MAX_YEARS_PER_REQUEST} years per request")
+    return sorted(years)
+
+
+def _sidereal_sun(jds: np.ndarray, ayanamsa: str):
+    """Sidereal Sun longitudes and daily motions at many instants."""
+    import swisseph  # Lazy import to avoid import-time failures
+
+    flag = swisseph.FLG_SWIEPH | swisseph.FLG_SPEED
+    results = np.array([swisseph.calc_ut(float(jd), swisseph.SUN, flag)[0][:4] for jd in jds])
+    return (results[:, 0] - get_ayanamsa_series(jds, ayanamsa)) % 360, results[:, 3]
+
+
+def find_solar_returns(natal_jd: float, natal_sun: float, ages: Sequence[int],
+                       ayanamsa: str = DEFAULT_AYANAMSA) -> np.ndarray:
+    """
+    Find the instants the sidereal Sun returns to its natal longitude.
+
+    Args:
+        natal_jd: Birth Julian Day (UT)
+        natal_sun: Natal sidereal Sun longitude
+        ages: Completed years at each return
+        ayanamsa: One of AYANAMSAS
+
+    Returns:
+        numpy array of return Julian Days (UT), one per age
+    """
+    jds = natal_jd + np.asarray(ages, dtype=np.float64) * SIDEREAL_YEAR_DAYS
+    for _ in range(_MAX_ITERATIONS):
+        longitude, speed = _sidereal_sun(jds, ayanamsa)
+        diff = (natal_sun - longitude + 180.0) % 360.0 - 180.0
+        jds = jds + diff / speed
+        if np.abs(diff).max() < _TOLERANCE_DEG:
+            break
+    return jds
+
+
+class VarshaphalaCalculator:
+    """
+    Annual charts of one natal chart.
+    """
+
+    def __init__(self, birth_jd: float, latitude: float, longitude: float, birth_year: int,
+                 ayanamsa: str = DEFAULT_AYANAMSA):
+        """
+        Initialize with the natal chart.
+
+        Args:
+            birth_jd: Birth Julian Day (UT)
+            latitude: Latitude the annual charts are cast for
+            longitude: Longitude the annual charts are cast for
+            birth_year: Calendar year of birth (local)
+            ayanamsa: One of AYANAMSAS
+        """
+        self.birth_jd = birth_jd
+        self.latitude = latitude
+        self.longitude = longitude
+        self.birth_year = birth_year
+        self.ayanamsa = resolve_ayanamsa(ayanamsa)
+        self.natal_sun = calculate_planet_positions(birth_jd, ayanamsa=self.ayanamsa)["Sun"]
+        self.natal_ascendant = calculate_ascendant(birth_jd, latitude, longitude, self.ayanamsa)
+
+    @property
+    def cache_key(self) -> tuple:
+        """Key identifying the natal chart in the return cache."""
+        return (round(self.birth_jd, 8), round(self.latitude, 6), round(self.longitude, 6), self.ayanamsa)
+
+    def annual_charts(self, years: Sequence[int]) -> List[Dict]:
+        """
+        Cast the annual charts of calendar years (the return near each birthday).
+
+        Args:
+            years: Calendar years after the birth year
+
+        Returns:
+            List of annual charts in year order
+
+        Raises:
+            ValueError: On years before the first return or beyond MAX_AGE
+        """
+        years = sorted(set(int(y) for y in years))
+        invalid = [y for y in years if not 1 <= y - self.birth_year <= MAX_AGE]
+        if invalid:
+            raise ValueError(
+                f"Years must be between {self.birth_year + 1} and {self.birth_year + MAX_AGE}, got {invalid}"
+            )
+
+        key = self.cache_key
+        with _cache_lock:
+            cached = _cache.setdefault(key, {})
+            _cache.move_to_end(key)
+            missing = [y for y in years if y not in cached]
+
+        if missing:
+            return_jds = find_solar_returns(self.birth_jd, self.natal_sun,
+                                            [y - self.birth_year for y in missing], self.ayanamsa)
+            charts = {year: self._cast(year, float(jd)) for year, jd in zip(missing, return_jds)}
+            with _cache_lock:
+                _cache.setdefault(key, {}).update(charts)
+                while len(_cache) > MAX_CACHED_CHARTS:
+                    _cache.popitem(last=False)
+            cached = {**cached, **charts}
+
+        return [cached[year] for year in years]
+
+    def _cast(self, year: int, jd: float) -> Dict:
+        """Cast the annual chart at a return instant."""
+        age = year - self.birth_year
+        lagna = calculate_ascendant(jd, self.latitude, self.longitude, self.ayanamsa)
+        lagna_sign = int(lagna // 30)
+
+        planets = {}
+        for planet, position in calculate_planet_positions(jd, ayanamsa=self.ayanamsa).items():
+            planets[planet] = {
+                "longitude": round(position, 4),
+                "sign": get_zodiac_sign(position),
+                "degree": round(position % 30, 4),
+                "house": (int(position // 30) - lagna_sign) % 12 + 1,
+            }
+
+        muntha_sign = (int(self.natal_ascendant // 30) + age) % 12
+        return {
+            "year": year,
+            "age": age,
+            "return_jd": round(jd, 6),
+            "return_time_utc": jd_to_datetime(jd).isoformat(),
+            "varsha_lagna": {
+                "longitude": round(lagna, 4),
+                "sign": get_zodiac_sign(lagna),
+                "degree": round(lagna % 30, 4),
+            },
+            "muntha": {
+                "sign": get_zodiac_sign(muntha_sign * 30),
+                "house": (muntha_sign - lagna_sign) % 12 + 1,
+            },
+            "planets": planets,
+        }
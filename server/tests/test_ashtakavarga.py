@@ -0,0 +1,117 @@
+"""
+Unit tests for the Ashtakavarga calculator.
+
+Tests BAV/SAV bindu totals, batch evaluation and transit scoring.
+"""
+
+import numpy as np
+import pytest
+
+from server.utils.ashtakavarga_calculator import (
+    AshtakavargaCalculator,
+    BAV_PLANETS,
+    CONTRIBUTORS,
+    calculate_bav_batch,
+    calculate_sav_batch,
+)
+from server.services.transit_calculator import TransitCalculator
+
+
+# Classical BAV totals are fixed regardless of placements
+EXPECTED_BAV_TOTALS = {
+    'Sun': 48, 'Moon': 49, 'Mars': 39, 'Mercury': 54,
+    'Jupiter': 56, 'Venus': 52, 'Saturn': 39,
+}
+
+
+@pytest.fixture
+def contributor_signs():
+    """Contributor signs for a sample chart (0 = Aries)."""
+    return {
+        'Sun': 1, 'Moon': 7, 'Mars': 0, 'Mercury': 1, 'Jupiter': 2,
+        'Venus': 0, 'Saturn': 9, 'Lagna': 5,
+    }
+
+
+class TestAshtakavargaCalculator:
+    """Tests for single-chart Ashtakavarga."""
+
+    def test_bav_totals_are_classical(self, contributor_signs):
+        calc = AshtakavargaCalculator(contributor_signs)
+        totals = calc.get_complete_analysis()['bav_totals']
+        assert totals == EXPECTED_BAV_TOTALS
+
+    def test_sav_total_is_337(self, contributor_signs):
+        calc = AshtakavargaCalculator(contributor_signs)
+        assert sum(calc.get_sarvashtakavarga()) == 337
+
+    def test_sun_bav_from_own_sign(self):
+        # With every contributor in Aries, Sun's BAV in Aries counts the
+        # contributors that donate to their own (1st) place
+        calc = AshtakavargaCalculator({c: 0 for c in CONTRIBUTORS})
+        assert calc.get_bav_bindus('Sun', 0) == 3  # Sun, Mars, Saturn
+        assert calc.get_bav_bindus('Rahu', 0) is None
+
+    def test_missing_contributor_raises(self):
+        with pytest.raises(ValueError):
+            AshtakavargaCalculator({'Sun': 0})
+
+    def test_from_chart_uses_first_house_sign(self, contributor_signs):
+        signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra',
+                 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+        chart = {
+            'planets': {p: {'sign': signs[contributor_signs[p]]} for p in BAV_PLANETS},
+            'houses': {1: {'sign': contributor_signs['Lagna'] + 1}},
+        }
+        from_chart = AshtakavargaCalculator.from_chart(chart)
+        direct = AshtakavargaCalculator(contributor_signs)
+        assert from_chart.get_sarvashtakavarga() == direct.get_sarvashtakavarga()
+
+
+class TestAshtakavargaBatch:
+    """Tests for the vectorized batch API."""
+
+    def test_batch_matches_single(self):
+        rng = np.random.default_rng(7)
+        signs = rng.integers(0, 12, size=(50, len(CONTRIBUTORS)))
+        bav = calculate_bav_batch(signs)
+        sav = calculate_sav_batch(signs)
+
+        assert bav.shape == (50, len(BAV_PLANETS), 12)
+        assert sav.shape == (50, 12)
+        for row, expected_sav in zip(signs, sav):
+            calc = AshtakavargaCalculator(dict(zip(CONTRIBUTORS, row.tolist())))
+            assert calc.get_sarvashtakavarga() == expected_sav.tolist()
+
+    def test_batch_rejects_bad_shape(self):
+        with pytest.raises(ValueError):
+            calculate_bav_batch(np.zeros((3, 7), dtype=int))
+
+
+class TestTransitScoring:
+    """Tests for SAV-based transit quality."""
+
+    def test_transit_quality_follows_sav(self, contributor_signs):
+        signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra',
+                 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+        chart = {
+            'planets': {p: {'sign': signs[contributor_signs[p]], 'longitude': 0.0}
+                        for p in BAV_PLANETS},
+            'houses': {1: {'sign': contributor_signs['Lagna'] + 1}},
+        }
+        calc = TransitCalculator(chart)
+        sav = calc.ashtakavarga.get_sarvashtakavarga()
+
+        for sign_index, bindus in enumerate(sav):
+            quality = calc._determine_transit_quality('Saturn', signs[sign_index], None)
+            if bindus >= 28:
+                assert quality == 'Benefic'
+            elif bindus < 25:
+                assert quality == 'Malefic'
+            else:
+                assert quality == 'Neutral'
+
+    def test_transit_quality_fallback_without_ascendant(self):
+        calc = TransitCalculator({'planets': {}})
+        assert calc.ashtakavarga is None
+        assert calc._determine_transit_quality('Jupiter', 'Leo', None) == 'Benefic'
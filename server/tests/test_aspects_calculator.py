@@ -0,0 +1,89 @@
+"""
+Unit tests for the Vedic aspects calculator.
+
+Tests the precomputed house/planet aspect matrices and the query methods
+that slice them.
+"""
+
+import pytest
+
+from server.utils.aspects_calculator import (
+    VedicAspectsCalculator,
+    PLANETS,
+    ASPECT_STANDARD,
+    ASPECT_SPECIAL,
+)
+
+
+@pytest.fixture
+def planets_info():
+    """Chart with every graha placed in a known house."""
+    return {
+        'Sun': {'house': 1},
+        'Moon': {'house': 4},
+        'Mars': {'house': 1},
+        'Mercury': {'house': 12},
+        'Jupiter': {'house': 10},
+        'Venus': {'house': 2},
+        'Saturn': {'house': 7},
+        'Rahu': {'house': 3},
+        'Ketu': {'house': 9},
+    }
+
+
+class TestAspectMatrices:
+    """Tests for the 9x12 and 9x9 aspect matrices."""
+
+    def test_matrix_shapes(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        assert calc.house_aspect_matrix.shape == (len(PLANETS), 12)
+        assert calc.planet_aspect_matrix.shape == (len(PLANETS), len(PLANETS))
+
+    def test_every_planet_aspects_seventh(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        for planet, info in planets_info.items():
+            seventh = (info['house'] + 5) % 12 + 1
+            assert calc.get_standard_aspects(planet) == [seventh]
+
+    def test_special_aspects_counted_from_own_house(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        # Mars in 1st aspects the 4th, 7th and 8th houses
+        assert calc.get_special_aspects('Mars') == [4, 7, 8]
+        # Saturn in 7th aspects the 9th, 1st and 4th houses
+        assert calc.get_special_aspects('Saturn') == [1, 4, 9]
+        assert calc.get_special_aspects('Sun') == []
+
+    def test_house_column_matches_rows(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        aspecting = {a['planet']: a['aspect_type'] for a in calc.get_aspects_to_house(4)}
+        assert aspecting == {'Mars': 'special', 'Jupiter': 'special', 'Saturn': 'special'}
+
+    def test_planet_matrix_follows_house_matrix(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        assert calc.get_planets_aspected_by('Saturn') == ['Sun', 'Moon', 'Mars', 'Ketu']
+        saturn_row = calc.planet_aspect_matrix[PLANETS.index('Saturn')]
+        assert saturn_row[PLANETS.index('Sun')] & (ASPECT_STANDARD | ASPECT_SPECIAL)
+
+    def test_missing_planets_are_masked(self):
+        calc = VedicAspectsCalculator({'Jupiter': {'house': 1}}, 0.0)
+        assert calc.get_standard_aspects('Saturn') == []
+        assert calc.get_planets_aspected_by('Jupiter') == []
+        assert [a['planet'] for a in calc.get_malefic_aspects()] == []
+        assert [a['planet'] for a in calc.get_benefic_aspects()] == ['Jupiter']
+
+
+class TestAspectRelationships:
+    """Tests for relationship and summary queries."""
+
+    def test_conjunctions_from_distance_matrix(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        relationships = calc.calculate_aspect_relationships()
+        pairs = {(r['planet1'], r['planet2']) for r in relationships['conjunctions']}
+        assert pairs == {('Sun', 'Mars')}
+        assert len(relationships['vedic_aspects']) == len(PLANETS)
+
+    def test_strongest_aspects(self, planets_info):
+        calc = VedicAspectsCalculator(planets_info, 0.0)
+        strongest = calc.get_strongest_aspects()
+        assert [s['planet'] for s in strongest] == ['Mars', 'Jupiter', 'Saturn']
+        assert all(s['aspect_count'] == 3 for s in strongest)
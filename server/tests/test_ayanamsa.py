@@ -0,0 +1,94 @@
+"""
+Unit tests for ayanamsa selection.
+
+Tests the cached exact and daily-series values, that the global Swiss
+Ephemeris sidereal mode is left at Lahiri, and the per-request ayanamsa in
+house and planet calculations.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import swisseph
+from pydantic import ValidationError
+
+from server.pydantic_schemas.kundali_schema import KundaliRequest
+from server.utils.astro_utils import calculate_houses, calculate_planet_positions
+from server.utils.ayanamsa import (
+    AYANAMSAS,
+    get_ayanamsa,
+    get_ayanamsa_series,
+    resolve_ayanamsa,
+)
+
+JD = 2448027.875  # 1990-05-15 09:00 UT
+LATITUDE, LONGITUDE = 28.61, 77.21
+
+
+def lahiri_reference(jd):
+    swisseph.set_sid_mode(swisseph.SIDM_LAHIRI)
+    return swisseph.get_ayanamsa_ut(jd)
+
+
+def test_default_is_lahiri():
+    assert get_ayanamsa(JD) == pytest.approx(lahiri_reference(JD), abs=1e-12)
+
+
+@pytest.mark.parametrize("name", list(AYANAMSAS))
+def test_every_ayanamsa_is_plausible(name):
+    assert 18 < get_ayanamsa(JD, name) < 29
+
+
+def test_global_sidereal_mode_left_at_lahiri():
+    get_ayanamsa(JD + 0.123, "fagan_bradley")
+    assert swisseph.get_ayanamsa_ut(JD) == pytest.approx(get_ayanamsa(JD, "lahiri"), abs=1e-12)
+
+
+def test_series_matches_exact_values():
+    jds = JD + np.linspace(-3000, 3000, 257)
+    series = get_ayanamsa_series(jds, "raman")
+    exact = np.array([get_ayanamsa(jd, "raman") for jd in jds])
+    np.testing.assert_allclose(series, exact, atol=1e-7)
+
+
+def test_resolve_ayanamsa_normalizes_names():
+    assert resolve_ayanamsa("Fagan-Bradley") == "fagan_bradley"
+    assert resolve_ayanamsa(None) == "lahiri"
+    with pytest.raises(ValueError):
+        resolve_ayanamsa("sayana")
+
+
+def test_request_validates_ayanamsa():
+    request = KundaliRequest(birth_date="1990-05-15", birth_time="14:30", latitude=LATITUDE,
+                             longitude=LONGITUDE, ayanamsa="KP")
+    assert request.ayanamsa == "kp"
+    with pytest.raises(ValidationError):
+        KundaliRequest(birth_date="1990-05-15", birth_time="14:30", latitude=LATITUDE,
+                       longitude=LONGITUDE, ayanamsa="sayana")
+
+
+def test_ayanamsa_shifts_houses_and_planets():
+    shift = get_ayanamsa(JD, "raman") - get_ayanamsa(JD, "lahiri")
+    wrapped = lambda angle: (angle + 180) % 360 - 180
+
+    lahiri = calculate_houses(JD, LATITUDE, LONGITUDE)
+    raman = calculate_houses(JD, LATITUDE, LONGITUDE, ayanamsa="raman")
+    assert raman["ayanamsa"] == "raman"
+    assert wrapped(lahiri["ascendant"] - raman["ascendant"]) == pytest.approx(shift)
+
+    lahiri_sun = calculate_planet_positions(JD)["Sun"]
+    raman_sun = calculate_planet_positions(JD, ayanamsa="raman")["Sun"]
+    assert wrapped(lahiri_sun - raman_sun) == pytest.approx(shift)
+
+
+def test_concurrent_mixed_ayanamsas():
+    names = list(AYANAMSAS) * 8
+    jds = JD + np.arange(len(names)) * 0.37
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda args: get_ayanamsa_series(args[0], args[1]), zip(jds, names)))
+
+    for jd, name, value in zip(jds, names, results):
+        swisseph.set_sid_mode(getattr(swisseph, AYANAMSAS[name]))
+        assert float(value) == pytest.approx(swisseph.get_ayanamsa_ut(jd), abs=1e-6)
+    swisseph.set_sid_mode(swisseph.SIDM_LAHIRI)
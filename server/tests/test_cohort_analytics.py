@@ -0,0 +1,117 @@
+"""
+Unit tests for cohort analytics over the placement index.
+
+Compares cohort distributions and group-bys with direct numpy computations
+and checks that value columns survive snapshots.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from server.services.cohort_analytics import cohort_statistics
+from server.services.placement_index import (
+    DASHA_LORDS,
+    SIGN_NAMES,
+    PlacementIndex,
+    chart_values,
+    placement_terms,
+    prediction_values,
+)
+
+N_CHARTS = 2000
+
+
+@pytest.fixture
+def cohort():
+    rng = np.random.default_rng(0)
+    moon_signs = rng.integers(0, 12, N_CHARTS)
+    maha_lords = rng.integers(0, 9, N_CHARTS)
+    strengths = rng.uniform(20, 100, N_CHARTS).round(1)
+    careers = rng.uniform(0, 100, N_CHARTS).astype(np.float32)
+
+    index = PlacementIndex()
+    ids = [f"c{i}" for i in range(N_CHARTS)]
+    charts = [
+        {
+            "planets": {"Moon": {"sign": SIGN_NAMES[moon_signs[i]]}},
+            "shad_bala": {"planetary_strengths": {"Sun": {"strength_percentage": strengths[i]}}},
+            "dasha": {"current_maha_dasha": DASHA_LORDS[maha_lords[i]]},
+        }
+        for i in range(N_CHARTS)
+    ]
+    index.set_charts(ids, [placement_terms(c) for c in charts])
+    index.set_values(ids, [chart_values(c) for c in charts])
+    # Every other chart has an ML prediction
+    index.set_values(ids[::2], [prediction_values({"career_potential": v}) for v in careers[::2]])
+    return index, moon_signs, maha_lords, strengths, careers
+
+
+def test_chart_values_extraction():
+    values = chart_values({
+        "shad_bala": {"planetary_strengths": {"Jupiter": {"strength_percentage": 72.5}, "Moon": {"error": "x"}}},
+        "dasha": {"current_maha_dasha": "Venus", "current_antar_dasha": "Unknown"},
+    })
+    assert values == {"jupiter_strength": 72.5, "maha_dasha_lord": float(DASHA_LORDS.index("Venus"))}
+
+
+def test_distributions_match_numpy(cohort):
+    index, moon_signs, maha_lords, strengths, careers = cohort
+    selected = moon_signs == SIGN_NAMES.index("Leo")
+
+    result = cohort_statistics(index, {"planet": "Moon", "sign": "Leo"}, bins=10)
+    assert result["cohort_size"] == selected.sum()
+
+    sun = result["strengths"]["Sun"]
+    assert sun["count"] == selected.sum()
+    assert sun["mean"] == pytest.approx(strengths[selected].mean(), abs=1e-3)
+    assert sun["percentiles"]["p50"] == pytest.approx(np.percentile(strengths[selected], 50), abs=0.06)
+    assert sun["histogram"]["counts"] == np.histogram(strengths[selected], bins=10, range=(0, 100))[0].tolist()
+
+    career = result["scores"]["career_potential"]
+    expected = careers[selected & (np.arange(N_CHARTS) % 2 == 0)]
+    assert career["count"] == expected.size
+    for p in (10, 25, 50, 75, 90):
+        assert career["percentiles"][f"p{p}"] == pytest.approx(np.percentile(expected, p), abs=0.02)
+    assert result["scores"]["wealth_potential"] == {"count": 0}
+
+    lords = result["dasha_lords"]["maha_dasha_lord"]
+    assert [lords[lord] for lord in DASHA_LORDS] == np.bincount(maha_lords[selected], minlength=9).tolist()
+
+
+def test_group_by_placement_and_dasha(cohort):
+    index, moon_signs, maha_lords, strengths, careers = cohort
+
+    groups = cohort_statistics(index, group_by="moon:sign")["groups"]
+    assert [g["group"] for g in groups] == list(SIGN_NAMES)
+    for code, group in enumerate(groups):
+        assert group["count"] == (moon_signs == code).sum()
+        assert group["means"]["sun_strength"] == pytest.approx(strengths[moon_signs == code].mean(), abs=1e-3)
+        assert group["means"]["health_status"] is None
+
+    groups = cohort_statistics(index, {"not": "moon:sign:aries"}, group_by="maha_dasha_lord")["groups"]
+    for group in groups:
+        mask = (maha_lords == DASHA_LORDS.index(group["group"])) & (moon_signs != 0)
+        assert group["count"] == mask.sum()
+
+
+def test_invalid_requests(cohort):
+    index = cohort[0]
+    for kwargs in ({"group_by": "moon:degree"}, {"group_by": "pluto:sign"}, {"bins": 0}, {"query": "moon:sign:x"}):
+        with pytest.raises(ValueError):
+            cohort_statistics(index, **kwargs)
+
+
+def test_values_survive_snapshots(cohort, tmp_path):
+    index = cohort[0]
+    index.save(tmp_path)
+    loaded = PlacementIndex.load(tmp_path)
+    assert cohort_statistics(loaded, group_by="moon:house") == cohort_statistics(index, group_by="moon:house")
+
+    # Snapshots written before value columns existed load with empty values
+    (tmp_path / f"values-{index.version}.npy").unlink()
+    meta = json.loads((tmp_path / "meta.json").read_text())
+    del meta["columns"]
+    (tmp_path / "meta.json").write_text(json.dumps(meta))
+    assert cohort_statistics(PlacementIndex.load(tmp_path))["strengths"]["Sun"] == {"count": 0}
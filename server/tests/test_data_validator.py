@@ -0,0 +1,120 @@
+"""
+Unit tests for the streaming data validator.
+
+Checks that the chunked report equals one computed on the whole DataFrame,
+that statistics of separate chunks merge into those of the whole, and that
+the sketches stay accurate once they stop being exact.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from server.ml.data_validator import DataValidator, DatasetStats, DuplicateSketch, QuantileSketch
+
+
+@pytest.fixture
+def dataset_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        'sun_degree': rng.uniform(-5, 365, n),
+        'moon_house': rng.integers(1, 13, n),
+        'career_potential': np.round(rng.normal(50, 15, n), 1),
+        'wealth_potential': rng.integers(0, 101, n),
+        'name': rng.choice(['a', 'b', 'c'], n),
+        'spread': rng.standard_cauchy(n),
+    })
+    df.loc[rng.choice(n, 100), 'career_potential'] = np.nan
+    # The first 1000-row chunk reads name as float, the file as text
+    df.loc[:999, 'name'] = None
+    df = pd.concat([df, df.iloc[:60]], ignore_index=True)
+    path = tmp_path / "training_data.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def expected_report(df: pd.DataFrame) -> dict:
+    """The checks computed on the whole DataFrame at once."""
+    numeric = df.select_dtypes(include=[np.number])
+    outliers = {}
+    for col in numeric.columns:
+        q1, q3 = df[col].quantile(0.25), df[col].quantile(0.75)
+        count = int(((df[col] < q1 - 1.5 * (q3 - q1)) | (df[col] > q3 + 1.5 * (q3 - q1))).sum())
+        if count:
+            outliers[col] = count
+    return {
+        'duplicate_count': int(df.duplicated().sum()),
+        'out_of_range_features': {
+            col: int(((df[col] < low) | (df[col] > high)).sum())
+            for col, (low, high) in DataValidator.FEATURE_RANGES.items()
+            if col in df.columns and ((df[col] < low) | (df[col] > high)).any()
+        },
+        'total_missing': int(df.isnull().sum().sum()),
+        'career_potential': {
+            'mean': round(df.career_potential.mean(), 2), 'std': round(df.career_potential.std(), 2),
+            'min': round(df.career_potential.min(), 2), 'max': round(df.career_potential.max(), 2),
+            'median': round(df.career_potential.median(), 2),
+        },
+        'wealth_potential_max': df.wealth_potential.max(),
+        'outlier_details': outliers,
+        'numeric_columns': len(numeric.columns),
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 700, 10_000])
+def test_streamed_report_matches_whole_frame(dataset_csv, chunk_size):
+    df = pd.read_csv(dataset_csv)
+    expected = expected_report(df)
+    report = DataValidator(chunk_size=chunk_size).validate(str(dataset_csv))
+
+    assert report['dataset_size'] == len(df) and report['feature_count'] == len(df.columns)
+    assert report['duplicate_check']['duplicate_count'] == expected['duplicate_count'] == 60
+    assert report['feature_ranges']['out_of_range_features'] == expected['out_of_range_features']
+    assert report['missing_values']['total_missing'] == expected['total_missing']
+    targets = report['target_distribution']['target_distribution']
+    assert targets['career_potential'] == pytest.approx(expected['career_potential'])
+    assert targets['wealth_potential']['max'] == expected['wealth_potential_max']
+    assert report['outlier_detection']['outlier_details'] == expected['outlier_details']
+    assert report['data_types']['numeric_columns'] == expected['numeric_columns']
+    assert report['data_types']['total_columns'] == len(df.columns)
+
+
+def test_loaded_frame_and_merged_stats_match_stream(dataset_csv):
+    streamed = DataValidator(chunk_size=500).validate(str(dataset_csv))
+    validator = DataValidator(chunk_size=800)
+    validator.load_data(str(dataset_csv))
+    assert validator.validate() == streamed
+
+    df = pd.read_csv(dataset_csv)
+    whole = DatasetStats(list(df.columns), DataValidator.FEATURE_RANGES)
+    whole.update(df)
+    parts = [DatasetStats(list(df.columns), DataValidator.FEATURE_RANGES) for _ in range(2)]
+    parts[0].update(df.iloc[:1234])
+    parts[1].update(df.iloc[1234:])
+    parts[0].merge(parts[1])
+    np.testing.assert_allclose(parts[0].moments.m2, whole.moments.m2, rtol=1e-9)
+    assert parts[0].duplicates.duplicates == whole.duplicates.duplicates
+    assert parts[0].numeric_columns() == whole.numeric_columns()
+
+
+def test_sketches_are_accurate_beyond_exact_size():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(0, 1, 200_000)
+    sketch = QuantileSketch(exact_values=1000)
+    for start in range(0, len(values), 10_000):
+        sketch.update(values[start:start + 10_000])
+
+    assert not sketch.exact and len(sketch.values) < 1000
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.01)
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    expected = int(((values < lower) | (values > upper)).sum())
+    assert sketch.count_outside(lower, upper) == pytest.approx(expected, rel=0.02)
+
+    hashes = rng.integers(0, 2 ** 64, 150_000, dtype=np.uint64)
+    duplicates = DuplicateSketch(size=20_000)
+    duplicates.update(np.concatenate([hashes, hashes[:30_000]]))
+    assert duplicates.saturated and len(duplicates.hashes) == 20_000
+    assert duplicates.duplicates == pytest.approx(30_000, rel=0.05 * 150_000 / 30_000)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the batch feature extractor.
+
+Checks that the batch matrix matches single-chart extraction, the vectorized
+aspect estimation against a pairwise loop, per-feature defaults for
+malformed values, and column reordering.
+"""
+
+import asyncio
+import copy
+import json
+
+import numpy as np
+import pytest
+
+from server.ml.feature_extractor import (
+    ASPECT_DEGREES,
+    ASPECT_ORB,
+    N_ASPECTS,
+    ChartTable,
+    KundaliFeatureExtractor,
+    estimate_aspect_strengths,
+)
+from server.pydantic_schemas.kundali_schema import KundaliRequest
+from server.services.logic import generate_kundali_logic
+
+
+@pytest.fixture(scope="module")
+def kundali():
+    birth = KundaliRequest(birthDate="1990-05-15", birthTime="14:30", latitude=28.6139,
+                           longitude=77.2090, timezone="Asia/Kolkata")
+    response = asyncio.run(generate_kundali_logic(birth)).model_dump(exclude_none=True)
+    # As received over the API (string keys)
+    return json.loads(json.dumps(response, default=str))
+
+
+def _loop_aspects(longitudes):
+    strengths = []
+    for i in range(len(longitudes)):
+        for j in range(i + 1, len(longitudes)):
+            diff = abs(longitudes[i] - longitudes[j])
+            if diff > 180:
+                diff = 360 - diff
+            for angle in ASPECT_DEGREES:
+                if abs(diff - angle) <= ASPECT_ORB:
+                    strengths.append(max(0, 100 * (1 - abs(diff - angle) / ASPECT_ORB)))
+                    break
+    return (strengths + [0.0] * N_ASPECTS)[:N_ASPECTS]
+
+
+def test_matrix_matches_single_chart(kundali):
+    extractor = KundaliFeatureExtractor()
+    estimated = copy.deepcopy(kundali)
+    estimated['shad_bala']['aspect_strengths'] = {}
+    charts = [kundali, estimated, {}]
+
+    matrix = extractor.extract_matrix(charts)
+    assert matrix.dtype == np.float32 and matrix.shape == (3, 53)
+
+    for row, chart in zip(extractor.extract_matrix(charts, dtype=np.float64), charts):
+        features, _ = extractor.extract_features(chart)
+        assert row.tolist() == list(features.values())
+    assert list(features) == extractor.required_features
+
+
+def test_aspect_estimation_matches_pairwise_loop():
+    rng = np.random.default_rng(0)
+    longitudes = rng.uniform(0, 360, (300, 9))
+    longitudes[:50, 1] = longitudes[:50, 0] + rng.uniform(-10, 10, 50)  # near conjunctions
+    longitudes[50:60, 3:] = np.nan
+
+    expected = [_loop_aspects([v for v in row if not np.isnan(v)]) for row in longitudes]
+    assert estimate_aspect_strengths(longitudes).tolist() == expected
+    assert estimate_aspect_strengths(longitudes[:, :1]).tolist() == [[0.0] * N_ASPECTS] * 300
+
+
+def test_malformed_values_fall_back(kundali):
+    chart = copy.deepcopy(kundali)
+    chart['planets']['Sun']['longitude'] = None
+    chart['shad_bala']['yogas'] = {'total_yoga_count': 'many', 'benefic_yoga_count': 2}
+    chart['shad_bala']['aspect_strengths'] = {'1': 40.0, '2': 'strong'}
+
+    features, missing = KundaliFeatureExtractor().extract_features(chart)
+
+    assert missing == ['sun_degree', 'total_yoga_count', 'aspect_strength_2']
+    assert (features['sun_degree'], features['total_yoga_count'], features['benefic_yoga_count']) == (0.0, 0.0, 2.0)
+    assert [features[f'aspect_strength_{i}'] for i in range(1, 7)] == [40.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+    table = ChartTable.from_responses([kundali, chart])
+    assert table.missing == [[], missing]
+
+
+def test_feature_names_reorder_columns(kundali):
+    extractor = KundaliFeatureExtractor()
+    names = list(reversed(extractor.required_features))
+
+    features, _ = extractor.extract_features(kundali)
+    row = extractor.extract_matrix([kundali], feature_names=names, dtype=np.float64)[0]
+    assert row.tolist() == [features[name] for name in names]
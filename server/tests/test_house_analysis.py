@@ -0,0 +1,95 @@
+"""
+Unit tests for house analysis.
+
+Checks house lords, own-sign and exaltation dignities, lord and house
+strength and the rule interpretations against hand-checked charts.
+"""
+
+import pytest
+
+from server.rule_engine.rules.house_rules import HouseRules
+from server.utils.house_analysis import HouseAnalyzer
+
+# Aries ascendant; Venus is left out, so houses it rules have an Unknown lord strength
+PLANETS = {
+    'Sun': {'sign': 'Leo', 'house': 5},             # own sign
+    'Moon': {'sign': 'Taurus', 'house': 2},         # exalted
+    'Mars': {'sign': 'Gemini', 'house': 3},         # strong house
+    'Mercury': {'sign': 'Cancer', 'house': 4},      # no dignity
+    'Jupiter': {'sign': 'Capricorn', 'house': 10},  # strong house
+    'Saturn': {'sign': 'Libra', 'house': 7},        # exalted
+    'Rahu': {'sign': 'Gemini', 'house': 3},
+    'Ketu': {'sign': 'Sagittarius', 'house': 9},
+}
+OCCUPANTS = {2: ['Moon'], 3: ['Mars', 'Rahu'], 4: ['Mercury'], 5: ['Sun'], 7: ['Saturn'], 9: ['Ketu'],
+             10: ['Jupiter']}
+# Signs given as numbers, as stored with saved charts
+HOUSES = {h: {'sign': h, 'planets': OCCUPANTS.get(h, [])} for h in range(1, 13)}
+
+EXPECTED_LORDS = {
+    1: ('Mars', 'Strong'), 2: ('Venus', 'Unknown'), 3: ('Mercury', 'Moderate'),
+    4: ('Moon', 'Very Strong'), 5: ('Sun', 'Very Strong'), 6: ('Mercury', 'Moderate'),
+    7: ('Venus', 'Unknown'), 8: ('Mars', 'Strong'), 9: ('Jupiter', 'Strong'),
+    10: ('Saturn', 'Very Strong'), 11: ('Saturn', 'Very Strong'), 12: ('Jupiter', 'Strong'),
+}
+
+
+@pytest.fixture
+def analyzer():
+    return HouseAnalyzer(PLANETS, HOUSES, 'Aries')
+
+
+def test_lords_and_dignities(analyzer):
+    table = analyzer.get_house_table()
+    assert {h: (table.lord_name(h), table.lord_strength_label(h)) for h in range(1, 13)} == EXPECTED_LORDS
+    assert [h for h in range(1, 13) if table.lord_in_own_sign[h - 1]] == [5]
+    assert [h for h in range(1, 13) if table.lord_exalted[h - 1]] == [4, 10, 11]
+    assert table.lord_houses.tolist() == [3, 0, 4, 2, 5, 4, 0, 3, 10, 7, 7, 10]
+    assert analyzer.get_house_table() is table
+
+
+def test_analyze_all_houses(analyzer):
+    houses = analyzer.analyze_all_houses()
+    assert [houses[h]['sign'] for h in (1, 6, 12)] == ['Aries', 'Virgo', 'Pisces']
+    assert houses[6]['interpretation'].startswith("House 6 (Health) is in Virgo sign. ")
+    assert houses[3]['planets'] == ['Mars', 'Rahu']
+    assert (houses[3]['strength'], houses[3]['quality']) == ('Very Strong', 'Malefic (Challenging)')
+    assert (houses[5]['strength'], houses[5]['quality']) == ('Strong', 'Benefic (Favorable)')
+    assert (houses[4]['strength'], houses[4]['quality']) == ('Moderate', 'Benefic (Favorable)')
+    assert (houses[1]['strength'], houses[1]['quality']) == ('Weak (No planets)', 'Neutral (Balanced)')
+    assert {h: (houses[h]['lord'], houses[h]['lord_strength']) for h in range(1, 13)} == EXPECTED_LORDS
+    assert analyzer.analyze_single_house(6) == houses[6] and analyzer.analyze_single_house(13) == {}
+
+
+def test_house_lords_analysis(analyzer):
+    lords = analyzer.get_house_lords_analysis()
+    assert lords[4] == {
+        'house': 4, 'lord': 'Moon', 'sign_in_house': 'Cancer', 'lord_position': 'Taurus in House 2',
+        'strength': 'Very Strong', 'aspects': [], 'conjunction': [],
+    }
+    assert (lords[7]['lord'], lords[7]['lord_position'], lords[7]['strength']) == ('Venus', 'Unknown', 'Unknown')
+
+
+def test_house_signs_follow_ascendant_when_missing():
+    houses = {h: {'planets': []} for h in range(1, 13)}
+    houses[1]['planets'] = ['Moon']
+    analyzer = HouseAnalyzer({'Moon': {'sign': 'Cancer', 'house': 1}}, houses, 'Cancer')
+    table = analyzer.get_house_table()
+    assert [table.sign_name(h) for h in (1, 2, 12)] == ['Cancer', 'Leo', 'Gemini']
+    assert (table.lord_name(1), table.lord_strength_label(1)) == ('Moon', 'Very Strong')
+    assert table.lord_in_own_sign[0] and not table.lord_exalted[0]
+    # The Sun is not in planets_info
+    assert (table.lord_name(2), table.lord_strength_label(2)) == ('Sun', 'Unknown')
+
+
+def test_interpret_house_table(analyzer):
+    interpretations = HouseRules.interpret_house_table(analyzer.get_house_table())
+    assert sorted(interpretations) == list(range(1, 13))
+    assert "\nSign: Virgo" in interpretations[6]
+    assert "\nHouse Lord: Mercury (Moderate)" in interpretations[6]
+    assert "\nHouse Lord: Venus (Unknown)" in interpretations[7]
+    assert "\nOverall Strength: Very Strong" in interpretations[3]
+
+    # Same text as interpreting each house's analysis dict
+    houses = analyzer.analyze_all_houses()
+    assert interpretations == {h: HouseRules.interpret_house(houses[h]) for h in range(1, 13)}
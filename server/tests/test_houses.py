@@ -0,0 +1,62 @@
+"""
+Unit tests for house cusp computation.
+
+Tests calculate_houses, its batch form and the reuse of the result by
+VargaCalculator.
+"""
+
+import numpy as np
+import pytest
+
+from server.utils.astro_utils import (
+    HOUSE_SYSTEMS,
+    calculate_ascendant,
+    calculate_houses,
+    calculate_houses_batch,
+)
+from server.utils.varga_calculator import VargaCalculator
+
+JD = 2448027.875  # 1990-05-15 09:00 UT
+LATITUDE, LONGITUDE = 28.61, 77.21
+
+
+@pytest.mark.parametrize("house_system", list(HOUSE_SYSTEMS))
+def test_every_system_returns_twelve_cusps(house_system):
+    houses = calculate_houses(JD, LATITUDE, LONGITUDE, house_system)
+    assert len(houses['cusps']) == 12
+    assert all(0 <= c < 360 for c in houses['cusps'])
+
+
+def test_placidus_first_cusp_is_ascendant():
+    houses = calculate_houses(JD, LATITUDE, LONGITUDE)
+    assert houses['cusps'][0] == pytest.approx(houses['ascendant'])
+    assert houses['ascendant'] == calculate_ascendant(JD, LATITUDE, LONGITUDE)
+
+
+def test_whole_sign_cusps_start_at_sign_boundaries():
+    houses = calculate_houses(JD, LATITUDE, LONGITUDE, 'whole_sign')
+    assert all(c % 30 == 0 for c in houses['cusps'])
+    assert houses['cusps'][0] == houses['ascendant'] - houses['ascendant'] % 30
+
+
+def test_batch_matches_single_and_broadcasts():
+    jds = JD + np.arange(4) * 0.1
+    batch = calculate_houses_batch(jds, LATITUDE, [LONGITUDE, 0.0, -70.0, 150.0])
+    assert batch['cusps'].shape == (4, 12)
+    single = calculate_houses(jds[2], LATITUDE, -70.0)
+    assert batch['mc'][2] == pytest.approx(single['mc'])
+    np.testing.assert_allclose(batch['cusps'][2], single['cusps'])
+
+
+def test_unknown_house_system_rejected():
+    with pytest.raises(ValueError):
+        calculate_houses(JD, LATITUDE, LONGITUDE, 'topocentric-ish')
+
+
+def test_varga_reuses_house_angles():
+    houses = calculate_houses(JD, LATITUDE, LONGITUDE)
+    calc = VargaCalculator({}, houses['ascendant'], houses=houses)
+    navamsha = calc.calculate_navamsha_chart()
+    assert navamsha['ascendant'] == calc._calculate_varga_ascendant(houses['ascendant'], 9)
+    assert navamsha['midheaven'] == calc._calculate_varga_ascendant(houses['mc'], 9)
+    assert calc.get_varga_angles(9) is calc.get_varga_angles(9)
@@ -0,0 +1,146 @@
+"""
+Unit tests for incremental retraining from saved charts.
+
+Checks that only charts past the watermark are read and featurized, that a
+rejected run leaves its shards pending, and that a published version
+continues the parent's trees and loads like any other version.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import joblib
+import numpy as np
+import pytest
+import xgboost as xgb
+from bson import ObjectId
+from sklearn.preprocessing import StandardScaler
+
+from server.ml.feature_extractor import KundaliFeatureExtractor
+from server.ml.incremental_retrainer import IncrementalRetrainer, chart_row, chart_targets
+from server.ml.model_registry import ModelRegistry
+from server.ml.shards import read_manifest
+from server.ml.training_data_builder import TARGET_COLUMNS
+
+PLANETS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+
+
+class FakeCursor(list):
+    def sort(self, keys):
+        return FakeCursor(sorted(self, key=lambda doc: tuple(doc[field] for field, _ in keys)))
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+        self.returned = 0
+
+    @staticmethod
+    def matches(doc, query):
+        for field, condition in query.items():
+            if field == "$or":
+                if not any(FakeCollection.matches(doc, clause) for clause in condition):
+                    return False
+            elif isinstance(condition, dict):
+                if not doc[field] > condition["$gt"]:
+                    return False
+            elif doc[field] != condition:
+                return False
+        return True
+
+    def find(self, query, projection):
+        found = FakeCursor(doc for doc in self.docs if self.matches(doc, query))
+        self.returned += len(found)
+        return found
+
+
+def make_chart(rng, created_at, labeled=True):
+    longitudes = rng.uniform(0, 360, len(PLANETS) + 1)
+    doc = {
+        "_id": ObjectId(),
+        "created_at": created_at,
+        "kundali_data": {
+            "planets": {planet: {"longitude": float(lon)} for planet, lon in zip(PLANETS, longitudes)},
+            "ascendant": {"longitude": float(longitudes[-1])},
+            "houses": {str(h): {"planets": PLANETS[:h % 3]} for h in range(1, 13)},
+        },
+        "ml_features": None,
+    }
+    if labeled:
+        doc["ml_features"] = {target: float(longitudes[k] / 3.6) for k, target in enumerate(TARGET_COLUMNS)}
+    return doc
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    """A default version trained on noise, so real labels improve it."""
+    feature_names = KundaliFeatureExtractor().required_features
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 360, (300, len(feature_names)))
+    y = rng.uniform(0, 100, (300, len(TARGET_COLUMNS)))
+    scaler = StandardScaler().fit(X)
+    model = xgb.XGBRegressor(n_estimators=5, max_depth=3).fit(scaler.transform(X), y)
+
+    joblib.dump(model, tmp_path / "xgboost_model.pkl")
+    joblib.dump(scaler, tmp_path / "scaler.pkl")
+    (tmp_path / "feature_names.json").write_text(json.dumps(feature_names))
+    (tmp_path / "target_names.json").write_text(json.dumps(TARGET_COLUMNS))
+    return tmp_path
+
+
+def test_chart_targets_and_rows():
+    doc = {"ml_features": {target: 50.0 for target in TARGET_COLUMNS}}
+    assert chart_targets(doc, TARGET_COLUMNS) == [50.0] * len(TARGET_COLUMNS)
+    assert chart_targets({"ml_features": {"career": 0.8}}, TARGET_COLUMNS) is None
+    assert chart_targets({"ml_features": {**doc["ml_features"], "health_status": float("nan")}}, TARGET_COLUMNS) is None
+    assert chart_targets({"ml_features": None}, TARGET_COLUMNS) is None
+
+    chart_id = ObjectId()
+    assert chart_row(chart_id) == chart_row(str(chart_id)) >= 0
+    assert chart_row(chart_id) != chart_row(ObjectId())
+
+
+def test_retraining_is_incremental_and_validated(models_dir):
+    rng = np.random.default_rng(1)
+    start = datetime(2026, 1, 1)
+    collection = FakeCollection()
+    collection.docs = [make_chart(rng, start + timedelta(seconds=i // 2), labeled=i % 10 != 0) for i in range(600)]
+    collection.docs[5]["kundali_data"]["houses"] = []
+    db = {"kundalis": collection}
+
+    retrainer = IncrementalRetrainer(db, models_dir, rounds=10, n_jobs=1)
+    retrainer.max_regression = -1.0
+    rejected = retrainer.run()
+    ingested = rejected["ingested"]
+    assert rejected["version"] is None and "worse" in rejected["reason"]
+    assert (ingested["charts"], ingested["unlabeled"], ingested["unreadable"]) == (600, 60, 1)
+    assert ingested["train"] + ingested["holdout"] == 539
+    assert ModelRegistry(models_dir).versions() == ["default"]
+
+    # The rejected shards are trained on without reading any chart again
+    retrainer.max_regression = 0.0
+    published = retrainer.run(activate=True)
+    assert collection.returned == 600 and published["ingested"]["charts"] == 0
+    assert published["pending_shards"] == [0] and published["version"] is not None
+    holdout = published["holdout"]
+    assert holdout["candidate"]["mse"] < holdout["parent"]["mse"]
+
+    registry = ModelRegistry(models_dir)
+    model = registry.active
+    assert model.version == published["version"] and registry.versions() == ["default", model.version]
+    metadata = json.loads((model.path / "model_metadata.json").read_text())
+    assert metadata["retraining"]["trained_shards"] == [0]
+    assert metadata["retraining"]["watermark"]["_id"] == str(collection.docs[-1]["_id"])
+    assert model.xgb_model.get_booster().num_boosted_rounds() == 15
+    np.testing.assert_allclose(
+        model.predict_matrix(np.zeros((3, 53))),
+        model.xgb_model.predict(model.plan.transform(np.zeros((3, 53)))),
+        rtol=1e-5, atol=1e-4,
+    )
+
+    # Charts saved in the same second as the watermark are not lost
+    collection.docs += [make_chart(rng, start + timedelta(seconds=299 + i // 100)) for i in range(200)]
+    stats = retrainer.run()
+    assert collection.returned == 800 and stats["ingested"]["charts"] == 200
+    assert stats["parent_version"] == model.version and stats["pending_shards"] == [1]
+    assert len(read_manifest(models_dir / "_retraining" / "train")["shards"]) == 2
@@ -0,0 +1,101 @@
+"""
+Unit tests for the micro-batching inference queue.
+
+Checks that concurrent single predictions are scored together, that batches
+respect the size limit, that failures reach every caller, and that the ML
+endpoints return the same scores through the queue.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from server.ml.inference_batcher import MicroBatcher, get_batching_metrics
+from server.ml.predictor import KundaliMLPredictor
+from server.routes import ml_predictions
+
+
+def _recording_batcher(name, **kwargs):
+    batches = []
+
+    def predict_fn(matrix):
+        batches.append(matrix.shape[0])
+        return matrix.sum(axis=1, keepdims=True)
+
+    return MicroBatcher(name, predict_fn, **kwargs), batches
+
+
+def _predict_concurrently(batcher, rows):
+    async def run():
+        return await asyncio.gather(*(batcher.predict(row) for row in rows))
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_share_a_batch():
+    batcher, batches = _recording_batcher("test_share", max_wait_ms=50)
+    rows = [np.full(3, i, dtype=np.float32) for i in range(10)]
+
+    results = _predict_concurrently(batcher, rows)
+
+    assert batches == [10]
+    assert [float(r[0]) for r in results] == [3.0 * i for i in range(10)]
+
+    metrics = get_batching_metrics()["test_share"]
+    assert (metrics["batches"], metrics["rows"], metrics["batch_sizes"]) == (1, 10, {10: 1})
+    assert metrics["queue_ms"]["count"] == 10
+    batcher.close()
+
+
+def test_batches_respect_max_size():
+    batcher, batches = _recording_batcher("test_split", max_batch_size=4, max_wait_ms=50)
+
+    results = _predict_concurrently(batcher, [np.ones(2)] * 10)
+
+    assert batches == [4, 4, 2]
+    assert len(results) == 10
+    batcher.close()
+
+
+def test_failures_reach_every_caller():
+    def failing(matrix):
+        raise RuntimeError("booster failed")
+
+    batcher = MicroBatcher("test_fail", failing, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict(np.ones(2)) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert batcher.metrics()["errors"] == 1
+
+    with pytest.raises(ValueError):
+        asyncio.run(batcher.predict(np.ones((2, 2))))
+    batcher.close()
+
+
+def test_predictor_async_matches_sync(valid_53_features):
+    predictor = KundaliMLPredictor()
+    features = dict(zip(predictor.feature_names, valid_53_features))
+
+    async def run():
+        return await asyncio.gather(*(predictor.predict_async(features) for _ in range(5)))
+
+    expected = predictor.predict(features)
+    for result in asyncio.run(run()):
+        for target in predictor.target_names:
+            assert result[target].score == pytest.approx(expected[target].score, abs=1e-3)
+    predictor.batcher.close()
+
+
+@pytest.mark.predict
+def test_predict_endpoint_uses_queue(client, valid_53_features):
+    response = client.post("/api/ml/predict", json={"features": valid_53_features})
+
+    data = response.json()["data"]
+    expected = ml_predictions.predict_matrix(np.array([valid_53_features]))[0]
+    assert data["career_potential"] == pytest.approx(float(expected[0]), abs=1e-3)
+
+    stats = client.get("/api/ml/inference-stats").json()["data"]
+    assert stats["model_registry"]["rows"] >= 1
@@ -2,8 +2,14 @@
 Tests for ML prediction endpoints.
 """
 
+import json
+
+import numpy as np
 import pytest
 
+from server.ml.model_registry import get_model_registry
+from server.routes import ml_predictions
+
 
 @pytest.mark.predict
 @pytest.mark.unit
@@ -184,6 +190,77 @@ class TestMLPredictEndpoint:
         assert abs(actual_average - expected_average) < 0.01
 
 
+@pytest.mark.predict
+@pytest.mark.unit
+class TestMLPredictBatchEndpoint:
+    """Test the /api/ml/predict-batch endpoint."""
+
+    @pytest.fixture
+    def records(self, valid_53_features):
+        rng = np.random.default_rng(0)
+        base = np.array(valid_53_features)
+        return (base * rng.uniform(0.8, 1.2, size=(50, 53))).tolist()
+
+    def test_batch_matches_single_predictions(self, client, records):
+        """Test that one batched prediction equals per-record predictions."""
+        response = client.post("/api/ml/predict-batch", json={"records": records})
+
+        data = response.json()["data"]
+        assert data["successful_predictions"] == 50
+        for record, prediction in zip(records, data["predictions"]):
+            single = ml_predictions.make_prediction(ml_predictions.normalize_features(record))["predictions"]
+            assert [prediction[name] for name in get_model_registry().active.target_names] == pytest.approx(single.tolist(), abs=1e-3)
+            assert prediction["average_score"] == pytest.approx(float(np.mean(single)), abs=1e-3)
+
+    def test_batch_columns_format(self, client, records):
+        """Test the columnar response format."""
+        response = client.post("/api/ml/predict-batch", json={"records": records, "format": "columns"})
+
+        columns = response.json()["data"]["predictions"]
+        assert columns["record_ids"] == list(range(50))
+        assert all(len(columns[name]) == 50 for name in get_model_registry().active.target_names)
+        assert columns["errors"] == []
+
+    def test_batch_invalid_records_reported(self, client, records):
+        """Test that malformed records get per-record errors without failing the batch."""
+        records[3] = records[3][:10]
+        response = client.post("/api/ml/predict-batch", json={"records": records})
+
+        data = response.json()["data"]
+        assert data["successful_predictions"] == 49
+        assert [p["record_id"] for p in data["predictions"]] == list(range(50))
+        assert "error" in data["predictions"][3]
+
+        _, record_ids, errors = ml_predictions.build_feature_matrix([records[0], [float("nan")] * 53])
+        assert record_ids.tolist() == [0]
+        assert errors == [{"record_id": 1, "error": "Non-finite feature value"}]
+
+    def test_batch_invalid_first_record_reported(self, client, records):
+        """Test that a malformed first record does not reject the whole batch."""
+        records[0] = records[0][:52]
+        response = client.post("/api/ml/predict-batch", json={"records": records})
+
+        data = response.json()["data"]
+        assert data["successful_predictions"] == 49
+        assert data["predictions"][0] == {"record_id": 0, "error": "Invalid feature count: expected 53, got 52"}
+        assert [p["record_id"] for p in data["predictions"]] == list(range(50))
+
+    def test_batch_ndjson_stream(self, client, records):
+        """Test the streamed newline-delimited JSON format."""
+        response = client.post("/api/ml/predict-batch", json={"records": records, "format": "ndjson"})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["record_id"] for line in lines] == list(range(50))
+
+    def test_batch_size_limit(self, client, records, monkeypatch):
+        """Test that batches above the limit are rejected."""
+        monkeypatch.setattr(ml_predictions, "MAX_BATCH_RECORDS", 10)
+        response = client.post("/api/ml/predict-batch", json={"records": records})
+
+        assert response.json()["error"]["code"] == "BATCH_TOO_LARGE"
+
+
 @pytest.mark.predict
 @pytest.mark.unit
 class TestMLPredictFromKundaliEndpoint:
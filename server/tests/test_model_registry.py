@@ -0,0 +1,94 @@
+"""
+Unit tests for the model registry.
+
+Covers single loading, versioned activation followed by other processes,
+rollback, rejection of broken versions, and load statistics.
+"""
+
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from server.ml.model_registry import (
+    ACTIVE_FILE,
+    DEFAULT_VERSION,
+    MODELS_DIR,
+    REQUIRED_FILES,
+    ModelRegistry,
+)
+from server.ml.predictor import KundaliMLPredictor
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for name in REQUIRED_FILES + ("model_metrics.json",):
+        shutil.copy(MODELS_DIR / name, tmp_path / name)
+    v2 = tmp_path / "v2"
+    v2.mkdir()
+    for name in REQUIRED_FILES:
+        shutil.copy(MODELS_DIR / name, v2 / name)
+    (v2 / "model_metadata.json").write_text(json.dumps({"version": "v2.0"}))
+    return tmp_path
+
+
+def test_loads_once_and_reports_stats(models_dir):
+    registry = ModelRegistry(models_dir)
+    first = registry.active
+    assert registry.active is first
+    assert first.version == DEFAULT_VERSION
+
+    status = registry.status()
+    assert status["active"]["load_time_ms"] > 0
+    assert status["active"]["memory_bytes"] > 100_000
+    assert status["available"] == [DEFAULT_VERSION, "v2"]
+
+
+def test_activation_reaches_other_workers(models_dir):
+    rollout, worker = ModelRegistry(models_dir), ModelRegistry(models_dir, poll_interval=0)
+    before = worker.active
+    assert rollout.active.version == DEFAULT_VERSION
+
+    rollout.activate("v2")
+    assert (models_dir / ACTIVE_FILE).read_text().strip() == "v2"
+    # The poll starts a background load and keeps serving the current version
+    assert worker.active is before
+    swapped = worker.wait_for_load()
+    assert worker.active is swapped
+    assert (swapped.version, swapped.model_version) == ("v2", "v2.0")
+
+    # Same artifacts, so the swapped model predicts identically
+    features = np.random.default_rng(0).uniform(0, 10, (4, len(before.feature_names)))
+    np.testing.assert_allclose(swapped.predict_matrix(features), before.predict_matrix(features))
+
+    rollout.rollback()
+    worker.active
+    assert worker.wait_for_load().version == DEFAULT_VERSION
+
+
+def test_broken_versions_are_rejected(models_dir):
+    registry = ModelRegistry(models_dir, poll_interval=0)
+    (models_dir / "v2" / "scaler.pkl").unlink()
+
+    with pytest.raises(ValueError):
+        registry.activate("v2")
+    for version in ("../v2", "missing"):
+        with pytest.raises(ValueError):
+            registry.activate(version)
+
+    # A broken version named in ACTIVE leaves the current one serving
+    assert registry.active.version == DEFAULT_VERSION
+    (models_dir / ACTIVE_FILE).write_text("v2")
+    assert registry.active.version == DEFAULT_VERSION
+    assert registry.wait_for_load().version == DEFAULT_VERSION
+    assert "scaler.pkl" in registry.status()["load_error"]
+
+
+def test_predictor_pinned_to_directory(models_dir):
+    predictor = KundaliMLPredictor(models_dir / "v2")
+    features = {name: 0.5 for name in predictor.feature_names}
+
+    result = predictor.predict(features)
+    assert result[predictor.target_names[0]].model_version == "v2.0"
+    assert KundaliMLPredictor(models_dir / "v2").model is predictor.model
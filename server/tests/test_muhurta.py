@@ -0,0 +1,67 @@
+"""
+Unit tests for the muhurta window search.
+
+Tests the batch ascendant against Swiss Ephemeris houses, Tara counting and
+the ranked, refined windows returned by MuhurtaSearch.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from server.services.muhurta_calculator import MuhurtaCriteria, MuhurtaSearch, tara_number
+from server.utils.astro_utils import calculate_ascendant, calculate_ascendant_batch
+
+
+LATITUDE, LONGITUDE = 28.61, 77.21
+
+
+def test_batch_ascendant_matches_single():
+    jds = 2461345.0 + np.linspace(0, 20, 7)
+    batch = calculate_ascendant_batch(jds, LATITUDE, LONGITUDE)
+    for jd, asc in zip(jds, batch):
+        diff = (calculate_ascendant(jd, LATITUDE, LONGITUDE) - asc + 180) % 360 - 180
+        assert abs(diff) < 0.01
+
+
+def test_tara_number():
+    # Rohini (3) to Dhanishta (22) is the 20th nakshatra: Sampat
+    assert int(tara_number(22, 3)) == 2
+    assert int(tara_number(3, 3)) == 1
+    assert int(tara_number(2, 3)) == 9
+
+
+class TestMuhurtaSearch:
+    """Tests for ranked window search."""
+
+    @pytest.fixture(scope="class")
+    def search(self):
+        return MuhurtaSearch(date(2026, 11, 1), 30, LATITUDE, LONGITUDE,
+                             natal_moon_nakshatra='Rohini')
+
+    def test_windows_ranked_and_within_range(self, search):
+        windows = search.find_windows(min_score=50, max_results=50)
+        assert windows
+        scores = [w['score'] for w in windows]
+        assert scores == sorted(scores, reverse=True)
+        for w in windows:
+            assert w['starts_at'] < w['ends_at']
+            assert '2026-11-01' <= w['starts_at'][:10] <= '2026-11-30'
+
+    def test_windows_honour_criteria(self, search):
+        for w in search.find_windows(min_score=100, max_results=50):
+            assert w['criteria_failed'] == []
+            assert w['malefics_in_kendras'] == []
+            assert w['tithi']['number'] not in (4, 9, 14, 19, 24, 29, 30)
+            assert w['tara']['number'] in (2, 4, 6, 8, 9)
+
+    def test_runs_tile_the_range(self, search):
+        windows = search.find_windows(min_score=0, max_results=10000)
+        total = sum(w['duration_minutes'] for w in windows)
+        # Durations are rounded to 0.1 minute each
+        assert total == pytest.approx(30 * 1440, abs=0.05 * len(windows))
+
+    def test_invalid_criteria_rejected(self):
+        with pytest.raises(ValueError):
+            MuhurtaCriteria(favorable_ascendants=['Ophiuchus'])
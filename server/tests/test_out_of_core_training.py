@@ -0,0 +1,82 @@
+"""
+Unit tests for out-of-core training from sharded datasets.
+
+Checks the hashed train/validation/test split, that the streamed scaler
+matches one fitted in memory, and that the trained artifacts load and
+serve like in-memory ones.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from server.ml.model_registry import load_model
+from server.ml.shards import read_frame
+from server.ml.synthetic_data_generator_fixed import FixedSyntheticKundaliGenerator
+from server.ml.train_models import SPLIT_FRACTIONS, OutOfCoreTrainer, _RegressionTotals, assign_splits
+
+
+@pytest.fixture(scope="module")
+def shard_dir(tmp_path_factory):
+    output = tmp_path_factory.mktemp("synthetic")
+    FixedSyntheticKundaliGenerator(seed=3).generate_shards(output, 3000, chunk_size=700, workers=1)
+    return output
+
+
+def test_assign_splits_is_stable_and_proportional():
+    rows = np.arange(100_000)
+    splits = assign_splits(rows, seed=42)
+
+    np.testing.assert_array_equal(assign_splits(rows[::-1], seed=42), splits[::-1])
+    assert not np.array_equal(assign_splits(rows, seed=7), splits)
+    fractions = np.bincount(splits, minlength=3) / len(rows)
+    np.testing.assert_allclose(fractions, SPLIT_FRACTIONS, atol=0.01)
+
+
+def test_regression_totals_match_sklearn():
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    rng = np.random.default_rng(0)
+    y = rng.uniform(0, 100, size=(500, 8))
+    prediction = y + rng.normal(0, 10, size=y.shape)
+    totals = _RegressionTotals(8)
+    for start in range(0, 500, 128):
+        totals.update(y[start:start + 128], prediction[start:start + 128])
+
+    metrics = totals.metrics()
+    assert metrics["r2"] == pytest.approx(r2_score(y, prediction))
+    assert metrics["mse"] == pytest.approx(mean_squared_error(y, prediction))
+    assert metrics["mae"] == pytest.approx(mean_absolute_error(y, prediction))
+
+
+def test_scaler_matches_in_memory_fit(shard_dir):
+    trainer = OutOfCoreTrainer(str(shard_dir))
+    trainer.fit_scaler()
+
+    frame = read_frame(shard_dir)
+    train = frame[assign_splits(frame.index.to_numpy(), trainer.random_state) == 0]
+    assert sum(trainer.counts.values()) == 3000 and trainer.counts["train"] == len(train)
+    np.testing.assert_allclose(trainer.scaler.mean_, train[trainer.feature_names].mean().to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(trainer.scaler.scale_, train[trainer.feature_names].std(ddof=0).to_numpy(), rtol=1e-5)
+
+    batches = list(trainer.iter_batches("val", trainer.batch_size))
+    assert len(batches) == trainer._batch_count("val")
+    assert sum(len(X) for X, _ in batches) == trainer.counts["val"]
+
+
+def test_out_of_core_models_load_and_predict(shard_dir, tmp_path):
+    trainer = OutOfCoreTrainer(str(shard_dir), n_estimators=5, cache_dir=str(tmp_path))
+
+    assert trainer.train_all(output_dir=str(tmp_path / "v1"))
+    metrics = trainer.metrics["xgboost"]
+    assert metrics["training_mode"] == "out_of_core" and np.isfinite(metrics["test_r2"])
+
+    model = load_model(Path(tmp_path / "v1"), version="v1")
+    frame = read_frame(shard_dir)
+    raw = frame[model.feature_names].to_numpy(dtype=np.float64)[:10]
+    np.testing.assert_allclose(
+        model.predict_matrix(raw),
+        trainer.models["xgboost"].predict(trainer.plan.transform(raw)),
+        rtol=1e-5, atol=1e-4,
+    )
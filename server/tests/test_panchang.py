@@ -0,0 +1,73 @@
+"""
+Unit tests for the Panchang calculator.
+
+Tests the transition root-finder, the monthly calendar store and the daily
+Panchang assembled from it.
+"""
+
+from datetime import date, datetime
+
+import pytz
+
+import pytest
+
+from server.services.panchang_calculator import (
+    KARANA_NAMES,
+    TITHI_NAMES,
+    compute_transitions,
+    datetime_to_jd,
+    get_daily_panchang,
+    get_lunation_dates,
+    get_noon_tithi,
+)
+
+
+class TestTransitions:
+    """Tests for the limb transition search."""
+
+    def test_transitions_are_ordered_and_contiguous(self):
+        start = datetime_to_jd(datetime(2026, 10, 1, tzinfo=pytz.UTC))
+        jds, indexes = compute_transitions('nakshatra', start, start + 30)
+        assert (jds[1:] > jds[:-1]).all()
+        # Each nakshatra follows the previous one
+        assert (((indexes[1:] - indexes[:-1]) % 27) == 1).all()
+
+    def test_karana_cycle_length(self):
+        assert len(KARANA_NAMES) == 60
+        assert len(TITHI_NAMES) == 30
+
+
+class TestDailyPanchang:
+    """Tests for the cached daily Panchang."""
+
+    def test_lunations_october_2026(self):
+        events = get_lunation_dates(2026, 10)
+        assert [e['event'] for e in events] == ['New Moon', 'Full Moon']
+        assert events[0]['datetime'].startswith('2026-10-10')
+        assert events[1]['datetime'].startswith('2026-10-26')
+
+    def test_lunation_near_month_boundary_listed_once(self):
+        # The 1 Nov 2024 new moon falls inside October's 2-day calendar margin
+        october = get_lunation_dates(2024, 10)
+        november = get_lunation_dates(2024, 11)
+        assert [e['datetime'][:10] for e in october] == ['2024-10-03', '2024-10-17']
+        assert [e['datetime'][:10] for e in november] == ['2024-11-01', '2024-11-16']
+
+    def test_noon_tithi_at_full_moon(self):
+        # Purnima is in effect at noon the day before the 26 Oct full moon
+        assert get_noon_tithi(date(2026, 10, 25)) == 14
+
+    def test_periods_cover_the_day(self):
+        panchang = get_daily_panchang(date(2026, 10, 18))
+        for limb in ('tithi', 'nakshatra', 'yoga', 'karana'):
+            periods = panchang[limb]
+            assert periods
+            assert periods[0]['starts_at'] <= '2026-10-18T00:00:00+05:30'
+            assert periods[-1]['ends_at'] >= '2026-10-19T00:00:00+05:30'
+            for prev, nxt in zip(periods, periods[1:]):
+                assert prev['ends_at'] == nxt['starts_at']
+        assert panchang['vara'] == 'Ravivara'
+
+    def test_unknown_timezone_rejected(self):
+        with pytest.raises(ValueError):
+            get_daily_panchang(date(2026, 10, 18), timezone='Mars/Olympus')
@@ -0,0 +1,190 @@
+"""
+Unit tests for the placement bitmap index.
+
+Tests term extraction, boolean queries against a brute-force scan,
+incremental updates, memory-mapped snapshots and the background update job.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from server.background_jobs.placement_indexer import update_placement_index
+from server.services.placement_index import (
+    PLACEMENT_BODIES,
+    SIGN_NAMES,
+    PlacementIndex,
+    get_placement_index,
+    placement_terms,
+    run_query,
+)
+from server.services.panchang_calculator import NAKSHATRA_NAMES
+
+
+def random_chart(rng):
+    planets = {
+        body: {
+            "sign": SIGN_NAMES[rng.integers(12)],
+            "house": int(rng.integers(1, 13)),
+            "nakshatra": NAKSHATRA_NAMES[rng.integers(27)],
+        }
+        for body in PLACEMENT_BODIES[:-1]
+    }
+    yogas = [{"yoga_name": "Gajakesari Yoga"}] if rng.random() < 0.3 else []
+    return {
+        "planets": planets,
+        "ascendant": {"sign": SIGN_NAMES[rng.integers(12)], "nakshatra": NAKSHATRA_NAMES[rng.integers(27)]},
+        "shad_bala": {"yogas": {"yogas": yogas}},
+    }
+
+
+@pytest.fixture
+def charts():
+    rng = np.random.default_rng(0)
+    return {f"c{i}": random_chart(rng) for i in range(700)}
+
+
+@pytest.fixture
+def index(charts):
+    index = PlacementIndex()
+    index.set_charts(list(charts), [placement_terms(c) for c in charts.values()])
+    return index
+
+
+def brute_force(charts, predicate):
+    return [chart_id for chart_id, chart in charts.items() if predicate(chart)]
+
+
+def test_placement_terms():
+    chart = {
+        "planets": {"Jupiter": {"sign": "Aries", "house": 1, "nakshatra": "Purva Phalguni"}},
+        "ascendant": {"sign": "Aries", "nakshatra": "Ashwini"},
+        "shad_bala": {"yogas": {"yogas": [{"yoga_name": "Gajakesari Yoga"}]}},
+    }
+    assert placement_terms(chart) == [
+        "jupiter:sign:aries", "jupiter:house:1", "jupiter:nakshatra:purva_phalguni",
+        "ascendant:sign:aries", "ascendant:nakshatra:ashwini", "yoga:gajakesari_yoga",
+    ]
+
+
+def test_boolean_queries_match_brute_force(index, charts):
+    jupiter_1 = lambda c: c["planets"]["Jupiter"]["house"] == 1
+    moon_rohini = lambda c: c["planets"]["Moon"]["nakshatra"] == "Rohini"
+    gajakesari = lambda c: bool(c["shad_bala"]["yogas"]["yogas"])
+
+    cases = [
+        ("jupiter:house:1", jupiter_1),
+        ({"planet": "Moon", "nakshatra": "Rohini"}, moon_rohini),
+        ({"and": [{"planet": "Jupiter", "house": 1}, {"yoga": "Gajakesari Yoga"}]},
+         lambda c: jupiter_1(c) and gajakesari(c)),
+        ({"or": ["jupiter:house:1", "moon:nakshatra:rohini"]}, lambda c: jupiter_1(c) or moon_rohini(c)),
+        ({"and": [{"not": "jupiter:house:1"}, {"planet": "Sun", "sign": "Leo", "house": 5}]},
+         lambda c: not jupiter_1(c) and c["planets"]["Sun"]["sign"] == "Leo" and c["planets"]["Sun"]["house"] == 5),
+    ]
+    for query, predicate in cases:
+        bitmap = index.evaluate(query)
+        expected = brute_force(charts, predicate)
+        assert index.count(bitmap) == len(expected)
+        assert index.chart_ids_of(bitmap) == expected
+
+
+def test_incremental_replace_and_remove(index, charts):
+    moved = dict(charts["c5"], planets={**charts["c5"]["planets"], "Jupiter": {"house": 1}})
+    index.set_charts(["c5", "new"], [placement_terms(moved), ["jupiter:house:1"]])
+    charts = {**charts, "c5": moved}
+
+    expected = brute_force(charts, lambda c: c["planets"]["Jupiter"].get("house") == 1) + ["new"]
+    assert index.chart_ids_of(index.evaluate("jupiter:house:1")) == expected
+    assert len(index) == 701
+
+    assert index.remove_charts(["c5", "unknown"]) == 1
+    assert "c5" not in index.chart_ids_of(index.evaluate("jupiter:house:1"))
+    assert "c5" not in index.chart_ids_of(index.evaluate({"not": "jupiter:house:1"}))
+    assert len(index) == 700
+
+
+def test_snapshot_is_memory_mapped_and_remapped(index, tmp_path):
+    index.save(tmp_path)
+    mapped = get_placement_index(tmp_path)
+    assert isinstance(mapped.bits, np.memmap)
+
+    query = {"or": ["mars:sign:aries", "yoga:gajakesari_yoga"]}
+    count, ids = run_query(query, limit=5, offset=2, directory=tmp_path)
+    assert count == index.count(index.evaluate(query))
+    assert ids == index.chart_ids_of(index.evaluate(query))[2:7]
+    assert get_placement_index(tmp_path) is mapped
+
+    first = index.version
+    index.remove_charts(ids)
+    index.save(tmp_path)
+    assert run_query(query, limit=0, directory=tmp_path) == (count - 5, [])
+    # The replaced snapshot stays mappable for readers that just read meta.json
+    second = index.version
+    assert {path.stem.split("-")[1] for path in tmp_path.glob("*.npy")} == {first, second}
+    index.save(tmp_path)
+    assert {path.stem.split("-")[1] for path in tmp_path.glob("*.npy")} == {second, index.version}
+
+
+def test_invalid_queries(index, tmp_path):
+    for query in ["jupiter:house:13", {"planet": "Pluto", "sign": "Aries"}, {"and": []},
+                  {"planet": "Moon"}, {"xor": ["jupiter:house:1"]}, {"or": ["sun:house:1"] * 100}]:
+        with pytest.raises(ValueError):
+            index.evaluate(query)
+    with pytest.raises(RuntimeError):
+        run_query("jupiter:house:1", directory=tmp_path)
+
+
+class FakeCursor(list):
+    def sort(self, field, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[field], reverse=direction < 0))
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection):
+        docs = list(self.docs.values())
+        for field, condition in query.items():
+            docs = [doc for doc in docs if doc[field] >= condition["$gte"]]
+        return FakeCursor(docs)
+
+
+def test_update_job_skips_while_another_process_updates(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    # flock locks belong to the open file, so a second open conflicts like another process
+    with open(tmp_path / ".update.lock", "w") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        assert update_placement_index({}, tmp_path)["skipped"]
+    assert not (tmp_path / "meta.json").exists()
+
+
+def test_update_job_is_incremental(charts, tmp_path):
+    collection = FakeCollection()
+    start = datetime(2026, 1, 1)
+    for i, (chart_id, chart) in enumerate(charts.items()):
+        collection.docs[chart_id] = {"_id": chart_id, "kundali_data": chart, "updated_at": start + timedelta(seconds=i)}
+    predictions = FakeCollection()
+    predictions.docs["p1"] = {"_id": "p1", "kundali_id": "c3", "career_potential": 70.0, "created_at": start}
+    db = {"kundalis": collection, "predictions": predictions}
+
+    stats = update_placement_index(db, tmp_path)
+    assert stats["full_rebuild"] and stats["updated"] == 700 and stats["scored"] == 1
+    version = stats["version"]
+    assert update_placement_index(db, tmp_path)["version"] == version
+
+    collection.docs["c1"]["kundali_data"] = {"planets": {"Saturn": {"house": 7}}}
+    collection.docs["c1"]["updated_at"] = start + timedelta(days=1)
+    del collection.docs["c2"]
+    predictions.docs["p2"] = {"_id": "p2", "kundali_id": "c3", "career_potential": 80.0,
+                              "created_at": start + timedelta(days=1)}
+    stats = update_placement_index(db, tmp_path)
+    # The chart at the previous watermark is re-applied along with c1
+    assert (stats["full_rebuild"], stats["updated"], stats["removed"], stats["charts"]) == (False, 2, 1, 699)
+
+    index = PlacementIndex.load(tmp_path)
+    assert index.values[index.columns.index("career_potential"), 3] == 80.0
+    expected = brute_force({k: d["kundali_data"] for k, d in collection.docs.items()},
+                           lambda c: c["planets"]["Saturn"].get("house") == 7)
+    assert sorted(index.chart_ids_of(index.evaluate("saturn:house:7"))) == sorted(expected)
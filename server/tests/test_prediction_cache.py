@@ -0,0 +1,99 @@
+"""
+Unit tests for the ML prediction cache.
+
+Checks hits per endpoint, exact vs quantized keys, model-version isolation,
+the memory bound, and that repeated charts hit the cache through the
+predict-from-kundali endpoint.
+"""
+
+import asyncio
+import dataclasses
+
+import numpy as np
+import pytest
+
+from server.ml.model_registry import get_model_registry
+from server.ml.prediction_cache import PredictionCache, _entry_bytes, get_prediction_cache
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_model_registry().active
+
+
+def _counting_compute():
+    calls = []
+
+    async def compute(features):
+        calls.append(features)
+        return np.array([features.sum(), 1.0], dtype=np.float32)
+
+    return compute, calls
+
+
+def test_hits_counted_per_endpoint(model):
+    cache = PredictionCache()
+    compute, calls = _counting_compute()
+    row = np.arange(53, dtype=np.float64)
+
+    async def run():
+        first = await cache.predict(model, row, "a", compute)
+        second = await cache.predict(model, row.copy(), "b", compute)
+        await cache.predict(model, row, "b", compute)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(calls) == 1 and np.array_equal(first, second)
+    assert not second.flags.writeable
+
+    endpoints = cache.metrics()["endpoints"]
+    assert (endpoints["a"]["hits"], endpoints["a"]["misses"]) == (0, 1)
+    assert (endpoints["b"]["hits"], endpoints["b"]["hit_rate"]) == (2, 1.0)
+
+
+def test_keys_exact_or_quantized(model):
+    row = np.linspace(0, 5, 53)
+    noisy = row + 1e-9
+    noisy[0] = -0.0
+
+    exact = PredictionCache()
+    assert exact.key(model, row) == exact.key(model, row.copy())
+    assert exact.key(model, row) != exact.key(model, noisy)
+
+    quantized = PredictionCache(decimals=6)
+    assert quantized.key(model, row) == quantized.key(model, noisy)
+
+    retrained = dataclasses.replace(model, fingerprint="0" * 16)
+    assert exact.key(model, row) != exact.key(retrained, row)
+
+
+def test_lru_eviction_respects_memory_bound():
+    value = np.zeros(8, dtype=np.float32)
+    cache = PredictionCache(max_bytes=1)
+    cache.put("too-big", value)
+    assert cache.metrics()["entries"] == 0
+
+    cache = PredictionCache(max_bytes=3 * _entry_bytes("k0", value))
+    for i in range(3):
+        cache.put(f"k{i}", value)
+    cache.get("k0")
+    cache.put("k3", value)
+
+    metrics = cache.metrics()
+    assert metrics["bytes"] <= metrics["max_bytes"]
+    assert metrics["evictions"] == 1
+    assert cache.get("k0") is not None and cache.get("k1") is None
+
+
+@pytest.mark.predict
+def test_repeated_chart_hits_cache(client, valid_birth_data):
+    get_prediction_cache().clear()
+
+    first = client.post("/api/ml/predict-from-kundali", json=valid_birth_data).json()["data"]
+    second = client.post("/api/ml/predict-from-kundali", json=valid_birth_data).json()["data"]
+    assert first["predictions"] == second["predictions"]
+
+    stats = client.get("/api/ml/cache-stats").json()["data"]
+    assert stats["endpoints"]["predict_from_kundali"] == {
+        "hits": 1, "misses": 1, "persisted_hits": 0, "hit_rate": 0.5
+    }
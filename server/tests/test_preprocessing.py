@@ -0,0 +1,73 @@
+"""
+Unit tests for the fused prediction preprocessing plan.
+
+Checks feature ordering from dicts, parity of the NumPy scaling with the
+fitted StandardScaler, score clipping and confidence bands, and that batch
+and single predictions agree.
+"""
+
+import numpy as np
+import pytest
+
+from server.ml.model_registry import get_model_registry
+from server.ml.predictor import KundaliMLPredictor
+from server.ml.preprocessing import PreprocessingPlan
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return get_model_registry().active.plan
+
+
+def test_order_maps_names_to_columns(plan, valid_53_features):
+    full = dict(zip(plan.feature_names, valid_53_features))
+    shuffled = dict(reversed(list(full.items())))
+    partial = {plan.feature_names[3]: 7.5, "not_a_feature": 1.0}
+
+    matrix = plan.order([full, shuffled, partial])
+
+    assert matrix.dtype == np.float64 and matrix.shape == (3, plan.n_features)
+    assert matrix[0].tolist() == valid_53_features
+    assert matrix[1].tolist() == valid_53_features
+    assert matrix[2, 3] == 7.5 and np.count_nonzero(matrix[2]) == 1
+
+
+def test_transform_matches_scaler(plan):
+    assert plan.fused
+    rng = np.random.default_rng(0)
+    raw = plan.mean + plan.scale * rng.normal(size=(100, plan.n_features))
+
+    expected = plan.scaler.transform(raw).astype(np.float32)
+    scaled = plan.transform(raw)
+    assert scaled.dtype == np.float32
+    assert np.array_equal(scaled, expected)
+
+    in_place = raw.copy()
+    assert np.array_equal(plan.transform(in_place, copy=False), expected)
+    assert np.array_equal(in_place, raw - plan.mean)
+
+    with pytest.raises(ValueError):
+        plan.transform(raw[:, :5])
+
+
+def test_postprocess_clips_and_buckets():
+    plan = PreprocessingPlan(["a"], ["t"], scaler=None)
+    scores, confidence = plan.postprocess(np.array([[-5.0, 20.0, 29.9, 30.0, 70.0, 75.0, 80.5, 120.0]]))
+
+    assert scores.tolist() == [[0.0, 20.0, 29.9, 30.0, 70.0, 75.0, 80.5, 100.0]]
+    assert confidence.tolist() == [[0.75, 0.80, 0.80, 0.85, 0.85, 0.80, 0.75, 0.75]]
+
+
+def test_predict_batch_matches_single(valid_53_features):
+    predictor = KundaliMLPredictor()
+    rows = [dict(zip(predictor.feature_names, valid_53_features))]
+    rows.append({name: value * 1.1 for name, value in rows[0].items()})
+
+    batch = predictor.predict_batch(rows)
+
+    assert len(batch) == 2
+    for features, result in zip(rows, batch):
+        single = predictor.predict(features)
+        for target in predictor.target_names:
+            assert result[target].score == pytest.approx(single[target].score, abs=1e-4)
+            assert result[target].confidence == single[target].confidence
@@ -0,0 +1,62 @@
+"""
+Unit tests for birth time rectification.
+
+Tests the batched Vimshottari dasha lookup against DashaCalculator and the
+ranked candidate windows returned by BirthTimeRectifier.
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from server.services.dasha_calculator import DashaCalculator, calculate_dasha_lords_batch
+from server.services.rectification_calculator import BirthTimeRectifier
+
+ORDER = DashaCalculator.DASHA_ORDER
+
+
+class TestDashaBatch:
+    """Tests for calculate_dasha_lords_batch."""
+
+    def test_birth_dasha_matches_calculator(self):
+        moons = np.linspace(0.5, 359.5, 40)
+        maha, _ = calculate_dasha_lords_batch(moons, [0.0])
+        for moon, lord in zip(moons, maha[:, 0]):
+            calc = DashaCalculator(datetime(2000, 1, 1), "12:00", moon)
+            assert ORDER[lord] == calc.calculate_dasha_balance()[0]
+
+    def test_sequence_through_cycle(self):
+        # Moon at the start of Ashwini: Ketu (7y) then Venus (20y), Venus-Venus first
+        maha, antar = calculate_dasha_lords_batch([0.0], [0.1, 6.9, 7.1, 27.2])
+        assert [ORDER[i] for i in maha[0]] == ['Ketu', 'Ketu', 'Venus', 'Sun']
+        assert [ORDER[i] for i in antar[0]] == ['Ketu', 'Mercury', 'Venus', 'Sun']
+
+
+class TestBirthTimeRectifier:
+    """Tests for ranked rectification windows."""
+
+    @pytest.fixture(scope="class")
+    def result(self):
+        rectifier = BirthTimeRectifier(date(1990, 5, 15), "14:30", 28.61, 77.21, "Asia/Kolkata")
+        return rectifier.rectify([
+            {'event_type': 'marriage', 'date': '2016-11-20'},
+            {'event_type': 'career', 'date': '2013-07-01'},
+        ], max_results=5)
+
+    def test_evaluates_every_minute(self, result):
+        assert result['candidates_evaluated'] == 241
+
+    def test_windows_ranked(self, result):
+        scores = [w['score'] for w in result['windows']]
+        assert scores == sorted(scores, reverse=True)
+        for window in result['windows']:
+            assert window['start_time'] <= window['best_time'] <= window['end_time']
+            assert [e['event_type'] for e in window['events']] == ['marriage', 'career']
+
+    def test_invalid_events_rejected(self):
+        rectifier = BirthTimeRectifier(date(1990, 5, 15), "14:30", 28.61, 77.21, "Asia/Kolkata", 10)
+        with pytest.raises(ValueError):
+            rectifier.rectify([{'event_type': 'lottery', 'date': '2016-11-20'}])
+        with pytest.raises(ValueError):
+            rectifier.rectify([{'event_type': 'marriage', 'date': '1980-01-01'}])
@@ -0,0 +1,156 @@
+"""
+Unit tests for the chart similarity index.
+
+Tests the circular feature encoding, brute-force and IVF search, incremental
+updates and persistence.
+"""
+
+import numpy as np
+import pytest
+
+from server.ml import similarity_index
+from server.ml.similarity_index import (
+    CIRCULAR_FEATURES,
+    FEATURE_NAMES,
+    KIND_CELEBRITY,
+    KIND_USER,
+    ChartSimilarityIndex,
+    chart_features,
+    index_saved_kundali,
+    sync_similarity_index,
+    unindex_kundali,
+)
+
+
+def random_features(rng, n):
+    rows = rng.uniform(0, 10, size=(n, len(FEATURE_NAMES)))
+    rows[:, :len(CIRCULAR_FEATURES)] = rng.uniform(0, 360, size=(n, len(CIRCULAR_FEATURES)))
+    return rows
+
+
+def as_dict(row):
+    return dict(zip(FEATURE_NAMES, row))
+
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(0)
+    rows = random_features(rng, 500)
+    index = ChartSimilarityIndex(mean=np.full(43, 5.0), std=np.full(43, 2.9))
+    index.add_many([f"c{i}" for i in range(500)], [KIND_CELEBRITY] * 500,
+                   [f"Celebrity {i}" for i in range(500)], index.encode(rows))
+    return index, rows
+
+
+def test_longitudes_wrap_around():
+    index = ChartSimilarityIndex()
+    base = np.zeros(len(FEATURE_NAMES))
+    near, far = base.copy(), base.copy()
+    base[0], near[0], far[0] = 359.0, 1.0, 180.0
+
+    encoded = index.encode(np.vstack((base, near, far)))
+    assert encoded[0] @ encoded[1] > encoded[0] @ encoded[2]
+    np.testing.assert_allclose(np.linalg.norm(encoded, axis=1), 1.0, rtol=1e-6)
+
+
+def test_search_finds_exact_match_first(index):
+    index, rows = index
+    matches = index.search(as_dict(rows[42]), k=5)
+    assert matches[0]["id"] == "c42"
+    assert matches[0]["similarity"] == pytest.approx(1.0, abs=1e-4)
+    assert [m["similarity"] for m in matches] == sorted((m["similarity"] for m in matches), reverse=True)
+
+
+def test_kind_filter_and_exclusion(index):
+    index, rows = index
+    index.add("u1", KIND_USER, "Mine", as_dict(rows[7]), owner_id="user-1")
+
+    user_matches = index.search(as_dict(rows[7]), k=5, kinds=[KIND_USER])
+    assert [m["id"] for m in user_matches] == ["u1"]
+    assert user_matches[0]["owner_id"] == "user-1"
+
+    assert index.search(as_dict(rows[7]), k=5, kinds=[KIND_USER], exclude_ids=["u1"]) == []
+
+
+def test_incremental_replace_and_remove(index):
+    index, rows = index
+    index.add("c3", KIND_CELEBRITY, "Moved", as_dict(rows[10]))
+    assert len(index) == 500
+    assert {m["id"] for m in index.search(as_dict(rows[10]), k=2)} == {"c3", "c10"}
+
+    assert index.remove("c10")
+    assert not index.remove("c10")
+    assert len(index) == 499
+    assert index.search(as_dict(rows[10]), k=1)[0]["id"] == "c3"
+    # The chart moved into the freed row is still found
+    assert index.search(as_dict(rows[499]), k=1)[0]["id"] == "c499"
+
+
+def test_ivf_recall_matches_brute_force(index):
+    index, rows = index
+    queries = [as_dict(r) for r in random_features(np.random.default_rng(1), 20)]
+    exact = [index.search(q, k=10) for q in queries]
+
+    index.build_ivf(n_lists=16)
+    approx = [index.search(q, k=10, nprobe=16) for q in queries]
+    assert [[m["id"] for m in r] for r in approx] == [[m["id"] for m in r] for r in exact]
+
+    partial = [index.search(q, k=10, nprobe=6) for q in queries]
+    recall = np.mean([len({m["id"] for m in a} & {m["id"] for m in e}) / 10 for a, e in zip(partial, exact)])
+    assert recall > 0.6
+
+
+def test_save_and_load_roundtrip(index, tmp_path):
+    index, rows = index
+    index.add("u1", KIND_USER, "Mine", as_dict(rows[0]), owner_id="user-1")
+    index.build_ivf(n_lists=8)
+    path = tmp_path / "index.npz"
+    index.save(path)
+
+    loaded = ChartSimilarityIndex.load(path)
+    assert len(loaded) == len(index)
+    np.testing.assert_allclose(loaded.mean, index.mean)
+    query = as_dict(rows[100])
+    assert loaded.search(query, k=5) == index.search(query, k=5)
+
+
+def test_chart_features_prefers_stored_ml_features():
+    stored = {f: 1.0 for f in FEATURE_NAMES}
+    assert chart_features({"ml_features": stored, "kundali_data": {}}) == stored
+
+    extracted = chart_features({"kundali_data": {"planets": {"Sun": {"longitude": 370.0}}}})
+    assert extracted["sun_degree"] == pytest.approx(10.0)
+
+
+def test_updates_are_queued_and_merged_with_other_workers(index, tmp_path, monkeypatch):
+    index, rows = index
+    path = tmp_path / "index.npz"
+    index.save(path)
+    monkeypatch.setattr(similarity_index, "INDEX_PATH", path)
+    monkeypatch.setattr(similarity_index, "_index", index)
+    monkeypatch.setattr(similarity_index, "_loaded_stamp", similarity_index._file_stamp(path))
+    monkeypatch.setattr(similarity_index, "_pending", {})
+    monkeypatch.setattr(similarity_index, "_start_sync_thread", lambda: None)
+    saved = path.stat().st_mtime_ns
+
+    index_saved_kundali({"_id": "u1", "name": "Mine", "user_id": "user-1", "ml_features": as_dict(rows[1])})
+    unindex_kundali("c2")
+    assert "u1" in index and "c2" not in index
+    assert path.stat().st_mtime_ns == saved
+
+    # Another worker saves its own chart in the meantime
+    other = ChartSimilarityIndex.load(path)
+    other.add("u2", KIND_USER, "Theirs", as_dict(rows[3]), owner_id="user-2")
+    other.save(path)
+
+    assert sync_similarity_index() == 2
+    merged = similarity_index.get_similarity_index()
+    on_disk = ChartSimilarityIndex.load(path)
+    for loaded in (merged, on_disk):
+        assert {"u1", "u2"} <= set(loaded.ids) and "c2" not in loaded
+        assert loaded.search(as_dict(rows[1]), k=1, kinds=[KIND_USER])[0]["id"] == "u1"
+
+    # Nothing queued and nothing new on disk: the file is left alone
+    saved = path.stat().st_mtime_ns
+    assert sync_similarity_index() == 0
+    assert path.stat().st_mtime_ns == saved and similarity_index.get_similarity_index() is merged
@@ -0,0 +1,107 @@
+"""
+Unit tests for the timezone / Julian Day conversion layer.
+
+Tests that local_to_julian_days reproduces pytz.localize + swisseph.julday,
+including DST gaps and overlaps, numeric offsets and error handling.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+import pytz
+import swisseph
+
+from server.pydantic_schemas.kundali_schema import KundaliRequest
+from server.utils.astro_utils import get_julian_day_from_birth_details
+from server.utils.time_utils import (
+    local_to_julian_day,
+    local_to_julian_days,
+    normalize_time_strings,
+)
+
+
+def reference_jd(date_str, time_str, zone):
+    """Julian Day the original pytz/julday code path produced."""
+    dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
+    utc = pytz.timezone(zone).localize(dt).astimezone(pytz.UTC)
+    return swisseph.julday(utc.year, utc.month, utc.day,
+                           utc.hour + utc.minute / 60.0 + utc.second / 3600.0)
+
+
+@pytest.mark.parametrize("date_str,time_str,zone", [
+    ("1990-05-15", "14:30:00", "Asia/Kolkata"),
+    ("1943-08-20", "23:10:00", "Asia/Kolkata"),
+    ("1969-07-20", "20:17:40", "America/New_York"),
+    ("2021-12-31", "23:59:59", "Australia/Sydney"),
+    ("1900-01-01", "00:00:00", "Europe/London"),
+    ("2024-03-10", "02:30:00", "America/New_York"),   # spring-forward gap
+    ("2024-11-03", "01:30:00", "America/New_York"),   # fall-back overlap
+    ("2024-10-27", "01:30:00", "Europe/London"),      # fall-back overlap
+    ("2024-04-07", "02:30:00", "Australia/Sydney"),   # southern overlap
+    ("2000-06-01", "12:00:00", "UTC"),
+])
+def test_matches_pytz_localize(date_str, time_str, zone):
+    jd = local_to_julian_day(date_str, time_str, zone)
+    assert jd == pytest.approx(reference_jd(date_str, time_str, zone), abs=1e-9)
+
+
+def test_vectorized_path_matches_scalar_across_zones():
+    dates = ["1990-05-15", "1985-03-02", "2024-11-03", "1972-01-01"]
+    times = ["14:30", "06:05:07", "01:30:00", "00:00"]
+    zones = ["Asia/Kolkata", "America/New_York", "America/New_York", 5.75]
+
+    jds = local_to_julian_days(dates, times, zones)
+
+    assert jds.shape == (4,)
+    for jd, d, t, z in zip(jds, dates, times, zones):
+        assert jd == pytest.approx(local_to_julian_day(d, t, z), abs=1e-12)
+
+
+def test_numeric_offset_is_fixed_hours():
+    jd_offset = local_to_julian_day("1990-05-15", "14:30", 5.5)
+    jd_utc = local_to_julian_day("1990-05-15", "09:00", "UTC")
+    assert jd_offset == pytest.approx(jd_utc, abs=1e-12)
+
+
+def test_single_zone_broadcasts():
+    jds = local_to_julian_days(["2000-01-01", "2000-01-02"], ["00:00", "00:00"], "UTC")
+    np.testing.assert_allclose(np.diff(jds), [1.0])
+    assert jds[0] == pytest.approx(2451544.5)
+
+
+def test_normalize_time_strings_pads_minutes():
+    assert list(normalize_time_strings(["14:30", " 06:05:07"])) == ["14:30:00", "06:05:07"]
+
+
+@pytest.mark.parametrize("date_str,time_str,padded_date,padded_time", [
+    ("1990-05-15", "9:30", "1990-05-15", "09:30:00"),
+    ("1990-5-15", "14:30", "1990-05-15", "14:30:00"),
+    ("1990-5-5", "9:5:7", "1990-05-05", "09:05:07"),
+])
+def test_accepts_non_padded_dates_and_times(date_str, time_str, padded_date, padded_time):
+    jd = local_to_julian_day(date_str, time_str, "Asia/Kolkata")
+    assert jd == pytest.approx(reference_jd(padded_date, padded_time, "Asia/Kolkata"), abs=1e-9)
+
+    jds = local_to_julian_days([date_str, "2000-01-01"], [time_str, "00:00"], "Asia/Kolkata")
+    assert jds[0] == jd
+
+
+def test_unknown_timezone_raises():
+    with pytest.raises(ValueError):
+        local_to_julian_day("1990-05-15", "14:30", "Mars/Olympus_Mons")
+
+
+def test_malformed_date_raises():
+    with pytest.raises(ValueError):
+        local_to_julian_days(["15/05/1990"], ["14:30"], "UTC")
+
+
+def test_birth_details_offset_overrides_timezone():
+    request = KundaliRequest(
+        birth_date="1990-05-15", birth_time="14:30", latitude=28.6, longitude=77.2,
+        timezone="America/New_York", timezone_offset=5.5,
+    )
+    assert get_julian_day_from_birth_details(request) == pytest.approx(
+        local_to_julian_day("1990-05-15", "14:30", "Asia/Kolkata"), abs=1e-12
+    )
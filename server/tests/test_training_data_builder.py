@@ -0,0 +1,89 @@
+"""
+Unit tests for the real-chart training data builder.
+
+Checks that chunk features equal the features served for the same birth
+details, that invalid rows are counted rather than written, and that a
+build resumes from its shard manifest.
+"""
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from server.ml.feature_extractor import KundaliFeatureExtractor
+from server.ml.shards import MANIFEST, iter_shards, read_frame, read_manifest
+from server.ml.training_data_builder import TARGET_COLUMNS, TrainingDataBuilder, build_chunk_features
+from server.pydantic_schemas.kundali_schema import KundaliRequest
+from server.services.logic import generate_kundali_logic
+
+RECORDS = [
+    ("1955-02-24", "19:15:00", 37.7749, -122.4194, "-8.0"),
+    ("1990-05-15", "14:30", 28.6139, 77.2090, "Asia/Kolkata"),
+    ("2001-11-03", "01:30:00", 40.7128, -74.0060, "America/New_York"),
+    ("1969-07-20", "20:17:00", -33.8688, 151.2093, "10.0"),
+]
+
+
+@pytest.fixture
+def birth_csv(tmp_path):
+    rows = [
+        {"name": f"Person {i}", "birth_date": date, "birth_time": time, "latitude": lat,
+         "longitude": lon, "timezone": zone, **{target: 10.0 * i + k for k, target in enumerate(TARGET_COLUMNS)}}
+        for i, (date, time, lat, lon, zone) in enumerate(RECORDS * 2)
+    ]
+    rows[5]["birth_date"] = "1990-13-45"
+    rows[6]["latitude"] = 120.0
+    path = tmp_path / "births.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def test_chunk_features_match_served_features():
+    chunk = pd.DataFrame(RECORDS, columns=["birth_date", "birth_time", "latitude", "longitude", "timezone"])
+    features, valid = build_chunk_features(chunk)
+
+    assert valid.all() and features.shape == (len(RECORDS), 53)
+    extractor = KundaliFeatureExtractor()
+    for row, (date, time, lat, lon, zone) in zip(features, RECORDS):
+        zone_field = {"timezone_offset": float(zone)} if zone[-1].isdigit() else {"timezone": zone}
+        birth = KundaliRequest(birthDate=date, birthTime=time, latitude=lat, longitude=lon, **zone_field)
+        served, _ = extractor.extract_features(asyncio.run(generate_kundali_logic(birth)).model_dump(exclude_none=True))
+        assert row.tolist() == [served[name] for name in extractor.required_features]
+
+
+def test_build_writes_valid_rows_and_counts_failures(birth_csv, tmp_path):
+    output = tmp_path / "features"
+    summary = TrainingDataBuilder(birth_csv, output, chunk_size=3, workers=1).build()
+
+    assert summary["rows"] == 6 and summary["failed"] == 2 and summary["chunks"] == 3
+    manifest = read_manifest(output)
+    assert [shard["failed"] for _, shard in sorted(manifest["shards"].items())] == [0, 1, 1]
+    assert manifest["target_names"] == TARGET_COLUMNS
+
+    frame = read_frame(output)
+    assert frame.index.tolist() == [0, 1, 2, 3, 4, 7]
+    assert frame.loc[7, "wealth_potential"] == pytest.approx(71.0)
+    np.testing.assert_array_equal(frame.iloc[4, :53], frame.iloc[0, :53])
+
+    columns = ["moon_degree", "ascendant_degree"]
+    selected = np.concatenate([features for features, _, _ in iter_shards(output, columns)])
+    np.testing.assert_array_equal(selected, frame[columns].to_numpy())
+
+
+def test_build_resumes_from_manifest(birth_csv, tmp_path):
+    output = tmp_path / "features"
+    TrainingDataBuilder(birth_csv, output, chunk_size=3, workers=1).build()
+    # As if interrupted before the second chunk was checkpointed
+    manifest = read_manifest(output)
+    del manifest["shards"]["1"]
+    (output / MANIFEST).write_text(json.dumps(manifest))
+
+    summary = TrainingDataBuilder(birth_csv, output, chunk_size=3, workers=1).build()
+
+    assert summary["chunks"] == 1 and summary["skipped_chunks"] == 2
+    assert summary["total_rows"] == 6 and len(read_frame(output)) == 6
+    with pytest.raises(ValueError):
+        TrainingDataBuilder(birth_csv, output, chunk_size=4, workers=1).build()
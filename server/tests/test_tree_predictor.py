@@ -0,0 +1,75 @@
+"""
+Unit tests for the native tree ensemble predictor.
+
+Checks parity with the XGBoost booster on the deployed model (including
+missing values), deeper trees that take the level-walk path, iteration
+ranges, unsupported ensembles and the registry's backend selection.
+"""
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from server.ml import model_registry
+from server.ml.model_registry import NATIVE_MAX_ROWS, get_model_registry
+from server.ml.tree_predictor import TreeEnsemblePredictor
+
+
+@pytest.fixture(scope="module")
+def active_model():
+    return get_model_registry().active
+
+
+def _scaled_rows(model, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return model.scaler.transform(model.plan.mean + model.plan.scale * rng.normal(0, 1.5, (rows, len(model.feature_names))))
+
+
+def test_matches_booster_on_deployed_model(active_model):
+    predictor = TreeEnsemblePredictor.from_booster(active_model.xgb_model)
+    scaled = _scaled_rows(active_model, 300)
+    scaled[::5, ::4] = np.nan
+
+    expected = active_model.xgb_model.predict(scaled)
+    assert predictor.predict(scaled) == pytest.approx(expected, abs=1e-4)
+    assert predictor.predict(scaled[7]) == pytest.approx(expected[7], abs=1e-4)
+
+    with pytest.raises(ValueError):
+        predictor.predict(scaled[:, :10])
+
+
+def test_deep_trees_and_iteration_range():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(400, 6))
+    y = X[:, 0] * X[:, 1] + np.sin(X[:, 2]) + rng.normal(0, 0.1, 400)
+    X[::9, 3] = np.nan
+    booster = xgb.train({"max_depth": 6, "eta": 0.3}, xgb.DMatrix(X, label=y), num_boost_round=20)
+
+    predictor = TreeEnsemblePredictor.from_booster(booster)
+    assert predictor.max_depth > 4 and predictor.leaf_lookup is None
+    assert predictor.predict(X)[:, 0] == pytest.approx(booster.predict(xgb.DMatrix(X)), abs=1e-4)
+
+    first_rounds = TreeEnsemblePredictor.from_booster(booster, iteration_range=(0, 5))
+    expected = booster.predict(xgb.DMatrix(X), iteration_range=(0, 5))
+    assert first_rounds.predict(X)[:, 0] == pytest.approx(expected, abs=1e-4)
+
+
+def test_unsupported_objective_rejected():
+    X = np.random.default_rng(4).normal(size=(100, 3))
+    booster = xgb.train({"objective": "binary:logistic"}, xgb.DMatrix(X, label=X[:, 0] > 0), num_boost_round=3)
+    with pytest.raises(ValueError):
+        TreeEnsemblePredictor.from_booster(booster)
+
+
+def test_registry_backend_selection(active_model, monkeypatch):
+    assert active_model.info()["backend"] == "native"
+    raw = active_model.plan.mean + active_model.plan.scale * np.random.default_rng(5).normal(size=(4, 53))
+
+    calls = []
+    monkeypatch.setattr(active_model.native_predictor, "predict", lambda x: calls.append(len(x)) or np.zeros((len(x), 8)))
+    active_model.predict_matrix(raw)
+    active_model.predict_matrix(np.repeat(raw, NATIVE_MAX_ROWS, axis=0))
+    assert calls == [4]
+
+    monkeypatch.setenv("ML_PREDICTOR_BACKEND", "xgboost")
+    assert model_registry.load_model(active_model.path).native_predictor is None
@@ -0,0 +1,87 @@
+"""
+Unit tests for Varshaphala (annual charts).
+
+Tests the solar return root-finding against exact Sun positions, the annual
+chart contents, per-chart caching and year parsing.
+"""
+
+import numpy as np
+import pytest
+
+from server.services import varshaphala_calculator
+from server.services.varshaphala_calculator import (
+    SIDEREAL_YEAR_DAYS,
+    VarshaphalaCalculator,
+    find_solar_returns,
+    parse_years,
+)
+from server.utils.astro_utils import calculate_planet_positions, get_zodiac_sign
+from server.utils.time_utils import local_to_julian_day
+
+BIRTH_JD = local_to_julian_day("1990-05-15", "14:30", "Asia/Kolkata")
+LATITUDE, LONGITUDE = 28.61, 77.21
+
+
+@pytest.fixture
+def calculator():
+    varshaphala_calculator._cache.clear()
+    return VarshaphalaCalculator(BIRTH_JD, LATITUDE, LONGITUDE, 1990)
+
+
+def test_returns_match_natal_sun():
+    natal_sun = calculate_planet_positions(BIRTH_JD, ayanamsa="raman")["Sun"]
+    return_jds = find_solar_returns(BIRTH_JD, natal_sun, range(1, 81), ayanamsa="raman")
+
+    for jd in return_jds:
+        sun = calculate_planet_positions(jd, ayanamsa="raman")["Sun"]
+        assert (sun - natal_sun + 180) % 360 - 180 == pytest.approx(0, abs=1e-5)
+    assert np.diff(return_jds) == pytest.approx(SIDEREAL_YEAR_DAYS, abs=0.05)
+
+
+def test_annual_chart_contents(calculator):
+    first, second = calculator.annual_charts([2025, 2024])
+    assert (first["year"], first["age"], second["year"], second["age"]) == (2024, 34, 2025, 35)
+    assert first["return_time_utc"].startswith("2024-05-1")
+
+    lagna_sign = int(first["varsha_lagna"]["longitude"] // 30)
+    sun = first["planets"]["Sun"]
+    assert sun["house"] == (int(sun["longitude"] // 30) - lagna_sign) % 12 + 1
+    assert len(first["planets"]) == 9
+
+    # Muntha advances one sign per year from the natal ascendant
+    natal_sign = int(calculator.natal_ascendant // 30)
+    signs = [chart["muntha"]["sign"] for chart in (first, second)]
+    expected = [(natal_sign + age) % 12 for age in (34, 35)]
+    assert signs == [get_zodiac_sign(s * 30) for s in expected]
+
+
+def test_results_cached_per_natal_chart(calculator, monkeypatch):
+    charts = calculator.annual_charts(range(2020, 2025))
+
+    calls = []
+    original = varshaphala_calculator._sidereal_sun
+    monkeypatch.setattr(varshaphala_calculator, "_sidereal_sun", lambda *a: calls.append(a) or original(*a))
+
+    again = VarshaphalaCalculator(BIRTH_JD, LATITUDE, LONGITUDE, 1990).annual_charts(range(2020, 2025))
+    assert again == charts and calls == []
+
+    calculator.annual_charts(range(2022, 2027))
+    assert calls and all(len(jds) == 2 for jds, _ in calls)
+
+    VarshaphalaCalculator(BIRTH_JD, LATITUDE, LONGITUDE, 1990, ayanamsa="kp").annual_charts([2024])
+    assert calls[-1][1] == "kp"
+
+
+def test_parse_years():
+    assert parse_years("2025") == [2025]
+    assert parse_years("2026, 2024,2026") == [2024, 2026]
+    assert parse_years("2024-2026,2030") == [2024, 2025, 2026, 2030]
+    for spec in ["", "twenty", "2024-", "1900-2100"]:
+        with pytest.raises(ValueError):
+            parse_years(spec)
+
+
+def test_years_outside_life_rejected(calculator):
+    for years in ([1990], [1989], [2141]):
+        with pytest.raises(ValueError):
+            calculator.annual_charts(years)
@@ -0,0 +1,301 @@
+"""
+Ashtakavarga Calculator Module
+Implements Bhinnashtakavarga (BAV) and Sarvashtakavarga (SAV) bindus.
+
+In Ashtakavarga:
+- Each of the seven planets has its own BAV chart of 12 signs
+- Eight contributors (the seven planets and the Lagna) donate a bindu to
+  fixed houses counted from their own sign
+- The SAV is the sign-wise sum of the seven BAV charts (337 bindus in total)
+
+The classical contribution tables are stored as 7x8x12 bit arrays and
+evaluated by rotating each contributor's row to its sign, so a whole batch of
+charts is resolved with a handful of array operations.
+
+Author: Astrology Backend
+"""
+
+from typing import Dict, List, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+SIGNS = [
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
+]
+
+# Planets that own a Bhinnashtakavarga chart
+BAV_PLANETS = ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn')
+
+# Bindu contributors, in table column order
+CONTRIBUTORS = BAV_PLANETS + ('Lagna',)
+
+# Benefic places (houses counted from each contributor) per BAV chart (BPHS)
+BENEFIC_PLACES = {
+    'Sun': {
+        'Sun': [1, 2, 4, 7, 8, 9, 10, 11],
+        'Moon': [3, 6, 10, 11],
+        'Mars': [1, 2, 4, 7, 8, 9, 10, 11],
+        'Mercury': [3, 5, 6, 9, 10, 11, 12],
+        'Jupiter': [5, 6, 9, 11],
+        'Venus': [6, 7, 12],
+        'Saturn': [1, 2, 4, 7, 8, 9, 10, 11],
+        'Lagna': [3, 4, 6, 10, 11, 12],
+    },
+    'Moon': {
+        'Sun': [3, 6, 7, 8, 10, 11],
+        'Moon': [1, 3, 6, 7, 10, 11],
+        'Mars': [2, 3, 5, 6, 9, 10, 11],
+        'Mercury': [1, 3, 4, 5, 7, 8, 10, 11],
+        'Jupiter': [1, 4, 7, 8, 10, 11, 12],
+        'Venus': [3, 4, 5, 7, 9, 10, 11],
+        'Saturn': [3, 5, 6, 11],
+        'Lagna': [3, 6, 10, 11],
+    },
+    'Mars': {
+        'Sun': [3, 5, 6, 10, 11],
+        'Moon': [3, 6, 11],
+        'Mars': [1, 2, 4, 7, 8, 10, 11],
+        'Mercury': [3, 5, 6, 11],
+        'Jupiter': [6, 10, 11, 12],
+        'Venus': [6, 8, 11, 12],
+        'Saturn': [1, 4, 7, 8, 9, 10, 11],
+        'Lagna': [1, 3, 6, 10, 11],
+    },
+    'Mercury': {
+        'Sun': [5, 6, 9, 11, 12],
+        'Moon': [2, 4, 6, 8, 10, 11],
+        'Mars': [1, 2, 4, 7, 8, 9, 10, 11],
+        'Mercury': [1, 3, 5, 6, 9, 10, 11, 12],
+        'Jupiter': [6, 8, 11, 12],
+        'Venus': [1, 2, 3, 4, 5, 8, 9, 11],
+        'Saturn': [1, 2, 4, 7, 8, 9, 10, 11],
+        'Lagna': [1, 2, 4, 6, 8, 10, 11],
+    },
+    'Jupiter': {
+        'Sun': [1, 2, 3, 4, 7, 8, 9, 10, 11],
+        'Moon': [2, 5, 7, 9, 11],
+        'Mars': [1, 2, 4, 7, 8, 10, 11],
+        'Mercury': [1, 2, 4, 5, 6, 9, 10, 11],
+        'Jupiter': [1, 2, 3, 4, 7, 8, 10, 11],
+        'Venus': [2, 5, 6, 9, 10, 11],
+        'Saturn': [3, 5, 6, 12],
+        'Lagna': [1, 2, 4, 5, 6, 7, 9, 10, 11],
+    },
+    'Venus': {
+        'Sun': [8, 11, 12],
+        'Moon': [1, 2, 3, 4, 5, 8, 9, 11, 12],
+        'Mars': [3, 5, 6, 9, 11, 12],
+        'Mercury': [3, 5, 6, 9, 11],
+        'Jupiter': [5, 8, 9, 10, 11],
+        'Venus': [1, 2, 3, 4, 5, 8, 9, 10, 11],
+        'Saturn': [3, 4, 5, 8, 9, 10, 11],
+        'Lagna': [1, 2, 3, 4, 5, 8, 9, 11],
+    },
+    'Saturn': {
+        'Sun': [1, 2, 4, 7, 8, 10, 11],
+        'Moon': [3, 6, 11],
+        'Mars': [3, 5, 6, 10, 11, 12],
+        'Mercury': [6, 8, 9, 10, 11, 12],
+        'Jupiter': [5, 6, 11, 12],
+        'Venus': [6, 11, 12],
+        'Saturn': [3, 5, 6, 11],
+        'Lagna': [1, 3, 4, 6, 10, 11],
+    },
+}
+
+# SAV thresholds used for transit scoring (average sign holds ~28 bindus)
+SAV_STRONG_THRESHOLD = 28
+SAV_WEAK_THRESHOLD = 25
+
+
+def _build_bindu_tables() -> np.ndarray:
+    """
+    Encode the benefic places as a 7x8x12 bit array.
+
+    Entry [p, c, k] is 1 when contributor c donates a bindu to planet p's
+    chart in the sign k places ahead of its own (k = 0 is the same sign).
+    """
+    tables = np.zeros((len(BAV_PLANETS), len(CONTRIBUTORS), 12), dtype=np.uint8)
+    for p, planet in enumerate(BAV_PLANETS):
+        for c, contributor in enumerate(CONTRIBUTORS):
+            tables[p, c, np.array(BENEFIC_PLACES[planet][contributor]) - 1] = 1
+    tables.setflags(write=False)
+    return tables
+
+
+BINDU_TABLES = _build_bindu_tables()
+
+
+def calculate_bav_batch(contributor_signs: np.ndarray) -> np.ndarray:
+    """
+    Calculate Bhinnashtakavarga bindus for a batch of charts.
+
+    Args:
+        contributor_signs: Integer array of shape (N, 8) with the 0-based sign
+            of each contributor, in CONTRIBUTORS order
+
+    Returns:
+        uint8 array of shape (N, 7, 12): bindus per BAV planet per sign
+    """
+    signs = np.asarray(contributor_signs, dtype=np.int64)
+    if signs.ndim != 2 or signs.shape[1] != len(CONTRIBUTORS):
+        raise ValueError(
+            f"contributor_signs must have shape (N, {len(CONTRIBUTORS)}), got {signs.shape}"
+        )
+
+    # Relative place of every sign from every contributor: (N, 8, 12)
+    places = (np.arange(12)[None, None, :] - signs[:, :, None]) % 12
+    contributors = np.arange(len(CONTRIBUTORS))[None, :, None]
+
+    # Rotate each contributor row to its sign: (7, N, 8, 12), then sum contributors
+    rotated = BINDU_TABLES[:, contributors, places]
+    return rotated.sum(axis=2, dtype=np.uint8).transpose(1, 0, 2)
+
+
+def calculate_sav_batch(contributor_signs: np.ndarray) -> np.ndarray:
+    """
+    Calculate Sarvashtakavarga bindus for a batch of charts.
+
+    Args:
+        contributor_signs: Integer array of shape (N, 8), see calculate_bav_batch
+
+    Returns:
+        uint8 array of shape (N, 12): SAV bindus per sign
+    """
+    return calculate_bav_batch(contributor_signs).sum(axis=1, dtype=np.uint8)
+
+
+class AshtakavargaCalculator:
+    """
+    Calculate Ashtakavarga bindus for a single chart.
+
+    BAV and SAV are computed once in the constructor; all lookups afterwards
+    are O(1) array reads.
+    """
+
+    def __init__(self, contributor_signs: Dict[str, int]):
+        """
+        Initialize Ashtakavarga Calculator.
+
+        Args:
+            contributor_signs: 0-based sign index (0 = Aries) for each of the
+                seven planets and 'Lagna'
+        """
+        missing = [c for c in CONTRIBUTORS if c not in contributor_signs]
+        if missing:
+            raise ValueError(f"Missing contributor signs for: {', '.join(missing)}")
+
+        self.contributor_signs = contributor_signs
+        signs = np.array([[contributor_signs[c] % 12 for c in CONTRIBUTORS]])
+        self.bav = calculate_bav_batch(signs)[0]
+        self.sav = self.bav.sum(axis=0, dtype=np.uint8)
+
+    @classmethod
+    def from_longitudes(cls, planet_positions: Dict[str, float],
+                        ascendant_degree: float) -> 'AshtakavargaCalculator':
+        """
+        Build a calculator from sidereal longitudes.
+
+        Args:
+            planet_positions: Planet name to sidereal longitude
+            ascendant_degree: Sidereal ascendant longitude
+
+        Returns:
+            AshtakavargaCalculator instance
+        """
+        signs = {planet: int((planet_positions[planet] % 360) // 30)
+                 for planet in BAV_PLANETS if planet in planet_positions}
+        signs['Lagna'] = int((ascendant_degree % 360) // 30)
+        return cls(signs)
+
+    @classmethod
+    def from_chart(cls, chart: Dict) -> Optional['AshtakavargaCalculator']:
+        """
+        Build a calculator from a birth chart dict.
+
+        The chart needs 'planets' with 'sign' names (or 'longitude') and either
+        an 'ascendant' with a 1-based 'index' or houses whose 1st house holds
+        the 1-based ascendant sign number.
+
+        Args:
+            chart: Birth chart dictionary
+
+        Returns:
+            AshtakavargaCalculator instance, or None if the chart is incomplete
+        """
+        try:
+            signs = {}
+            for planet in BAV_PLANETS:
+                planet_data = chart.get('planets', {}).get(planet)
+                if not isinstance(planet_data, dict):
+                    return None
+                if planet_data.get('sign') in SIGNS:
+                    signs[planet] = SIGNS.index(planet_data['sign'])
+                else:
+                    signs[planet] = int((planet_data['longitude'] % 360) // 30)
+
+            ascendant = chart.get('ascendant')
+            houses = chart.get('houses', {})
+            first_house = houses.get(1, houses.get('1'))
+            if isinstance(ascendant, dict) and ascendant.get('index'):
+                signs['Lagna'] = int(ascendant['index']) - 1
+            elif isinstance(first_house, dict) and isinstance(first_house.get('sign'), int):
+                signs['Lagna'] = first_house['sign'] - 1
+            else:
+                return None
+
+            return cls(signs)
+
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Could not build Ashtakavarga from chart: {str(e)}")
+            return None
+
+    def get_sav_bindus(self, sign_index: int) -> int:
+        """Get SAV bindus for a 0-based sign index."""
+        return int(self.sav[sign_index % 12])
+
+    def get_bav_bindus(self, planet: str, sign_index: int) -> Optional[int]:
+        """Get a planet's BAV bindus for a 0-based sign index (None for nodes)."""
+        if planet not in BAV_PLANETS:
+            return None
+        return int(self.bav[BAV_PLANETS.index(planet), sign_index % 12])
+
+    def get_bhinnashtakavarga(self) -> Dict[str, List[int]]:
+        """
+        Get the BAV chart of every planet.
+
+        Returns:
+            Planet name to list of 12 sign bindus (Aries first)
+        """
+        return {planet: self.bav[p].tolist() for p, planet in enumerate(BAV_PLANETS)}
+
+    def get_sarvashtakavarga(self) -> List[int]:
+        """
+        Get the SAV chart.
+
+        Returns:
+            List of 12 sign bindus (Aries first)
+        """
+        return self.sav.tolist()
+
+    def get_complete_analysis(self) -> Dict:
+        """
+        Get comprehensive Ashtakavarga analysis.
+
+        Returns:
+            Dictionary with BAV, SAV, totals and strong/weak signs
+        """
+        sav = self.get_sarvashtakavarga()
+        return {
+            'bhinnashtakavarga': self.get_bhinnashtakavarga(),
+            'bav_totals': {planet: int(self.bav[p].sum()) for p, planet in enumerate(BAV_PLANETS)},
+            'sarvashtakavarga': sav,
+            'sav_total': int(sum(sav)),
+            'strong_signs': [SIGNS[i] for i, b in enumerate(sav) if b >= SAV_STRONG_THRESHOLD],
+            'weak_signs': [SIGNS[i] for i, b in enumerate(sav) if b < SAV_WEAK_THRESHOLD],
+        }
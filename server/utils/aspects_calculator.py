@@ -13,9 +13,24 @@ Author: Astrology Backend
 from typing import Dict, List, Tuple, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+# Canonical row/column order for the aspect matrices
+PLANETS = ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu')
+PLANET_INDEX = {planet: i for i, planet in enumerate(PLANETS)}
+
+BENEFIC_PLANETS = ('Sun', 'Moon', 'Jupiter', 'Venus', 'Mercury')
+MALEFIC_PLANETS = ('Mars', 'Saturn', 'Rahu', 'Ketu')
+
+# Bit flags stored in the aspect matrices
+ASPECT_NONE = 0
+ASPECT_STANDARD = 1
+ASPECT_SPECIAL = 2
+
+
 class VedicAspectsCalculator:
     """
     Calculate Vedic planetary aspects (Graha Drishti).
@@ -27,6 +42,11 @@ class VedicAspectsCalculator:
     - Mars: aspects 4th, 8th, and 7th houses
     - Jupiter: aspects 5th, 9th, and 7th houses
     - Saturn: aspects 3rd, 10th, and 7th houses
+
+    All aspects for a chart are resolved once in the constructor into two
+    matrices, and every query method is answered as a slice of them:
+    - house_aspect_matrix: 9x12, flags each planet casts on each house
+    - planet_aspect_matrix: 9x9, flags planet (row) casts on planet (column)
     """
 
     # Planet special aspect configurations
@@ -56,6 +76,44 @@ class VedicAspectsCalculator:
         self.planets_info = planets_info
         self.ascendant_degree = ascendant_degree
 
+        # Planets present in this chart (canonical order) and their 0-based houses
+        self.present = np.array([p in planets_info for p in PLANETS], dtype=bool)
+        self.house_index = np.array([
+            (planets_info[p].get('house', 1) - 1) % 12 if p in planets_info else 0
+            for p in PLANETS
+        ], dtype=np.int8)
+
+        self.house_aspect_matrix, self.planet_aspect_matrix = self._build_matrices()
+
+        # Signed house distance from planet (row) to planet (column), 0-11
+        self.house_distance = (self.house_index[None, :] - self.house_index[:, None]) % 12
+
+    def _build_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rotate the static aspect table by each planet's house.
+
+        Returns:
+            Tuple of (9x12 house aspect matrix, 9x9 planet aspect matrix)
+        """
+        columns = (np.arange(12)[None, :] - self.house_index[:, None]) % 12
+        house_matrix = _ASPECT_TABLE[np.arange(len(PLANETS))[:, None], columns]
+        house_matrix[~self.present] = ASPECT_NONE
+
+        planet_matrix = house_matrix[:, self.house_index]
+        planet_matrix[:, ~self.present] = ASPECT_NONE
+        return house_matrix, planet_matrix
+
+    def _present_planets(self, candidates=PLANETS) -> List[str]:
+        """Return candidate planets that are present in this chart, in canonical order."""
+        return [p for p in candidates if self.present[PLANET_INDEX[p]]]
+
+    def _houses_with_flag(self, planet: str, flag: int) -> List[int]:
+        """Return 1-based houses on which the planet casts an aspect with the given flag."""
+        if planet not in PLANET_INDEX or not self.present[PLANET_INDEX[planet]]:
+            return []
+        row = self.house_aspect_matrix[PLANET_INDEX[planet]]
+        return (np.flatnonzero(row & flag) + 1).tolist()
+
     def get_standard_aspects(self, planet: str) -> List[int]:
         """
         Get standard aspect houses for a planet (7th house aspect).
@@ -66,10 +124,7 @@ class VedicAspectsCalculator:
         Returns:
             List of houses this planet aspects
         """
-        # All planets aspect the 7th house
-        planet_house = self.planets_info.get(planet, {}).get('house', 1)
-        seventh_aspect = ((planet_house - 1 + 6) % 12) + 1  # 7th house from planet
-        return [seventh_aspect]
+        return self._houses_with_flag(planet, ASPECT_STANDARD)
 
     def get_special_aspects(self, planet: str) -> List[int]:
         """
@@ -81,15 +136,7 @@ class VedicAspectsCalculator:
         Returns:
             List of special aspect houses (or empty if no special aspects)
         """
-        if planet in self.SPECIAL_ASPECTS:
-            planet_house = self.planets_info.get(planet, {}).get('house', 1)
-            special_config = self.SPECIAL_ASPECTS[planet]
-            special_aspects = special_config['aspects']
-
-            # Convert relative aspects to actual houses
-            return [(planet_house - 1 + aspect) % 12 + 1 for aspect in special_aspects]
-
-        return []
+        return self._houses_with_flag(planet, ASPECT_SPECIAL)
 
     def get_all_aspects_for_planet(self, planet: str) -> Dict[str, List[int]]:
         """
@@ -106,6 +153,21 @@ class VedicAspectsCalculator:
             'special': self.get_special_aspects(planet)
         }
 
+    def get_planets_aspected_by(self, planet: str) -> List[str]:
+        """
+        Get the planets that receive an aspect from the given planet.
+
+        Args:
+            planet: Planet name
+
+        Returns:
+            List of aspected planet names
+        """
+        if planet not in PLANET_INDEX:
+            return []
+        row = self.planet_aspect_matrix[PLANET_INDEX[planet]]
+        return [PLANETS[i] for i in np.flatnonzero(row)]
+
     def calculate_aspect_relationships(self) -> Dict[str, List[Dict]]:
         """
         Calculate all aspect relationships between planets and houses.
@@ -130,38 +192,30 @@ class VedicAspectsCalculator:
         }
 
         try:
-            planets_list = list(self.planets_info.keys())
-
-            # Calculate conjunction and other relationships
-            for i, planet1 in enumerate(planets_list):
-                house1 = self.planets_info[planet1].get('house', 1)
-
-                for planet2 in planets_list[i + 1:]:
-                    house2 = self.planets_info[planet2].get('house', 1)
-                    house_diff = abs(house2 - house1)
-
-                    # Normalize difference (min distance)
-                    if house_diff > 6:
-                        house_diff = 12 - house_diff
-
-                    relationship = {
-                        'planet1': planet1,
-                        'planet2': planet2,
-                        'house1': house1,
-                        'house2': house2,
-                        'house_difference': house_diff
-                    }
-
-                    if house_diff == 0:
-                        relationships['conjunctions'].append(relationship)
-                    elif house_diff == 6:
-                        relationships['oppositions'].append(relationship)
-                    elif house_diff in [3, 9]:
-                        relationships['trines'].append(relationship)
-                    elif house_diff in [4, 8]:
-                        relationships['squares'].append(relationship)
-                    elif house_diff in [2, 10]:
-                        relationships['sextiles'].append(relationship)
+            # Minimum house distance between every pair of planets
+            min_distance = np.minimum(self.house_distance, 12 - self.house_distance)
+            rows, cols = np.nonzero(np.triu(self.present[:, None] & self.present[None, :], k=1))
+
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                house_diff = int(min_distance[i, j])
+                relationship = {
+                    'planet1': PLANETS[i],
+                    'planet2': PLANETS[j],
+                    'house1': int(self.house_index[i]) + 1,
+                    'house2': int(self.house_index[j]) + 1,
+                    'house_difference': house_diff
+                }
+
+                if house_diff == 0:
+                    relationships['conjunctions'].append(relationship)
+                elif house_diff == 6:
+                    relationships['oppositions'].append(relationship)
+                elif house_diff in [3, 9]:
+                    relationships['trines'].append(relationship)
+                elif house_diff in [4, 8]:
+                    relationships['squares'].append(relationship)
+                elif house_diff in [2, 10]:
+                    relationships['sextiles'].append(relationship)
 
             # Calculate Vedic aspects
             vedic_aspects = self._calculate_vedic_aspect_matrix()
@@ -182,21 +236,19 @@ class VedicAspectsCalculator:
         vedic_aspects = []
 
         try:
-            for planet in self.planets_info.keys():
-                standard_aspects = self.get_standard_aspects(planet)
-                special_aspects = self.get_special_aspects(planet)
+            houses_aspected = np.count_nonzero(self.house_aspect_matrix, axis=1)
 
-                aspect_entry = {
+            for planet in self._present_planets():
+                special_aspects = self.get_special_aspects(planet)
+                vedic_aspects.append({
                     'planet': planet,
                     'houses_aspected': {
-                        'standard': standard_aspects,
+                        'standard': self.get_standard_aspects(planet),
                         'special': special_aspects
                     },
-                    'total_houses_aspected': len(set(standard_aspects + special_aspects)),
+                    'total_houses_aspected': int(houses_aspected[PLANET_INDEX[planet]]),
                     'aspect_strength': 'strong' if special_aspects else 'normal'
-                }
-
-                vedic_aspects.append(aspect_entry)
+                })
 
         except Exception as e:
             logger.error(f"Error calculating Vedic aspect matrix: {str(e)}", exc_info=True)
@@ -216,26 +268,30 @@ class VedicAspectsCalculator:
         aspects_to_house = []
 
         try:
-            for planet in self.planets_info.keys():
-                standard_aspects = self.get_standard_aspects(planet)
-                special_aspects = self.get_special_aspects(planet)
-                all_aspects = standard_aspects + special_aspects
-
-                if house in all_aspects:
-                    aspect_type = 'special' if house in special_aspects else 'standard'
-                    aspects_to_house.append({
-                        'planet': planet,
-                        'aspect_type': aspect_type,
-                        'description': self.SPECIAL_ASPECTS.get(
-                            planet, {}
-                        ).get('description', f'{planet} aspects house {house}')
-                    })
+            if house < 1 or house > 12:
+                return []
+
+            column = self.house_aspect_matrix[:, house - 1]
+            for i in np.flatnonzero(column).tolist():
+                planet = PLANETS[i]
+                aspect_type = 'special' if column[i] & ASPECT_SPECIAL else 'standard'
+                aspects_to_house.append({
+                    'planet': planet,
+                    'aspect_type': aspect_type,
+                    'description': self.SPECIAL_ASPECTS.get(
+                        planet, {}
+                    ).get('description', f'{planet} aspects house {house}')
+                })
 
         except Exception as e:
             logger.error(f"Error getting aspects to house {house}: {str(e)}", exc_info=True)
 
         return aspects_to_house
 
+    def _aspected_houses(self, planet: str) -> List[int]:
+        """Return every 1-based house the planet aspects."""
+        return self._houses_with_flag(planet, ASPECT_STANDARD | ASPECT_SPECIAL)
+
     def get_benefic_aspects(self) -> List[Dict]:
         """
         Identify benefic planetary aspects.
@@ -243,21 +299,16 @@ class VedicAspectsCalculator:
         Returns:
             List of benefic aspect configurations
         """
-        benefic_planets = ['Sun', 'Moon', 'Jupiter', 'Venus', 'Mercury']
         benefic_aspects = []
 
         try:
-            for planet in benefic_planets:
-                if planet in self.planets_info:
-                    standard_aspects = self.get_standard_aspects(planet)
-                    special_aspects = self.get_special_aspects(planet)
-
-                    benefic_aspects.append({
-                        'planet': planet,
-                        'aspect_type': 'benefic',
-                        'aspected_houses': standard_aspects + special_aspects,
-                        'benefit': f'Positive influence from {planet}'
-                    })
+            for planet in self._present_planets(BENEFIC_PLANETS):
+                benefic_aspects.append({
+                    'planet': planet,
+                    'aspect_type': 'benefic',
+                    'aspected_houses': self._aspected_houses(planet),
+                    'benefit': f'Positive influence from {planet}'
+                })
 
         except Exception as e:
             logger.error(f"Error calculating benefic aspects: {str(e)}", exc_info=True)
@@ -271,21 +322,16 @@ class VedicAspectsCalculator:
         Returns:
             List of malefic aspect configurations
         """
-        malefic_planets = ['Mars', 'Saturn', 'Rahu', 'Ketu']
         malefic_aspects = []
 
         try:
-            for planet in malefic_planets:
-                if planet in self.planets_info:
-                    standard_aspects = self.get_standard_aspects(planet)
-                    special_aspects = self.get_special_aspects(planet)
-
-                    malefic_aspects.append({
-                        'planet': planet,
-                        'aspect_type': 'malefic',
-                        'aspected_houses': standard_aspects + special_aspects,
-                        'challenge': f'Challenging influence from {planet}'
-                    })
+            for planet in self._present_planets(MALEFIC_PLANETS):
+                malefic_aspects.append({
+                    'planet': planet,
+                    'aspect_type': 'malefic',
+                    'aspected_houses': self._aspected_houses(planet),
+                    'challenge': f'Challenging influence from {planet}'
+                })
 
         except Exception as e:
             logger.error(f"Error calculating malefic aspects: {str(e)}", exc_info=True)
@@ -303,16 +349,17 @@ class VedicAspectsCalculator:
 
         try:
             # Planets with special aspects are strongest
-            for planet, config in self.SPECIAL_ASPECTS.items():
-                if planet in self.planets_info:
-                    house = self.planets_info[planet].get('house', 1)
-                    strongest.append({
-                        'planet': planet,
-                        'aspect_count': len(config['aspects']),
-                        'special_aspects': config['aspects'],
-                        'significance': 'very strong',
-                        'description': config['description']
-                    })
+            special_counts = np.count_nonzero(self.house_aspect_matrix & ASPECT_SPECIAL, axis=1)
+
+            for planet in self._present_planets(tuple(self.SPECIAL_ASPECTS)):
+                config = self.SPECIAL_ASPECTS[planet]
+                strongest.append({
+                    'planet': planet,
+                    'aspect_count': int(special_counts[PLANET_INDEX[planet]]),
+                    'special_aspects': config['aspects'],
+                    'significance': 'very strong',
+                    'description': config['description']
+                })
 
             # Sort by aspect count (descending)
             strongest.sort(key=lambda x: x['aspect_count'], reverse=True)
@@ -343,3 +390,22 @@ class VedicAspectsCalculator:
         except Exception as e:
             logger.error(f"Error in complete aspect analysis: {str(e)}", exc_info=True)
             return {}
+
+
+def _build_aspect_table() -> np.ndarray:
+    """
+    Build the static 9x12 relative aspect table.
+
+    Row p, column k holds the aspect flags planet p casts on the house k
+    places ahead of the house it occupies (column 0 is its own house, so the
+    7th-house aspect lives in column 6).
+    """
+    table = np.zeros((len(PLANETS), 12), dtype=np.int8)
+    table[:, 6] |= ASPECT_STANDARD
+    for planet, config in VedicAspectsCalculator.SPECIAL_ASPECTS.items():
+        for nth_house in config['aspects']:
+            table[PLANET_INDEX[planet], nth_house - 1] |= ASPECT_SPECIAL
+    return table
+
+
+_ASPECT_TABLE = _build_aspect_table()
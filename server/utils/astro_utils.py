@@ -530,8 +530,12 @@
 #         logger.warning(f"Error cleaning up Swiss Ephemeris: {e}")
 
 from datetime import datetime
+from functools import lru_cache
 import pytz
+import numpy as np
 from server.pydantic_schemas.kundali_schema import KundaliRequest
+from server.utils.ayanamsa import DEFAULT_AYANAMSA, get_ayanamsa, get_ayanamsa_series, resolve_ayanamsa
+from server.utils.time_utils import local_to_julian_day
 import logging
 
 # Note: swisseph is imported lazily in functions that use it to avoid
@@ -545,41 +549,24 @@ logger = logging.getLogger(__name__)
 def get_julian_day_from_birth_details(birth_details: KundaliRequest) -> float:
     """
     Convert birth details to UTC and calculate Julian Day with enhanced precision.
-    """
-    import swisseph  # Lazy import to avoid import-time failures
 
+    Uses the cached timezone tables in time_utils; a numeric timezone_offset
+    takes precedence over the timezone name.
+    """
     try:
-        # Parse the datetime string with better error handling
-        # Accept both HH:MM and HH:MM:SS formats
-        time_str = birth_details.birthTime
-        if time_str.count(':') == 2:  # HH:MM:SS format
-            dt = datetime.strptime(f"{birth_details.birthDate} {time_str}", "%Y-%m-%d %H:%M:%S")
-        else:  # HH:MM format
-            dt = datetime.strptime(f"{birth_details.birthDate} {time_str}", "%Y-%m-%d %H:%M")
-        
-        # Handle timezone more robustly
-        if hasattr(birth_details, 'timezone') and birth_details.timezone:
-            tz = pytz.timezone(birth_details.timezone)
-        else:
+        zone = getattr(birth_details, 'timezone_offset', None)
+        if zone is None:
+            zone = getattr(birth_details, 'timezone', None)
+        if zone is None or zone == "":
             # Default to UTC if no timezone provided
-            tz = pytz.UTC
+            zone = "UTC"
             logger.warning("No timezone provided, defaulting to UTC")
-        
-        # Localize and convert to UTC
-        dt = tz.localize(dt)
-        utc_time = dt.astimezone(pytz.UTC)
 
-        # Calculate Julian Day with full precision
-        jd = swisseph.julday(
-            utc_time.year,
-            utc_time.month,
-            utc_time.day,
-            utc_time.hour + utc_time.minute / 60.0 + utc_time.second / 3600.0
-        )
-        
-        logger.debug(f"Calculated JD: {jd} for UTC time: {utc_time}")
+        jd = local_to_julian_day(birth_details.birthDate, birth_details.birthTime, zone)
+
+        logger.debug(f"Calculated JD: {jd} for zone: {zone}")
         return jd
-        
+
     except Exception as e:
         logger.error(f"Error calculating Julian Day: {e}")
         raise ValueError(f"Invalid birth details format: {e}")
@@ -609,18 +596,19 @@ def get_zodiac_sign(longitude):
     return zodiac_signs[sign_index]
 
 
-def calculate_planet_positions(jd, lat=None, lon=None):
+def calculate_planet_positions(jd, lat=None, lon=None, ayanamsa=DEFAULT_AYANAMSA):
     """
     Calculate accurate sidereal positions for all planets with enhanced precision and error handling.
+
+    The ayanamsa defaults to Lahiri (most commonly used in Vedic astrology);
+    any name from AYANAMSAS can be passed.
     """
     import swisseph  # Lazy import to avoid import-time failures
 
     try:
-        # Set sidereal mode to Lahiri (most commonly used in Vedic astrology)
-        swisseph.set_sid_mode(swisseph.SIDM_LAHIRI)
-        ayanamsa = swisseph.get_ayanamsa(jd)
+        ayanamsa_deg = get_ayanamsa(jd, ayanamsa)
         
-        logger.debug(f"Ayanamsa for JD {jd}: {ayanamsa}")
+        logger.debug(f"Ayanamsa ({ayanamsa}) for JD {jd}: {ayanamsa_deg}")
         
         # Set geographic position if coordinates are provided (for topocentric calculations)
         if lat is not None and lon is not None:
@@ -666,7 +654,7 @@ def calculate_planet_positions(jd, lat=None, lon=None):
                 speed = result[0][3] if len(result[0]) > 3 else 0  # Daily motion
                 
                 # Convert to sidereal with proper normalization
-                sidereal_longitude = (tropical_longitude - ayanamsa) % 360
+                sidereal_longitude = (tropical_longitude - ayanamsa_deg) % 360
                 
                 # Store additional data for enhanced accuracy
                 positions[planet_name] = {
@@ -687,7 +675,7 @@ def calculate_planet_positions(jd, lat=None, lon=None):
                     flag = swisseph.FLG_SWIEPH
                     result = swisseph.calc_ut(jd, planet_id, flag)
                     tropical_longitude = result[0][0]
-                    sidereal_longitude = (tropical_longitude - ayanamsa) % 360
+                    sidereal_longitude = (tropical_longitude - ayanamsa_deg) % 360
                     
                     positions[planet_name] = {
                         'longitude': sidereal_longitude,
@@ -734,12 +722,146 @@ def calculate_planet_positions(jd, lat=None, lon=None):
         raise RuntimeError(f"Failed to calculate planet positions: {e}")
 
 
-def calculate_ascendant(jd, lat, lon):
+# Supported house systems (name -> Swiss Ephemeris code)
+HOUSE_SYSTEMS = {
+    "placidus": b'P',
+    "koch": b'K',
+    "porphyry": b'O',
+    "regiomontanus": b'R',
+    "campanus": b'C',
+    "equal": b'E',
+    "whole_sign": b'W',
+    "sripati": b'S',
+}
+
+
+def _house_system_code(house_system):
+    """Resolve a house system name to its Swiss Ephemeris code."""
+    try:
+        return HOUSE_SYSTEMS[house_system.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(
+            f"Unknown house system: {house_system}. Use one of: {', '.join(HOUSE_SYSTEMS)}"
+        )
+
+
+@lru_cache(maxsize=4096)
+def _sidereal_houses(jd, lat, lon, hsys, ayanamsa):
     """
-    Calculate the sidereal ascendant with enhanced precision and validation.
+    Compute sidereal cusps and angles once per (jd, location, system, ayanamsa).
+
+    Tropical results from swisseph.houses are shifted by the ayanamsa,
+    matching how planet longitudes are made sidereal. Whole-sign cusps are
+    rebuilt from the sidereal ascendant's sign.
+
+    Returns:
+        Tuple of (12 cusps, ascendant, MC, ARMC, vertex)
     """
     import swisseph  # Lazy import to avoid import-time failures
 
+    ayanamsa = get_ayanamsa(jd, ayanamsa)
+
+    houses_result = swisseph.houses(jd, lat, lon, hsys)
+    if not houses_result or len(houses_result) < 2:
+        raise RuntimeError("Failed to calculate houses")
+
+    cusps, ascmc = houses_result[0], houses_result[1]
+    ascendant = (ascmc[0] - ayanamsa) % 360
+    if hsys == b'W':
+        first = ascendant - ascendant % 30
+        cusps = tuple((first + 30 * i) % 360 for i in range(12))
+    else:
+        cusps = tuple((c - ayanamsa) % 360 for c in cusps[:12])
+
+    return cusps, ascendant, (ascmc[1] - ayanamsa) % 360, ascmc[2], (ascmc[3] - ayanamsa) % 360
+
+
+def calculate_houses(jd, lat, lon, house_system="placidus", ayanamsa=DEFAULT_AYANAMSA):
+    """
+    Calculate sidereal house cusps, ascendant and MC for one chart.
+
+    Results are cached per (jd, location, house system), so every calculator
+    working on the same chart shares one Swiss Ephemeris call.
+
+    Args:
+        jd: Julian Day (UT)
+        lat: Latitude
+        lon: Longitude
+        house_system: One of HOUSE_SYSTEMS (default Placidus)
+        ayanamsa: One of AYANAMSAS (default Lahiri)
+
+    Returns:
+        Dictionary with house_system, ayanamsa, ayanamsa_degrees, cusps
+        (12 longitudes, 1st house first), ascendant, mc, armc and vertex
+    """
+    validate_birth_coordinates(lat, lon)
+    hsys = _house_system_code(house_system)
+    ayanamsa = resolve_ayanamsa(ayanamsa)
+
+    cusps, ascendant, mc, armc, vertex = _sidereal_houses(float(jd), float(lat), float(lon), hsys, ayanamsa)
+    return {
+        "house_system": house_system.lower(),
+        "ayanamsa": ayanamsa,
+        "ayanamsa_degrees": get_ayanamsa(jd, ayanamsa),
+        "cusps": list(cusps),
+        "ascendant": ascendant,
+        "mc": mc,
+        "armc": armc,
+        "vertex": vertex,
+    }
+
+
+def calculate_houses_batch(jds, lats, lons, house_system="placidus", ayanamsa=DEFAULT_AYANAMSA):
+    """
+    Calculate sidereal house cusps, ascendants and MCs for many charts.
+
+    jds, lats and lons are broadcast against each other, so one location can
+    be paired with many instants or many locations with one instant.
+
+    Args:
+        jds: Array of Julian Days (UT)
+        lats: Latitude(s)
+        lons: Longitude(s)
+        house_system: One of HOUSE_SYSTEMS (default Placidus)
+        ayanamsa: One of AYANAMSAS (default Lahiri)
+
+    Returns:
+        Dictionary with cusps (N, 12), ascendant (N,), mc (N,), armc (N,)
+        and vertex (N,) numpy arrays
+    """
+    hsys = _house_system_code(house_system)
+    ayanamsa = resolve_ayanamsa(ayanamsa)
+    jds, lats, lons = np.broadcast_arrays(
+        np.asarray(jds, dtype=np.float64),
+        np.asarray(lats, dtype=np.float64),
+        np.asarray(lons, dtype=np.float64),
+    )
+    jds, lats, lons = jds.ravel(), lats.ravel(), lons.ravel()
+
+    if ((lats < -90) | (lats > 90)).any() or ((lons < -180) | (lons > 180)).any():
+        raise ValueError("Latitudes must be within [-90, 90] and longitudes within [-180, 180]")
+
+    rows = [_sidereal_houses(float(jd), float(lat), float(lon), hsys, ayanamsa)
+            for jd, lat, lon in zip(jds, lats, lons)]
+
+    return {
+        "house_system": house_system.lower(),
+        "ayanamsa": ayanamsa,
+        "cusps": np.array([row[0] for row in rows]).reshape(len(rows), 12),
+        "ascendant": np.array([row[1] for row in rows]),
+        "mc": np.array([row[2] for row in rows]),
+        "armc": np.array([row[3] for row in rows]),
+        "vertex": np.array([row[4] for row in rows]),
+    }
+
+
+def calculate_ascendant(jd, lat, lon, ayanamsa=DEFAULT_AYANAMSA):
+    """
+    Calculate the sidereal ascendant with enhanced precision and validation.
+
+    Uses the cached Placidus house computation, so callers that also need
+    cusps or the MC should use calculate_houses directly.
+    """
     try:
         # Validate coordinates
         if not (-90 <= lat <= 90):
@@ -747,35 +869,125 @@ def calculate_ascendant(jd, lat, lon):
         if not (-180 <= lon <= 180):
             raise ValueError(f"Invalid longitude: {lon}. Must be between -180 and 180.")
 
-        # Set sidereal mode consistently
-        swisseph.set_sid_mode(swisseph.SIDM_LAHIRI)
-        ayanamsa = swisseph.get_ayanamsa(jd)
-        
-        # Calculate houses with proper house system (Placidus is default)
-        houses_result = swisseph.houses(jd, lat, lon, b'P')  # 'P' for Placidus
-        
-        if not houses_result or len(houses_result) < 2:
-            raise RuntimeError("Failed to calculate houses")
-        
-        houses = houses_result[0]  # House cusps
-        ascmc = houses_result[1]   # Ascendant, MC, etc.
-        
-        # Get tropical ascendant (first element is ascendant)
-        tropical_ascendant = ascmc[0]
-        
-        # Convert to sidereal with proper normalization
-        sidereal_ascendant = (tropical_ascendant - ayanamsa) % 360
-        
-        logger.debug(f"Tropical Ascendant: {tropical_ascendant:.6f}°")
+        sidereal_ascendant = calculate_houses(jd, lat, lon, ayanamsa=ayanamsa)["ascendant"]
+
         logger.debug(f"Sidereal Ascendant: {sidereal_ascendant:.6f}° in {get_zodiac_sign(sidereal_ascendant)}")
-        
+
         return sidereal_ascendant
-        
+
     except Exception as e:
         logger.error(f"Error calculating ascendant: {e}")
         raise RuntimeError(f"Failed to calculate ascendant: {e}")
 
 
+# Mean sidereal rotation of the Earth (degrees of sidereal time per solar day)
+SIDEREAL_DEGREES_PER_DAY = 360.98564736629
+
+
+def calculate_ascendant_batch(jds, lat, lon, ayanamsa=DEFAULT_AYANAMSA):
+    """
+    Calculate sidereal ascendants for many instants at one location.
+
+    Sidereal time and obliquity are anchored with Swiss Ephemeris at the first
+    instant and sidereal time is advanced at the mean rate, so a whole batch
+    costs a few ephemeris calls plus array trigonometry. Agrees with
+    calculate_ascendant to well under 0.001 degrees over spans of weeks.
+
+    Args:
+        jds: Array of Julian Days (UT)
+        lat: Latitude
+        lon: Longitude
+        ayanamsa: One of AYANAMSAS (default Lahiri)
+
+    Returns:
+        numpy array of sidereal ascendant longitudes (0-360)
+    """
+    import swisseph  # Lazy import to avoid import-time failures
+
+    validate_birth_coordinates(lat, lon)
+    jds = np.asarray(jds, dtype=np.float64)
+    if jds.size == 0:
+        return np.empty(0)
+
+    jd_first = float(jds.min())
+
+    ramc_first = swisseph.sidtime(jd_first) * 15.0 + lon
+    obliquity = np.radians(swisseph.calc_ut(jd_first, swisseph.ECL_NUT)[0][0])
+    ramc = np.radians(ramc_first + (jds - jd_first) * SIDEREAL_DEGREES_PER_DAY)
+
+    tropical = np.degrees(np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * np.cos(obliquity) + np.tan(np.radians(lat)) * np.sin(obliquity))
+    ))
+    return (tropical - get_ayanamsa_series(jds, ayanamsa)) % 360
+
+
+def calculate_planet_positions_batch(jds, planets=None, node_step=0.25, ayanamsa=DEFAULT_AYANAMSA):
+    """
+    Calculate sidereal planet longitudes for many instants.
+
+    Swiss Ephemeris is sampled on a regular grid of nodes covering the
+    instants and the unwrapped longitudes are linearly interpolated. With the
+    default 6-hour nodes the Moon stays within ~0.02 degrees; slower planets
+    are far more accurate. With node_step=None every instant is computed
+    exactly as calculate_planet_positions does, which is cheaper when the
+    instants are spread over years rather than clustered in a window.
+
+    Args:
+        jds: Array of Julian Days (UT)
+        planets: Planet names to compute (defaults to all nine grahas)
+        node_step: Spacing of ephemeris nodes in days, or None for exact
+            positions at every instant
+        ayanamsa: One of AYANAMSAS (default Lahiri)
+
+    Returns:
+        Dictionary of planet name to numpy array of sidereal longitudes (0-360)
+    """
+    import swisseph  # Lazy import to avoid import-time failures
+
+    planet_ids = {
+        "Sun": swisseph.SUN,
+        "Moon": swisseph.MOON,
+        "Mars": swisseph.MARS,
+        "Mercury": swisseph.MERCURY,
+        "Jupiter": swisseph.JUPITER,
+        "Venus": swisseph.VENUS,
+        "Saturn": swisseph.SATURN,
+        "Rahu": swisseph.MEAN_NODE,
+    }
+    planets = list(planets) if planets is not None else list(planet_ids) + ["Ketu"]
+    jds = np.asarray(jds, dtype=np.float64)
+    if jds.size == 0:
+        return {planet: np.empty(0) for planet in planets}
+
+    if node_step is None:
+        flag = swisseph.FLG_SWIEPH | swisseph.FLG_SPEED
+        ayanamsa_deg = np.array([get_ayanamsa(float(jd), ayanamsa) for jd in jds.ravel()])
+        exact = {}
+        for planet in dict.fromkeys("Rahu" if planet == "Ketu" else planet for planet in planets):
+            body = planet_ids[planet]
+            tropical = np.array([swisseph.calc_ut(float(jd), body, flag)[0][0] for jd in jds.ravel()])
+            exact[planet] = ((tropical - ayanamsa_deg) % 360).reshape(jds.shape)
+        # Ketu is exactly opposite the sidereal Rahu
+        return {planet: (exact["Rahu"] + 180) % 360 if planet == "Ketu" else exact[planet] for planet in planets}
+
+    first = np.floor(jds.min() / node_step) * node_step
+    count = int(np.ceil((jds.max() - first) / node_step)) + 1
+    nodes = first + np.arange(max(count, 2)) * node_step
+    ayanamsa_deg = get_ayanamsa_series(nodes, ayanamsa)
+
+    positions = {}
+    for planet in planets:
+        body = planet_ids["Rahu" if planet == "Ketu" else planet]
+        tropical = np.array([swisseph.calc_ut(jd, body, swisseph.FLG_SWIEPH)[0][0] for jd in nodes])
+        if planet == "Ketu":
+            tropical = tropical + 180.0
+        sidereal = np.unwrap(np.radians((tropical - ayanamsa_deg) % 360))
+        positions[planet] = np.degrees(np.interp(jds, nodes, sidereal)) % 360
+
+    return positions
+
+
 def assign_planets_to_houses(planet_positions, ascendant):
     """
     Assign planets to houses using Whole Sign House System with enhanced accuracy.
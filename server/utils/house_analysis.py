@@ -8,11 +8,150 @@ Author: Astrology Backend
 """
 
 import logging
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+SIGNS = (
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
+)
+
+# Planets that can rule a sign (dignity table columns), then the nodes
+LORD_PLANETS = ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn')
+GRAHAS = LORD_PLANETS + ('Rahu', 'Ketu')
+GRAHA_INDEX = {planet: i for i, planet in enumerate(GRAHAS)}
+
+BENEFIC_PLANETS = ('Sun', 'Moon', 'Jupiter', 'Venus', 'Mercury')
+MALEFIC_PLANETS = ('Mars', 'Saturn', 'Rahu', 'Ketu')
+
+OWN_SIGNS = {
+    'Sun': ['Leo'],
+    'Moon': ['Cancer'],
+    'Mars': ['Aries', 'Scorpio'],
+    'Mercury': ['Gemini', 'Virgo'],
+    'Jupiter': ['Sagittarius', 'Pisces'],
+    'Venus': ['Taurus', 'Libra'],
+    'Saturn': ['Capricorn', 'Aquarius'],
+}
+
+EXALTED_SIGNS = {
+    'Sun': 'Aries',
+    'Moon': 'Taurus',
+    'Mars': 'Capricorn',
+    'Mercury': 'Virgo',
+    'Jupiter': 'Cancer',
+    'Venus': 'Pisces',
+    'Saturn': 'Libra',
+}
+
+# Lord strength codes, indexes into LORD_STRENGTH_LABELS
+LORD_UNKNOWN, LORD_MODERATE, LORD_STRONG, LORD_VERY_STRONG = range(4)
+LORD_STRENGTH_LABELS = ('Unknown', 'Moderate', 'Strong', 'Very Strong')
+
+
+def _build_sign_lords() -> np.ndarray:
+    """Build the 12-entry sign -> lord array (values index LORD_PLANETS)."""
+    lords = np.full(12, -1, dtype=np.int8)
+    for planet, signs in OWN_SIGNS.items():
+        for sign in signs:
+            lords[SIGNS.index(sign)] = LORD_PLANETS.index(planet)
+    return lords
+
+
+def _build_dignity_table(dignities: Dict[str, List[str]]) -> np.ndarray:
+    """Build a 12x7 sign x planet boolean table from a planet -> signs mapping."""
+    table = np.zeros((12, len(LORD_PLANETS)), dtype=bool)
+    for planet, signs in dignities.items():
+        for sign in signs:
+            table[SIGNS.index(sign), LORD_PLANETS.index(planet)] = True
+    return table
+
+
+SIGN_LORDS = _build_sign_lords()
+OWN_SIGN_TABLE = _build_dignity_table(OWN_SIGNS)
+EXALTED_SIGN_TABLE = _build_dignity_table({p: [s] for p, s in EXALTED_SIGNS.items()})
+
+
+def _sign_index(sign) -> int:
+    """Resolve a sign given as a name or 1-based number to a 0-based index (-1 if unknown)."""
+    if isinstance(sign, (int, np.integer)) and 1 <= sign <= 12:
+        return int(sign) - 1
+    if isinstance(sign, str) and sign.strip() in SIGNS:
+        return SIGNS.index(sign.strip())
+    return -1
+
+
+@dataclass
+class HouseTable:
+    """
+    Structured per-house arrays for all twelve houses (index 0 = house 1).
+
+    Lord columns index LORD_PLANETS; -1 marks an unknown value.
+    """
+    house_signs: np.ndarray        # (12,) 0-based sign of each house
+    lords: np.ndarray              # (12,) lord of each house
+    lord_signs: np.ndarray         # (12,) 0-based sign the lord occupies
+    lord_houses: np.ndarray        # (12,) 1-based house the lord occupies (0 if unknown)
+    lord_in_own_sign: np.ndarray   # (12,) bool
+    lord_exalted: np.ndarray       # (12,) bool
+    lord_strength: np.ndarray      # (12,) LORD_* strength codes
+    occupancy: np.ndarray          # (9, 12) bool, graha x house
+    strong_counts: np.ndarray      # (12,) occupants strong in that house
+    benefic_counts: np.ndarray     # (12,)
+    malefic_counts: np.ndarray     # (12,)
+
+    @property
+    def planet_counts(self) -> np.ndarray:
+        """Number of grahas in each house."""
+        return self.occupancy.sum(axis=0)
+
+    def planets_in_house(self, house_num: int) -> List[str]:
+        """Grahas occupying a house, in canonical order."""
+        return [GRAHAS[i] for i in np.flatnonzero(self.occupancy[:, house_num - 1])]
+
+    def lord_name(self, house_num: int) -> str:
+        """Name of a house lord."""
+        lord = self.lords[house_num - 1]
+        return LORD_PLANETS[lord] if lord >= 0 else 'Unknown'
+
+    def lord_strength_label(self, house_num: int) -> str:
+        """Lord strength label for a house."""
+        return LORD_STRENGTH_LABELS[self.lord_strength[house_num - 1]]
+
+    def sign_name(self, house_num: int) -> str:
+        """Sign name of a house ('' if unknown)."""
+        sign = self.house_signs[house_num - 1]
+        return SIGNS[sign] if sign >= 0 else ''
+
+    def house_strength_label(self, house_num: int) -> str:
+        """Overall house strength from the number of occupants strong in it."""
+        if self.planet_counts[house_num - 1] == 0:
+            return 'Weak (No planets)'
+
+        strong_count = self.strong_counts[house_num - 1]
+        if strong_count >= 2:
+            return 'Very Strong'
+        elif strong_count == 1:
+            return 'Strong'
+        return 'Moderate'
+
+    def house_quality_label(self, house_num: int) -> str:
+        """Overall benefic/malefic quality of a house from its occupants."""
+        benefic_count = self.benefic_counts[house_num - 1]
+        malefic_count = self.malefic_counts[house_num - 1]
+
+        if benefic_count > malefic_count:
+            return 'Benefic (Favorable)'
+        elif malefic_count > benefic_count:
+            return 'Malefic (Challenging)'
+        return 'Neutral (Balanced)'
+
+
 class HouseAnalyzer:
     """
     Analyze astrological houses in detail.
@@ -61,6 +200,96 @@ class HouseAnalyzer:
         self.planets_info = planets_info
         self.houses = houses
         self.ascendant_sign = ascendant_sign
+        self._house_table: Optional[HouseTable] = None
+
+    def _compact_chart(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reduce the chart dicts to index arrays.
+
+        Returns:
+            Tuple of (planet signs (9,), planet houses (9,), house signs (12,),
+            occupancy (9, 12)); unknown signs are -1, unknown houses 0
+        """
+        planet_signs = np.full(len(GRAHAS), -1, dtype=np.int8)
+        planet_houses = np.zeros(len(GRAHAS), dtype=np.int8)
+        for planet, i in GRAHA_INDEX.items():
+            planet_data = self.planets_info.get(planet)
+            if not isinstance(planet_data, dict):
+                continue
+            planet_signs[i] = _sign_index(planet_data.get('sign', ''))
+            house = planet_data.get('house', 0)
+            planet_houses[i] = house if isinstance(house, int) and 1 <= house <= 12 else 0
+
+        ascendant_index = _sign_index(self.ascendant_sign)
+        house_signs = np.full(12, -1, dtype=np.int8)
+        occupancy = np.zeros((len(GRAHAS), 12), dtype=bool)
+        for house_num in range(1, 13):
+            house_data = self.houses.get(house_num, {})
+            if not isinstance(house_data, dict):
+                house_data = {}
+            sign = _sign_index(house_data.get('sign', ''))
+            if sign < 0 and ascendant_index >= 0:
+                sign = (ascendant_index + house_num - 1) % 12
+            house_signs[house_num - 1] = sign
+            for planet in house_data.get('planets', []):
+                if planet in GRAHA_INDEX:
+                    occupancy[GRAHA_INDEX[planet], house_num - 1] = True
+
+        return planet_signs, planet_houses, house_signs, occupancy
+
+    def get_house_table(self) -> HouseTable:
+        """
+        Analyze all twelve houses in a single pass over the compact chart.
+
+        The result is cached, so repeated queries never re-derive lords or dignities.
+
+        Returns:
+            HouseTable with per-house lordship, dignity and occupancy arrays
+        """
+        if self._house_table is not None:
+            return self._house_table
+
+        planet_signs, planet_houses, house_signs, occupancy = self._compact_chart()
+
+        known_sign = house_signs >= 0
+        lords = np.where(known_sign, SIGN_LORDS[house_signs], -1).astype(np.int8)
+        known_lord = lords >= 0
+        safe_lords = np.where(known_lord, lords, 0)
+
+        lord_signs = np.where(known_lord, planet_signs[safe_lords], -1)
+        lord_houses = np.where(known_lord, planet_houses[safe_lords], 0)
+        located = known_lord & (lord_signs >= 0)
+        safe_lord_signs = np.where(located, lord_signs, 0)
+
+        in_own = located & OWN_SIGN_TABLE[safe_lord_signs, safe_lords]
+        exalted = located & EXALTED_SIGN_TABLE[safe_lord_signs, safe_lords]
+        strong_house = (lord_houses > 0) & _HOUSE_STRENGTH_TABLE[safe_lords, np.maximum(lord_houses - 1, 0)]
+
+        # A lord missing from planets_info keeps the Unknown code
+        placed = known_lord & np.array([
+            LORD_PLANETS[l] in self.planets_info and isinstance(self.planets_info[LORD_PLANETS[l]], dict)
+            for l in safe_lords
+        ])
+        lord_strength = np.select(
+            [~placed, in_own | exalted, strong_house],
+            [LORD_UNKNOWN, LORD_VERY_STRONG, LORD_STRONG],
+            default=LORD_MODERATE
+        ).astype(np.int8)
+
+        self._house_table = HouseTable(
+            house_signs=house_signs,
+            lords=lords,
+            lord_signs=lord_signs.astype(np.int8),
+            lord_houses=lord_houses.astype(np.int8),
+            lord_in_own_sign=in_own,
+            lord_exalted=exalted,
+            lord_strength=lord_strength,
+            occupancy=occupancy,
+            strong_counts=(occupancy & _HOUSE_STRENGTH_TABLE).sum(axis=0),
+            benefic_counts=occupancy[_BENEFIC_ROWS].sum(axis=0),
+            malefic_counts=occupancy[_MALEFIC_ROWS].sum(axis=0),
+        )
+        return self._house_table
 
     def analyze_all_houses(self) -> Dict:
         """
@@ -70,12 +299,8 @@ class HouseAnalyzer:
             Dictionary with detailed analysis for each house
         """
         try:
-            house_analysis = {}
-
-            for house_num in range(1, 13):
-                house_analysis[house_num] = self.analyze_single_house(house_num)
-
-            return house_analysis
+            table = self.get_house_table()
+            return {house_num: self._analyze_house_row(table, house_num) for house_num in range(1, 13)}
 
         except Exception as e:
             logger.error(f"Error analyzing all houses: {str(e)}")
@@ -95,161 +320,44 @@ class HouseAnalyzer:
             if house_num < 1 or house_num > 12:
                 return {}
 
-            house_data = self.houses.get(house_num, {})
-            significator_info = self.HOUSE_SIGNIFICATORS.get(house_num, {})
-            house_sign = house_data.get('sign', '') if isinstance(house_data, dict) else ''
-            planets_in_house = house_data.get('planets', []) if isinstance(house_data, dict) else []
-
-            analysis = {
-                'house_number': house_num,
-                'house_name': significator_info.get('name', ''),
-                'sign': house_sign,
-                'areas': significator_info.get('areas', []),
-                'significators': significator_info.get('karakas', []),
-                'planets': planets_in_house,
-                'strength': self._calculate_house_strength(house_num, planets_in_house),
-                'lord': self._get_house_lord(house_num, house_sign),
-                'lord_strength': self._get_house_lord_strength(house_num, house_sign),
-                'interpretation': self._get_house_interpretation(
-                    house_num, house_sign, planets_in_house
-                ),
-                'quality': self._determine_house_quality(house_num, planets_in_house),
-                'remedies': self._get_house_remedies(house_num, planets_in_house)
-            }
-
-            return analysis
+            return self._analyze_house_row(self.get_house_table(), house_num)
 
         except Exception as e:
             logger.error(f"Error analyzing house {house_num}: {str(e)}")
             return {}
 
-    def _get_house_lord(self, house_num: int, sign: str) -> str:
+    def _analyze_house_row(self, table: HouseTable, house_num: int) -> Dict:
         """
-        Get the lord (ruler) of a house based on its sign.
+        Build the analysis dict for one house from the precomputed house table.
 
         Args:
-            house_num: House number
-            sign: Zodiac sign in that house
-
-        Returns:
-            Planet name that rules this sign
-        """
-        sign_rulers = {
-            'Aries': 'Mars',
-            'Taurus': 'Venus',
-            'Gemini': 'Mercury',
-            'Cancer': 'Moon',
-            'Leo': 'Sun',
-            'Virgo': 'Mercury',
-            'Libra': 'Venus',
-            'Scorpio': 'Mars',
-            'Sagittarius': 'Jupiter',
-            'Capricorn': 'Saturn',
-            'Aquarius': 'Saturn',
-            'Pisces': 'Jupiter'
-        }
-        return sign_rulers.get(sign, 'Unknown')
-
-    def _get_house_lord_strength(self, house_num: int, sign: str) -> str:
-        """
-        Get the strength of the house lord.
-
-        Args:
-            house_num: House number
-            sign: Sign in that house
+            table: House table for this chart
+            house_num: House number (1-12)
 
         Returns:
-            Strength assessment string
+            Dictionary with house analysis
         """
-        lord = self._get_house_lord(house_num, sign)
-
-        if lord in self.planets_info:
-            planet_data = self.planets_info[lord]
-            if isinstance(planet_data, dict):
-                # Check if lord is in strong position
-                planet_house = planet_data.get('house', 0)
-                planet_sign = planet_data.get('sign', '')
-
-                # Lord in own sign or exalted sign = very strong
-                if self._is_lord_in_own_sign(lord, planet_sign):
-                    return 'Very Strong'
-                elif self._is_lord_in_exalted_sign(lord, planet_sign):
-                    return 'Very Strong'
-                # Lord in strong house
-                elif planet_house in self.PLANET_HOUSE_STRENGTH.get(lord, []):
-                    return 'Strong'
-                else:
-                    return 'Moderate'
-
-        return 'Unknown'
-
-    def _is_lord_in_own_sign(self, planet: str, sign: str) -> bool:
-        """Check if planet is in its own sign."""
-        own_signs = {
-            'Sun': 'Leo',
-            'Moon': 'Cancer',
-            'Mars': ['Aries', 'Scorpio'],
-            'Mercury': ['Gemini', 'Virgo'],
-            'Jupiter': ['Sagittarius', 'Pisces'],
-            'Venus': ['Taurus', 'Libra'],
-            'Saturn': ['Capricorn', 'Aquarius'],
+        significator_info = self.HOUSE_SIGNIFICATORS.get(house_num, {})
+        house_sign = table.sign_name(house_num)
+        planets_in_house = table.planets_in_house(house_num)
+
+        return {
+            'house_number': house_num,
+            'house_name': significator_info.get('name', ''),
+            'sign': house_sign,
+            'areas': significator_info.get('areas', []),
+            'significators': significator_info.get('karakas', []),
+            'planets': planets_in_house,
+            'strength': table.house_strength_label(house_num),
+            'lord': table.lord_name(house_num),
+            'lord_strength': table.lord_strength_label(house_num),
+            'interpretation': self._get_house_interpretation(
+                house_num, house_sign, planets_in_house
+            ),
+            'quality': table.house_quality_label(house_num),
+            'remedies': self._get_house_remedies(house_num, planets_in_house)
         }
 
-        own = own_signs.get(planet, [])
-        if isinstance(own, list):
-            return sign in own
-        else:
-            return sign == own
-
-    def _is_lord_in_exalted_sign(self, planet: str, sign: str) -> bool:
-        """Check if planet is in its exalted sign."""
-        exalted_signs = {
-            'Sun': 'Aries',
-            'Moon': 'Taurus',
-            'Mars': 'Capricorn',
-            'Mercury': 'Virgo',
-            'Jupiter': 'Cancer',
-            'Venus': 'Pisces',
-            'Saturn': 'Libra',
-            'Rahu': 'Gemini',
-            'Ketu': 'Sagittarius'
-        }
-
-        return exalted_signs.get(planet) == sign
-
-    def _calculate_house_strength(self, house_num: int, planets_in_house: List[str]) -> str:
-        """
-        Calculate overall house strength.
-
-        Args:
-            house_num: House number
-            planets_in_house: List of planets in this house
-
-        Returns:
-            Strength assessment
-        """
-        if not planets_in_house:
-            return 'Weak (No planets)'
-
-        # Count strong planets in this house
-        strong_count = 0
-        for planet in planets_in_house:
-            if self._is_planet_strong_in_house(planet, house_num):
-                strong_count += 1
-
-        if strong_count >= 2:
-            return 'Very Strong'
-        elif strong_count == 1:
-            return 'Strong'
-        elif len(planets_in_house) > 0:
-            return 'Moderate'
-        else:
-            return 'Weak'
-
-    def _is_planet_strong_in_house(self, planet: str, house_num: int) -> bool:
-        """Check if a planet is strong in a given house."""
-        return house_num in self.PLANET_HOUSE_STRENGTH.get(planet, [])
-
     def _get_house_interpretation(self, house_num: int, sign: str,
                                   planets_in_house: List[str]) -> str:
         """
@@ -278,30 +386,6 @@ class HouseAnalyzer:
 
         return interpretation
 
-    def _determine_house_quality(self, house_num: int, planets_in_house: List[str]) -> str:
-        """
-        Determine overall quality (benefic/malefic) of a house.
-
-        Args:
-            house_num: House number
-            planets_in_house: List of planets
-
-        Returns:
-            Quality assessment
-        """
-        benefic_planets = ['Sun', 'Moon', 'Jupiter', 'Venus', 'Mercury']
-        malefic_planets = ['Mars', 'Saturn', 'Rahu', 'Ketu']
-
-        benefic_count = sum(1 for p in planets_in_house if p in benefic_planets)
-        malefic_count = sum(1 for p in planets_in_house if p in malefic_planets)
-
-        if benefic_count > malefic_count:
-            return 'Benefic (Favorable)'
-        elif malefic_count > benefic_count:
-            return 'Malefic (Challenging)'
-        else:
-            return 'Neutral (Balanced)'
-
     def _get_house_remedies(self, house_num: int, planets_in_house: List[str]) -> List[str]:
         """
         Get remedies for house issues.
@@ -349,19 +433,18 @@ class HouseAnalyzer:
             Dictionary with house lord analysis
         """
         try:
+            table = self.get_house_table()
             lords_analysis = {}
 
             for house_num in range(1, 13):
-                house_data = self.houses.get(house_num, {})
-                house_sign = house_data.get('sign', '') if isinstance(house_data, dict) else ''
-                lord = self._get_house_lord(house_num, house_sign)
+                lord = table.lord_name(house_num)
 
                 lords_analysis[house_num] = {
                     'house': house_num,
                     'lord': lord,
-                    'sign_in_house': house_sign,
+                    'sign_in_house': table.sign_name(house_num),
                     'lord_position': self._get_planet_position(lord),
-                    'strength': self._get_house_lord_strength(house_num, house_sign),
+                    'strength': table.lord_strength_label(house_num),
                     'aspects': self._get_lord_aspects(lord),
                     'conjunction': self._get_lord_conjunctions(lord)
                 }
@@ -432,3 +515,12 @@ class HouseAnalyzer:
             return "Moderate Chart - Mixed support across life areas"
         else:
             return "Weak Chart - Focus on remedies for weak areas"
+
+
+# Graha x house strength table and benefic/malefic row masks, built at import time
+_HOUSE_STRENGTH_TABLE = np.zeros((len(GRAHAS), 12), dtype=bool)
+for _planet, _strong_houses in HouseAnalyzer.PLANET_HOUSE_STRENGTH.items():
+    _HOUSE_STRENGTH_TABLE[GRAHA_INDEX[_planet], np.array(_strong_houses) - 1] = True
+
+_BENEFIC_ROWS = np.array([p in BENEFIC_PLANETS for p in GRAHAS])
+_MALEFIC_ROWS = np.array([p in MALEFIC_PLANETS for p in GRAHAS])
@@ -0,0 +1,205 @@
+"""
+Timezone and Julian Day conversion utilities.
+
+Birth details arrive as local date/time strings plus a timezone, given either
+as an IANA name ("Asia/Kolkata") or a UTC offset in hours (5.5). Timezone
+objects and each zone's UTC-offset transition table are cached, so converting
+many records costs one table build per zone plus array arithmetic.
+
+Local times are resolved exactly as pytz.localize(dt) does by default
+(is_dst=False): ambiguous times take the standard-time reading and
+non-existent times take the offset in effect just before the gap.
+
+Author: Astrology Backend
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Sequence, Tuple, Union
+import logging
+
+import numpy as np
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Julian Day of the Unix epoch (1970-01-01 00:00 UTC)
+UNIX_EPOCH_JD = 2440587.5
+SECONDS_PER_DAY = 86400.0
+
+# pytz stores transition instants as naive UTC datetimes
+_EPOCH = datetime(1970, 1, 1)
+
+Zone = Union[str, float, int]
+
+
+@lru_cache(maxsize=1024)
+def get_timezone(name: str):
+    """
+    Get a cached pytz timezone.
+
+    Args:
+        name: IANA timezone name
+
+    Returns:
+        pytz timezone object
+
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def _parse_offset_hours(zone: Zone):
+    """Return the UTC offset in hours if the zone is numeric, else None."""
+    if isinstance(zone, (int, float, np.integer, np.floating)):
+        return float(zone)
+    try:
+        return float(zone)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def get_offset_table(zone: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the cached UTC-offset transition table of a zone.
+
+    Args:
+        zone: IANA timezone name or numeric UTC offset in hours (as a string)
+
+    Returns:
+        Tuple of (transition instants as UTC seconds since the epoch, offset
+        in seconds from each transition, DST flag from each transition). The
+        first transition is -inf so every instant falls in some period.
+    """
+    offset_hours = _parse_offset_hours(zone)
+    if offset_hours is not None:
+        return (np.array([-np.inf]), np.array([offset_hours * 3600.0]), np.array([False]))
+
+    tz = get_timezone(zone)
+    transitions = getattr(tz, '_utc_transition_times', None)
+    if not transitions:
+        # Fixed zones (UTC, StaticTzInfo) have a single offset
+        offset = tz.utcoffset(None).total_seconds()
+        return (np.array([-np.inf]), np.array([offset]), np.array([False]))
+
+    starts = np.array([(t - _EPOCH).total_seconds() for t in transitions[1:]], dtype=np.float64)
+    starts = np.concatenate(([-np.inf], starts))
+    offsets = np.array([info[0].total_seconds() for info in tz._transition_info], dtype=np.float64)
+    dst = np.array([info[1].total_seconds() != 0 for info in tz._transition_info])
+    return starts, offsets, dst
+
+
+def local_seconds_to_utc(local_seconds: np.ndarray, zone: Zone) -> np.ndarray:
+    """
+    Convert naive local times (seconds since the epoch, read as wall clock)
+    in one zone to UTC seconds since the epoch.
+
+    Args:
+        local_seconds: Array of wall-clock seconds since 1970-01-01 00:00
+        zone: IANA timezone name or UTC offset in hours
+
+    Returns:
+        Array of UTC seconds since the epoch
+    """
+    starts, offsets, dst = get_offset_table(str(zone))
+    local_seconds = np.asarray(local_seconds, dtype=np.float64)
+    if len(offsets) == 1:
+        return local_seconds - offsets[0]
+
+    # Latest period whose wall-clock start is not after each local time. For
+    # times inside a spring-forward gap this is the period before the gap,
+    # whose offset is the one pytz applies.
+    local_starts = starts + offsets
+    period = np.maximum(np.searchsorted(local_starts, local_seconds, side='right') - 1, 0)
+
+    # Fall-back overlap: the time is also valid in the previous period
+    previous = np.maximum(period - 1, 0)
+    in_overlap = (period > 0) & (local_seconds - offsets[previous] < starts[period])
+
+    # Overlap: prefer the standard-time period, else the later UTC instant
+    prefer_previous = np.where(
+        dst[previous] != dst[period],
+        ~dst[previous],
+        offsets[previous] < offsets[period],
+    )
+    chosen = np.where(in_overlap & prefer_previous, previous, period)
+    return local_seconds - offsets[chosen]
+
+
+def normalize_time_strings(times: Sequence[str]) -> np.ndarray:
+    """Pad HH:MM times to HH:MM:SS."""
+    times = np.char.strip(np.asarray(times, dtype=str))
+    short = np.char.count(times, ':') == 1
+    return np.where(short, np.char.add(times, ':00'), times)
+
+
+def _parse_stamps(dates: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Parse date and HH:MM:SS time strings one by one into datetime64[s]."""
+    stamps = np.empty(dates.shape, dtype='datetime64[s]')
+    for i, (date_str, time_str) in enumerate(zip(dates.ravel(), times.ravel())):
+        try:
+            parsed = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
+        except ValueError as e:
+            raise ValueError(f"Invalid birth date/time format: {e}")
+        stamps.flat[i] = np.datetime64(parsed, 's')
+    return stamps
+
+
+def local_to_julian_days(dates: Sequence[str], times: Sequence[str], zones) -> np.ndarray:
+    """
+    Convert arrays of local birth dates/times and zones to Julian Days (UT).
+
+    Args:
+        dates: YYYY-MM-DD strings
+        times: HH:MM or HH:MM:SS strings
+        zones: IANA names or UTC offsets in hours, one per record or a single
+            value for all records
+
+    Returns:
+        numpy array of Julian Days
+
+    Raises:
+        ValueError: On malformed dates/times or unknown timezones
+    """
+    dates = np.char.strip(np.asarray(dates, dtype=str))
+    times = normalize_time_strings(times)
+    try:
+        stamps = np.char.add(np.char.add(dates, 'T'), times).astype('datetime64[s]')
+    except ValueError:
+        # numpy only parses zero-padded ISO fields; strptime also takes "1990-5-15" and "9:30"
+        stamps = _parse_stamps(dates, times)
+    local_seconds = stamps.astype(np.int64).astype(np.float64)
+
+    zones = np.broadcast_to(np.asarray(zones, dtype=object), local_seconds.shape)
+    zone_keys = np.array([str(z) for z in zones.ravel()], dtype=str).reshape(local_seconds.shape)
+
+    # One offset-table lookup per distinct zone
+    utc_seconds = np.empty_like(local_seconds)
+    unique_zones, inverse = np.unique(zone_keys, return_inverse=True)
+    inverse = inverse.reshape(local_seconds.shape)
+    for k, zone in enumerate(unique_zones):
+        mask = inverse == k
+        utc_seconds[mask] = local_seconds_to_utc(local_seconds[mask], zone)
+
+    return UNIX_EPOCH_JD + utc_seconds / SECONDS_PER_DAY
+
+
+def local_to_julian_day(date_str: str, time_str: str, zone: Zone) -> float:
+    """
+    Convert one local birth date/time and zone to a Julian Day (UT).
+
+    Args:
+        date_str: YYYY-MM-DD
+        time_str: HH:MM or HH:MM:SS
+        zone: IANA timezone name or UTC offset in hours
+
+    Returns:
+        Julian Day
+    """
+    return float(local_to_julian_days([date_str], [time_str], [zone])[0])
+
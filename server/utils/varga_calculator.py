@@ -35,16 +35,22 @@ class VargaCalculator:
         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
     ]
 
-    def __init__(self, planets_info: Dict[str, Dict], ascendant_degree: float):
+    def __init__(self, planets_info: Dict[str, Dict], ascendant_degree: float,
+                 houses: Optional[Dict] = None):
         """
         Initialize Varga Calculator.
 
         Args:
             planets_info: Dictionary with planet positions
             ascendant_degree: Ascendant degree (0-360)
+            houses: Optional result of astro_utils.calculate_houses for this
+                chart; its cusps and MC are reused by every varga
         """
         self.planets_info = planets_info
         self.ascendant_degree = ascendant_degree
+        self.houses = houses
+        self.midheaven_degree = houses.get('mc') if houses else None
+        self._varga_angles: Dict[int, Dict[str, Optional[str]]] = {}
 
     def calculate_all_vargas(self) -> Dict:
         """
@@ -72,7 +78,10 @@ class VargaCalculator:
                 'description': 'Basic birth chart',
                 'significance': 'Overall life, personality, general events',
                 'planets': self.planets_info,
-                'ascendant_degree': self.ascendant_degree
+                'ascendant_degree': self.ascendant_degree,
+                'ascendant': self.SIGNS[int(self.ascendant_degree % 360 // 30)],
+                'midheaven': self.get_varga_angles(1)['midheaven'],
+                'house_cusps': self.houses.get('cusps') if self.houses else None
             }
         except Exception as e:
             logger.error(f"Error getting Rasi chart: {str(e)}")
@@ -117,9 +126,7 @@ class VargaCalculator:
                     'hour': hora_lord
                 }
 
-            hora_chart['ascendant'] = self._calculate_varga_ascendant(
-                self.ascendant_degree, 2
-            )
+            hora_chart.update(self.get_varga_angles(2))
 
             return hora_chart
 
@@ -200,9 +207,7 @@ class VargaCalculator:
                     'interpretation': self._get_saptamsha_interpretation(saptamsha_num)
                 }
 
-            saptamsha_chart['ascendant'] = self._calculate_varga_ascendant(
-                self.ascendant_degree, 7
-            )
+            saptamsha_chart.update(self.get_varga_angles(7))
 
             saptamsha_chart['fertility_analysis'] = self._analyze_saptamsha_fertility()
 
@@ -282,9 +287,7 @@ class VargaCalculator:
                     'significance': self._get_navamsha_significance(navamsha_num)
                 }
 
-            navamsha_chart['ascendant'] = self._calculate_varga_ascendant(
-                self.ascendant_degree, 9
-            )
+            navamsha_chart.update(self.get_varga_angles(9))
 
             navamsha_chart['marriage_analysis'] = self._analyze_navamsha_marriage()
             navamsha_chart['hidden_strengths'] = self._analyze_hidden_strengths()
@@ -342,6 +345,27 @@ class VargaCalculator:
         ]
         return significances[navamsha_num % 9]
 
+    def get_varga_angles(self, division: int) -> Dict[str, Optional[str]]:
+        """
+        Get the ascendant and midheaven signs of a divisional chart.
+
+        Computed once per division and shared by every chart that needs them.
+
+        Args:
+            division: Varga division (1, 2, 7, 9, etc.)
+
+        Returns:
+            Dictionary with 'ascendant' and 'midheaven' signs (midheaven is
+            None when no house data was supplied)
+        """
+        if division not in self._varga_angles:
+            self._varga_angles[division] = {
+                'ascendant': self._calculate_varga_ascendant(self.ascendant_degree, division),
+                'midheaven': (self._calculate_varga_ascendant(self.midheaven_degree, division)
+                              if self.midheaven_degree is not None else None),
+            }
+        return self._varga_angles[division]
+
     def _calculate_varga_ascendant(self, ascendant_degree: float, division: int) -> str:
         """
         Calculate divisional chart ascendant.
@@ -13,7 +13,6 @@ Verifies that:
 import sys
 import json
 from pathlib import Path
-import joblib
 import os
 
 # Set output encoding
@@ -65,49 +64,37 @@ def main():
             checks.append((f"File: {filename}", False))
             all_ok = False
 
-    # Check 3: Load models
+    # Check 3: Load models (with the same loader the server uses)
     print("\n[CHECK 3] Model Loading")
+    model = None
     try:
-        xgb_model = joblib.load(str(models_dir / "xgboost_model.pkl"))
+        from server.ml.model_registry import load_model
+        model = load_model(models_dir)
         print(f"[PASS] XGBoost model loaded successfully")
-        print(f"  Type: {type(xgb_model)}")
-        checks.append(("XGBoost loading", True))
-    except Exception as e:
-        print(f"[FAIL] Failed to load XGBoost model: {str(e)}")
-        checks.append(("XGBoost loading", False))
-        all_ok = False
-
-    try:
-        scaler = joblib.load(str(models_dir / "scaler.pkl"))
+        print(f"  Type: {type(model.xgb_model)}")
         print(f"[PASS] Scaler loaded successfully")
-        print(f"  Type: {type(scaler)}")
+        print(f"  Type: {type(model.scaler)}")
+        print(f"  Load time: {model.load_time_ms:.1f} ms, memory: {model.memory_bytes / (1024 * 1024):.1f} MB")
+        checks.append(("XGBoost loading", True))
         checks.append(("Scaler loading", True))
     except Exception as e:
-        print(f"[FAIL] Failed to load scaler: {str(e)}")
+        print(f"[FAIL] Failed to load models: {str(e)}")
+        checks.append(("XGBoost loading", False))
         checks.append(("Scaler loading", False))
         all_ok = False
 
     # Check 4: Load metadata
     print("\n[CHECK 4] Model Metadata")
-    try:
-        with open(models_dir / "feature_names.json") as f:
-            feature_names = json.load(f)
-        print(f"[PASS] Feature names loaded: {len(feature_names)} features")
-        print(f"  Features: {', '.join(list(feature_names)[:5])}...")
+    if model is not None:
+        print(f"[PASS] Feature names loaded: {len(model.feature_names)} features")
+        print(f"  Features: {', '.join(list(model.feature_names)[:5])}...")
+        print(f"[PASS] Target names loaded: {len(model.target_names)} targets")
+        print(f"  Targets: {', '.join(model.target_names)}")
         checks.append(("Feature names", True))
-    except Exception as e:
-        print(f"[FAIL] Failed to load feature names: {str(e)}")
-        checks.append(("Feature names", False))
-        all_ok = False
-
-    try:
-        with open(models_dir / "target_names.json") as f:
-            target_names = json.load(f)
-        print(f"[PASS] Target names loaded: {len(target_names)} targets")
-        print(f"  Targets: {', '.join(target_names)}")
         checks.append(("Target names", True))
-    except Exception as e:
-        print(f"[FAIL] Failed to load target names: {str(e)}")
+    else:
+        print(f"[FAIL] Model metadata unavailable")
+        checks.append(("Feature names", False))
         checks.append(("Target names", False))
         all_ok = False
 